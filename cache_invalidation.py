@@ -0,0 +1,190 @@
+"""
+cache_invalidation.py
+Cross-Process Cache Invalidation - PRAGMA data_version + table generations
+
+In-process caches (shop config, materials, tags, the fingerprint matrix,
+report results) go stale when *another* connection writes: a second worker,
+scripts/reset_db.py, baseline_declarations.py, a migration. This module lets
+them stay correct without TTLs:
+
+1. One private read-only connection per process polls `PRAGMA data_version`,
+   which changes whenever any other connection commits to the database file
+   (every write in this process goes through other connections too). When
+   it has not moved, a check costs one stat() and one PRAGMA.
+2. When it moved, the trigger-bumped ops__table_generations counters
+   (migrations 22 and 23) say which tables changed.
+3. Registered listeners whose tables changed are called with the changed
+   set. A replaced database file, a new epoch or a database without
+   counters means "everything changed".
+
+TableCache wraps the common case: a value loaded from some tables and
+dropped when any of them changes.
+"""
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+EPOCH_KEY = "__epoch__"
+# Sentinel in changed-table sets: a change that cannot be attributed to tables
+ALL_TABLES = "*"
+
+
+class _Listener(NamedTuple):
+    name: str
+    tables: frozenset
+    callback: Callable[[Set[str]], None]
+
+
+_lock = threading.RLock()
+_listeners: Dict[str, _Listener] = {}
+_conn: Optional[sqlite3.Connection] = None
+_conn_pid: Optional[int] = None
+_file_id: Optional[Tuple[str, int, int]] = None
+_data_version: Optional[int] = None
+_generations: Optional[Dict[str, int]] = None
+
+
+def register(name: str, tables: Iterable[str], callback: Callable[[Set[str]], None]) -> None:
+    """Call callback(changed_tables) when any of tables changes (re-registering replaces)."""
+    with _lock:
+        _listeners[name] = _Listener(name, frozenset(tables), callback)
+
+
+def unregister(name: str) -> None:
+    with _lock:
+        _listeners.pop(name, None)
+
+
+def _close() -> None:
+    global _conn, _file_id, _data_version, _generations
+    # A connection inherited across fork() must not be touched by the child
+    if _conn is not None and _conn_pid == os.getpid():
+        try:
+            _conn.close()
+        except sqlite3.Error:
+            pass
+    _conn, _file_id, _data_version, _generations = None, None, None, None
+
+
+def _read_generations(conn: sqlite3.Connection) -> Optional[Dict[str, int]]:
+    try:
+        rows = conn.execute("SELECT table_name, generation FROM ops__table_generations").fetchall()
+    except sqlite3.Error:
+        return None
+    return {name: generation for name, generation in rows}
+
+
+def _diff(before: Optional[Dict[str, int]], after: Optional[Dict[str, int]]) -> Set[str]:
+    if before is None or after is None or before.get(EPOCH_KEY) != after.get(EPOCH_KEY):
+        return {ALL_TABLES}
+    return {name for name in set(before) | set(after) if before.get(name) != after.get(name)}
+
+
+def _poll() -> Set[str]:
+    """Changed tables since the last poll (caller holds _lock)."""
+    global _conn, _conn_pid, _file_id, _data_version, _generations
+    import database  # lazy: database.py builds its caches on this module
+
+    db_path = database.resolve_db_path()
+    try:
+        stat = os.stat(db_path)
+    except OSError:
+        _close()
+        return {ALL_TABLES}
+    file_id = (str(db_path), stat.st_dev, stat.st_ino)
+
+    if _conn is None or file_id != _file_id or _conn_pid != os.getpid():
+        # First poll, forked worker, TEST_DB_PATH switch or database file replaced
+        _close()
+        try:
+            _conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+            _conn_pid = os.getpid()
+            _data_version = _conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            _close()
+            return {ALL_TABLES}
+        _file_id = file_id
+        _generations = _read_generations(_conn)
+        return {ALL_TABLES}
+
+    try:
+        data_version = _conn.execute("PRAGMA data_version").fetchone()[0]
+    except sqlite3.Error:
+        _close()
+        return {ALL_TABLES}
+    if data_version == _data_version:
+        return set()
+    _data_version = data_version
+    generations = _read_generations(_conn)
+    changed = _diff(_generations, generations)
+    _generations = generations
+    return changed
+
+
+def check() -> Set[str]:
+    """
+    Poll for changes made by any connection and notify affected listeners.
+
+    Returns the changed table names (ALL_TABLES when unattributable).
+    """
+    with _lock:
+        changed = _poll()
+        if not changed:
+            return changed
+        listeners: List[_Listener] = [
+            listener for listener in _listeners.values()
+            if ALL_TABLES in changed or listener.tables & changed
+        ]
+    for listener in listeners:
+        try:
+            listener.callback(changed)
+        except Exception as e:
+            print(f"[CACHE] Invalidation listener {listener.name} failed: {e}")
+    return changed
+
+
+def reset() -> None:
+    """Forget the polled state; the next check() reports everything changed."""
+    with _lock:
+        _close()
+
+
+class TableCache:
+    """
+    A value loaded from some tables, dropped as soon as any of them changes.
+
+    get() runs check() first, so a hit costs one stat() and one PRAGMA.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, name: str, tables: Iterable[str], loader: Callable[[], Any]) -> None:
+        self.name = name
+        self.tables = frozenset(tables)
+        self._loader = loader
+        self._value: Any = self._MISSING
+        self._version = 0
+        self._value_lock = threading.Lock()
+        register(name, self.tables, self._invalidate)
+
+    def _invalidate(self, changed: Set[str]) -> None:
+        with self._value_lock:
+            self._value = self._MISSING
+            self._version += 1
+
+    def invalidate(self) -> None:
+        self._invalidate({ALL_TABLES})
+
+    def get(self) -> Any:
+        check()
+        with self._value_lock:
+            value, version = self._value, self._version
+        if value is self._MISSING:
+            value = self._loader()
+            with self._value_lock:
+                # Invalidated while loading: serve this value, but do not keep it
+                if self._version == version:
+                    self._value = value
+        return value
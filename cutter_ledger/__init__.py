@@ -14,6 +14,6 @@ Provenance Design:
 - Debug callsite: Optional best-effort in event_data.debug.callsite
 """
 
-from .boundary import emit_cutter_event, get_events
+from .boundary import emit_cutter_event, get_events, get_latest_events
 
-__all__ = ['emit_cutter_event', 'get_events']
+__all__ = ['emit_cutter_event', 'get_events', 'get_latest_events']
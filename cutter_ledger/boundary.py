@@ -19,7 +19,11 @@ import inspect
 import subprocess
 import os
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+import read_connection
+import write_queue
+from cutter_ledger import projections
 
 
 # Support TEST_DB_PATH for hermetic testing
@@ -55,14 +59,11 @@ def get_version() -> str:
 
 def get_connection() -> sqlite3.Connection:
     """
-    Get database connection with WAL mode (Constitutional requirement C2).
+    Get a read-only database connection (read_connection.py).
+    Writes go through write_queue.run(), which opens its own connection.
     Respects TEST_DB_PATH environment variable for hermetic testing.
     """
-    db_path = _get_db_path()  # Re-evaluate in case TEST_DB_PATH changed
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL;")  # CRITICAL: Constitution Rule #2
-    return conn
+    return read_connection.connect(_get_db_path())
 
 
 def emit_cutter_event(
@@ -147,43 +148,34 @@ def emit_cutter_event(
     event_data_json = json.dumps(event_data) if event_data else None
     
     # INSERT into Cutter Ledger (ONLY authorized write location)
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO cutter__events 
-        (event_type, subject_ref, event_data, ingested_by_service, ingested_by_version)
-        VALUES (?, ?, ?, ?, ?)
-    """, (event_type, subject_ref_str, event_data_json, ingested_by_service, ingested_by_version))
+    # Routed through the process writer (write_queue.py): group-committed when enabled
+    def _write(conn: sqlite3.Connection) -> int:
+        cursor = conn.execute("""
+            INSERT INTO cutter__events 
+            (event_type, subject_ref, event_data, ingested_by_service, ingested_by_version)
+            VALUES (?, ?, ?, ?, ?)
+        """, (event_type, subject_ref_str, event_data_json, ingested_by_service, ingested_by_version))
+        event_id = cursor.lastrowid
+        # Derived read tables commit with the event (cutter_ledger/projections.py)
+        projections.apply_after_append(conn)
+        return event_id
     
-    event_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    
-    return event_id
+    return write_queue.run(_write, db_path=_get_db_path())
 
 
-def get_events(subject_ref: Optional[str] = None, event_type: Optional[str] = None) -> list:
-    """
-    Read events from the Cutter Ledger (industry-agnostic, read-only access).
-    
-    Args:
-        subject_ref: Filter by subject reference string (e.g., "quote:123") (optional, returns all if None)
-        event_type: Filter by event type (optional)
-    
-    Returns:
-        List of event dicts with id, event_type, subject_ref, event_data, created_at, 
-        ingested_by_service, ingested_by_version
-    """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Build query dynamically based on filters
-    query = """
-        SELECT id, event_type, subject_ref, event_data, created_at, 
-               ingested_by_service, ingested_by_version
-        FROM cutter__events
-    """
+_EVENT_COLUMNS = """
+    SELECT id, event_type, subject_ref, event_data, created_at,
+           ingested_by_service, ingested_by_version
+    FROM cutter__events
+"""
+
+
+def _event_filters(
+    subject_ref: Optional[str],
+    event_type: Optional[str],
+    subject_kind: Optional[str],
+    subject_id: Optional[str]
+) -> Tuple[List[str], List[Any]]:
     params = []
     conditions = []
     
@@ -200,29 +192,133 @@ def get_events(subject_ref: Optional[str] = None, event_type: Optional[str] = No
         conditions.append("event_type = ?")
         params.append(event_type)
     
+    if subject_kind is not None:
+        conditions.append("subject_kind = ?")
+        params.append(subject_kind)
+    
+    if subject_id is not None:
+        conditions.append("subject_id = ?")
+        params.append(str(subject_id))
+    
+    return conditions, params
+
+
+def _event_row(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        'id': row['id'],
+        'event_type': row['event_type'],
+        'subject_ref': row['subject_ref'],  # Already industry-agnostic
+        'event_data': json.loads(row['event_data']) if row['event_data'] else None,
+        'created_at': row['created_at'],
+        'ingested_by_service': row['ingested_by_service'],
+        'ingested_by_version': row['ingested_by_version']
+    }
+
+
+def _read_events(conn: Optional[sqlite3.Connection], query: str, params: List[Any]) -> List[Dict[str, Any]]:
+    owns_conn = conn is None
+    if owns_conn:
+        conn = get_connection()
+    try:
+        return [_event_row(row) for row in conn.execute(query, params).fetchall()]
+    finally:
+        if owns_conn:
+            conn.close()
+
+
+def get_events(
+    subject_ref: Optional[str] = None,
+    event_type: Optional[str] = None,
+    subject_kind: Optional[str] = None,
+    subject_id: Optional[str] = None,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> list:
+    """
+    Read events from the Cutter Ledger (industry-agnostic, read-only access).
+    
+    Args:
+        subject_ref: Filter by subject reference string (e.g., "quote:123") (optional, returns all if None)
+        event_type: Filter by event type (optional)
+        subject_kind: Filter by parsed subject kind (e.g., "quote", "customer") (optional)
+        subject_id: Filter by parsed subject id (e.g., "123") (optional)
+        after_id: Keyset cursor - only events with id > after_id (optional)
+        limit: Max events to return (optional)
+        conn: Open connection to read through (optional; e.g. a stream's snapshot)
+    
+    subject_kind/subject_id are generated from subject_ref (migration 19), so
+    "quote:123" and legacy bare "123" QUOTE_* events both match ("quote", "123").
+    
+    Without after_id/limit the whole filtered ledger is returned ordered by
+    created_at (legacy behaviour). With either, events are ordered by id, the
+    append order, and read by keyset: pass the last id seen as after_id to get
+    the next page. A page costs O(limit), however long the ledger is.
+    
+    Returns:
+        List of event dicts with id, event_type, subject_ref, event_data, created_at, 
+        ingested_by_service, ingested_by_version
+    """
+    conditions, params = _event_filters(subject_ref, event_type, subject_kind, subject_id)
+    keyset = after_id is not None or limit is not None
+    
+    if after_id is not None:
+        conditions.append("id > ?")
+        params.append(int(after_id))
+    
+    query = _EVENT_COLUMNS
     if conditions:
         query += " WHERE " + " AND ".join(conditions)
     
-    query += " ORDER BY created_at ASC"
+    if keyset:
+        query += " ORDER BY id ASC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(max(int(limit), 0))
+    else:
+        query += " ORDER BY created_at ASC"
     
-    cursor.execute(query, params)
+    return _read_events(conn, query, params)
+
+
+def get_latest_events(
+    limit: int,
+    subject_ref: Optional[str] = None,
+    event_type: Optional[str] = None,
+    subject_kind: Optional[str] = None,
+    subject_id: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> list:
+    """
+    The last `limit` events (by id) matching the filters, oldest first.
     
-    events = []
-    for row in cursor.fetchall():
-        events.append({
-            'id': row['id'],
-            'event_type': row['event_type'],
-            'subject_ref': row['subject_ref'],  # Already industry-agnostic
-            'event_data': json.loads(row['event_data']) if row['event_data'] else None,
-            'created_at': row['created_at'],
-            'ingested_by_service': row['ingested_by_service'],
-            'ingested_by_version': row['ingested_by_version']
-        })
+    Reads backwards from the end of the ledger, so it does not load the
+    events it skips. Filters are the same as get_events().
+    """
+    conditions, params = _event_filters(subject_ref, event_type, subject_kind, subject_id)
+    query = _EVENT_COLUMNS
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY id DESC LIMIT ?"
+    params.append(max(int(limit), 0))
     
-    conn.close()
+    events = _read_events(conn, query, params)
+    events.reverse()
     return events
 
 
+def count_events(conn: Optional[sqlite3.Connection] = None) -> int:
+    """Number of events in the Cutter Ledger."""
+    owns_conn = conn is None
+    if owns_conn:
+        conn = get_connection()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM cutter__events").fetchone()[0]
+    finally:
+        if owns_conn:
+            conn.close()
+
+
 # Backward compatibility wrapper (deprecated)
 def get_events_for_quote(quote_id: int) -> list:
     """
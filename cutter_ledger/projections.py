@@ -0,0 +1,459 @@
+"""
+Cutter Ledger Projections (Derived Read Tables)
+
+Registered projectors consume cutter__events in id order from a stored
+checkpoint and maintain small derived tables, so read queries stop rescanning
+and re-parsing the whole ledger:
+
+- stage_intervals:    cutter__proj_stage_intervals (first start/completion per subject+stage)
+- responses_received: cutter__proj_responses_received (first response per subject)
+- carrier_handoffs:   cutter__proj_carrier_handoffs (first handoff per subject)
+
+Catch-up runs on the writer side: cutter_ledger.boundary.emit_cutter_event() calls
+apply_after_append() inside the append's own write transaction, so the
+derived tables and checkpoints commit together with the event. Read queries
+never write: they read the derived tables as of the checkpoint and fold in
+the tail of events newer than it (tail_events). Events written by other
+paths (bootstrap SQL in tests, migrations) are therefore still reflected,
+and the next append (or --rebuild) moves the checkpoint past them.
+
+Constitutional notes:
+- Projections never write cutter__events (ledger stays append-only)
+- Derived tables are disposable: rebuild() replays from event id 0
+- Projectors are deterministic (first-by-created_at, independent of replay order)
+
+Usage:
+    python -m cutter_ledger.projections --rebuild --verify
+    python -m cutter_ledger.projections --status
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CHECKPOINT_TABLE = "cutter__projection_checkpoints"
+CATCH_UP_BATCH_SIZE = 5000
+
+# (id, event_type, subject_ref, event_data, created_at)
+EventRow = Tuple[int, str, str, Optional[str], str]
+
+
+class Projector:
+    """Base projector: consumes selected event types into derived tables."""
+
+    name: str = ""
+    event_types: Tuple[str, ...] = ()
+    tables: Tuple[str, ...] = ()
+
+    def apply(self, conn: sqlite3.Connection, event: EventRow) -> None:
+        raise NotImplementedError
+
+    def reset(self, conn: sqlite3.Connection) -> None:
+        for table in self.tables:
+            conn.execute(f"DELETE FROM {table}")
+
+
+class StageIntervalsProjector(Projector):
+    """
+    First stage_started / stage_completed timestamp per (subject_ref, stage).
+
+    Events with missing or malformed event_data are recorded as rejects so
+    reads can raise the same ValueError the full-scan query raised.
+    """
+
+    name = "stage_intervals"
+    event_types = ("stage_started", "stage_completed")
+    tables = ("cutter__proj_stage_intervals", "cutter__proj_stage_rejects")
+
+    @staticmethod
+    def parse(event: EventRow) -> Tuple[Optional[str], Optional[str]]:
+        """(stage, None) for a well-formed event, else (None, error)."""
+        _event_id, _event_type, subject_ref, event_data, _created_at = event
+        if event_data is None:
+            return None, f"Missing event_data for {subject_ref}"
+        try:
+            payload = json.loads(event_data)
+        except json.JSONDecodeError as exc:
+            return None, f"Malformed event_data JSON for {subject_ref}: {exc}"
+        if not isinstance(payload, dict) or "stage" not in payload:
+            return None, f"Missing stage in event_data for {subject_ref}"
+        return str(payload["stage"]), None
+
+    def apply(self, conn: sqlite3.Connection, event: EventRow) -> None:
+        event_id, event_type, subject_ref, _event_data, created_at = event
+        stage, error = self.parse(event)
+        if error is not None:
+            conn.execute("""
+                INSERT OR IGNORE INTO cutter__proj_stage_rejects
+                (event_id, subject_ref, created_at, error)
+                VALUES (?, ?, ?, ?)
+            """, (event_id, subject_ref, created_at, error))
+            return
+
+        column = "started_at" if event_type == "stage_started" else "completed_at"
+        conn.execute(f"""
+            INSERT INTO cutter__proj_stage_intervals
+            (subject_ref, stage, {column}, first_event_at, first_event_id)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(subject_ref, stage) DO UPDATE SET
+                {column} = CASE
+                    WHEN {column} IS NULL OR excluded.{column} < {column} THEN excluded.{column}
+                    ELSE {column}
+                END,
+                first_event_id = CASE
+                    WHEN excluded.first_event_at < first_event_at
+                      OR (excluded.first_event_at = first_event_at AND excluded.first_event_id < first_event_id)
+                    THEN excluded.first_event_id ELSE first_event_id
+                END,
+                first_event_at = MIN(first_event_at, excluded.first_event_at)
+        """, (subject_ref, stage, created_at, created_at, event_id))
+
+
+class FirstEventPerSubjectProjector(Projector):
+    """Earliest event of one type per subject_ref (existence + timestamp)."""
+
+    def __init__(self, name: str, event_type: str, table: str) -> None:
+        self.name = name
+        self.event_types = (event_type,)
+        self.tables = (table,)
+        self.table = table
+
+    def apply(self, conn: sqlite3.Connection, event: EventRow) -> None:
+        event_id, _event_type, subject_ref, _event_data, created_at = event
+        conn.execute(f"""
+            INSERT INTO {self.table} (subject_ref, first_event_id, first_event_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(subject_ref) DO UPDATE SET
+                first_event_id = CASE
+                    WHEN excluded.first_event_at < first_event_at THEN excluded.first_event_id
+                    ELSE first_event_id
+                END,
+                first_event_at = MIN(first_event_at, excluded.first_event_at)
+        """, (subject_ref, event_id, created_at))
+
+
+PROJECTORS: Dict[str, Projector] = {}
+
+
+def register_projector(projector: Projector) -> Projector:
+    if not projector.name:
+        raise ValueError("Projector requires a name")
+    if projector.name in PROJECTORS:
+        raise ValueError(f"Projector already registered: {projector.name}")
+    PROJECTORS[projector.name] = projector
+    return projector
+
+
+register_projector(StageIntervalsProjector())
+register_projector(FirstEventPerSubjectProjector(
+    "responses_received", "response_received", "cutter__proj_responses_received"
+))
+register_projector(FirstEventPerSubjectProjector(
+    "carrier_handoffs", "carrier_handoff", "cutter__proj_carrier_handoffs"
+))
+
+
+def _select_projectors(names: Optional[Iterable[str]]) -> List[Projector]:
+    if names is None:
+        return list(PROJECTORS.values())
+    selected = []
+    for name in names:
+        if name not in PROJECTORS:
+            raise KeyError(f"Unknown projector: {name}")
+        selected.append(PROJECTORS[name])
+    return selected
+
+
+def is_available(conn: sqlite3.Connection) -> bool:
+    """True when projection tables exist (migration 18); else callers full-scan."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (CHECKPOINT_TABLE,)
+    ).fetchone()
+    return row is not None
+
+
+def get_checkpoints(conn: sqlite3.Connection) -> Dict[str, int]:
+    rows = conn.execute(f"SELECT projector, last_event_id FROM {CHECKPOINT_TABLE}").fetchall()
+    return {row[0]: row[1] for row in rows}
+
+
+def get_checkpoint(conn: sqlite3.Connection, name: str) -> int:
+    """Last event id applied by one projector (0 before its first catch-up)."""
+    _select_projectors([name])
+    row = conn.execute(
+        f"SELECT last_event_id FROM {CHECKPOINT_TABLE} WHERE projector = ?", (name,)
+    ).fetchone()
+    return row[0] if row is not None else 0
+
+
+def tail_events(
+    conn: sqlite3.Connection,
+    name: str,
+    after_id: int,
+    subject_ref: Optional[str] = None
+) -> List[EventRow]:
+    """
+    Events for one projector newer than after_id, in id order.
+
+    Read queries fold these into the derived tables read at checkpoint
+    after_id; projectors are idempotent, so an event counted in both is
+    harmless.
+    """
+    event_types = _select_projectors([name])[0].event_types
+    params: List[Any] = [after_id, *event_types]
+    subject_clause = ""
+    if subject_ref is not None:
+        subject_clause = "AND subject_ref = ?"
+        params.append(subject_ref)
+    placeholders = ", ".join("?" for _ in event_types)
+    rows = conn.execute(f"""
+        SELECT id, event_type, subject_ref, event_data, created_at
+        FROM cutter__events
+        WHERE id > ? AND event_type IN ({placeholders})
+        {subject_clause}
+        ORDER BY id ASC
+    """, params).fetchall()
+    return [tuple(row) for row in rows]
+
+
+def _max_event_id(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT COALESCE(MAX(id), 0) FROM cutter__events").fetchone()
+    return row[0]
+
+
+def _begin(conn: sqlite3.Connection) -> str:
+    # Caller-owned transaction (the append) -> savepoint; otherwise take the
+    # write lock up front (rebuild, CLI).
+    if conn.in_transaction:
+        conn.execute("SAVEPOINT cutter_projection")
+        return "savepoint"
+    previous = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+    finally:
+        conn.isolation_level = previous
+    return "transaction"
+
+
+def _commit(conn: sqlite3.Connection, mode: str) -> None:
+    if mode == "savepoint":
+        conn.execute("RELEASE SAVEPOINT cutter_projection")
+    else:
+        conn.commit()
+
+
+def _rollback(conn: sqlite3.Connection, mode: str) -> None:
+    if mode == "savepoint":
+        conn.execute("ROLLBACK TO SAVEPOINT cutter_projection")
+        conn.execute("RELEASE SAVEPOINT cutter_projection")
+    else:
+        conn.rollback()
+
+
+def catch_up(conn: sqlite3.Connection, names: Optional[Iterable[str]] = None) -> int:
+    """
+    Apply events newer than each projector's checkpoint. Returns events applied.
+
+    Cheap when current: two indexed SELECTs, no write transaction.
+    """
+    projectors = _select_projectors(names)
+    if is_current(conn, names):
+        return 0
+
+    mode = _begin(conn)
+    applied = 0
+    try:
+        checkpoints = get_checkpoints(conn)
+        max_id = _max_event_id(conn)
+        pending = [p for p in projectors if checkpoints.get(p.name, 0) < max_id]
+        if pending:
+            low = min(checkpoints.get(p.name, 0) for p in pending)
+            by_type: Dict[str, List[Projector]] = {}
+            for projector in pending:
+                for event_type in projector.event_types:
+                    by_type.setdefault(event_type, []).append(projector)
+            placeholders = ", ".join("?" for _ in by_type)
+            cursor = conn.execute(f"""
+                SELECT id, event_type, subject_ref, event_data, created_at
+                FROM cutter__events
+                WHERE id > ? AND id <= ? AND event_type IN ({placeholders})
+                ORDER BY id ASC
+            """, [low, max_id, *by_type.keys()])
+            while True:
+                batch = cursor.fetchmany(CATCH_UP_BATCH_SIZE)
+                if not batch:
+                    break
+                for event in batch:
+                    event = tuple(event)
+                    for projector in by_type[event[1]]:
+                        if event[0] > checkpoints.get(projector.name, 0):
+                            projector.apply(conn, event)
+                            applied += 1
+            now = datetime.utcnow().isoformat()
+            conn.executemany(f"""
+                INSERT INTO {CHECKPOINT_TABLE} (projector, last_event_id, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(projector) DO UPDATE SET
+                    last_event_id = excluded.last_event_id,
+                    updated_at = excluded.updated_at
+            """, [(p.name, max_id, now) for p in pending])
+        _commit(conn, mode)
+    except Exception:
+        _rollback(conn, mode)
+        raise
+    return applied
+
+
+def is_current(conn: sqlite3.Connection, names: Optional[Iterable[str]] = None) -> bool:
+    """True if every selected projector has applied the newest event."""
+    max_id = _max_event_id(conn)
+    checkpoints = get_checkpoints(conn)
+    return all(checkpoints.get(p.name, 0) >= max_id for p in _select_projectors(names))
+
+
+def apply_after_append(conn: sqlite3.Connection) -> int:
+    """
+    Writer-side catch-up, called by the cutter ledger boundary inside the
+    append's write transaction. Returns events applied (0 before migration 18).
+    """
+    if not is_available(conn):
+        return 0
+    return catch_up(conn)
+
+
+def rebuild(conn: sqlite3.Connection, names: Optional[Iterable[str]] = None) -> int:
+    """Clear derived tables and replay from event id 0. Returns events applied."""
+    projectors = _select_projectors(names)
+    mode = _begin(conn)
+    try:
+        for projector in projectors:
+            projector.reset(conn)
+        placeholders = ", ".join("?" for _ in projectors)
+        conn.execute(
+            f"DELETE FROM {CHECKPOINT_TABLE} WHERE projector IN ({placeholders})",
+            [p.name for p in projectors],
+        )
+        _commit(conn, mode)
+    except Exception:
+        _rollback(conn, mode)
+        raise
+    return catch_up(conn, [p.name for p in projectors])
+
+
+def _connect(db_path: Optional[Path]) -> sqlite3.Connection:
+    if db_path is None:
+        import database
+        db_path = database.resolve_db_path()
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON;")
+    return conn
+
+
+def _sorted_rows(rows: Sequence[Dict[str, Any]], keys: Sequence[str]) -> List[Dict[str, Any]]:
+    return sorted(rows, key=lambda row: tuple(str(row.get(key)) for key in keys))
+
+
+def verify(db_path: Optional[Path] = None, now: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Compare projection-backed reads against the full-scan implementations.
+
+    Returns {"query": {"equal": bool, "projection_rows": n, "scan_rows": n}}.
+    """
+    from cutter_ledger import queries as cutter_queries
+    from state_ledger import queries as state_queries
+
+    now = now or datetime.utcnow().replace(microsecond=0).isoformat()
+    checks = {
+        "dwell_vs_expectation": (
+            lambda conn: cutter_queries.query_dwell_vs_expectation(conn=conn, now=now),
+            lambda conn: cutter_queries._query_dwell_vs_expectation_scan(conn=conn, now=now),
+            ("subject_ref", "stage"),
+        ),
+        "open_response_deadlines": (
+            lambda conn: cutter_queries.query_open_response_deadlines(conn=conn),
+            lambda conn: cutter_queries._query_open_response_deadlines_scan(conn=conn),
+            ("entity_ref", "declared_at", "deadline"),
+        ),
+        "open_deadlines": (
+            lambda conn: state_queries.query_open_deadlines(conn=conn),
+            lambda conn: state_queries._query_open_deadlines_scan(conn=conn),
+            ("entity_ref", "declared_at", "deadline"),
+        ),
+    }
+    report: Dict[str, Any] = {}
+    conn = _connect(db_path)
+    try:
+        for name, (projected_fn, scan_fn, keys) in checks.items():
+            try:
+                projected = _sorted_rows(projected_fn(conn), keys)
+                scanned = _sorted_rows(scan_fn(conn), keys)
+            except ValueError as exc:
+                # Both paths must refuse the same malformed ledger rows
+                try:
+                    scan_fn(conn)
+                    report[name] = {"equal": False, "error": f"projection only: {exc}"}
+                except ValueError:
+                    report[name] = {"equal": True, "error": str(exc)}
+                continue
+            report[name] = {
+                "equal": projected == scanned,
+                "projection_rows": len(projected),
+                "scan_rows": len(scanned),
+            }
+    finally:
+        conn.close()
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Cutter Ledger projections: status, rebuild from zero, verify",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m cutter_ledger.projections --status
+  python -m cutter_ledger.projections --rebuild --verify
+  python -m cutter_ledger.projections --rebuild --projector stage_intervals
+        """
+    )
+    parser.add_argument("--db-path", type=str, help="Database path (default: active DB)")
+    parser.add_argument("--status", action="store_true", help="Show checkpoints vs ledger head")
+    parser.add_argument("--rebuild", action="store_true", help="Clear derived tables and replay from id 0")
+    parser.add_argument("--verify", action="store_true",
+                        help="Compare projection reads with full-scan queries")
+    parser.add_argument("--projector", action="append", help="Limit rebuild to projector(s)")
+    parser.add_argument("--now", type=str, help="Fixed 'now' for dwell comparison (ISO)")
+    args = parser.parse_args()
+
+    db_path = Path(args.db_path) if args.db_path else None
+    conn = _connect(db_path)
+    try:
+        if not is_available(conn):
+            print(json.dumps({"error": "Projection tables missing; run migrations (python -m migrations.runner)"}))
+            return 1
+        result: Dict[str, Any] = {}
+        if args.rebuild:
+            result["rebuilt_events_applied"] = rebuild(conn, args.projector)
+        if args.status or not (args.rebuild or args.verify):
+            result["ledger_head"] = _max_event_id(conn)
+            result["checkpoints"] = get_checkpoints(conn)
+    finally:
+        conn.close()
+
+    exit_code = 0
+    if args.verify:
+        result["verify"] = verify(db_path, now=args.now)
+        if not all(check["equal"] for check in result["verify"].values()):
+            exit_code = 1
+    print(json.dumps(result, indent=2))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,9 +6,10 @@ import json
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 
 import database
+from cutter_ledger import projections
 from ops_layer.stage_expectations import get_expected_duration_seconds
 
 
@@ -22,6 +23,41 @@ def _parse_iso_ts(value: str) -> datetime:
     return dt
 
 
+def _open_connection(
+    db_path: Optional[Path],
+    conn: Optional[sqlite3.Connection]
+) -> Tuple[sqlite3.Connection, bool]:
+    if conn is not None:
+        return conn, False
+    return database.get_read_connection(db_path), True
+
+
+def _dwell_row(
+    subject: str,
+    stage: str,
+    started_at: str,
+    completed_at: Optional[str],
+    now_dt: datetime
+) -> Dict[str, Any]:
+    started_dt = _parse_iso_ts(started_at)
+    if completed_at is not None:
+        completed_dt = _parse_iso_ts(completed_at)
+        elapsed_seconds = int((completed_dt - started_dt).total_seconds())
+    else:
+        elapsed_seconds = int((now_dt - started_dt).total_seconds())
+
+    expected_seconds = get_expected_duration_seconds(stage)
+    return {
+        "subject_ref": subject,
+        "stage": stage,
+        "started_at": started_at,
+        "completed_at": completed_at,
+        "elapsed_seconds": elapsed_seconds,
+        "expected_seconds": expected_seconds,
+        "delta_seconds": elapsed_seconds - expected_seconds
+    }
+
+
 def query_dwell_vs_expectation(
     db_path: Optional[Path] = None,
     subject_ref: Optional[str] = None,
@@ -30,20 +66,88 @@ def query_dwell_vs_expectation(
 ) -> List[Dict[str, Any]]:
     """
     Query dwell time vs expectation for stage events.
+
+    Reads the stage_intervals projection at its checkpoint plus the tail of
+    newer stage events; falls back to a full ledger scan when projection
+    tables are absent. Never takes the write lock.
+    """
+    conn, owns_conn = _open_connection(db_path, conn)
+    try:
+        if not projections.is_available(conn):
+            return _query_dwell_vs_expectation_scan(subject_ref=subject_ref, now=now, conn=conn)
+
+        params: List[Any] = []
+        subject_clause = ""
+        if subject_ref is not None:
+            subject_clause = "WHERE subject_ref = ?"
+            params.append(subject_ref)
+
+        # Checkpoint first: anything applied after it is also in the tail
+        checkpoint = projections.get_checkpoint(conn, "stage_intervals")
+        rejects = [tuple(row) for row in conn.execute(f"""
+            SELECT created_at, event_id, error FROM cutter__proj_stage_rejects
+            {subject_clause}
+        """, params).fetchall()]
+        intervals: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for row in conn.execute(f"""
+            SELECT subject_ref, stage, started_at, completed_at, first_event_at, first_event_id
+            FROM cutter__proj_stage_intervals
+            {subject_clause}
+        """, params).fetchall():
+            intervals[(row[0], row[1])] = {
+                "started_at": row[2], "completed_at": row[3],
+                "first_event_at": row[4], "first_event_id": row[5],
+            }
+        tail = projections.tail_events(conn, "stage_intervals", checkpoint, subject_ref)
+    finally:
+        if owns_conn:
+            conn.close()
+
+    # Same rules as StageIntervalsProjector.apply()
+    for event in tail:
+        event_id, event_type, subject, _event_data, created_at = event
+        stage, error = projections.StageIntervalsProjector.parse(event)
+        if error is not None:
+            rejects.append((created_at, event_id, error))
+            continue
+        interval = intervals.setdefault((subject, stage), {
+            "started_at": None, "completed_at": None,
+            "first_event_at": created_at, "first_event_id": event_id,
+        })
+        column = "started_at" if event_type == "stage_started" else "completed_at"
+        if interval[column] is None or created_at < interval[column]:
+            interval[column] = created_at
+        if (created_at, event_id) < (interval["first_event_at"], interval["first_event_id"]):
+            interval["first_event_at"], interval["first_event_id"] = created_at, event_id
+    if rejects:
+        raise ValueError(min(rejects)[2])
+
+    # Group by subject in order of first appearance (matches the scan's ordering)
+    grouped: Dict[str, List[Tuple[str, str, Optional[str], Optional[str]]]] = {}
+    ordered = sorted(intervals.items(), key=lambda item: (item[1]["first_event_at"], item[1]["first_event_id"]))
+    for (subject, stage), interval in ordered:
+        grouped.setdefault(subject, []).append((subject, stage, interval["started_at"], interval["completed_at"]))
+
+    now_dt = _parse_iso_ts(now) if now is not None else datetime.utcnow()
+    results: List[Dict[str, Any]] = []
+    for subject_rows in grouped.values():
+        for subject, stage, started_at, completed_at in subject_rows:
+            if started_at is None:
+                continue
+            results.append(_dwell_row(subject, stage, started_at, completed_at, now_dt))
+    return results
+
+
+def _query_dwell_vs_expectation_scan(
+    db_path: Optional[Path] = None,
+    subject_ref: Optional[str] = None,
+    now: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> List[Dict[str, Any]]:
+    """
+    Full-scan reference implementation (projection verify + fallback).
     """
-    owns_conn = False
-    if conn is None:
-        if db_path is not None:
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA foreign_keys = ON;")
-            owns_conn = True
-        else:
-            resolved = database.resolve_db_path()
-            conn = sqlite3.connect(resolved)
-            conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA foreign_keys = ON;")
-            owns_conn = True
+    conn, owns_conn = _open_connection(db_path, conn)
     cursor = conn.cursor()
 
     params: List[Any] = []
@@ -104,31 +208,34 @@ def query_dwell_vs_expectation(
             if started_at is None:
                 continue
 
-            started_dt = _parse_iso_ts(started_at)
-            if completed_at is not None:
-                completed_dt = _parse_iso_ts(completed_at)
-                elapsed_seconds = int((completed_dt - started_dt).total_seconds())
-            else:
-                elapsed_seconds = int((now_dt - started_dt).total_seconds())
-
-            expected_seconds = get_expected_duration_seconds(stage)
-            delta_seconds = elapsed_seconds - expected_seconds
-
-            results.append({
-                "subject_ref": subject,
-                "stage": stage,
-                "started_at": started_at,
-                "completed_at": completed_at,
-                "elapsed_seconds": elapsed_seconds,
-                "expected_seconds": expected_seconds,
-                "delta_seconds": delta_seconds
-            })
+            results.append(_dwell_row(subject, stage, started_at, completed_at, now_dt))
 
     if owns_conn:
         conn.close()
     return results
 
 
+# Projection rows plus response events newer than its checkpoint (the only parameter)
+RESPONSE_EXISTS_PROJECTION_SQL = """
+    SELECT 1
+    FROM cutter__proj_responses_received r
+    WHERE r.subject_ref = d.entity_ref
+    UNION ALL
+    SELECT 1
+    FROM cutter__events e
+    WHERE e.subject_ref = d.entity_ref
+    AND e.event_type = 'response_received'
+    AND e.id > ?
+"""
+
+RESPONSE_EXISTS_SCAN_SQL = """
+    SELECT 1
+    FROM cutter__events e
+    WHERE e.event_type = 'response_received'
+    AND e.subject_ref = d.entity_ref
+"""
+
+
 def query_open_response_deadlines(
     db_path: Optional[Path] = None,
     entity_ref: Optional[str] = None,
@@ -136,20 +243,44 @@ def query_open_response_deadlines(
 ) -> List[Dict[str, Any]]:
     """
     Query promise:response_by declarations with no response_received event.
+
+    Anti-joins on the responses_received projection (PK lookup per
+    declaration) plus responses newer than its checkpoint, instead of
+    cutter__events.
     """
-    owns_conn = False
-    if conn is None:
-        if db_path is not None:
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA foreign_keys = ON;")
-            owns_conn = True
-        else:
-            resolved = database.resolve_db_path()
-            conn = sqlite3.connect(resolved)
-            conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA foreign_keys = ON;")
-            owns_conn = True
+    conn, owns_conn = _open_connection(db_path, conn)
+    try:
+        if not projections.is_available(conn):
+            return _select_open_response_deadlines(conn, entity_ref, RESPONSE_EXISTS_SCAN_SQL)
+        checkpoint = projections.get_checkpoint(conn, "responses_received")
+        return _select_open_response_deadlines(conn, entity_ref, RESPONSE_EXISTS_PROJECTION_SQL, [checkpoint])
+    finally:
+        if owns_conn:
+            conn.close()
+
+
+def _query_open_response_deadlines_scan(
+    db_path: Optional[Path] = None,
+    entity_ref: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> List[Dict[str, Any]]:
+    """
+    Full-scan reference implementation (projection verify).
+    """
+    conn, owns_conn = _open_connection(db_path, conn)
+    try:
+        return _select_open_response_deadlines(conn, entity_ref, RESPONSE_EXISTS_SCAN_SQL)
+    finally:
+        if owns_conn:
+            conn.close()
+
+
+def _select_open_response_deadlines(
+    conn: sqlite3.Connection,
+    entity_ref: Optional[str],
+    response_exists_sql: str,
+    response_exists_params: Sequence[Any] = ()
+) -> List[Dict[str, Any]]:
     cursor = conn.cursor()
 
     params: List[Any] = []
@@ -157,18 +288,14 @@ def query_open_response_deadlines(
     if entity_ref is not None:
         entity_clause = "AND d.entity_ref = ?"
         params.append(entity_ref)
+    params.extend(response_exists_params)
 
     cursor.execute(f"""
         SELECT d.entity_ref, d.state_text, d.declared_at, d.declared_by_actor_ref
         FROM state__declarations d
         WHERE d.scope_ref = 'promise:response_by'
         {entity_clause}
-        AND NOT EXISTS (
-            SELECT 1
-            FROM cutter__events e
-            WHERE e.event_type = 'response_received'
-            AND e.subject_ref = d.entity_ref
-        )
+        AND NOT EXISTS ({response_exists_sql})
         ORDER BY d.declared_at ASC
     """, params)
 
@@ -177,13 +304,9 @@ def query_open_response_deadlines(
         try:
             payload = json.loads(row['state_text'])
         except json.JSONDecodeError as exc:
-            if owns_conn:
-                conn.close()
             raise ValueError(f"Malformed state_text JSON for {row['entity_ref']}: {exc}") from exc
 
         if not isinstance(payload, dict) or 'deadline' not in payload:
-            if owns_conn:
-                conn.close()
             raise ValueError(f"Missing deadline in state_text for {row['entity_ref']}")
 
         results.append({
@@ -193,6 +316,4 @@ def query_open_response_deadlines(
             'declared_by_actor_ref': row['declared_by_actor_ref'],
         })
 
-    if owns_conn:
-        conn.close()
     return results
@@ -5,11 +5,23 @@ Uses SQLite for local storage.
 import json
 import os
 import sqlite3
+import struct
 import sys
 from typing import Optional, Tuple, List, Dict, Any
 from pathlib import Path
 from datetime import datetime
 
+import cache_invalidation
+import read_connection
+import write_queue
+from migrations import runner as migration_runner
+from migrations import schema_snapshot
+
+# Part fingerprints: fixed-width BLOB beside fingerprint_json (migration 21)
+FINGERPRINT_DIMS = 5
+FINGERPRINT_BLOB_FORMAT = "<5d"  # little-endian float64 -> 40 bytes
+FINGERPRINT_BLOB_SIZE = struct.calcsize(FINGERPRINT_BLOB_FORMAT)
+
 # Support isolated test database via environment variable
 REPO_ROOT = Path(__file__).parent
 PROD_DB_PATH = (REPO_ROOT / "cutter.db").resolve()
@@ -75,367 +87,43 @@ def resolve_db_path() -> Path:
     return DB_PATH
 
 def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(resolve_db_path())
+    conn = sqlite3.connect(resolve_db_path(), timeout=write_queue.BUSY_TIMEOUT_SECONDS)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL;")  # CRITICAL: Constitution Rule #2
     return conn
 
-def initialize_database() -> None:
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # --- PHASE 1-3 LEGACY TABLES ---
-    
-    # 1. Materials
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS ops__materials (
-            name TEXT PRIMARY KEY,
-            cost_per_cubic_inch REAL NOT NULL,
-            machinability_score REAL NOT NULL
-        )
-    """)
-    
-    # 2. Shop Configuration
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS ops__shop_config (
-            key TEXT PRIMARY KEY,
-            value TEXT NOT NULL,
-            description TEXT,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # 3. Quote History (Legacy Flat Table)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS ops__quote_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            filename TEXT,
-            fingerprint TEXT,
-            anchor_price REAL,
-            final_price REAL,
-            setup_time INTEGER,
-            user_feedback_tags TEXT,
-            tag_weights TEXT,
-            status TEXT DEFAULT 'Draft',
-            actual_runtime REAL,
-            is_guild_submission INTEGER DEFAULT 0,
-            -- guild_credit_earned removed (PHASE 1: Guild economics in Ops DB violates firewall)
-            timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-            loss_reason TEXT,
-            win_notes TEXT,
-            closed_at TEXT
-        )
-    ''')
-
-    # --- PHASE 4: IDENTITY MODEL (4-TABLES) ---
-
-    # 4. Customers (The Bill-To)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS ops__customers (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL,
-            domain TEXT NOT NULL,
-            corporate_tags_json TEXT DEFAULT '[]',
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # 5. Contacts (The Decision-Maker)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS ops__contacts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            phone TEXT,
-            current_customer_id INTEGER,
-            behavior_tags_json TEXT DEFAULT '[]',
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(current_customer_id) REFERENCES ops__customers(id)
-        )
-    """)
-
-    # 6. Parts (The Geometry)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS ops__parts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            genesis_hash TEXT UNIQUE NOT NULL,
-            filename TEXT,
-            fingerprint_json TEXT,
-            volume REAL,
-            surface_area REAL,
-            dimensions_json TEXT,
-            process_routing_json TEXT DEFAULT '[]',
-            features_json TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # 7. Quotes (The Transaction)
-    # Includes "Deal Closer" fields: win_notes, loss_reason, closed_at
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS ops__quotes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            quote_id TEXT UNIQUE NOT NULL,
-            part_id INTEGER NOT NULL,
-            customer_id INTEGER NOT NULL,
-            contact_id INTEGER,
-            user_id INTEGER,
-            
-            material TEXT NOT NULL,
-            quantity INTEGER DEFAULT 1,
-            target_date TEXT,
-            payment_terms_days INTEGER DEFAULT 30,
-            
-            system_price_anchor REAL NOT NULL,
-            final_quoted_price REAL NOT NULL,
-            
-            variance_json TEXT,
-            pricing_tags_json TEXT,
-            physics_snapshot_json TEXT,
-            
-            status TEXT DEFAULT 'Draft',
-            notes TEXT,
-            
-            -- RFQ First Fields
-            lead_time_date TEXT,
-            lead_time_days INTEGER,
-            target_price_per_unit REAL,
-            price_breaks_json TEXT,
-            outside_processing_json TEXT,
-            quality_requirements_json TEXT,
-            part_marking_json TEXT,
-            
-            -- Deal Closer Fields
-            win_notes TEXT,
-            loss_reason TEXT,
-            closed_at TEXT,
-            
-            -- Structured Win/Loss Attribution (Per quote outcome modal spec)
-            win_attribution_json TEXT,
-            loss_attribution_json TEXT,
-            
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            
-            FOREIGN KEY(part_id) REFERENCES ops__parts(id) ON DELETE CASCADE,
-            FOREIGN KEY(customer_id) REFERENCES ops__customers(id) ON DELETE RESTRICT,
-            FOREIGN KEY(contact_id) REFERENCES ops__contacts(id) ON DELETE SET NULL
-        )
-    """)
-    
-    # 8. Quote Outcome Events (Append-Only Truth Ledger + Wizard Data)
-    # Per wizard spec: Progressive auto-save with original vs final values
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS ops__quote_outcome_events (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            quote_id INTEGER NOT NULL,
-            outcome_type TEXT NOT NULL,
-            actor_user_id INTEGER,
-            saved_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            
-            -- Wizard: Price tracking (original vs final)
-            original_price REAL,
-            final_price REAL,
-            price_changed BOOLEAN DEFAULT FALSE,
-            
-            -- Wizard: Lead time tracking
-            original_leadtime_days INTEGER,
-            final_leadtime_days INTEGER,
-            leadtime_changed BOOLEAN DEFAULT FALSE,
-            
-            -- Wizard: Payment terms tracking
-            original_terms_days INTEGER,
-            final_terms_days INTEGER,
-            terms_changed BOOLEAN DEFAULT FALSE,
-            
-            -- Wizard: Other notes
-            other_notes TEXT,
-            
-            -- Wizard completion tracking
-            wizard_completed BOOLEAN DEFAULT FALSE,
-            wizard_step_reached INTEGER DEFAULT 0,
-            
-            FOREIGN KEY(quote_id) REFERENCES ops__quotes(id) ON DELETE CASCADE
-        )
-    """)
-    
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_outcome_events_quote ON ops__quote_outcome_events (quote_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_outcome_events_actor ON ops__quote_outcome_events (actor_user_id)")
-    
-    # 9. Custom Tags (Guild Ledger removed - PHASE 1 REMEDIATION)
-    # ops__guild_ledger deleted: Guild economics belong in Guild product
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS ops__custom_tags (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE,
-            impact_type TEXT, 
-            impact_value REAL,
-            persistence_type TEXT DEFAULT 'transient',
-            category TEXT DEFAULT 'General'
-        )
-    ''')
+def get_read_connection(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    """Read-only connection (read_connection.py); never creates the database."""
+    return read_connection.connect(db_path if db_path is not None else resolve_db_path())
 
-    # 10. Query-scoped reconciliation records (MVP-12)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS ops__reconciliations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            scope_ref TEXT NOT NULL,
-            scope_kind TEXT NOT NULL CHECK (scope_kind IN ('query', 'report')),
-            predicate_ref TEXT NOT NULL,
-            predicate_text TEXT,
-            actor_ref TEXT NOT NULL,
-            reconciled_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+def initialize_database() -> None:
+    """
+    Bring the ops schema to the latest version (migrations/runner.py).
 
-    # 11. Saved report definitions (Post-MVP planning-only)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS ops__saved_reports (
-            report_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            report_name TEXT NOT NULL UNIQUE,
-            query_type TEXT NOT NULL,
-            params_json TEXT NOT NULL,
-            created_by_actor_ref TEXT NOT NULL,
-            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            last_run_at TEXT
-        )
-    """)
-    
-    # --- MIGRATIONS (Ensure columns exist on legacy/existing DBs) ---
-    
-    # Helper to safe-add columns
-    def add_column_safe(table, col_name, col_type):
-        try:
-            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type}")
-        except sqlite3.OperationalError:
-            pass # Column exists
-
-    def rebuild_reconciliations_if_needed():
-        cursor.execute("PRAGMA table_info(ops__reconciliations)")
-        columns = cursor.fetchall()
-        if not columns:
-            return
-        col_by_name = {row[1]: row for row in columns}
-        predicate_ref_missing = "predicate_ref" not in col_by_name
-        predicate_text_notnull = col_by_name.get("predicate_text", (None, None, None, 0))[3] == 1
-        if not predicate_ref_missing and not predicate_text_notnull:
-            return
-        cursor.execute("ALTER TABLE ops__reconciliations RENAME TO ops__reconciliations_old")
-        cursor.execute("""
-            CREATE TABLE ops__reconciliations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                scope_ref TEXT NOT NULL,
-                scope_kind TEXT NOT NULL CHECK (scope_kind IN ('query', 'report')),
-                predicate_ref TEXT NOT NULL,
-                predicate_text TEXT,
-                actor_ref TEXT NOT NULL,
-                reconciled_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        cursor.execute("""
-            INSERT INTO ops__reconciliations (
-                scope_ref,
-                scope_kind,
-                predicate_ref,
-                predicate_text,
-                actor_ref,
-                reconciled_at
-            )
-            SELECT
-                scope_ref,
-                scope_kind,
-                predicate_text,
-                predicate_text,
-                actor_ref,
-                reconciled_at
-            FROM ops__reconciliations_old
-        """)
-        cursor.execute("DROP TABLE ops__reconciliations_old")
-
-    # Migrate Quotes table (Deal Closer fields)
-    add_column_safe('ops__quotes', 'win_notes', 'TEXT')
-    add_column_safe('ops__quotes', 'loss_reason', 'TEXT')
-    add_column_safe('ops__quotes', 'closed_at', 'TEXT')
-    add_column_safe('ops__quotes', 'win_attribution_json', 'TEXT')
-    add_column_safe('ops__quotes', 'loss_attribution_json', 'TEXT')
-    add_column_safe('ops__quotes', 'payment_terms_days', 'INTEGER')
-    
-    # Migrate Quote Outcome Events table (Wizard fields)
-    add_column_safe('ops__quote_outcome_events', 'original_price', 'REAL')
-    add_column_safe('ops__quote_outcome_events', 'final_price', 'REAL')
-    add_column_safe('ops__quote_outcome_events', 'price_changed', 'BOOLEAN')
-    add_column_safe('ops__quote_outcome_events', 'original_leadtime_days', 'INTEGER')
-    add_column_safe('ops__quote_outcome_events', 'final_leadtime_days', 'INTEGER')
-    add_column_safe('ops__quote_outcome_events', 'leadtime_changed', 'BOOLEAN')
-    add_column_safe('ops__quote_outcome_events', 'original_terms_days', 'INTEGER')
-    add_column_safe('ops__quote_outcome_events', 'final_terms_days', 'INTEGER')
-    add_column_safe('ops__quote_outcome_events', 'terms_changed', 'BOOLEAN')
-    add_column_safe('ops__quote_outcome_events', 'other_notes', 'TEXT')
-    add_column_safe('ops__quote_outcome_events', 'wizard_completed', 'BOOLEAN')
-    add_column_safe('ops__quote_outcome_events', 'wizard_step_reached', 'INTEGER')
-    
-    # Migrate Quote History (Legacy compatibility)
-    add_column_safe('ops__quote_history', 'tag_weights', 'TEXT')
-    add_column_safe('ops__quote_history', 'user_feedback_tags', 'TEXT')
-    add_column_safe('ops__quote_history', 'status', 'TEXT')
-    add_column_safe('ops__quote_history', 'actual_runtime', 'REAL')
-    add_column_safe('ops__quote_history', 'is_guild_submission', 'INTEGER')
-    # guild_credit_earned migration removed (PHASE 1: Guild economics in Ops violates firewall)
-    add_column_safe('ops__quote_history', 'submission_date', 'TEXT')
-    add_column_safe('ops__quote_history', 'loss_reason', 'TEXT')
-    add_column_safe('ops__quote_history', 'exported_at', 'TEXT')
-    add_column_safe('ops__quote_history', 'material', 'TEXT')
-    add_column_safe('ops__quote_history', 'is_compliant', 'INTEGER')
-    add_column_safe('ops__quote_history', 'genesis_hash', 'TEXT')
-    add_column_safe('ops__quote_history', 'process_routing', 'TEXT')
-    add_column_safe('ops__quote_history', 'source_type', 'TEXT')
-    add_column_safe('ops__quote_history', 'reference_image', 'TEXT')
-    add_column_safe('ops__quote_history', 'quote_id', 'TEXT')
-    add_column_safe('ops__quote_history', 'is_deleted', 'INTEGER')
-    add_column_safe('ops__quote_history', 'handling_time', 'REAL')
-    add_column_safe('ops__quote_history', 'win_notes', 'TEXT')
-    add_column_safe('ops__quote_history', 'closed_at', 'TEXT')
-
-    # Migrate State Ledger declarations (if table exists)
-    add_column_safe('state__declarations', 'evidence_refs_json', "TEXT DEFAULT '[]'")
-
-    rebuild_reconciliations_if_needed()
-
-    conn.commit()
-    conn.close()
-    
-    init_default_tags()
-    seed_default_data()
-    seed_shop_config()
+    Already-current databases cost one SELECT on schema_version. Ledger tables
+    are never created here; scripts/reset_db.py builds them (preflight fails
+    fast when they are missing).
+    """
+    conn = get_connection()
+    try:
+        migration_runner.ensure_schema(conn)
+    finally:
+        conn.close()
 
 def init_default_tags() -> None:
-    conn = get_connection()
-    cursor = conn.cursor()
-    defaults = [
-        ('Rush Job', 'price_markup_percent', 1.50, 'transient', 'Market'),
-        ('Expedite', 'price_markup_percent', 1.25, 'transient', 'Market'),
-        ('Risk: Scrap High', 'price_markup_percent', 1.10, 'structural', 'Risk'),
-        ('Friends / Family', 'price_markup_percent', 0.90, 'transient', 'Market'),
-        ('Tight Tol', 'add_setup_minutes', 60.0, 'structural', 'Geometry'),
-        ('Complex Fixture', 'add_setup_minutes', 120.0, 'structural', 'Geometry'),
-        ('Heavy Deburr', 'add_setup_minutes', 30.0, 'structural', 'Finish'),
-        ('Proto', 'set_shop_rate', 150.0, 'transient', 'Market'),
-        ('Cust. Material', 'set_material_mult', 0.0, 'transient', 'Material'),
-        ('Price Rounding', 'none', 0.0, 'transient', 'Strategy')
-    ]
-    cursor.executemany('''
+    write_queue.run(lambda conn: conn.executemany('''
         INSERT OR IGNORE INTO ops__custom_tags 
         (name, impact_type, impact_value, persistence_type, category) 
         VALUES (?, ?, ?, ?, ?)
-    ''', defaults)
-    conn.commit()
-    conn.close()
+    ''', schema_snapshot.DEFAULT_TAGS))
 
-def generate_default_quote_id() -> str:
+def generate_default_quote_id(conn: Optional[sqlite3.Connection] = None) -> str:
+    """Next Q-YYYYMMDD-NNN id; pass the write connection to reserve it atomically."""
     from datetime import datetime
     today = datetime.now().strftime('%Y%m%d')
-    conn = get_connection()
+    owns_conn = conn is None
+    if owns_conn:
+        conn = get_connection()
     cursor = conn.cursor()
     
     # Check quotes table first (primary truth)
@@ -456,10 +144,31 @@ def generate_default_quote_id() -> str:
     else:
         new_seq = 1
     
-    conn.close()
+    if owns_conn:
+        conn.close()
     return f'Q-{today}-{new_seq:03d}'
 
 
+def pack_fingerprint(fingerprint: Any) -> Optional[bytes]:
+    """
+    Pack a 5D fingerprint (list or JSON text) into its fixed-width BLOB.
+    
+    Returns None when the value is not exactly FINGERPRINT_DIMS numbers
+    (legacy vectors are skipped by similarity search, as before).
+    """
+    if isinstance(fingerprint, str):
+        try:
+            fingerprint = json.loads(fingerprint)
+        except json.JSONDecodeError:
+            return None
+    if not isinstance(fingerprint, (list, tuple)) or len(fingerprint) != FINGERPRINT_DIMS:
+        return None
+    try:
+        return struct.pack(FINGERPRINT_BLOB_FORMAT, *(float(value) for value in fingerprint))
+    except (TypeError, ValueError):
+        return None
+
+
 def upsert_part(
     genesis_hash: str,
     filename: str,
@@ -469,30 +178,26 @@ def upsert_part(
     dimensions_json: str,
     process_routing_json: str
 ) -> int:
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT id FROM ops__parts WHERE genesis_hash = ?", (genesis_hash,))
-    result = cursor.fetchone()
-    
-    if result:
-        part_id = result[0]
-        conn.close()
-        return part_id
-    else:
+    fingerprint_blob = pack_fingerprint(fingerprint_json)
+
+    def _write(conn: sqlite3.Connection) -> int:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id FROM ops__parts WHERE genesis_hash = ?", (genesis_hash,))
+        result = cursor.fetchone()
+        if result:
+            return result[0]
         cursor.execute("""
             INSERT INTO ops__parts (
-                genesis_hash, filename, fingerprint_json, volume, 
+                genesis_hash, filename, fingerprint_json, fingerprint_blob, volume, 
                 surface_area, dimensions_json, process_routing_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """, (
-            genesis_hash, filename, fingerprint_json, volume,
+            genesis_hash, filename, fingerprint_json, fingerprint_blob, volume,
             surface_area, dimensions_json, process_routing_json
         ))
-        conn.commit()
-        part_id = cursor.lastrowid
-        conn.close()
-        return part_id
+        return cursor.lastrowid
+
+    return write_queue.run(_write)
 
 
 def resolve_customer(name: str, email_domain: Optional[str]) -> tuple:
@@ -504,46 +209,44 @@ def resolve_customer(name: str, email_domain: Optional[str]) -> tuple:
         - resolution_action: "matched_domain" | "matched_name" | "created"
         - input_domain_present: bool
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     normalized_name = name.strip().title() if name else "Unknown Customer"
     input_domain_present = bool(email_domain)
-    
-    # Try domain match first
-    if email_domain:
-        cursor.execute("SELECT id FROM ops__customers WHERE domain = ? LIMIT 1", (email_domain,))
+
+    # Match and create in one write transaction: concurrent saves never duplicate a customer
+    def _write(conn: sqlite3.Connection) -> tuple:
+        cursor = conn.cursor()
+        
+        # Try domain match first
+        if email_domain:
+            cursor.execute("SELECT id FROM ops__customers WHERE domain = ? LIMIT 1", (email_domain,))
+            result = cursor.fetchone()
+            if result:
+                return (result[0], {
+                    'resolution_action': 'matched_domain',
+                    'input_domain_present': input_domain_present
+                })
+        
+        # Try name match
+        cursor.execute("SELECT id FROM ops__customers WHERE name = ? LIMIT 1", (normalized_name,))
         result = cursor.fetchone()
         if result:
-            conn.close()
             return (result[0], {
-                'resolution_action': 'matched_domain',
+                'resolution_action': 'matched_name',
                 'input_domain_present': input_domain_present
             })
-    
-    # Try name match
-    cursor.execute("SELECT id FROM ops__customers WHERE name = ? LIMIT 1", (normalized_name,))
-    result = cursor.fetchone()
-    if result:
-        conn.close()
-        return (result[0], {
-            'resolution_action': 'matched_name',
+        
+        # Create new customer
+        cursor.execute("""
+            INSERT INTO ops__customers (name, domain, corporate_tags_json)
+            VALUES (?, ?, ?)
+        """, (normalized_name, email_domain if email_domain else "unknown", "[]"))
+        
+        return (cursor.lastrowid, {
+            'resolution_action': 'created',
             'input_domain_present': input_domain_present
         })
-    
-    # Create new customer
-    cursor.execute("""
-        INSERT INTO ops__customers (name, domain, corporate_tags_json)
-        VALUES (?, ?, ?)
-    """, (normalized_name, email_domain if email_domain else "unknown", "[]"))
-    
-    customer_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return (customer_id, {
-        'resolution_action': 'created',
-        'input_domain_present': input_domain_present
-    })
+
+    return write_queue.run(_write)
 
 
 def resolve_contact(name: str, email: str, customer_id: int, phone: Optional[str] = None) -> tuple:
@@ -562,96 +265,92 @@ def resolve_contact(name: str, email: str, customer_id: int, phone: Optional[str
     """
     import uuid
     
-    conn = get_connection()
-    cursor = conn.cursor()
+    def _write(conn: sqlite3.Connection) -> tuple:
+        cursor = conn.cursor()
     
-    # Normalize inputs
-    normalized_name = name.strip().title() if name else "Unknown Contact"
-    normalized_email = email.strip().lower() if email else ""
+        # Normalize inputs
+        normalized_name = name.strip().title() if name else "Unknown Contact"
+        normalized_email = email.strip().lower() if email else ""
     
-    # Strategy 1: Match by Email (Strongest Signal)
-    if normalized_email:
+        # Strategy 1: Match by Email (Strongest Signal)
+        if normalized_email:
+            cursor.execute(
+                "SELECT id, current_customer_id FROM ops__contacts WHERE email = ? LIMIT 1",
+                (normalized_email,)
+            )
+            result = cursor.fetchone()
+        
+            if result:
+                contact_id = result[0]
+                old_customer_id = result[1]
+            
+                # Handle "Roaming Buyer" (changed jobs)
+                roaming = (old_customer_id != customer_id)
+                if roaming:
+                    cursor.execute(
+                        "UPDATE ops__contacts SET current_customer_id = ?, name = ?, phone = ? WHERE id = ?",
+                        (customer_id, normalized_name, phone, contact_id)
+                    )
+            
+                return (contact_id, {
+                    'resolution_action': 'matched_email',
+                    'roaming': roaming,
+                    'old_customer_id': old_customer_id if roaming else None,
+                    'placeholder_email': False
+                })
+
+        # Strategy 2: Match by Name + Customer ID (Weak Signal, but necessary for no-email contacts)
+        # This prevents "Alice" and "Bob" at the same company from merging into one "Anonymous" record
         cursor.execute(
-            "SELECT id, current_customer_id FROM ops__contacts WHERE email = ? LIMIT 1",
-            (normalized_email,)
+            "SELECT id FROM ops__contacts WHERE name = ? AND current_customer_id = ? LIMIT 1",
+            (normalized_name, customer_id)
         )
         result = cursor.fetchone()
-        
+    
         if result:
             contact_id = result[0]
-            old_customer_id = result[1]
-            
-            # Handle "Roaming Buyer" (changed jobs)
-            roaming = (old_customer_id != customer_id)
-            if roaming:
-                cursor.execute(
-                    "UPDATE ops__contacts SET current_customer_id = ?, name = ?, phone = ? WHERE id = ?",
-                    (customer_id, normalized_name, phone, contact_id)
-                )
-                conn.commit()
-            
-            conn.close()
+            # Update phone if provided and currently empty
+            if phone:
+                cursor.execute("UPDATE ops__contacts SET phone = ? WHERE id = ? AND phone IS NULL", (phone, contact_id))
             return (contact_id, {
-                'resolution_action': 'matched_email',
-                'roaming': roaming,
-                'old_customer_id': old_customer_id if roaming else None,
+                'resolution_action': 'matched_name_customer',
+                'roaming': False,
+                'old_customer_id': None,
                 'placeholder_email': False
             })
+    
+        # Strategy 3: Create New Contact
+        # If no email, generate a TRULY unique placeholder to prevent future lookup collisions
+        placeholder_generated = False
+        if not normalized_email:
+            # Format: anon-{customer_id}-{uuid}@placeholder.com
+            # Includes UUID to ensure Alice and Bob get different emails
+            unique_suffix = str(uuid.uuid4())[:8]
+            final_email = f"anon-{customer_id}-{unique_suffix}@placeholder.com"
+            placeholder_generated = True
+        else:
+            final_email = normalized_email
 
-    # Strategy 2: Match by Name + Customer ID (Weak Signal, but necessary for no-email contacts)
-    # This prevents "Alice" and "Bob" at the same company from merging into one "Anonymous" record
-    cursor.execute(
-        "SELECT id FROM ops__contacts WHERE name = ? AND current_customer_id = ? LIMIT 1",
-        (normalized_name, customer_id)
-    )
-    result = cursor.fetchone()
+        cursor.execute("""
+            INSERT INTO ops__contacts (name, email, phone, behavior_tags_json, current_customer_id)
+            VALUES (?, ?, ?, ?, ?)
+        """, (
+            normalized_name,
+            final_email,
+            phone,
+            "[]",  # Empty tags
+            customer_id
+        ))
     
-    if result:
-        contact_id = result[0]
-        # Update phone if provided and currently empty
-        if phone:
-            cursor.execute("UPDATE ops__contacts SET phone = ? WHERE id = ? AND phone IS NULL", (phone, contact_id))
-            conn.commit()
-        conn.close()
+        contact_id = cursor.lastrowid
         return (contact_id, {
-            'resolution_action': 'matched_name_customer',
+            'resolution_action': 'created',
             'roaming': False,
             'old_customer_id': None,
-            'placeholder_email': False
+            'placeholder_email': placeholder_generated
         })
-    
-    # Strategy 3: Create New Contact
-    # If no email, generate a TRULY unique placeholder to prevent future lookup collisions
-    placeholder_generated = False
-    if not normalized_email:
-        # Format: anon-{customer_id}-{uuid}@placeholder.com
-        # Includes UUID to ensure Alice and Bob get different emails
-        unique_suffix = str(uuid.uuid4())[:8]
-        final_email = f"anon-{customer_id}-{unique_suffix}@placeholder.com"
-        placeholder_generated = True
-    else:
-        final_email = normalized_email
 
-    cursor.execute("""
-        INSERT INTO ops__contacts (name, email, phone, behavior_tags_json, current_customer_id)
-        VALUES (?, ?, ?, ?, ?)
-    """, (
-        normalized_name,
-        final_email,
-        phone,
-        "[]",  # Empty tags
-        customer_id
-    ))
-    
-    contact_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return (contact_id, {
-        'resolution_action': 'created',
-        'roaming': False,
-        'old_customer_id': None,
-        'placeholder_email': placeholder_generated
-    })
+    return write_queue.run(_write)
 
 
 def create_quote(
@@ -679,36 +378,35 @@ def create_quote(
     part_marking_json: Optional[str] = None,
     status: str = 'Draft'
 ) -> int:
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     normalized_material, is_compliant = validate_material(material if material else 'Unknown')
-    if not quote_id or not quote_id.strip():
-        quote_id = generate_default_quote_id()
+
+    def _write(conn: sqlite3.Connection) -> int:
+        cursor = conn.cursor()
+        # Generated ids are read and inserted under the same write lock (no duplicates)
+        human_quote_id = quote_id if quote_id and quote_id.strip() else generate_default_quote_id(conn)
     
-    cursor.execute("""
-        INSERT INTO ops__quotes (
-            part_id, customer_id, contact_id, user_id, quote_id, material,
+        cursor.execute("""
+            INSERT INTO ops__quotes (
+                part_id, customer_id, contact_id, user_id, quote_id, material,
+                system_price_anchor, final_quoted_price, quantity, target_date, notes,
+                variance_json, pricing_tags_json, physics_snapshot_json,
+                lead_time_date, lead_time_days, payment_terms_days, target_price_per_unit,
+                price_breaks_json, outside_processing_json, quality_requirements_json,
+                part_marking_json, status
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            part_id, customer_id, contact_id, user_id, human_quote_id, normalized_material,
             system_price_anchor, final_quoted_price, quantity, target_date, notes,
             variance_json, pricing_tags_json, physics_snapshot_json,
             lead_time_date, lead_time_days, payment_terms_days, target_price_per_unit,
             price_breaks_json, outside_processing_json, quality_requirements_json,
             part_marking_json, status
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        part_id, customer_id, contact_id, user_id, quote_id, normalized_material,
-        system_price_anchor, final_quoted_price, quantity, target_date, notes,
-        variance_json, pricing_tags_json, physics_snapshot_json,
-        lead_time_date, lead_time_days, payment_terms_days, target_price_per_unit,
-        price_breaks_json, outside_processing_json, quality_requirements_json,
-        part_marking_json, status
-    ))
+        ))
     
-    quote_record_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return quote_record_id
+        return cursor.lastrowid
+
+    return write_queue.run(_write)
 
 
 def get_unclosed_quotes() -> List[Dict[str, Any]]:
@@ -787,10 +485,8 @@ def save_quote_outcome_wizard(
     Returns:
         event_id if saved, 0 on error
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    try:
+    def _write(conn: sqlite3.Connection) -> int:
+        cursor = conn.cursor()
         # Check if event already exists for this quote (progressive update)
         cursor.execute("""
             SELECT id FROM ops__quote_outcome_events 
@@ -884,14 +580,12 @@ def save_quote_outcome_wizard(
             """, (new_status, datetime.now().isoformat(), quote_id))
         # NO_RESPONSE: Don't update status, stays on exception list
         
-        conn.commit()
-        conn.close()
         return event_id
-        
+
+    try:
+        return write_queue.run(_write)
     except Exception as e:
         print(f"[ERROR] Failed to save wizard outcome: {e}")
-        conn.rollback()
-        conn.close()
         return 0
 
 
@@ -915,13 +609,10 @@ def update_quote_status_simple(
         win_attribution: Structured win data (what changed, why won)
         loss_attribution: Structured loss data (loss reasons, competitor info)
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    try:
+    def _write(conn: sqlite3.Connection) -> bool:
+        cursor = conn.cursor()
         cursor.execute("SELECT id FROM ops__quotes WHERE id = ?", (quote_id,))
         if not cursor.fetchone():
-            conn.close()
             return False
         
         updates = ["status = ?", "updated_at = ?"]
@@ -962,81 +653,174 @@ def update_quote_status_simple(
         query = f"UPDATE ops__quotes SET {', '.join(updates)} WHERE id = ?"
         cursor.execute(query, params)
         
-        conn.commit()
-        conn.close()
         return True
-        
+
+    try:
+        return write_queue.run(_write)
     except Exception as e:
         print(f"[ERROR] Failed to update quote status: {e}")
-        conn.rollback()
-        conn.close()
         return False
 
 
+def set_final_quoted_price(quote_id: int, final_quoted_price: float) -> Optional[float]:
+    """
+    Set a quote's final_quoted_price (agreed price on a Won deal).
+    
+    The old price is read in the same write transaction, so concurrent
+    writes cannot make it stale.
+    
+    Returns:
+        The previous final_quoted_price (None if unset or no such quote)
+    """
+    def _write(conn: sqlite3.Connection) -> Optional[float]:
+        row = conn.execute("SELECT final_quoted_price FROM ops__quotes WHERE id = ?", (quote_id,)).fetchone()
+        conn.execute("UPDATE ops__quotes SET final_quoted_price = ? WHERE id = ?", (final_quoted_price, quote_id))
+        return row[0] if row else None
+
+    return write_queue.run(_write)
+
+
+_HISTORY_SELECT = """
+    SELECT 
+        q.id, q.quote_id, q.material, q.system_price_anchor, q.final_quoted_price,
+        q.variance_json, q.pricing_tags_json, q.status, q.created_at, q.user_id,
+        q.quantity, q.target_date, q.notes,
+        p.id as part_id, p.genesis_hash, p.filename, p.fingerprint_json, 
+        p.volume, p.surface_area, p.dimensions_json, p.process_routing_json,
+        cu.id as customer_id, cu.name as customer_name, cu.domain as customer_domain,
+        co.id as contact_id, co.name as contact_name, co.email as contact_email
+    FROM ops__quotes q
+    JOIN ops__parts p ON q.part_id = p.id
+    LEFT JOIN ops__customers cu ON q.customer_id = cu.id
+    LEFT JOIN ops__contacts co ON q.contact_id = co.id
+"""
+
+
+def _history_record(row: sqlite3.Row) -> Dict[str, Any]:
+    pricing_tags = json.loads(row['pricing_tags_json']) if row['pricing_tags_json'] else {}
+    return {
+        'id': row['id'],
+        'quote_id': row['quote_id'],
+        'material': row['material'],
+        'system_price_anchor': row['system_price_anchor'],
+        'final_quoted_price': row['final_quoted_price'],
+        'variance_json': json.loads(row['variance_json']) if row['variance_json'] else None,
+        'pricing_tags_json': pricing_tags,
+        'status': row['status'],
+        'timestamp': row['created_at'],
+        'user_id': row['user_id'],
+        'quantity': row['quantity'],
+        'target_date': row['target_date'],
+        'notes': row['notes'],
+        'part_id': row['part_id'],
+        'genesis_hash': row['genesis_hash'],
+        'filename': row['filename'],
+        'fingerprint': json.loads(row['fingerprint_json']) if row['fingerprint_json'] else [],
+        'volume': row['volume'],
+        'surface_area': row['surface_area'],
+        'dimensions': json.loads(row['dimensions_json']) if row['dimensions_json'] else {},
+        'process_routing': json.loads(row['process_routing_json']) if row['process_routing_json'] else [],
+        'customer_id': row['customer_id'],
+        'customer_name': row['customer_name'],
+        'customer_domain': row['customer_domain'],
+        'contact_id': row['contact_id'],
+        'contact_name': row['contact_name'],
+        'contact_email': row['contact_email'],
+        # Legacy mapping
+        'final_price': row['final_quoted_price'],
+        'anchor_price': row['system_price_anchor'],
+        'tag_weights': dict(pricing_tags)
+    }
+
+
 def get_all_history() -> List[Dict[str, Any]]:
     conn = get_connection()
     cursor = conn.cursor()
     
     # Join quotes with parts, customers, and contacts
+    cursor.execute(_HISTORY_SELECT + " ORDER BY q.created_at DESC")
+    
+    rows = cursor.fetchall()
+    conn.close()
+    
+    return [_history_record(row) for row in rows]
+
+
+def get_history_records(quote_ids: List[int]) -> List[Dict[str, Any]]:
+    """get_all_history() records for specific quote ids, in the given order."""
+    if not quote_ids:
+        return []
+    conn = get_connection()
+    cursor = conn.cursor()
+    placeholders = ", ".join("?" for _ in quote_ids)
+    cursor.execute(_HISTORY_SELECT + f" WHERE q.id IN ({placeholders})", [int(q) for q in quote_ids])
+    by_id = {row['id']: _history_record(row) for row in cursor.fetchall()}
+    conn.close()
+    return [by_id[int(q)] for q in quote_ids if int(q) in by_id]
+
+
+def get_quote_fingerprint_rows() -> List[sqlite3.Row]:
+    """
+    (quote id, fingerprint_blob, fingerprint_json, part id) for active quotes, newest first.
+    
+    fingerprint_json is only returned where the BLOB is missing (rows written
+    before migration 21 and not yet backfilled).
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
     cursor.execute("""
-        SELECT 
-            q.id, q.quote_id, q.material, q.system_price_anchor, q.final_quoted_price,
-            q.variance_json, q.pricing_tags_json, q.status, q.created_at, q.user_id,
-            q.quantity, q.target_date, q.notes,
-            p.id as part_id, p.genesis_hash, p.filename, p.fingerprint_json, 
-            p.volume, p.surface_area, p.dimensions_json, p.process_routing_json,
-            cu.id as customer_id, cu.name as customer_name, cu.domain as customer_domain,
-            co.id as contact_id, co.name as contact_name, co.email as contact_email
+        SELECT q.id, p.fingerprint_blob,
+               CASE WHEN p.fingerprint_blob IS NULL THEN p.fingerprint_json END,
+               p.id
         FROM ops__quotes q
         JOIN ops__parts p ON q.part_id = p.id
-        LEFT JOIN ops__customers cu ON q.customer_id = cu.id
-        LEFT JOIN ops__contacts co ON q.contact_id = co.id
+        WHERE COALESCE(q.is_deleted, 0) = 0
         ORDER BY q.created_at DESC
     """)
-    
     rows = cursor.fetchall()
     conn.close()
+    return rows
+
+
+def get_table_generations(table_names: List[str]) -> Optional[Dict[str, int]]:
+    """
+    Trigger-maintained change counters (migration 22), plus the '__epoch__' row.
     
-    records = []
-    for row in rows:
-        record = {
-            'id': row['id'],
-            'quote_id': row['quote_id'],
-            'material': row['material'],
-            'system_price_anchor': row['system_price_anchor'],
-            'final_quoted_price': row['final_quoted_price'],
-            'variance_json': json.loads(row['variance_json']) if row['variance_json'] else None,
-            'pricing_tags_json': json.loads(row['pricing_tags_json']) if row['pricing_tags_json'] else {},
-            'status': row['status'],
-            'timestamp': row['created_at'],
-            'user_id': row['user_id'],
-            'quantity': row['quantity'],
-            'target_date': row['target_date'],
-            'notes': row['notes'],
-            'part_id': row['part_id'],
-            'genesis_hash': row['genesis_hash'],
-            'filename': row['filename'],
-            'fingerprint': json.loads(row['fingerprint_json']) if row['fingerprint_json'] else [],
-            'volume': row['volume'],
-            'surface_area': row['surface_area'],
-            'dimensions': json.loads(row['dimensions_json']) if row['dimensions_json'] else {},
-            'process_routing': json.loads(row['process_routing_json']) if row['process_routing_json'] else [],
-            'customer_id': row['customer_id'],
-            'customer_name': row['customer_name'],
-            'customer_domain': row['customer_domain'],
-            'contact_id': row['contact_id'],
-            'contact_name': row['contact_name'],
-            'contact_email': row['contact_email'],
-            # Legacy mapping
-            'final_price': row['final_quoted_price'],
-            'anchor_price': row['system_price_anchor'],
-            'tag_weights': json.loads(row['pricing_tags_json']) if row['pricing_tags_json'] else {}
-        }
-        records.append(record)
-    
-    return records
+    Returns None on databases without ops__table_generations.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    names = ['__epoch__'] + list(table_names)
+    placeholders = ", ".join("?" for _ in names)
+    try:
+        cursor.execute(
+            f"SELECT table_name, generation FROM ops__table_generations WHERE table_name IN ({placeholders})",
+            names
+        )
+    except sqlite3.OperationalError:
+        conn.close()
+        return None
+    generations = {row['table_name']: row['generation'] for row in cursor.fetchall()}
+    conn.close()
+    return generations
 
-def get_all_tags() -> List[Dict[str, Any]]:
+
+def get_part_fingerprint_rows() -> List[sqlite3.Row]:
+    """(part id, fingerprint_blob, fingerprint_json-if-no-blob) for all parts, by id."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT id, fingerprint_blob,
+               CASE WHEN fingerprint_blob IS NULL THEN fingerprint_json END
+        FROM ops__parts
+        ORDER BY id
+    """)
+    rows = cursor.fetchall()
+    conn.close()
+    return rows
+
+
+def _load_tags() -> List[Dict[str, Any]]:
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT id, name, impact_type, impact_value, persistence_type, category FROM ops__custom_tags ORDER BY name")
@@ -1051,6 +835,14 @@ def get_all_tags() -> List[Dict[str, Any]]:
     return tags
 
 
+_tags_cache = cache_invalidation.TableCache("database.custom_tags", ["ops__custom_tags"], _load_tags)
+
+
+def get_all_tags() -> List[Dict[str, Any]]:
+    # Copies: callers may annotate the dicts
+    return [dict(tag) for tag in _tags_cache.get()]
+
+
 def record_reconciliation(
     scope_ref: str,
     scope_kind: str,
@@ -1061,23 +853,23 @@ def record_reconciliation(
     """
     Record an explicit, query-scoped reconciliation entry (MVP-12).
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO ops__reconciliations
-        (scope_ref, scope_kind, predicate_ref, predicate_text, actor_ref)
-        VALUES (?, ?, ?, ?, ?)
-    """, (scope_ref, scope_kind, predicate_ref, predicate_text, actor_ref))
-    reconciliation_id = cursor.lastrowid
-    cursor.execute("""
-        SELECT id, scope_ref, scope_kind, predicate_ref, predicate_text, actor_ref, reconciled_at
-        FROM ops__reconciliations
-        WHERE id = ?
-    """, (reconciliation_id,))
-    row = cursor.fetchone()
-    conn.commit()
-    conn.close()
-    return dict(row) if row else {}
+    def _write(conn: sqlite3.Connection) -> Dict[str, Any]:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO ops__reconciliations
+            (scope_ref, scope_kind, predicate_ref, predicate_text, actor_ref)
+            VALUES (?, ?, ?, ?, ?)
+        """, (scope_ref, scope_kind, predicate_ref, predicate_text, actor_ref))
+        reconciliation_id = cursor.lastrowid
+        cursor.execute("""
+            SELECT id, scope_ref, scope_kind, predicate_ref, predicate_text, actor_ref, reconciled_at
+            FROM ops__reconciliations
+            WHERE id = ?
+        """, (reconciliation_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else {}
+
+    return write_queue.run(_write)
 
 
 def list_reconciliations(
@@ -1144,34 +936,34 @@ def create_saved_report(
     params_json: str,
     created_by_actor_ref: str
 ) -> Dict[str, Any]:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO ops__saved_reports
-        (report_name, query_type, params_json, created_by_actor_ref)
-        VALUES (?, ?, ?, ?)
-    """, (report_name, query_type, params_json, created_by_actor_ref))
-    report_id = cursor.lastrowid
-    cursor.execute("""
-        SELECT
-            report_id,
-            report_name,
-            query_type,
-            params_json,
-            created_by_actor_ref,
-            created_at,
-            last_run_at
-        FROM ops__saved_reports
-        WHERE report_id = ?
-    """, (report_id,))
-    row = cursor.fetchone()
-    conn.commit()
-    conn.close()
-    return dict(row) if row else {}
+    def _write(conn: sqlite3.Connection) -> Dict[str, Any]:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO ops__saved_reports
+            (report_name, query_type, params_json, created_by_actor_ref)
+            VALUES (?, ?, ?, ?)
+        """, (report_name, query_type, params_json, created_by_actor_ref))
+        report_id = cursor.lastrowid
+        cursor.execute("""
+            SELECT
+                report_id,
+                report_name,
+                query_type,
+                params_json,
+                created_by_actor_ref,
+                created_at,
+                last_run_at
+            FROM ops__saved_reports
+            WHERE report_id = ?
+        """, (report_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else {}
+
+    return write_queue.run(_write)
 
 
 def list_saved_reports() -> List[Dict[str, Any]]:
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
     cursor.execute("""
         SELECT
@@ -1191,7 +983,7 @@ def list_saved_reports() -> List[Dict[str, Any]]:
 
 
 def get_saved_report(report_id: int) -> Optional[Dict[str, Any]]:
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
     cursor.execute("""
         SELECT
@@ -1211,93 +1003,89 @@ def get_saved_report(report_id: int) -> Optional[Dict[str, Any]]:
 
 
 def mark_report_run(report_id: int) -> Optional[str]:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE ops__saved_reports
-        SET last_run_at = CURRENT_TIMESTAMP
-        WHERE report_id = ?
-    """, (report_id,))
-    conn.commit()
-    cursor.execute("""
-        SELECT last_run_at
-        FROM ops__saved_reports
-        WHERE report_id = ?
-    """, (report_id,))
-    row = cursor.fetchone()
-    conn.close()
-    return row["last_run_at"] if row else None
+    def _write(conn: sqlite3.Connection) -> Optional[str]:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE ops__saved_reports
+            SET last_run_at = CURRENT_TIMESTAMP
+            WHERE report_id = ?
+        """, (report_id,))
+        cursor.execute("""
+            SELECT last_run_at
+            FROM ops__saved_reports
+            WHERE report_id = ?
+        """, (report_id,))
+        row = cursor.fetchone()
+        return row["last_run_at"] if row else None
+
+    return write_queue.run(_write)
 
 def create_custom_tag(name: str, impact_type: str, impact_value: float, persistence_type: str = 'transient', category: str = 'General') -> int:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO ops__custom_tags (name, impact_type, impact_value, persistence_type, category) VALUES (?, ?, ?, ?, ?)", 
-                   (name, impact_type, impact_value, persistence_type, category))
-    rowid = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return rowid
+    def _write(conn: sqlite3.Connection) -> int:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO ops__custom_tags (name, impact_type, impact_value, persistence_type, category) VALUES (?, ?, ?, ?, ?)", 
+                       (name, impact_type, impact_value, persistence_type, category))
+        rowid = cursor.lastrowid
+        return rowid
+
+    return write_queue.run(_write)
 
 def delete_custom_tag(tag_id: int) -> None:
-    conn = get_connection()
-    conn.execute("DELETE FROM ops__custom_tags WHERE id = ?", (tag_id,))
-    conn.commit()
-    conn.close()
+    write_queue.run(lambda conn: conn.execute("DELETE FROM ops__custom_tags WHERE id = ?", (tag_id,)))
 
 def update_custom_tag(tag_id: int, name: str, impact_type: str, impact_value: float, category: str) -> None:
-    conn = get_connection()
-    conn.execute("UPDATE ops__custom_tags SET name=?, impact_type=?, impact_value=?, category=? WHERE id=?", 
-                 (name, impact_type, impact_value, category, tag_id))
-    conn.commit()
-    conn.close()
+    write_queue.run(lambda conn: conn.execute(
+        "UPDATE ops__custom_tags SET name=?, impact_type=?, impact_value=?, category=? WHERE id=?", 
+        (name, impact_type, impact_value, category, tag_id)
+    ))
 
 def update_quote_status(quote_id: int, status: str, actual_runtime: Optional[float] = None, is_guild_submission: bool = False, loss_reason: Optional[str] = None) -> Tuple[float, bool]:
     """
     Legacy function for quote_history table (Partner Mode credit logic).
     The new Deal Closer logic uses update_quote_status_simple.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    def _write(conn: sqlite3.Connection) -> Tuple[float, bool]:
+        cursor = conn.cursor()
     
-    # PHASE 1 REMEDIATION: guild_credit_earned check removed (field deleted)
+        # PHASE 1 REMEDIATION: guild_credit_earned check removed (field deleted)
     
-    updates = ["status = ?"]
-    params = [status]
+        updates = ["status = ?"]
+        params = [status]
     
-    if actual_runtime is not None:
-        updates.append("actual_runtime = ?")
-        params.append(actual_runtime)
+        if actual_runtime is not None:
+            updates.append("actual_runtime = ?")
+            params.append(actual_runtime)
     
-    if loss_reason is not None:
-        loss_json = json.dumps(loss_reason) if isinstance(loss_reason, list) else json.dumps([str(loss_reason)])
-        updates.append("loss_reason = ?")
-        params.append(loss_json)
+        if loss_reason is not None:
+            loss_json = json.dumps(loss_reason) if isinstance(loss_reason, list) else json.dumps([str(loss_reason)])
+            updates.append("loss_reason = ?")
+            params.append(loss_json)
         
-    # PHASE 1 REMEDIATION: Guild credit calculation removed
-    # Credits/caps are Guild economics - Ops must not compute them
-    # Ops only tracks export intent (is_guild_submission field retained for Phase 2 refactor)
+        # PHASE 1 REMEDIATION: Guild credit calculation removed
+        # Credits/caps are Guild economics - Ops must not compute them
+        # Ops only tracks export intent (is_guild_submission field retained for Phase 2 refactor)
     
-    updates.append("is_guild_submission = ?")
-    params.append(1 if is_guild_submission else 0)
-    # guild_credit_earned field removed - violates firewall
+        updates.append("is_guild_submission = ?")
+        params.append(1 if is_guild_submission else 0)
+        # guild_credit_earned field removed - violates firewall
     
-    if is_guild_submission and status in ('Won', 'Lost'):
-        updates.append("submission_date = ?")
-        params.append(datetime.now().isoformat())
+        if is_guild_submission and status in ('Won', 'Lost'):
+            updates.append("submission_date = ?")
+            params.append(datetime.now().isoformat())
         
-    params.append(quote_id)
-    cursor.execute(f"UPDATE ops__quote_history SET {', '.join(updates)} WHERE id = ?", params)
+        params.append(quote_id)
+        cursor.execute(f"UPDATE ops__quote_history SET {', '.join(updates)} WHERE id = ?", params)
     
-    # Also sync status to the main quotes table
-    try:
-        cursor.execute("UPDATE ops__quotes SET status = ?, updated_at = ? WHERE id = ?", (status, datetime.now().isoformat(), quote_id))
-    except:
-        pass
+        # Also sync status to the main quotes table
+        try:
+            cursor.execute("UPDATE ops__quotes SET status = ?, updated_at = ? WHERE id = ?", (status, datetime.now().isoformat(), quote_id))
+        except:
+            pass
         
-    conn.commit()
-    conn.close()
-    # PHASE 1: Return dummy values (credits removed from Ops, computed by Guild)
-    return (0.0, False)
+        # PHASE 1: Return dummy values (credits removed from Ops, computed by Guild)
+        return (0.0, False)
+
+    return write_queue.run(_write)
 
 def get_pending_export_count() -> int:
     conn = get_connection()
@@ -1354,12 +1142,11 @@ def get_pending_exports() -> List[Dict[str, Any]]:
 
 def mark_as_exported(quote_ids: List[int]) -> None:
     if not quote_ids: return
-    conn = get_connection()
     placeholders = ','.join(['?'] * len(quote_ids))
-    conn.execute(f"UPDATE ops__quote_history SET exported_at = ? WHERE id IN ({placeholders})", 
-                 [datetime.now().isoformat()] + quote_ids)
-    conn.commit()
-    conn.close()
+    write_queue.run(lambda conn: conn.execute(
+        f"UPDATE ops__quote_history SET exported_at = ? WHERE id IN ({placeholders})", 
+        [datetime.now().isoformat()] + quote_ids
+    ))
 
 # get_monthly_ledger() removed - PHASE 1 REMEDIATION
 # Guild credit retrieval violates firewall (Guild economics belong in Guild product)
@@ -1378,120 +1165,97 @@ def validate_material(input_name: str) -> Tuple[str, bool]:
             return (valid_name, True)
     return (input_normalized, False)
 
+def _set_quote_material(conn: sqlite3.Connection, quote_id: int, normalized: str) -> None:
+    conn.execute("UPDATE ops__quote_history SET material = ?, is_compliant = 1 WHERE id = ?", (normalized, quote_id))
+    # Also update main quotes table
+    conn.execute("UPDATE ops__quotes SET material = ? WHERE id = ?", (normalized, quote_id))
+
 def update_quote_material(quote_id: int, new_material: str) -> bool:
     normalized, is_compliant = validate_material(new_material)
     if not is_compliant: return False
+    write_queue.run(lambda conn: _set_quote_material(conn, quote_id, normalized))
+    return True
+
+def _load_materials() -> List[Tuple[str, float, float]]:
     conn = get_connection()
-    conn.execute("UPDATE ops__quote_history SET material = ?, is_compliant = 1 WHERE id = ?", (normalized, quote_id))
-    # Also update main quotes table
-    conn.execute("UPDATE ops__quotes SET material = ? WHERE id = ?", (normalized, quote_id))
-    conn.commit()
+    cursor = conn.cursor()
+    cursor.execute("SELECT name, cost_per_cubic_inch, machinability_score FROM ops__materials ORDER BY name")
+    materials = [tuple(row) for row in cursor.fetchall()]
     conn.close()
-    return True
+    return materials
+
+
+# Reference data cached per process; dropped when any connection writes the table
+_materials_cache = cache_invalidation.TableCache("database.materials", ["ops__materials"], _load_materials)
+
 
 def get_material_cost(name: str) -> Optional[float]:
     """Get the cost per cubic inch for a material."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT cost_per_cubic_inch FROM ops__materials WHERE name=?", (name,))
-    res = cur.fetchone()
-    conn.close()
-    return res[0] if res else None
+    for material_name, cost, _ in _materials_cache.get():
+        if material_name == name:
+            return cost
+    return None
 
 def get_material_score(name: str) -> float:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT machinability_score FROM ops__materials WHERE name=?", (name,))
-    res = cur.fetchone()
-    conn.close()
-    return res[0] if res else 1.0
+    for material_name, _, score in _materials_cache.get():
+        if material_name == name:
+            return score
+    return 1.0
 
 def get_all_materials() -> List[str]:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM ops__materials ORDER BY name")
-    materials = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return materials
+    return [name for name, _, _ in _materials_cache.get()]
 
 def fix_quote_compliance(quote_id: int, new_material: str) -> Tuple[bool, str]:
     normalized, is_compliant = validate_material(new_material)
     if not is_compliant: return (False, "Material is still non-compliant")
-    conn = get_connection()
-    conn.execute("UPDATE ops__quote_history SET material = ?, is_compliant = 1 WHERE id = ?", (normalized, quote_id))
-    conn.execute("UPDATE ops__quotes SET material = ? WHERE id = ?", (normalized, quote_id))
-    conn.commit()
-    conn.close()
+    write_queue.run(lambda conn: _set_quote_material(conn, quote_id, normalized))
     return (True, "Material updated successfully")
 
 def soft_delete_quote(quote_id: int) -> bool:
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Soft delete in both tables
-    cursor.execute("SELECT id FROM ops__quote_history WHERE id = ? AND is_deleted = 0", (quote_id,))
-    if cursor.fetchone():
-        cursor.execute("UPDATE ops__quote_history SET is_deleted = 1 WHERE id = ?", (quote_id,))
-    
-    # Add is_deleted column to quotes table if it doesn't exist
-    try:
-        cursor.execute("ALTER TABLE ops__quotes ADD COLUMN is_deleted INTEGER DEFAULT 0")
-    except sqlite3.OperationalError:
-        pass
-    
-    cursor.execute("SELECT id FROM ops__quotes WHERE id = ?", (quote_id,))
-    if cursor.fetchone():
-        cursor.execute("UPDATE ops__quotes SET is_deleted = 1 WHERE id = ?", (quote_id,))
-    
-    conn.commit()
-    success = cursor.rowcount > 0
-    conn.close()
-    return success
+    def _write(conn: sqlite3.Connection) -> bool:
+        cursor = conn.cursor()
+        
+        # Soft delete in both tables
+        cursor.execute("SELECT id FROM ops__quote_history WHERE id = ? AND is_deleted = 0", (quote_id,))
+        if cursor.fetchone():
+            cursor.execute("UPDATE ops__quote_history SET is_deleted = 1 WHERE id = ?", (quote_id,))
+        
+        # Add is_deleted column to quotes table if it doesn't exist
+        try:
+            cursor.execute("ALTER TABLE ops__quotes ADD COLUMN is_deleted INTEGER DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass
+        
+        cursor.execute("SELECT id FROM ops__quotes WHERE id = ?", (quote_id,))
+        if cursor.fetchone():
+            cursor.execute("UPDATE ops__quotes SET is_deleted = 1 WHERE id = ?", (quote_id,))
+        
+        return cursor.rowcount > 0
+
+    return write_queue.run(_write)
 
 def seed_default_data() -> None:
-    conn = get_connection()
-    cur = conn.cursor()
-    defaults = [
-        ('Aluminum 6061', 0.30, 1.0),
-        ('Steel 1018', 0.25, 1.8),
-        ('Stainless 304', 0.65, 2.5),
-        ('Customer Supplied', 0.00, 1.0)
-    ]
-    cur.executemany("INSERT OR IGNORE INTO ops__materials (name, cost_per_cubic_inch, machinability_score) VALUES (?,?,?)", defaults)
-    conn.commit()
-    conn.close()
+    write_queue.run(lambda conn: conn.executemany("INSERT OR IGNORE INTO ops__materials (name, cost_per_cubic_inch, machinability_score) VALUES (?,?,?)", schema_snapshot.DEFAULT_MATERIALS))
 
 def seed_shop_config() -> None:
+    write_queue.run(lambda conn: conn.executemany("INSERT OR IGNORE INTO ops__shop_config (key, value, description) VALUES (?, ?, ?)", schema_snapshot.DEFAULT_SHOP_CONFIG))
+
+def _load_shop_config() -> Dict[str, str]:
     conn = get_connection()
-    cur = conn.cursor()
-    defaults = [
-        ('base_mrr', '30.0', 'Material Removal Rate for Aluminum 6061'),
-        ('setup_time_minutes', '60.0', 'Default setup time'),
-        ('saw_kerf', '0.125', 'Stock buffer'),
-        ('min_hand_time', '5.0', 'Minimum hand time'),
-        ('material_markup', '1.2', 'Material markup'),
-        ('shop_rate_standard', '75.0', 'Standard shop rate'),
-        ('shop_rate_marginal', '45.0', 'Marginal shop rate'),
-        ('default_handling_time', '0.5', 'Default load/unload time'),
-        # Shop Branding (PDF Headers) - Per EXECUTION_CHAT_BRIEF.md
-        ('shop_name', 'Precision Machine Works', 'Company name for PDFs'),
-        ('shop_address', '123 Industrial Way, City, ST 12345', 'Address for PDFs'),
-        ('shop_phone', '(555) 123-4567', 'Contact phone'),
-        ('shop_email', 'quotes@precisionworks.com', 'Contact email'),
-        ('shop_logo_path', '', 'Optional logo path (future use)')
-    ]
-    cur.executemany("INSERT OR IGNORE INTO ops__shop_config (key, value, description) VALUES (?, ?, ?)", defaults)
-    conn.commit()
-    conn.close()
+    try:
+        return {row['key']: row['value'] for row in conn.execute("SELECT key, value FROM ops__shop_config")}
+    finally:
+        conn.close()
+
+
+_shop_config_cache = cache_invalidation.TableCache("database.shop_config", ["ops__shop_config"], _load_shop_config)
+
 
 def get_config(key: str, default: Any = None, value_type: type = float) -> Any:
-    conn = get_connection()
-    cursor = conn.cursor()
     try:
-        cursor.execute("SELECT value FROM ops__shop_config WHERE key = ?", (key,))
-        result = cursor.fetchone()
-        if result:
-            val = result[0]
+        config = _shop_config_cache.get()
+        if key in config:
+            val = config[key]
             if value_type == bool: return val.lower() in ('true', '1', 'yes')
             if value_type == int: return int(float(val))
             if value_type == float: return float(val)
@@ -1499,22 +1263,19 @@ def get_config(key: str, default: Any = None, value_type: type = float) -> Any:
         return default
     except:
         return default
-    finally:
-        conn.close()
 
 def set_config(key: str, value: Any, description: str = None) -> bool:
-    conn = get_connection()
-    try:
+    def _write(conn: sqlite3.Connection) -> None:
         if description:
             conn.execute("INSERT OR REPLACE INTO ops__shop_config (key, value, description, updated_at) VALUES (?, ?, ?, datetime('now'))", (key, str(value), description))
         else:
             conn.execute("INSERT OR REPLACE INTO ops__shop_config (key, value, updated_at) VALUES (?, ?, datetime('now'))", (key, str(value)))
-        conn.commit()
+
+    try:
+        write_queue.run(_write)
         return True
     except:
         return False
-    finally:
-        conn.close()
 
 
 # ============================================================================
@@ -1713,19 +1474,14 @@ def create_customer(company_name, domain=None):
     Returns:
         int: New customer ID
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO ops__customers (name, domain)
-        VALUES (?, ?)
-    """, (company_name, domain))
-    
-    customer_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    
-    return customer_id
+    def _write(conn: sqlite3.Connection) -> int:
+        cursor = conn.execute("""
+            INSERT INTO ops__customers (name, domain)
+            VALUES (?, ?)
+        """, (company_name, domain))
+        return cursor.lastrowid
+
+    return write_queue.run(_write)
 
 
 def update_customer(customer_id, company_name=None, domain=None):
@@ -1740,9 +1496,6 @@ def update_customer(customer_id, company_name=None, domain=None):
     Returns:
         bool: Success status
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     updates = []
     params = []
     
@@ -1755,19 +1508,15 @@ def update_customer(customer_id, company_name=None, domain=None):
         params.append(domain)
     
     if not updates:
-        conn.close()
         return False
     
     params.append(customer_id)
     
-    cursor.execute(f"""
+    write_queue.run(lambda conn: conn.execute(f"""
         UPDATE ops__customers
         SET {", ".join(updates)}
         WHERE id = ?
-    """, params)
-    
-    conn.commit()
-    conn.close()
+    """, params))
     
     return True
 
@@ -1783,18 +1532,15 @@ def delete_customer(customer_id):
     Returns:
         bool: Success status
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # First remove from junction tables
-    cursor.execute("DELETE FROM customer_parts WHERE customer_id = ?", (customer_id,))
-    cursor.execute("DELETE FROM contact_companies WHERE customer_id = ?", (customer_id,))
-    
-    # Then delete the customer
-    cursor.execute("DELETE FROM ops__customers WHERE id = ?", (customer_id,))
+    def _write(conn: sqlite3.Connection) -> None:
+        # First remove from junction tables
+        conn.execute("DELETE FROM customer_parts WHERE customer_id = ?", (customer_id,))
+        conn.execute("DELETE FROM contact_companies WHERE customer_id = ?", (customer_id,))
+        
+        # Then delete the customer
+        conn.execute("DELETE FROM ops__customers WHERE id = ?", (customer_id,))
     
-    conn.commit()
-    conn.close()
+    write_queue.run(_write)
     
     return True
 
@@ -1813,27 +1559,24 @@ def create_contact_for_customer(customer_id, contact_name, email=None, phone=Non
     Returns:
         int: New contact ID
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Create contact (using 'name' and 'current_customer_id' per actual schema)
-    cursor.execute("""
-        INSERT INTO ops__contacts (name, email, phone, current_customer_id)
-        VALUES (?, ?, ?, ?)
-    """, (contact_name, email, phone, customer_id))
-    
-    contact_id = cursor.lastrowid
-    
-    # Link to customer via junction table
-    cursor.execute("""
-        INSERT INTO contact_companies (contact_id, customer_id, is_primary)
-        VALUES (?, ?, ?)
-    """, (contact_id, customer_id, 1 if is_primary else 0))
-    
-    conn.commit()
-    conn.close()
+    def _write(conn: sqlite3.Connection) -> int:
+        # Create contact (using 'name' and 'current_customer_id' per actual schema)
+        cursor = conn.execute("""
+            INSERT INTO ops__contacts (name, email, phone, current_customer_id)
+            VALUES (?, ?, ?, ?)
+        """, (contact_name, email, phone, customer_id))
+        
+        contact_id = cursor.lastrowid
+        
+        # Link to customer via junction table
+        conn.execute("""
+            INSERT INTO contact_companies (contact_id, customer_id, is_primary)
+            VALUES (?, ?, ?)
+        """, (contact_id, customer_id, 1 if is_primary else 0))
+        
+        return contact_id
     
-    return contact_id
+    return write_queue.run(_write)
 
 
 def update_contact(contact_id, contact_name=None, email=None, phone=None):
@@ -1849,9 +1592,6 @@ def update_contact(contact_id, contact_name=None, email=None, phone=None):
     Returns:
         bool: Success status
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     updates = []
     params = []
     
@@ -1868,19 +1608,15 @@ def update_contact(contact_id, contact_name=None, email=None, phone=None):
         params.append(phone)
     
     if not updates:
-        conn.close()
         return False
     
     params.append(contact_id)
     
-    cursor.execute(f"""
+    write_queue.run(lambda conn: conn.execute(f"""
         UPDATE ops__contacts
         SET {", ".join(updates)}
         WHERE id = ?
-    """, params)
-    
-    conn.commit()
-    conn.close()
+    """, params))
     
     return True
 
@@ -1931,29 +1667,57 @@ def count_quotes_for_contact(contact_id):
     return count
 
 
-def count_quotes_using_tag_name_approx(tag_name: str) -> int:
+def count_quotes_using_tag_name(tag_name: str) -> int:
     """
-    Count quotes approximately using a tag name (via JSON LIKE search).
-    
-    Note: This is approximate because it uses LIKE on JSON text.
+    Count quotes carrying a tag name (exact match via ops__quote_tags).
     
     Args:
         tag_name (str): Tag name to search for
     
     Returns:
-        int: Approximate count of quotes using this tag
+        int: Number of quotes whose pricing tags include this tag
     """
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("""
-        SELECT COUNT(*) FROM ops__quotes 
-        WHERE pricing_tags_json LIKE ?
-    """, (f'%"{tag_name}"%',))
+    cursor.execute("SELECT COUNT(*) FROM ops__quote_tags WHERE tag_name = ?", (tag_name,))
     count = cursor.fetchone()[0]
     conn.close()
     return count
 
 
+def get_quote_ids_with_tag(tag_name: str, active_only: bool = True) -> List[int]:
+    """
+    Quote record ids carrying a tag (indexed lookup on ops__quote_tags).
+    
+    Args:
+        tag_name (str): Tag name (e.g. "Rush Job")
+        active_only (bool): Only tags applied with a numeric weight > 0
+    
+    Returns:
+        List[int]: Quote record ids, ascending
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT quote_id FROM ops__quote_tags
+        WHERE tag_name = ?
+        {"AND typeof(value) IN ('integer', 'real') AND value > 0" if active_only else ""}
+        ORDER BY quote_id
+    """, (tag_name,))
+    quote_ids = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    return quote_ids
+
+
+def count_quotes_using_tag_name_approx(tag_name: str) -> int:
+    """
+    DEPRECATED: Use count_quotes_using_tag_name() (exact, indexed).
+    
+    Maintained for backward compatibility only.
+    """
+    return count_quotes_using_tag_name(tag_name)
+
+
 def delete_contact(contact_id):
     """
     Delete a contact.
@@ -1965,17 +1729,14 @@ def delete_contact(contact_id):
     Returns:
         bool: Success status
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # First remove from junction table
-    cursor.execute("DELETE FROM contact_companies WHERE contact_id = ?", (contact_id,))
-    
-    # Then delete the contact (FK ON DELETE SET NULL will handle quotes)
-    cursor.execute("DELETE FROM ops__contacts WHERE id = ?", (contact_id,))
+    def _write(conn: sqlite3.Connection) -> None:
+        # First remove from junction table
+        conn.execute("DELETE FROM contact_companies WHERE contact_id = ?", (contact_id,))
+        
+        # Then delete the contact (FK ON DELETE SET NULL will handle quotes)
+        conn.execute("DELETE FROM ops__contacts WHERE id = ?", (contact_id,))
     
-    conn.commit()
-    conn.close()
+    write_queue.run(_write)
     
     return True
 
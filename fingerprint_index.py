@@ -0,0 +1,230 @@
+"""
+fingerprint_index.py
+Shared Fingerprint Matrix - one copy of the similarity data for all workers
+
+The active-quote fingerprint matrix (quote ids, part ids, decoded volumes and
+the (N, 5) vectors) is published once to a memory-mapped file next to the
+database (cutter.db -> cutter.db-fingerprints). Every worker process maps the
+same file read-only, so the OS page cache holds one copy whatever the worker
+count, instead of each process decoding and holding its own.
+
+The file header records the database epoch and the ops__parts + ops__quotes
+generation counters (migration 22) it was built from. cache_invalidation
+tells a worker when either table was written; it then compares counters and
+remaps when they moved on, and whichever process notices first republishes.
+Publishing writes a temp file and os.replace()s it, so readers never see a
+partial file and existing maps stay valid until they are dropped.
+
+CUTTER_FINGERPRINT_INDEX overrides the file path; "off" keeps the matrix in
+process memory only (still rebuilt only when the generation changes).
+"""
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Any, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+import cache_invalidation
+import database
+
+INDEX_ENV = "CUTTER_FINGERPRINT_INDEX"
+INDEX_SUFFIX = "-fingerprints"
+WATCHED_TABLES = ["ops__parts", "ops__quotes"]
+
+# magic, epoch, generation, rows, dims; arrays start at HEADER_SIZE
+HEADER_MAGIC = b"CUTFPIX1"
+HEADER_FORMAT = "<8sqqqq"
+HEADER_SIZE = 64
+
+
+class FingerprintSnapshot(NamedTuple):
+    epoch: int
+    generation: int
+    quote_ids: np.ndarray   # int64 (N,)
+    part_ids: np.ndarray    # int64 (N,)
+    volumes: np.ndarray     # float64 (N,), decoded from vector[0] * 10
+    vectors: np.ndarray     # float64 (N, 5)
+    source: str             # "mmap" or "memory"
+
+
+_lock = threading.Lock()
+_current: Optional[FingerprintSnapshot] = None
+_current_key: Optional[Tuple[str, int, int]] = None
+_invalidations = 0
+
+
+def _invalidate(changed: Set[str]) -> None:
+    global _current, _current_key, _invalidations
+    with _lock:
+        _current, _current_key = None, None
+        _invalidations += 1
+
+
+cache_invalidation.register("fingerprint_index", WATCHED_TABLES, _invalidate)
+
+
+def get_index_path(db_path: Optional[Path] = None) -> Optional[Path]:
+    raw_value = os.environ.get(INDEX_ENV)
+    if raw_value is not None and raw_value.strip():
+        if raw_value.strip().lower() in {"0", "off", "false", "no"}:
+            return None
+        return Path(raw_value)
+    db_path = Path(db_path) if db_path is not None else database.resolve_db_path()
+    return db_path.with_name(db_path.name + INDEX_SUFFIX)
+
+
+def valid_fingerprint_rows(rows: Sequence[Sequence[Any]]) -> List[Sequence[Any]]:
+    """
+    Keep (id, fingerprint_blob, fingerprint_json, ...) rows with a usable vector.
+
+    Rows without a BLOB (not yet backfilled) get one packed from their JSON;
+    rows with no valid 5D vector are dropped. Extra columns are preserved.
+    """
+    blob_size = database.FINGERPRINT_BLOB_SIZE
+    if all(row[1] is not None and len(row[1]) == blob_size for row in rows):
+        return list(rows)
+    kept = []
+    for row in rows:
+        blob = row[1] if row[1] is not None else database.pack_fingerprint(row[2]) if row[2] else None
+        if blob is not None and len(blob) == blob_size:
+            kept.append((row[0], blob, *row[2:]))
+    return kept
+
+
+def vectors_from_rows(rows: Sequence[Sequence[Any]]) -> np.ndarray:
+    """(N, 5) float64 view over the joined BLOBs of already-valid rows."""
+    vectors = np.frombuffer(b"".join(row[1] for row in rows), dtype="<f8")
+    return vectors.reshape(len(rows), database.FINGERPRINT_DIMS)
+
+
+def _build_arrays(rows: Sequence[Sequence[Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    rows = valid_fingerprint_rows(rows)
+    quote_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    part_ids = np.fromiter((row[3] for row in rows), dtype=np.int64, count=len(rows))
+    vectors = vectors_from_rows(rows)
+    return quote_ids, part_ids, vectors[:, 0] * 10.0, vectors
+
+
+def _snapshot_from_buffer(buffer: Any, source: str) -> Optional[FingerprintSnapshot]:
+    """Zero-copy arrays over a published file's bytes; None if malformed."""
+    if len(buffer) < HEADER_SIZE:
+        return None
+    magic, epoch, generation, count, dims = struct.unpack_from(HEADER_FORMAT, buffer, 0)
+    if magic != HEADER_MAGIC or dims != database.FINGERPRINT_DIMS or count < 0:
+        return None
+    if len(buffer) != HEADER_SIZE + count * 8 * (3 + dims):
+        return None
+    offset = HEADER_SIZE
+    quote_ids = np.frombuffer(buffer, dtype="<i8", count=count, offset=offset)
+    offset += count * 8
+    part_ids = np.frombuffer(buffer, dtype="<i8", count=count, offset=offset)
+    offset += count * 8
+    volumes = np.frombuffer(buffer, dtype="<f8", count=count, offset=offset)
+    offset += count * 8
+    vectors = np.frombuffer(buffer, dtype="<f8", count=count * dims, offset=offset).reshape(count, dims)
+    return FingerprintSnapshot(epoch, generation, quote_ids, part_ids, volumes, vectors, source)
+
+
+def _encode(epoch: int, generation: int, arrays: Tuple[np.ndarray, ...]) -> bytes:
+    quote_ids, part_ids, volumes, vectors = arrays
+    header = struct.pack(HEADER_FORMAT, HEADER_MAGIC, epoch, generation, len(quote_ids), vectors.shape[1])
+    return b"".join([
+        header.ljust(HEADER_SIZE, b"\0"),
+        quote_ids.astype("<i8").tobytes(),
+        part_ids.astype("<i8").tobytes(),
+        volumes.astype("<f8").tobytes(),
+        np.ascontiguousarray(vectors, dtype="<f8").tobytes(),
+    ])
+
+
+def publish(index_path: Path, epoch: int, generation: int,
+            rows: Sequence[Sequence[Any]]) -> None:
+    """Write the matrix for (epoch, generation) and atomically swap it in."""
+    payload = _encode(epoch, generation, _build_arrays(rows))
+    tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, index_path)
+    except OSError:
+        # e.g. Windows refuses to replace a file another worker has mapped
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _attach(index_path: Path, epoch: int, generation: int) -> Optional[FingerprintSnapshot]:
+    """Map a published file read-only if it was built for (epoch, generation)."""
+    try:
+        with open(index_path, "rb") as handle:
+            header = handle.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                return None
+            magic, file_epoch, file_generation, _, _ = struct.unpack_from(HEADER_FORMAT, header, 0)
+            if magic != HEADER_MAGIC or (file_epoch, file_generation) != (epoch, generation):
+                return None
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    # The arrays keep the map alive; it is unmapped once the last one is dropped
+    return _snapshot_from_buffer(mapped, "mmap")
+
+
+def _memory_snapshot(epoch: int, generation: int, rows: Sequence[Sequence[Any]]) -> FingerprintSnapshot:
+    quote_ids, part_ids, volumes, vectors = _build_arrays(rows)
+    return FingerprintSnapshot(epoch, generation, quote_ids, part_ids, volumes, vectors, "memory")
+
+
+def get_snapshot() -> FingerprintSnapshot:
+    """
+    Current active-quote fingerprint matrix for the active database.
+
+    Cost when nothing changed: one PRAGMA data_version (cache_invalidation);
+    after a write elsewhere, one SELECT on ops__table_generations.
+    """
+    global _current, _current_key
+    cache_invalidation.check()
+    with _lock:
+        if _current is not None:
+            return _current
+        invalidations = _invalidations
+
+    db_path = database.resolve_db_path()
+    generations = database.get_table_generations(WATCHED_TABLES)
+    if generations is None or "__epoch__" not in generations:
+        # Pre-migration-22 database: no change tracking, so no caching
+        return _memory_snapshot(0, -1, database.get_quote_fingerprint_rows())
+    epoch = generations["__epoch__"]
+    generation = sum(generations.get(name, 0) for name in WATCHED_TABLES)
+    key = (str(db_path), epoch, generation)
+
+    with _lock:
+        if _current is not None and _current_key == key:
+            return _current
+
+        index_path = get_index_path(db_path)
+        snapshot = None
+        if index_path is not None:
+            snapshot = _attach(index_path, epoch, generation)
+            if snapshot is None:
+                # Stamped with the generation read *before* loading rows: if a
+                # write lands in between, the next search sees a newer
+                # generation and republishes, so a stale file is never kept.
+                try:
+                    publish(index_path, epoch, generation, database.get_quote_fingerprint_rows())
+                    snapshot = _attach(index_path, epoch, generation)
+                except OSError as e:
+                    print(f"[FINGERPRINT] Could not publish {index_path}: {e}")
+        if snapshot is None:
+            snapshot = _memory_snapshot(epoch, generation, database.get_quote_fingerprint_rows())
+
+        # Invalidated while building: serve it, but let the next search recheck
+        if _invalidations == invalidations:
+            _current, _current_key = snapshot, key
+        return snapshot
+
+
+def reset() -> None:
+    """Drop this process's attached snapshot (next search re-checks the file)."""
+    _invalidate({cache_invalidation.ALL_TABLES})
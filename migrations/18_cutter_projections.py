@@ -0,0 +1,51 @@
+"""
+Migration 18: Cutter Ledger projection tables.
+
+Derived, disposable read tables maintained by cutter_ledger/projections.py
+from cutter__events. They are never ledger truth and can be rebuilt from
+event id 0 at any time (python -m cutter_ledger.projections --rebuild).
+
+Created on ops-only databases too; they stay empty until a ledger exists.
+"""
+import sqlite3
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS cutter__projection_checkpoints (
+            projector TEXT PRIMARY KEY,
+            last_event_id INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS cutter__proj_stage_intervals (
+            subject_ref TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            started_at TEXT,
+            completed_at TEXT,
+            first_event_at TEXT NOT NULL,
+            first_event_id INTEGER NOT NULL,
+            PRIMARY KEY (subject_ref, stage)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS cutter__proj_stage_rejects (
+            event_id INTEGER PRIMARY KEY,
+            subject_ref TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            error TEXT NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_proj_stage_rejects_subject
+        ON cutter__proj_stage_rejects(subject_ref, created_at)
+    """)
+    for table in ("cutter__proj_responses_received", "cutter__proj_carrier_handoffs"):
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                subject_ref TEXT PRIMARY KEY,
+                first_event_id INTEGER NOT NULL,
+                first_event_at TEXT NOT NULL
+            )
+        """)
@@ -0,0 +1,62 @@
+"""
+Migration 19: Parsed subject columns on cutter__events.
+
+Adds VIRTUAL generated columns parsed from subject_ref and an index on them,
+so ledger <-> ops joins are indexed lookups instead of SUBSTR/CAST surgery:
+
+    quote:123                          -> ('quote', '123')
+    org:acme/entity:customer:42        -> ('customer', '42')
+    entity:job-7                       -> ('entity', 'job-7')
+    123 (QUOTE_* events, bare quote id) -> ('quote', '123')
+    anything else without ':'          -> (NULL, NULL)
+
+Generated columns are computed, never written, so the append-only triggers
+are unaffected. The ledger part is skipped on ops-only databases (no
+cutter__events yet). Also indexes ops__quotes(customer_id), the ops side of
+customer -> quote -> event joins.
+"""
+import sqlite3
+
+# subject_ref without an "org:<org>/" prefix
+_UNSCOPED = (
+    "CASE WHEN subject_ref LIKE 'org:%/%' "
+    "THEN substr(subject_ref, instr(subject_ref, '/') + 1) ELSE subject_ref END"
+)
+# "entity:<type>:<id>" -> "<type>:<id>"
+_TAIL = (
+    f"CASE WHEN ({_UNSCOPED}) LIKE 'entity:%:%' "
+    f"THEN substr(({_UNSCOPED}), 8) ELSE ({_UNSCOPED}) END"
+)
+_BARE_QUOTE_ID = "event_type GLOB 'QUOTE_*' AND subject_ref GLOB '[0-9]*' AND subject_ref NOT GLOB '*[^0-9]*'"
+
+SUBJECT_KIND_SQL = (
+    f"CASE WHEN {_BARE_QUOTE_ID} THEN 'quote' "
+    f"WHEN instr(({_TAIL}), ':') > 1 THEN substr(({_TAIL}), 1, instr(({_TAIL}), ':') - 1) END"
+)
+SUBJECT_ID_SQL = (
+    f"CASE WHEN {_BARE_QUOTE_ID} THEN subject_ref "
+    f"WHEN instr(({_TAIL}), ':') > 1 THEN substr(({_TAIL}), instr(({_TAIL}), ':') + 1) END"
+)
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    # Ops side of "all events for quotes of customer X"
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_quotes_customer_id ON ops__quotes(customer_id)")
+
+    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(cutter__events)").fetchall()}
+    if not columns:
+        return
+    if "subject_kind" not in columns:
+        conn.execute(
+            f"ALTER TABLE cutter__events ADD COLUMN subject_kind TEXT "
+            f"GENERATED ALWAYS AS ({SUBJECT_KIND_SQL}) VIRTUAL"
+        )
+    if "subject_id" not in columns:
+        conn.execute(
+            f"ALTER TABLE cutter__events ADD COLUMN subject_id TEXT "
+            f"GENERATED ALWAYS AS ({SUBJECT_ID_SQL}) VIRTUAL"
+        )
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_events_subject_kind_id
+        ON cutter__events(subject_kind, subject_id)
+    """)
@@ -0,0 +1,69 @@
+"""
+Migration 20: ops__quote_tags side table.
+
+One row per (quote, tag) from ops__quotes.pricing_tags_json, so "which
+quotes used Rush Job" and per-tag counts are indexed SQL instead of
+json.loads / LIKE over every quote.
+
+Triggers keep it in step with pricing_tags_json inside the writing
+statement's transaction (create_quote, seeders, bulk generators alike).
+Malformed or non-object JSON yields no tag rows instead of failing the
+quote write. Existing quotes are backfilled once here.
+"""
+import sqlite3
+
+# '{}' unless the column holds a JSON object (CASE is lazy, so json_type
+# never sees malformed text)
+_TAGS_OBJECT_SQL = (
+    "CASE WHEN json_valid(NEW.pricing_tags_json) THEN "
+    "CASE WHEN json_type(NEW.pricing_tags_json) = 'object' THEN NEW.pricing_tags_json ELSE '{}' END "
+    "ELSE '{}' END"
+)
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ops__quote_tags (
+            quote_id INTEGER NOT NULL,
+            tag_name TEXT NOT NULL,
+            value REAL,
+            PRIMARY KEY (quote_id, tag_name)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_quote_tags_tag_name ON ops__quote_tags(tag_name, quote_id)")
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS quote_tags_after_insert
+        AFTER INSERT ON ops__quotes
+        BEGIN
+            INSERT OR REPLACE INTO ops__quote_tags (quote_id, tag_name, value)
+            SELECT NEW.id, j.key, j.value FROM json_each({_TAGS_OBJECT_SQL}) j;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS quote_tags_after_update
+        AFTER UPDATE OF pricing_tags_json ON ops__quotes
+        BEGIN
+            DELETE FROM ops__quote_tags WHERE quote_id = OLD.id;
+            INSERT OR REPLACE INTO ops__quote_tags (quote_id, tag_name, value)
+            SELECT NEW.id, j.key, j.value FROM json_each({_TAGS_OBJECT_SQL}) j;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS quote_tags_after_delete
+        AFTER DELETE ON ops__quotes
+        BEGIN
+            DELETE FROM ops__quote_tags WHERE quote_id = OLD.id;
+        END
+    """)
+
+    conn.execute("DELETE FROM ops__quote_tags")
+    conn.execute("""
+        INSERT OR REPLACE INTO ops__quote_tags (quote_id, tag_name, value)
+        SELECT q.id, j.key, j.value
+        FROM ops__quotes q, json_each(
+            CASE WHEN json_valid(q.pricing_tags_json) THEN
+                CASE WHEN json_type(q.pricing_tags_json) = 'object' THEN q.pricing_tags_json ELSE '{}' END
+            ELSE '{}' END
+        ) j
+    """)
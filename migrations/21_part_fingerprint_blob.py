@@ -0,0 +1,17 @@
+"""
+Migration 21: Packed fingerprint BLOB on ops__parts.
+
+fingerprint_blob holds the 5D fingerprint as 5 little-endian float64 values
+(40 bytes), written alongside fingerprint_json by database.upsert_part(), so
+similarity search loads every vector with one query + np.frombuffer.
+
+Existing parts are filled by scripts/backfill_fingerprint_blobs.py; until
+then loaders fall back to fingerprint_json for rows without a BLOB.
+"""
+import sqlite3
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(ops__parts)").fetchall()}
+    if "fingerprint_blob" not in columns:
+        conn.execute("ALTER TABLE ops__parts ADD COLUMN fingerprint_blob BLOB")
@@ -0,0 +1,59 @@
+"""
+Migration 22: Per-table generation counters.
+
+ops__table_generations holds one monotonically increasing counter per
+watched table, bumped by triggers in the writing statement's transaction,
+so any process can tell "has X changed since I cached it?" with one SELECT,
+whoever the writer was (another worker, a script, a bulk generator).
+
+Watched here (the shared fingerprint matrix, fingerprint_index.py):
+    ops__parts   insert / delete / fingerprint or volume update
+    ops__quotes  insert / delete / part_id or is_deleted update
+
+The '__epoch__' row is a random value chosen when the table is created. It
+distinguishes a rebuilt database whose counters restarted from the one a
+cache was built against.
+"""
+import sqlite3
+
+EPOCH_KEY = "__epoch__"
+
+_WATCHED = {
+    "ops__parts": "fingerprint_json, fingerprint_blob, volume",
+    "ops__quotes": "part_id, is_deleted",
+}
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ops__table_generations (
+            table_name TEXT PRIMARY KEY,
+            generation INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute(
+        "INSERT OR IGNORE INTO ops__table_generations (table_name, generation) "
+        "VALUES (?, abs(random() % 9007199254740991))",
+        (EPOCH_KEY,)
+    )
+    for table_name, columns in _WATCHED.items():
+        conn.execute(
+            "INSERT OR IGNORE INTO ops__table_generations (table_name, generation) VALUES (?, 0)",
+            (table_name,)
+        )
+        bump = (
+            f"UPDATE ops__table_generations SET generation = generation + 1 "
+            f"WHERE table_name = '{table_name}';"
+        )
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table_name}_generation_insert
+            AFTER INSERT ON {table_name} BEGIN {bump} END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table_name}_generation_update
+            AFTER UPDATE OF {columns} ON {table_name} BEGIN {bump} END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table_name}_generation_delete
+            AFTER DELETE ON {table_name} BEGIN {bump} END
+        """)
@@ -0,0 +1,36 @@
+"""
+Migration 23: Generation counters for config, materials, tags and saved reports.
+
+Extends ops__table_generations (migration 22) to the small reference tables
+the app caches in process (cache_invalidation.py). Unlike ops__parts /
+ops__quotes, every insert, update or delete on these tables counts: they
+are tiny and rarely written, so a coarse counter costs nothing.
+"""
+import sqlite3
+
+WATCHED_TABLES = (
+    "ops__shop_config",
+    "ops__materials",
+    "ops__custom_tags",
+    "ops__saved_reports",
+)
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for table_name in WATCHED_TABLES:
+        if table_name not in existing:
+            continue
+        conn.execute(
+            "INSERT OR IGNORE INTO ops__table_generations (table_name, generation) VALUES (?, 0)",
+            (table_name,)
+        )
+        bump = (
+            f"UPDATE ops__table_generations SET generation = generation + 1 "
+            f"WHERE table_name = '{table_name}';"
+        )
+        for action in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table_name}_generation_{action.lower()}
+                AFTER {action} ON {table_name} BEGIN {bump} END
+            """)
@@ -0,0 +1,47 @@
+"""
+Migration 24: Generation counter for the unclosed-quotes worklist.
+
+ops_layer/unclosed_worklist.py keeps view_ops_unclosed_quotes in memory and
+applies appends incrementally: new ops__quotes rows and new outcome events
+are found by id high-water mark. Edits and deletes cannot be seen that way,
+so they bump the 'view_ops_unclosed_quotes' counter in
+ops__table_generations (migration 22), which tells the worklist to reload:
+
+    ops__quotes                update of a worklist column, delete
+    ops__quote_outcome_events  update of quote_id / outcome_type, delete
+    ops__customers             update of name, delete
+
+Inserts do not bump it; they are what the high-water marks are for.
+"""
+import sqlite3
+
+WORKLIST_KEY = "view_ops_unclosed_quotes"
+
+_WATCHED = {
+    "ops__quotes": "final_quoted_price, lead_time_days, payment_terms_days, status, created_at, customer_id",
+    "ops__quote_outcome_events": "quote_id, outcome_type",
+    "ops__customers": "name",
+}
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    conn.execute(
+        "INSERT OR IGNORE INTO ops__table_generations (table_name, generation) VALUES (?, 0)",
+        (WORKLIST_KEY,)
+    )
+    bump = (
+        f"UPDATE ops__table_generations SET generation = generation + 1 "
+        f"WHERE table_name = '{WORKLIST_KEY}';"
+    )
+    for table_name, columns in _WATCHED.items():
+        if table_name not in existing:
+            continue
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table_name}_worklist_update
+            AFTER UPDATE OF {columns} ON {table_name} BEGIN {bump} END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table_name}_worklist_delete
+            AFTER DELETE ON {table_name} BEGIN {bump} END
+        """)
@@ -0,0 +1,43 @@
+"""
+Migration 25: What-if repricing result sets.
+
+ops_layer/repricing.py recomputes the physics anchor of every open (Draft /
+Sent) quote under a pricing scenario (shop rate, material markup, material
+costs) and stores the outcome here. Quotes themselves are never touched:
+
+    ops__reprice_runs     one row per run: scenario, counts, totals
+    ops__reprice_results  one row per repriced quote: anchor before / after
+"""
+import sqlite3
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ops__reprice_runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            scenario_json TEXT NOT NULL,
+            quote_count INTEGER NOT NULL DEFAULT 0,
+            repriced_count INTEGER NOT NULL DEFAULT 0,
+            anchor_before_total REAL NOT NULL DEFAULT 0,
+            anchor_after_total REAL NOT NULL DEFAULT 0,
+            duration_ms REAL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ops__reprice_results (
+            run_id INTEGER NOT NULL REFERENCES ops__reprice_runs(run_id) ON DELETE CASCADE,
+            quote_row_id INTEGER NOT NULL,
+            quote_id TEXT NOT NULL,
+            status TEXT,
+            material TEXT,
+            quantity INTEGER,
+            stock_volume_in3 REAL,
+            stock_source TEXT,
+            anchor_before REAL,
+            anchor_after REAL,
+            delta REAL,
+            delta_pct REAL,
+            PRIMARY KEY (run_id, quote_row_id)
+        )
+    """)
@@ -0,0 +1,45 @@
+"""
+Migration 26: Closing a quote no longer reloads the unclosed-quotes worklist.
+
+Migration 24 bumped the 'view_ops_unclosed_quotes' generation on every
+update of ops__quotes.status. database.save_quote_outcome_wizard() sets
+status = 'Won' / 'Lost' right after inserting the outcome event, so every
+WON / LOST outcome forced ops_layer/unclosed_worklist.py into a full reload
+instead of the outcome high-water mark path.
+
+A status update now bumps the counter only while the quote has no closing
+outcome (outcome_type other than NO_RESPONSE). A closed quote is not on the
+worklist, so its status cannot change the list:
+
+    ops__quotes_worklist_update  worklist columns except status (as before)
+    ops__quotes_worklist_status  status, unless a closing outcome exists
+"""
+import sqlite3
+
+WORKLIST_KEY = "view_ops_unclosed_quotes"
+
+_COLUMNS = "final_quoted_price, lead_time_days, payment_terms_days, created_at, customer_id"
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if "ops__quotes" not in existing or "ops__quote_outcome_events" not in existing:
+        return
+    bump = (
+        f"UPDATE ops__table_generations SET generation = generation + 1 "
+        f"WHERE table_name = '{WORKLIST_KEY}';"
+    )
+    conn.execute("DROP TRIGGER IF EXISTS ops__quotes_worklist_update")
+    conn.execute(f"""
+        CREATE TRIGGER ops__quotes_worklist_update
+        AFTER UPDATE OF {_COLUMNS} ON ops__quotes BEGIN {bump} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS ops__quotes_worklist_status
+        AFTER UPDATE OF status ON ops__quotes
+        WHEN NOT EXISTS (
+            SELECT 1 FROM ops__quote_outcome_events e
+            WHERE e.quote_id = NEW.id AND e.outcome_type != 'NO_RESPONSE'
+        )
+        BEGIN {bump} END
+    """)
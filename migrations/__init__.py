@@ -0,0 +1,7 @@
+"""
+Schema migrations.
+
+runner.py applies the consolidated baseline (schema_snapshot.py) and numbered
+migrations newer than it, tracked in the schema_version table. The numbered
+scripts 01-17 are the historical manual migrations the baseline consolidates.
+"""
@@ -0,0 +1,308 @@
+"""
+Versioned schema migrations.
+
+Every applied step is recorded in `schema_version`; a database that is already
+current costs one SELECT at startup.
+
+Steps:
+- Baseline (version 17, schema_snapshot.py): fresh databases are built from
+  the consolidated snapshot in one transaction. Databases that predate
+  schema_version get the idempotent snapshot plus any missing LEGACY_COLUMNS
+  once, then are stamped.
+- Numbered migrations: migrations/NN_name.py with NN > 17 defining
+  `upgrade(conn)`. Applied once, in order, each in its own transaction.
+  BEGIN IMMEDIATE serializes concurrent boots; the version is re-checked
+  under the lock so a step never runs twice.
+
+`upgrade(conn)` runs inside the transaction and must not commit. Migrations
+that touch ledger tables must tolerate ops-only databases (ledgers absent),
+because initialize_database() never creates ledgers on its own.
+
+Legacy scripts 01-17 stay in this directory as manual history and are never
+run here.
+
+Usage:
+    python -m migrations.runner --status
+    python -m migrations.runner --db-path ./data/test_cutter.db
+"""
+import argparse
+import importlib.util
+import re
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set
+
+from . import schema_snapshot
+
+MIGRATIONS_DIR = Path(__file__).parent
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d+)_([A-Za-z0-9_]+)\.py$")
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    path: Path
+
+
+_migrations_cache: Optional[List[Migration]] = None
+
+
+def discover_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Numbered migration files newer than the baseline, in version order."""
+    found: List[Migration] = []
+    for path in directory.glob("*.py"):
+        match = MIGRATION_FILE_PATTERN.match(path.name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version <= schema_snapshot.BASELINE_VERSION:
+            continue
+        found.append(Migration(version, match.group(2), path))
+    found.sort()
+    versions = [migration.version for migration in found]
+    duplicates = sorted({v for v in versions if versions.count(v) > 1})
+    if duplicates:
+        raise RuntimeError(f"Duplicate migration versions: {duplicates}")
+    return found
+
+
+def get_migrations() -> List[Migration]:
+    global _migrations_cache
+    if _migrations_cache is None:
+        _migrations_cache = discover_migrations()
+    return _migrations_cache
+
+
+def latest_version() -> int:
+    migrations = get_migrations()
+    return migrations[-1].version if migrations else schema_snapshot.BASELINE_VERSION
+
+
+def get_schema_version(conn: sqlite3.Connection) -> Optional[int]:
+    """Highest applied version, or None for a database that predates versioning."""
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def list_applied(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    try:
+        rows = conn.execute(
+            "SELECT version, name, applied_at FROM schema_version ORDER BY version"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    return [{"version": row[0], "name": row[1], "applied_at": row[2]} for row in rows]
+
+
+def _table_exists(conn: sqlite3.Connection, table_name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table_name,)
+    ).fetchone()
+    return row is not None
+
+
+def _column_names(conn: sqlite3.Connection, table_name: str) -> Set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table_name})").fetchall()}
+
+
+def _apply_snapshot(conn: sqlite3.Connection, include_ledgers: bool) -> None:
+    for statement in schema_snapshot.OPS_SCHEMA:
+        conn.execute(statement)
+    if include_ledgers:
+        for statement in schema_snapshot.LEDGER_SCHEMA:
+            conn.execute(statement)
+    for table_name, statement in schema_snapshot.LEDGER_INDEXES:
+        if _table_exists(conn, table_name):
+            conn.execute(statement)
+
+
+def _apply_legacy_columns(conn: sqlite3.Connection) -> None:
+    columns_by_table: Dict[str, Set[str]] = {}
+    for table_name, column_name, column_type in schema_snapshot.LEGACY_COLUMNS:
+        if table_name not in columns_by_table:
+            columns_by_table[table_name] = _column_names(conn, table_name)
+        existing = columns_by_table[table_name]
+        if not existing or column_name in existing:
+            continue
+        conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
+        existing.add(column_name)
+
+
+def _rebuild_reconciliations_if_needed(conn: sqlite3.Connection) -> None:
+    """MVP-12 schema fix: predicate_ref NOT NULL, predicate_text nullable."""
+    columns = conn.execute("PRAGMA table_info(ops__reconciliations)").fetchall()
+    if not columns:
+        return
+    col_by_name = {row[1]: row for row in columns}
+    predicate_ref_missing = "predicate_ref" not in col_by_name
+    predicate_text_notnull = col_by_name.get("predicate_text", (None, None, None, 0))[3] == 1
+    if not predicate_ref_missing and not predicate_text_notnull:
+        return
+    conn.execute("ALTER TABLE ops__reconciliations RENAME TO ops__reconciliations_old")
+    conn.execute("""
+        CREATE TABLE ops__reconciliations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            scope_ref TEXT NOT NULL,
+            scope_kind TEXT NOT NULL CHECK (scope_kind IN ('query', 'report')),
+            predicate_ref TEXT NOT NULL,
+            predicate_text TEXT,
+            actor_ref TEXT NOT NULL,
+            reconciled_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        INSERT INTO ops__reconciliations (
+            scope_ref, scope_kind, predicate_ref, predicate_text, actor_ref, reconciled_at
+        )
+        SELECT scope_ref, scope_kind, predicate_text, predicate_text, actor_ref, reconciled_at
+        FROM ops__reconciliations_old
+    """)
+    conn.execute("DROP TABLE ops__reconciliations_old")
+
+
+def seed_defaults(conn: sqlite3.Connection) -> None:
+    """Default materials, pricing tags and shop config (INSERT OR IGNORE)."""
+    conn.executemany(
+        "INSERT OR IGNORE INTO ops__materials (name, cost_per_cubic_inch, machinability_score) VALUES (?,?,?)",
+        schema_snapshot.DEFAULT_MATERIALS,
+    )
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO ops__custom_tags
+        (name, impact_type, impact_value, persistence_type, category)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        schema_snapshot.DEFAULT_TAGS,
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO ops__shop_config (key, value, description) VALUES (?, ?, ?)",
+        schema_snapshot.DEFAULT_SHOP_CONFIG,
+    )
+
+
+def _apply_baseline(conn: sqlite3.Connection, include_ledgers: bool) -> None:
+    _apply_snapshot(conn, include_ledgers)
+    _apply_legacy_columns(conn)
+    _rebuild_reconciliations_if_needed(conn)
+    seed_defaults(conn)
+
+
+def _load_upgrade(migration: Migration) -> Callable[[sqlite3.Connection], None]:
+    spec = importlib.util.spec_from_file_location(
+        f"migrations._m{migration.version}_{migration.name}", migration.path
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    upgrade = getattr(module, "upgrade", None)
+    if not callable(upgrade):
+        raise RuntimeError(f"Migration {migration.path.name} has no upgrade(conn) function")
+    return upgrade
+
+
+def _run_step(conn: sqlite3.Connection, version: int, name: str,
+              apply: Callable[[sqlite3.Connection], None]) -> bool:
+    """Apply one step in its own transaction; False if already applied."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TEXT NOT NULL
+            )
+        """)
+        current = get_schema_version(conn)
+        if current is not None and current >= version:
+            conn.execute("ROLLBACK")
+            return False
+        apply(conn)
+        conn.execute(
+            "INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+            (version, name, datetime.utcnow().isoformat()),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return True
+
+
+def migrate(conn: sqlite3.Connection, include_ledgers: bool = False) -> List[int]:
+    """Apply the baseline (if unversioned) and all pending numbered migrations."""
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None  # explicit BEGIN/COMMIT per step
+    applied: List[int] = []
+    try:
+        if _run_step(conn, schema_snapshot.BASELINE_VERSION, schema_snapshot.BASELINE_NAME,
+                     lambda c: _apply_baseline(c, include_ledgers)):
+            applied.append(schema_snapshot.BASELINE_VERSION)
+        for migration in get_migrations():
+            current = get_schema_version(conn)
+            if current is not None and current >= migration.version:
+                continue
+            if _run_step(conn, migration.version, migration.name, _load_upgrade(migration)):
+                print(f"[MIGRATE] Applied {migration.version:02d}_{migration.name}")
+                applied.append(migration.version)
+    finally:
+        conn.isolation_level = previous_isolation
+    return applied
+
+
+def ensure_schema(conn: sqlite3.Connection) -> List[int]:
+    """Startup path: one SELECT when current, otherwise migrate."""
+    current = get_schema_version(conn)
+    if current is not None and current >= latest_version():
+        return []
+    return migrate(conn)
+
+
+def build_fresh_schema(conn: sqlite3.Connection) -> List[int]:
+    """Full schema (ops + ledgers) for an empty database, then pending migrations."""
+    return migrate(conn, include_ledgers=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Apply pending schema migrations (schema_version)",
+        epilog="Example: python -m migrations.runner --status"
+    )
+    parser.add_argument("--db-path", type=str, help="Database path (default: active DB)")
+    parser.add_argument("--status", action="store_true", help="Show versions without migrating")
+    args = parser.parse_args()
+
+    if args.db_path:
+        db_path = Path(args.db_path)
+    else:
+        import database
+        db_path = database.resolve_db_path()
+    if not db_path.exists():
+        print(f"[ERROR] Database not found at {db_path}")
+        return 1
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.execute("PRAGMA journal_mode=WAL;")
+        current = get_schema_version(conn)
+        pending = [m for m in get_migrations() if current is None or m.version > current]
+        print(f"[SCHEMA] {db_path}: version {current if current is not None else 'unversioned'}"
+              f" (latest {latest_version()})")
+        for row in list_applied(conn):
+            print(f"  [OK] {row['version']:02d} {row['name']} ({row['applied_at']})")
+        for migration in pending:
+            print(f"  [PENDING] {migration.version:02d} {migration.name}")
+        if args.status:
+            return 0
+        applied = migrate(conn)
+        print(f"[SCHEMA] Applied {len(applied)} step(s); now at version {get_schema_version(conn)}")
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,541 @@
+"""
+Consolidated schema snapshot (baseline = legacy migrations 01-17).
+
+Fresh databases are built from these statements in one transaction instead of
+replaying the numbered legacy scripts. Databases created before the
+schema_version table existed are brought up to the same baseline once via
+LEGACY_COLUMNS (the old per-boot add_column_safe list).
+
+Split:
+- OPS_SCHEMA: what database.initialize_database() may create on its own.
+- LEDGER_SCHEMA: Cutter/State Ledger tables, append-only triggers and views.
+  Only created explicitly (scripts/reset_db.py) so preflight still fails fast
+  when ledgers are missing.
+
+Changes after the baseline belong in a new numbered migration
+(migrations/NN_name.py with upgrade(conn)), not here.
+"""
+
+BASELINE_VERSION = 17
+BASELINE_NAME = "baseline_snapshot"
+
+
+OPS_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS ops__materials (
+        name TEXT PRIMARY KEY,
+        cost_per_cubic_inch REAL NOT NULL,
+        machinability_score REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ops__shop_config (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        description TEXT,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Legacy flat table (pre-Phase 4)
+    """
+    CREATE TABLE IF NOT EXISTS ops__quote_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        filename TEXT,
+        fingerprint TEXT,
+        anchor_price REAL,
+        final_price REAL,
+        setup_time INTEGER,
+        user_feedback_tags TEXT,
+        tag_weights TEXT,
+        status TEXT DEFAULT 'Draft',
+        actual_runtime REAL,
+        is_guild_submission INTEGER DEFAULT 0,
+        submission_date TEXT,
+        exported_at TEXT,
+        is_compliant INTEGER DEFAULT 1,
+        is_deleted INTEGER DEFAULT 0,
+        timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+        loss_reason TEXT,
+        win_notes TEXT,
+        closed_at TEXT,
+        material TEXT,
+        genesis_hash TEXT,
+        process_routing TEXT,
+        source_type TEXT,
+        reference_image TEXT,
+        quote_id TEXT,
+        handling_time REAL
+    )
+    """,
+    # Phase 4 identity model: customers -> contacts, parts -> quotes
+    """
+    CREATE TABLE IF NOT EXISTS ops__customers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        domain TEXT NOT NULL,
+        corporate_tags_json TEXT DEFAULT '[]',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ops__contacts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        phone TEXT,
+        current_customer_id INTEGER,
+        behavior_tags_json TEXT DEFAULT '[]',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(current_customer_id) REFERENCES ops__customers(id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ops__parts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        genesis_hash TEXT UNIQUE NOT NULL,
+        filename TEXT,
+        fingerprint_json TEXT,
+        volume REAL,
+        surface_area REAL,
+        dimensions_json TEXT,
+        process_routing_json TEXT DEFAULT '[]',
+        features_json TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ops__quotes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        quote_id TEXT UNIQUE NOT NULL,
+        part_id INTEGER NOT NULL,
+        customer_id INTEGER NOT NULL,
+        contact_id INTEGER,
+        user_id INTEGER,
+        material TEXT NOT NULL,
+        quantity INTEGER DEFAULT 1,
+        target_date TEXT,
+        payment_terms_days INTEGER DEFAULT 30,
+        system_price_anchor REAL NOT NULL,
+        final_quoted_price REAL NOT NULL,
+        variance_json TEXT,
+        pricing_tags_json TEXT,
+        physics_snapshot_json TEXT,
+        status TEXT DEFAULT 'Draft',
+        notes TEXT,
+        lead_time_date TEXT,
+        lead_time_days INTEGER,
+        target_price_per_unit REAL,
+        price_breaks_json TEXT,
+        outside_processing_json TEXT,
+        quality_requirements_json TEXT,
+        part_marking_json TEXT,
+        win_notes TEXT,
+        loss_reason TEXT,
+        closed_at TEXT,
+        win_attribution_json TEXT,
+        loss_attribution_json TEXT,
+        is_deleted INTEGER DEFAULT 0,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(part_id) REFERENCES ops__parts(id) ON DELETE CASCADE,
+        FOREIGN KEY(customer_id) REFERENCES ops__customers(id) ON DELETE RESTRICT,
+        FOREIGN KEY(contact_id) REFERENCES ops__contacts(id) ON DELETE SET NULL
+    )
+    """,
+    # Quote outcome events (append-only truth ledger + wizard data)
+    """
+    CREATE TABLE IF NOT EXISTS ops__quote_outcome_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        quote_id INTEGER NOT NULL,
+        outcome_type TEXT NOT NULL,
+        actor_user_id INTEGER,
+        saved_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        original_price REAL,
+        final_price REAL,
+        price_changed BOOLEAN DEFAULT FALSE,
+        original_leadtime_days INTEGER,
+        final_leadtime_days INTEGER,
+        leadtime_changed BOOLEAN DEFAULT FALSE,
+        original_terms_days INTEGER,
+        final_terms_days INTEGER,
+        terms_changed BOOLEAN DEFAULT FALSE,
+        other_notes TEXT,
+        wizard_completed BOOLEAN DEFAULT FALSE,
+        wizard_step_reached INTEGER DEFAULT 0,
+        FOREIGN KEY(quote_id) REFERENCES ops__quotes(id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_outcome_events_quote ON ops__quote_outcome_events (quote_id)",
+    "CREATE INDEX IF NOT EXISTS idx_outcome_events_actor ON ops__quote_outcome_events (actor_user_id)",
+    """
+    CREATE TABLE IF NOT EXISTS ops__custom_tags (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE,
+        impact_type TEXT,
+        impact_value REAL,
+        persistence_type TEXT DEFAULT 'transient',
+        category TEXT DEFAULT 'General'
+    )
+    """,
+    # Query-scoped reconciliation records (MVP-12)
+    """
+    CREATE TABLE IF NOT EXISTS ops__reconciliations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        scope_ref TEXT NOT NULL,
+        scope_kind TEXT NOT NULL CHECK (scope_kind IN ('query', 'report')),
+        predicate_ref TEXT NOT NULL,
+        predicate_text TEXT,
+        actor_ref TEXT NOT NULL,
+        reconciled_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Saved report definitions (Post-MVP planning-only)
+    """
+    CREATE TABLE IF NOT EXISTS ops__saved_reports (
+        report_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        report_name TEXT NOT NULL UNIQUE,
+        query_type TEXT NOT NULL,
+        params_json TEXT NOT NULL,
+        created_by_actor_ref TEXT NOT NULL,
+        created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        last_run_at TEXT
+    )
+    """,
+    # Customer relationship junctions (legacy migration 07)
+    """
+    CREATE TABLE IF NOT EXISTS customer_parts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        customer_id INTEGER NOT NULL,
+        genesis_hash TEXT NOT NULL,
+        first_quoted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        total_quotes INTEGER DEFAULT 1,
+        FOREIGN KEY (customer_id) REFERENCES ops__customers(id),
+        UNIQUE(customer_id, genesis_hash)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS contact_companies (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        contact_id INTEGER NOT NULL,
+        customer_id INTEGER NOT NULL,
+        is_primary BOOLEAN DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (contact_id) REFERENCES ops__contacts(id),
+        FOREIGN KEY (customer_id) REFERENCES ops__customers(id),
+        UNIQUE(contact_id, customer_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_customer_parts_customer ON customer_parts(customer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_customer_parts_hash ON customer_parts(genesis_hash)",
+    "CREATE INDEX IF NOT EXISTS idx_contact_companies_contact ON contact_companies(contact_id)",
+    "CREATE INDEX IF NOT EXISTS idx_contact_companies_customer ON contact_companies(customer_id)",
+    # Unclosed quotes worklist (legacy migration 17)
+    """
+    CREATE VIEW IF NOT EXISTS view_ops_unclosed_quotes AS
+    SELECT
+        q.id,
+        q.quote_id,
+        q.final_quoted_price,
+        q.lead_time_days,
+        q.payment_terms_days,
+        q.status,
+        q.created_at,
+        cu.name as customer_name,
+        CAST((JULIANDAY('now') - JULIANDAY(q.created_at)) AS INTEGER) AS age_days
+    FROM ops__quotes q
+    LEFT JOIN ops__customers cu ON q.customer_id = cu.id
+    LEFT JOIN ops__quote_outcome_events e ON q.id = e.quote_id AND e.outcome_type != 'NO_RESPONSE'
+    WHERE e.id IS NULL
+    ORDER BY q.created_at ASC
+    """,
+]
+
+
+LEDGER_SCHEMA = [
+    # Cutter Ledger (append-only operational exhaust)
+    """
+    CREATE TABLE IF NOT EXISTS cutter__events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_type TEXT NOT NULL,
+        subject_ref TEXT NOT NULL,
+        event_data TEXT,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        ingested_by_service TEXT,
+        ingested_by_version TEXT
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS block_cutter_events_update
+    BEFORE UPDATE ON cutter__events
+    BEGIN
+        SELECT RAISE(ABORT, 'Constitutional violation: cutter__events is append-only (no UPDATE)');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS block_cutter_events_delete
+    BEFORE DELETE ON cutter__events
+    BEGIN
+        SELECT RAISE(ABORT, 'Constitutional violation: cutter__events is append-only (no DELETE)');
+    END
+    """,
+    # State Ledger (entities, recognition ownership, append-only declarations)
+    """
+    CREATE TABLE IF NOT EXISTS state__entities (
+        entity_ref TEXT PRIMARY KEY,
+        entity_label TEXT NOT NULL,
+        cadence_days INTEGER NOT NULL DEFAULT 7,
+        created_at TEXT NOT NULL DEFAULT (datetime('now'))
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS state__recognition_owners (
+        entity_ref TEXT NOT NULL,
+        owner_actor_ref TEXT NOT NULL,
+        assigned_at TEXT NOT NULL DEFAULT (datetime('now')),
+        unassigned_at TEXT,
+        assigned_by_actor_ref TEXT NOT NULL,
+        FOREIGN KEY (entity_ref) REFERENCES state__entities(entity_ref)
+    )
+    """,
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_one_current_owner
+    ON state__recognition_owners(entity_ref)
+    WHERE unassigned_at IS NULL
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS state__declarations (
+        declaration_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        entity_ref TEXT NOT NULL,
+        scope_ref TEXT NOT NULL,
+        state_text TEXT NOT NULL,
+        declaration_kind TEXT NOT NULL CHECK (declaration_kind IN ('REAFFIRMATION','RECLASSIFICATION')),
+        declared_by_actor_ref TEXT NOT NULL,
+        declared_at TEXT NOT NULL DEFAULT (datetime('now')),
+        supersedes_declaration_id INTEGER,
+        cutter_evidence_ref TEXT,
+        evidence_refs_json TEXT DEFAULT '[]',
+        classification TEXT,
+        FOREIGN KEY (entity_ref) REFERENCES state__entities(entity_ref)
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS block_state_declarations_update
+    BEFORE UPDATE ON state__declarations
+    BEGIN
+        SELECT RAISE(ABORT, 'Constitutional violation: state__declarations is append-only (no UPDATE)');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS block_state_declarations_delete
+    BEFORE DELETE ON state__declarations
+    BEGIN
+        SELECT RAISE(ABORT, 'Constitutional violation: state__declarations is append-only (no DELETE)');
+    END
+    """,
+    # DS-2: Unowned Recognition
+    """
+    CREATE VIEW IF NOT EXISTS view_ds2_unowned_recognition AS
+    SELECT
+        e.entity_ref,
+        e.entity_label,
+        e.cadence_days,
+        e.created_at as entity_created_at
+    FROM state__entities e
+    WHERE NOT EXISTS (
+        SELECT 1 FROM state__recognition_owners o
+        WHERE o.entity_ref = e.entity_ref
+        AND o.unassigned_at IS NULL
+    )
+    """,
+    # DS-5: Deferred Recognition
+    """
+    CREATE VIEW IF NOT EXISTS view_ds5_deferred_recognition AS
+    SELECT
+        e.entity_ref,
+        e.entity_label,
+        e.cadence_days,
+        MAX(d.declared_at) as last_declaration_at,
+        CAST((JULIANDAY('now') - JULIANDAY(MAX(d.declared_at))) AS INTEGER) as days_since_last_declaration
+    FROM state__entities e
+    LEFT JOIN state__declarations d ON e.entity_ref = d.entity_ref
+    GROUP BY e.entity_ref, e.entity_label, e.cadence_days
+    HAVING
+        last_declaration_at IS NULL
+        OR CAST((JULIANDAY('now') - JULIANDAY(last_declaration_at)) AS INTEGER) > e.cadence_days
+    """,
+    # DS-1: Persistent Continuity
+    """
+    CREATE VIEW IF NOT EXISTS view_ds1_persistent_continuity AS
+    WITH last_reclassification AS (
+        SELECT
+            entity_ref,
+            scope_ref,
+            MAX(declaration_id) as last_recl_id
+        FROM state__declarations
+        WHERE declaration_kind = 'RECLASSIFICATION'
+        GROUP BY entity_ref, scope_ref
+    ),
+    current_reaffirmations AS (
+        SELECT
+            d.entity_ref,
+            d.scope_ref,
+            d.classification,
+            d.declared_at,
+            d.declaration_id,
+            lr.last_recl_id
+        FROM state__declarations d
+        LEFT JOIN last_reclassification lr
+            ON d.entity_ref = lr.entity_ref
+            AND d.scope_ref = lr.scope_ref
+        WHERE d.declaration_kind = 'REAFFIRMATION'
+            AND (lr.last_recl_id IS NULL OR d.declaration_id > lr.last_recl_id)
+    )
+    SELECT
+        entity_ref,
+        scope_ref,
+        classification,
+        COUNT(*) as consecutive_reaffirmations,
+        MIN(declared_at) as first_reaffirmed_at,
+        MAX(declared_at) as last_reaffirmed_at
+    FROM current_reaffirmations
+    GROUP BY entity_ref, scope_ref, classification
+    HAVING COUNT(*) > 1
+    ORDER BY consecutive_reaffirmations DESC, entity_ref
+    """,
+    """
+    CREATE VIEW IF NOT EXISTS view_state_time_in_state AS
+    WITH latest AS (
+        SELECT
+            entity_ref,
+            scope_ref,
+            MAX(declared_at) AS last_declared_at
+        FROM state__declarations
+        GROUP BY entity_ref, scope_ref
+    ),
+    latest_rows AS (
+        SELECT d.*
+        FROM state__declarations d
+        JOIN latest l
+            ON d.entity_ref = l.entity_ref
+            AND d.scope_ref = l.scope_ref
+            AND d.declared_at = l.last_declared_at
+    )
+    SELECT
+        e.entity_ref,
+        e.entity_label,
+        e.cadence_days,
+        l.scope_ref,
+        l.state_text,
+        l.classification,
+        l.declaration_kind,
+        l.declared_by_actor_ref,
+        l.declared_at,
+        CAST((JULIANDAY('now') - JULIANDAY(l.declared_at)) AS INTEGER) AS days_since_declaration
+    FROM state__entities e
+    LEFT JOIN latest_rows l
+        ON e.entity_ref = l.entity_ref
+    """,
+]
+
+# Ledger read indexes (legacy migrations 11-13). Keyed by table so the
+# baseline can add them to pre-versioning DBs that already have ledgers.
+LEDGER_INDEXES = [
+    ("cutter__events", "CREATE INDEX IF NOT EXISTS idx_events_subject_ref ON cutter__events(subject_ref)"),
+    ("cutter__events", "CREATE INDEX IF NOT EXISTS idx_events_type ON cutter__events(event_type)"),
+    ("cutter__events", "CREATE INDEX IF NOT EXISTS idx_events_created_at ON cutter__events(created_at)"),
+    ("state__recognition_owners",
+     "CREATE INDEX IF NOT EXISTS idx_ownership_history ON state__recognition_owners(entity_ref, assigned_at)"),
+    ("state__declarations",
+     "CREATE INDEX IF NOT EXISTS idx_declarations_entity ON state__declarations(entity_ref, declared_at DESC)"),
+    ("state__declarations",
+     "CREATE INDEX IF NOT EXISTS idx_declarations_scope ON state__declarations(scope_ref, declared_at DESC)"),
+    ("state__declarations",
+     "CREATE INDEX IF NOT EXISTS idx_declarations_actor ON state__declarations(declared_by_actor_ref, declared_at DESC)"),
+]
+
+
+# Columns added over time to tables that may predate them. Applied once when a
+# pre-versioning database is stamped to the baseline (formerly every boot).
+LEGACY_COLUMNS = [
+    # Quotes (Deal Closer fields)
+    ("ops__quotes", "win_notes", "TEXT"),
+    ("ops__quotes", "loss_reason", "TEXT"),
+    ("ops__quotes", "closed_at", "TEXT"),
+    ("ops__quotes", "win_attribution_json", "TEXT"),
+    ("ops__quotes", "loss_attribution_json", "TEXT"),
+    ("ops__quotes", "payment_terms_days", "INTEGER"),
+    ("ops__quotes", "is_deleted", "INTEGER DEFAULT 0"),
+    # Quote outcome events (Wizard fields)
+    ("ops__quote_outcome_events", "original_price", "REAL"),
+    ("ops__quote_outcome_events", "final_price", "REAL"),
+    ("ops__quote_outcome_events", "price_changed", "BOOLEAN"),
+    ("ops__quote_outcome_events", "original_leadtime_days", "INTEGER"),
+    ("ops__quote_outcome_events", "final_leadtime_days", "INTEGER"),
+    ("ops__quote_outcome_events", "leadtime_changed", "BOOLEAN"),
+    ("ops__quote_outcome_events", "original_terms_days", "INTEGER"),
+    ("ops__quote_outcome_events", "final_terms_days", "INTEGER"),
+    ("ops__quote_outcome_events", "terms_changed", "BOOLEAN"),
+    ("ops__quote_outcome_events", "other_notes", "TEXT"),
+    ("ops__quote_outcome_events", "wizard_completed", "BOOLEAN"),
+    ("ops__quote_outcome_events", "wizard_step_reached", "INTEGER"),
+    # Quote history (legacy compatibility)
+    ("ops__quote_history", "tag_weights", "TEXT"),
+    ("ops__quote_history", "user_feedback_tags", "TEXT"),
+    ("ops__quote_history", "status", "TEXT"),
+    ("ops__quote_history", "actual_runtime", "REAL"),
+    ("ops__quote_history", "is_guild_submission", "INTEGER"),
+    ("ops__quote_history", "submission_date", "TEXT"),
+    ("ops__quote_history", "loss_reason", "TEXT"),
+    ("ops__quote_history", "exported_at", "TEXT"),
+    ("ops__quote_history", "material", "TEXT"),
+    ("ops__quote_history", "is_compliant", "INTEGER"),
+    ("ops__quote_history", "genesis_hash", "TEXT"),
+    ("ops__quote_history", "process_routing", "TEXT"),
+    ("ops__quote_history", "source_type", "TEXT"),
+    ("ops__quote_history", "reference_image", "TEXT"),
+    ("ops__quote_history", "quote_id", "TEXT"),
+    ("ops__quote_history", "is_deleted", "INTEGER"),
+    ("ops__quote_history", "handling_time", "REAL"),
+    ("ops__quote_history", "win_notes", "TEXT"),
+    ("ops__quote_history", "closed_at", "TEXT"),
+    # State Ledger declarations (only if the table exists)
+    ("state__declarations", "evidence_refs_json", "TEXT DEFAULT '[]'"),
+]
+
+
+DEFAULT_MATERIALS = [
+    ('Aluminum 6061', 0.30, 1.0),
+    ('Steel 1018', 0.25, 1.8),
+    ('Stainless 304', 0.65, 2.5),
+    ('Customer Supplied', 0.00, 1.0),
+]
+
+DEFAULT_TAGS = [
+    ('Rush Job', 'price_markup_percent', 1.50, 'transient', 'Market'),
+    ('Expedite', 'price_markup_percent', 1.25, 'transient', 'Market'),
+    ('Risk: Scrap High', 'price_markup_percent', 1.10, 'structural', 'Risk'),
+    ('Friends / Family', 'price_markup_percent', 0.90, 'transient', 'Market'),
+    ('Tight Tol', 'add_setup_minutes', 60.0, 'structural', 'Geometry'),
+    ('Complex Fixture', 'add_setup_minutes', 120.0, 'structural', 'Geometry'),
+    ('Heavy Deburr', 'add_setup_minutes', 30.0, 'structural', 'Finish'),
+    ('Proto', 'set_shop_rate', 150.0, 'transient', 'Market'),
+    ('Cust. Material', 'set_material_mult', 0.0, 'transient', 'Material'),
+    ('Price Rounding', 'none', 0.0, 'transient', 'Strategy'),
+]
+
+DEFAULT_SHOP_CONFIG = [
+    ('base_mrr', '30.0', 'Material Removal Rate for Aluminum 6061'),
+    ('setup_time_minutes', '60.0', 'Default setup time'),
+    ('saw_kerf', '0.125', 'Stock buffer'),
+    ('min_hand_time', '5.0', 'Minimum hand time'),
+    ('material_markup', '1.2', 'Material markup'),
+    ('shop_rate_standard', '75.0', 'Standard shop rate'),
+    ('shop_rate_marginal', '45.0', 'Marginal shop rate'),
+    ('default_handling_time', '0.5', 'Default load/unload time'),
+    # Shop Branding (PDF Headers) - Per EXECUTION_CHAT_BRIEF.md
+    ('shop_name', 'Precision Machine Works', 'Company name for PDFs'),
+    ('shop_address', '123 Industrial Way, City, ST 12345', 'Address for PDFs'),
+    ('shop_phone', '(555) 123-4567', 'Contact phone'),
+    ('shop_email', 'quotes@precisionworks.com', 'Contact email'),
+    ('shop_logo_path', '', 'Optional logo path (future use)'),
+]
@@ -2,31 +2,38 @@
 Flask API for geometry analysis and pricing calculations.
 """
 import os
+import math
 import time
 import base64
 import json
 import uuid
 import tempfile
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, Any, List
-from flask import Flask, request, jsonify, render_template, send_file, send_from_directory
+from typing import Dict, Any, List, TYPE_CHECKING
+from flask import Flask, Response, request, jsonify, render_template, send_file, send_from_directory, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
-import trimesh
-import psutil
 
 # Custom Modules
-from .pricing_engine import PriceCalculator
+from .pricing_engine import (
+    PriceCalculator,
+    QUANTITY_BREAKS,
+    CURVE_MAX_QUANTITY,
+    CURVE_QUANTITY_LIMIT,
+    price_curve,
+    curve_quantities,
+    curve_to_lists,
+    price_breaks_from_curve,
+    pricing_inputs,
+    reproduces_anchor
+)
 from .estimator import estimate_runtime, suggest_stock, calculate_geometry_raw, get_unit_options, calculate_geometry
 from . import genesis_hash
-from . import pdf_generator
 import vector_engine  # Cross-layer utility (remains at root)
 import database  # Cross-layer utility (remains at root)
-from cutter_ledger.boundary import emit_cutter_event, get_events as get_cutter_events
+from cutter_ledger.boundary import emit_cutter_event, get_events as get_cutter_events, get_latest_events as get_latest_cutter_events
 from state_ledger import validation as state_validation
 from state_ledger import boundary as state_boundary
-from state_ledger import queries as state_queries
 from .ledger_events import emit_carrier_handoff
 from .query_a import get_query_a_open_deadlines
 from .query_registry import (
@@ -36,6 +43,23 @@ from .query_registry import (
 )
 from cutter_ledger.queries import query_dwell_vs_expectation, query_open_response_deadlines
 from .preflight import run_preflight_or_exit
+from . import db_backup
+from . import db_maintenance
+from . import event_stream
+from . import metrics
+from . import pricing_model
+from . import profiling
+from . import repricing
+from . import report_cache
+from . import report_scheduler
+from . import unclosed_worklist
+from .report_cache import normalize_report_params
+from . import warmup
+
+# Heavy modules (trimesh, reportlab/qrcode, psutil) are imported on first use
+# to keep startup fast; see ops_layer/warmup.py
+if TYPE_CHECKING:
+    import trimesh
 
 # --- CONFIGURATION (AIR GAP ANCHOR) ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -50,10 +74,15 @@ app.config['UPLOAD_FOLDER'] = r'C:\cutter_assets'
 if not os.path.exists(app.config['UPLOAD_FOLDER']):
     os.makedirs(app.config['UPLOAD_FOLDER'])
 
+# Quote and traveler PDFs go under quotes_pdf/ and travelers_pdf/ here ('' = working directory)
+app.config['PDF_OUTPUT_DIR'] = ''
+
 # Initialize database
 database.initialize_database()
 # Fail-fast if ledger schema/triggers are missing
 run_preflight_or_exit()
+# Optional: import heavy modules in the background (CUTTER_WARMUP=1)
+warmup.start_warmup_thread()
 
 # Default values
 DEFAULT_MATERIAL = "Aluminum 6061"
@@ -145,6 +174,18 @@ def get_ops_mode() -> str | None:
     return mode
 
 
+# Opt-in request profiling (planning mode only, see ops_layer/profiling.py)
+profiling.install(app, get_ops_mode)
+# Background report snapshots (CUTTER_REPORT_SCHEDULER, see ops_layer/report_scheduler.py)
+report_scheduler.install(app)
+# Health metrics sampler and in-flight request count (ops_layer/metrics.py)
+metrics.install(app)
+# Scheduled SQLite maintenance (CUTTER_DB_MAINTENANCE, see ops_layer/db_maintenance.py)
+db_maintenance.install(app)
+# Online snapshots and ledger exports (CUTTER_BACKUP / CUTTER_LEDGER_EXPORT, see ops_layer/db_backup.py)
+db_backup.install(app)
+
+
 def require_ops_mode():
     mode = get_ops_mode()
     if mode is None:
@@ -152,32 +193,6 @@ def require_ops_mode():
     return mode, None
 
 
-def normalize_report_params(query_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    if not isinstance(params, dict):
-        raise ValueError("params must be an object")
-    if query_type == "latest_declaration_per_entity":
-        if params:
-            raise ValueError("params must be empty for latest_declaration_per_entity")
-        return {}
-    if query_type == "entities_time_in_state_over":
-        threshold_days = params.get("threshold_days")
-        cadence_days = params.get("cadence_days")
-        raw_value = threshold_days if threshold_days is not None else cadence_days
-        if raw_value is None:
-            raise ValueError("threshold_days or cadence_days is required")
-        if not isinstance(raw_value, int) or raw_value < 0:
-            raise ValueError("threshold_days must be a non-negative integer")
-        return {"threshold_days": raw_value}
-    if query_type == "entities_missing_reaffirmation_over":
-        threshold_days = params.get("threshold_days")
-        if threshold_days is None:
-            raise ValueError("threshold_days is required")
-        if not isinstance(threshold_days, int) or threshold_days < 0:
-            raise ValueError("threshold_days must be a non-negative integer")
-        return {"threshold_days": threshold_days}
-    raise ValueError("query_type is not supported")
-
-
 def strip_execution_fields(payload: Any) -> Any:
     if isinstance(payload, dict):
         return {
@@ -197,8 +212,10 @@ def apply_execution_guard(payload: Dict[str, Any], mode: str | None = None) -> D
         return strip_execution_fields(payload)
     return payload
 
-def load_mesh_file(file_path: str) -> trimesh.Trimesh:
+def load_mesh_file(file_path: str) -> "trimesh.Trimesh":
     """Load a mesh file (STL or STEP) using trimesh."""
+    import trimesh
+
     if not isinstance(file_path, str):
         file_path = str(file_path)
     
@@ -353,7 +370,7 @@ def quote() -> Dict[str, Any]:
                 print(f"   Similar Parts Found: {cluster_stats['count']}")
                 print(f"   Price Range: ${cluster_stats['min_price']:.2f} - ${cluster_stats['max_price']:.2f}")
                 print(f"   Median: ${cluster_stats['median_price']:.2f}")
-                print(f"   Current vs Median: {variance_pct:+.1f}% ({market_analysis['recommendation']})")
+                print(f"   Current vs Median: {variance_pct:+.1f}% ({local_history_analysis['recommendation']})")
         
         # 3. OPTIMIZATION PASS 1: Stream URL instead of Base64
         # Generate model URL for browser streaming (no memory bloat)
@@ -378,6 +395,12 @@ def quote() -> Dict[str, Any]:
             'price': {
                 'total_price': round(physics_result['total_price'], 2)
             },
+            'pricing_inputs': pricing_inputs(
+                material_cost_per_unit=physics_result['material_cost_per_unit'],
+                per_part_time_mins=runtime_breakdown['per_part_time_mins'],
+                setup_time_mins=runtime_breakdown['setup_time_mins'],
+                shop_rate_hour=shop_rate_hour
+            ),
             'stock': {'volume': stock_vol, 'x': stock_x, 'y': stock_y, 'z': stock_z},
             'runtime': {
                 'minutes': round(physics_result['total_runtime_mins'], 2),
@@ -515,26 +538,20 @@ def confirm_units() -> Dict[str, Any]:
         # Runtime
         runtime_breakdown = estimate_runtime(part_volume_in3, stock_volume_in3, material_name)
         
-        # Price
+        # Price + Price Breaks: one curve over the breaks (quantity 1 is the anchor)
         calculator = PriceCalculator()
-        price_result = calculator.calculate_anchor(
-            stock_volume_in3=stock_volume_in3,
-            material_name=material_name,
+        material_cost_per_unit = calculator.material_cost_per_unit(stock_volume_in3, material_name)
+        curve_inputs = pricing_inputs(
+            material_cost_per_unit=material_cost_per_unit,
             per_part_time_mins=runtime_breakdown['per_part_time_mins'],
             setup_time_mins=runtime_breakdown['setup_time_mins'],
             shop_rate_hour=shop_rate_hour
         )
+        curve = price_curve(sorted({1, *QUANTITY_BREAKS}), **curve_inputs)
+        price_breaks = price_breaks_from_curve(curve)
+        price_result = price_breaks[1]
         
-        # Price Breaks
-        price_breaks = calculator.calculate_price_breaks(
-            stock_volume_in3=stock_volume_in3,
-            material_name=material_name,
-            per_part_time_mins=runtime_breakdown['per_part_time_mins'],
-            setup_time_mins=runtime_breakdown['setup_time_mins'],
-            shop_rate_hour=shop_rate_hour
-        )
-        
-        physics_price = round(price_result['total_price'], 2)
+        physics_price = price_result['total_price']
         
         # Fingerprint
         surface_area_approx = part_volume_in3 * 6 
@@ -591,10 +608,11 @@ def confirm_units() -> Dict[str, Any]:
         response = {
             'price': {
                 'total_price': physics_price,
-                'material_cost': round(price_result['material_cost'], 2),
-                'labor_cost': round(price_result['labor_cost'], 2)
+                'material_cost': price_result['material_cost'],
+                'labor_cost': price_result['labor_cost']
             },
             'price_breaks': price_breaks,
+            'pricing_inputs': curve_inputs,
             'dimensions': {
                 'part': {
                     'x': round(bbox_x, 3),
@@ -646,59 +664,10 @@ def recalculate() -> Dict[str, Any]:
         data = request.get_json()
         if not data: return jsonify({'error': 'No data'}), 400
         
-        # Extract
-        material_name = data.get('material_name', DEFAULT_MATERIAL)
-        stock_vol = float(data.get('stock_x', 0)) * float(data.get('stock_y', 0)) * float(data.get('stock_z', 0))
-        part_volume = float(data.get('part_volume', 0))
-        setup_time = float(data.get('setup_time', 60.0))
-        shop_rate = float(data.get('shop_rate', DEFAULT_SHOP_RATE()))
-        # Phase 5: Complexity slider removed - anchor must be pure physics
-        complexity = 1.0  # Always 1.0 for pure physics anchor
-        quantity = int(data.get('quantity', 1))
-        handling_time = float(data.get('handling_time', 0.5))
-        
-        # Calculate Runtime
-        score = database.get_material_score(material_name)
-        if score is None:
-            print(f"WARNING: Material '{material_name}' not found. Using fallback pricing.")
-            score = 1.0  # Aluminum 6061 machinability score
-        from estimator import BASE_MRR, MIN_HAND_TIME_PER_PART
-        adjusted_mrr = BASE_MRR() / score
-        removal_vol = max(0, stock_vol - part_volume)
-        # FIX: Lowered minimum from 1.0 to 0.1 to allow price sensitivity on small parts
-        base_machine = max(removal_vol / adjusted_mrr, 0.1)
-        
-        # Pure physics runtime (no complexity multiplier - Phase 5)
-        machine_time = base_machine
-        hand_time = MIN_HAND_TIME_PER_PART()
-        per_part_time = machine_time + hand_time
-        
-        # Pricing - Include handling time in per-part calculation
-        calculator = PriceCalculator()
-        price_result = calculator.calculate_anchor(
-            stock_volume_in3=stock_vol,
-            material_name=material_name,
-            per_part_time_mins=per_part_time,
-            setup_time_mins=setup_time,
-            shop_rate_hour=shop_rate,
-            quantity=quantity,
-            handling_time_mins=handling_time
+        # Same evaluation as the browser's (static/js/modules/pricing_model.js)
+        response = pricing_model.recalculate(
+            **pricing_model.recalculation_inputs(data, DEFAULT_MATERIAL, DEFAULT_SHOP_RATE())
         )
-        
-        # Calculate total runtime: one-time setup + ((per-part time + handling time) × quantity)
-        total_runtime_mins = setup_time + ((per_part_time + handling_time) * quantity)
-        
-        response = {
-            'total_price': round(price_result['total_price'], 2),
-            'material_cost': round(price_result['material_cost'], 2),
-            'labor_cost': round(price_result['labor_cost'], 2),
-            'total_runtime_mins': round(total_runtime_mins, 2),
-            'per_part_time_mins': round(per_part_time, 2),
-            'setup_time_mins': round(setup_time, 2),
-            'machine_time_mins': round(machine_time, 2),
-            'hand_time_mins': round(hand_time, 2),
-            'quantity': quantity
-        }
         response = apply_execution_guard(response)
         return jsonify(response)
         
@@ -706,6 +675,147 @@ def recalculate() -> Dict[str, Any]:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/pricing/model', methods=['GET'])
+def get_pricing_model() -> Response:
+    """
+    GET /api/pricing/model - everything /recalculate needs, for evaluation in the browser.
+    
+    Materials (cost, machinability), shop config constants and formula
+    parameters, versioned by a content hash (ops_layer/pricing_model.py).
+    Served with the version as ETag: a request with a matching
+    If-None-Match gets 304 Not Modified.
+    """
+    try:
+        model = pricing_model.build_pricing_model()
+    except Exception as e:
+        return jsonify({'error': f'Failed to build pricing model: {str(e)}'}), 500
+    response = jsonify(model)
+    response.set_etag(model['version'])
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+@app.route('/api/pricing/curve', methods=['POST'])
+def pricing_curve() -> Dict[str, Any]:
+    """
+    POST /api/pricing/curve - the full price curve for plotting.
+    
+    Body: either the `pricing_inputs` object returned by /quote,
+    /quote/confirm-units, /recalculate and /manual_quote, or the raw inputs
+    (stock_volume_in3, material_name, per_part_time_mins, setup_time_mins,
+    shop_rate_hour, optional handling_time_mins).
+    Quantities: `quantities` (custom tiers, each 1..CURVE_QUANTITY_LIMIT)
+    or `max_quantity` (1..max_quantity, default and at most
+    CURVE_MAX_QUANTITY).
+    
+    Returns aligned arrays: quantity, material_cost, labor_cost,
+    total_price, unit_price, total_runtime_mins.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        raw_inputs = data.get('pricing_inputs') or data
+        if not isinstance(raw_inputs, dict):
+            raise ValueError('pricing_inputs must be an object')
+        handling_time = float(raw_inputs.get('handling_time_mins', 0.5))
+        if 'material_cost_per_unit' in raw_inputs:
+            material_cost_per_unit = float(raw_inputs['material_cost_per_unit'])
+        else:
+            material_cost_per_unit = PriceCalculator().material_cost_per_unit(
+                float(raw_inputs['stock_volume_in3']),
+                raw_inputs.get('material_name', DEFAULT_MATERIAL)
+            )
+        curve_inputs = pricing_inputs(
+            material_cost_per_unit=material_cost_per_unit,
+            per_part_time_mins=float(raw_inputs['per_part_time_mins']),
+            setup_time_mins=float(raw_inputs['setup_time_mins']),
+            shop_rate_hour=float(raw_inputs.get('shop_rate_hour', DEFAULT_SHOP_RATE())),
+            handling_time_mins=handling_time
+        )
+        if not all(math.isfinite(value) for value in curve_inputs.values()):
+            raise ValueError('pricing inputs must be finite numbers')
+        
+        if data.get('quantities') is not None:
+            quantities = [int(q) for q in data['quantities']]
+            if not quantities or len(quantities) > CURVE_MAX_QUANTITY:
+                raise ValueError(f'quantities must list 1 to {CURVE_MAX_QUANTITY} values')
+            if not all(1 <= q <= CURVE_QUANTITY_LIMIT for q in quantities):
+                raise ValueError(f'quantities must be between 1 and {CURVE_QUANTITY_LIMIT}')
+        else:
+            max_quantity = int(data.get('max_quantity', CURVE_MAX_QUANTITY))
+            if not 1 <= max_quantity <= CURVE_MAX_QUANTITY:
+                raise ValueError(f'max_quantity must be between 1 and {CURVE_MAX_QUANTITY}')
+            quantities = curve_quantities(max_quantity)
+        curve = price_curve(quantities, **curve_inputs)
+        if not all(math.isfinite(price) for price in curve['total_price'].tolist()):
+            raise ValueError('pricing inputs are too large to price')
+    except KeyError as e:
+        return jsonify({'error': f'Missing pricing input: {e.args[0]}', 'code': 'INVALID_PRICING_INPUT'}), 400
+    except (TypeError, ValueError, OverflowError) as e:
+        return jsonify({'error': str(e), 'code': 'INVALID_PRICING_INPUT'}), 400
+    
+    return jsonify({
+        'success': True,
+        'pricing_inputs': curve_inputs,
+        'count': int(curve['quantity'].size),
+        'curve': curve_to_lists(curve)
+    })
+
+
+@app.route('/api/quotes/reprice', methods=['POST'])
+def reprice_open_quotes() -> Dict[str, Any]:
+    """
+    POST /api/quotes/reprice - what-if anchors for every open quote.
+    
+    Recomputes the physics anchor of all Draft / Sent quotes under a
+    scenario and stores the result set (ops_layer/repricing.py). Quotes are
+    not modified. Planning mode only.
+    
+    Body (all optional; defaults are the current shop config and materials):
+    shop_rate_hour, material_markup, setup_time_mins, handling_time_mins,
+    material_costs ({material name: cost_per_cubic_inch}).
+    """
+    mode, error = require_ops_mode()
+    if error:
+        return error
+    if mode != "planning":
+        return jsonify({'error': 'repricing requires ops_mode planning'}), 400
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        summary = repricing.run_reprice({
+            key: value for key, value in data.items() if key not in ('ops_mode', 'mode')
+        })
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e), 'code': 'INVALID_REPRICE_SCENARIO'}), 400
+    except Exception as e:
+        return jsonify({'error': f'Repricing failed: {str(e)}', 'code': 'REPRICE_FAILED'}), 500
+    return jsonify({'success': True, 'run': summary})
+
+
+@app.route('/api/quotes/reprice/<int:run_id>', methods=['GET'])
+def get_reprice_run(run_id: int) -> Dict[str, Any]:
+    """
+    GET /api/quotes/reprice/<run_id>?limit=N
+    
+    A stored repricing run and its per-quote results, largest absolute
+    change first. Planning mode only.
+    """
+    mode, error = require_ops_mode()
+    if error:
+        return error
+    if mode != "planning":
+        return jsonify({'error': 'repricing requires ops_mode planning'}), 400
+    
+    try:
+        limit = request.args.get('limit', type=int)
+        run = repricing.get_run(run_id, limit=limit)
+    except Exception as e:
+        return jsonify({'error': f'Failed to load repricing run: {str(e)}', 'code': 'REPRICE_FAILED'}), 500
+    if run is None:
+        return jsonify({'error': f'Repricing run {run_id} not found', 'code': 'REPRICE_RUN_NOT_FOUND'}), 404
+    return jsonify({'success': True, 'run': run})
+
+
 @app.route('/manual_quote', methods=['POST'])
 def manual_quote() -> Dict[str, Any]:
     """
@@ -795,6 +905,7 @@ def manual_quote() -> Dict[str, Any]:
             
             # 1. Generate Synthetic Mesh (Box) representing the stock envelope
             # trimesh expects extents as [x, y, z] in consistent units (we use inches)
+            import trimesh
             synthetic_mesh = trimesh.creation.box(extents=[stock_x, stock_y, stock_z])
             
             # 2. Extract Geometry Data
@@ -860,7 +971,7 @@ def manual_quote() -> Dict[str, Any]:
                     print(f"   Similar Parts Found: {cluster_stats['count']}")
                     print(f"   Price Range: ${cluster_stats['min_price']:.2f} - ${cluster_stats['max_price']:.2f}")
                     print(f"   Median: ${cluster_stats['median_price']:.2f}")
-                    print(f"   Current vs Median: {variance_pct:+.1f}% ({market_analysis['recommendation']})")
+                    print(f"   Current vs Median: {variance_pct:+.1f}% ({local_history_analysis['recommendation']})")
         
         # Calculate total runtime and amortized values for display
         # Formula: Setup (once) + ((Per-Part Time + Handling Time) × Quantity)
@@ -901,6 +1012,13 @@ def manual_quote() -> Dict[str, Any]:
             'price': {
                 'total_price': round(physics_result['total_price'], 2)
             },
+            'pricing_inputs': pricing_inputs(
+                material_cost_per_unit=physics_result['material_cost_per_unit'],
+                per_part_time_mins=per_part_time,
+                setup_time_mins=setup_time,
+                shop_rate_hour=shop_rate_hour,
+                handling_time_mins=handling_time
+            ),
             'stock': {
                 'volume': stock_volume_in3,
                 'x': stock_x,
@@ -990,6 +1108,38 @@ def save_quote_endpoint() -> Dict[str, Any]:
     try:
         data = request.get_json()
         
+        # --- STEP 0: VALIDATE A CLIENT-COMPUTED ANCHOR ---
+        # The browser prices edits locally (GET /api/pricing/model); recompute
+        # the anchor from the inputs it used before anything is written, and
+        # compare it with the anchor that will be stored (system_price_anchor,
+        # falling back to anchor_price, as in STEP 3)
+        stock_volume_verified = False
+        recalc_inputs = data.get('recalc_inputs')
+        if isinstance(recalc_inputs, dict):
+            try:
+                inputs = pricing_model.recalculation_inputs(recalc_inputs, DEFAULT_MATERIAL, DEFAULT_SHOP_RATE())
+                recalculated = pricing_model.recalculate(**inputs)
+                saved_quantity = int(data.get('quantity', 1))
+            except (TypeError, ValueError) as e:
+                return jsonify({'error': f'Invalid recalc_inputs: {str(e)}', 'code': 'INVALID_PRICING_INPUT'}), 400
+            saved_anchor = data.get('system_price_anchor')
+            if saved_anchor is None:
+                saved_anchor = data.get('anchor_price')
+            if not reproduces_anchor(recalculated['pricing_inputs'], saved_quantity, saved_anchor):
+                current_version = pricing_model.build_pricing_model()['version']
+                stale = data.get('pricing_model_version') not in (None, current_version)
+                return jsonify({
+                    'error': ('Pricing model changed since this price was computed' if stale
+                              else 'Anchor price does not match the server calculation'),
+                    'code': 'PRICING_MODEL_STALE' if stale else 'ANCHOR_MISMATCH',
+                    'expected_anchor_price': recalculated['total_price'],
+                    'pricing_model_version': current_version
+                }), 409
+            # Snapshot what the server computed, not what the client claimed
+            data['pricing_inputs'] = recalculated['pricing_inputs']
+            data['stock_volume_in3'] = inputs['stock_volume_in3']
+            stock_volume_verified = True
+        
         # --- STEP 1: EXTRACT PART DATA ---
         
         # Extract fingerprint and reverse engineer raw physics values
@@ -1186,6 +1336,30 @@ def save_quote_endpoint() -> Dict[str, Any]:
             'total_cost': data.get('total_cost', 0.0),
             'timestamp': datetime.now().isoformat()
         }
+        # Price curve inputs at quote time: the PDF recomputes price breaks from these,
+        # so they are kept only if they reproduce the anchor being saved
+        raw_pricing_inputs = data.get('pricing_inputs')
+        if isinstance(raw_pricing_inputs, dict):
+            try:
+                saved_inputs = pricing_inputs(**{
+                    key: float(value) for key, value in raw_pricing_inputs.items()
+                })
+            except (TypeError, ValueError):
+                saved_inputs = None
+                print("[WARNING] Ignoring malformed pricing_inputs on save_quote")
+            if saved_inputs is not None:
+                if reproduces_anchor(saved_inputs, quantity, system_price_anchor):
+                    physics_snapshot['pricing_inputs'] = saved_inputs
+                else:
+                    print("[WARNING] Ignoring pricing_inputs that do not reproduce the anchor on save_quote")
+        # Stock volume at quote time: repricing (ops_layer/repricing.py) applies new material costs to it.
+        # Without recalc_inputs it is kept only if it explains the validated pricing_inputs
+        if data.get('stock_volume_in3') is not None:
+            if stock_volume_verified or pricing_model.stock_matches_inputs(
+                    data['stock_volume_in3'], material, physics_snapshot.get('pricing_inputs')):
+                physics_snapshot['stock_volume_in3'] = float(data['stock_volume_in3'])
+            else:
+                print("[WARNING] Ignoring stock_volume_in3 that does not match pricing_inputs on save_quote")
         physics_snapshot_json = json.dumps(physics_snapshot)
         
         # Phase 5: Extract RFQ-First Fields
@@ -1349,7 +1523,7 @@ def generate_quote_pdf_endpoint(quote_id: int) -> Any:
                 q.id, q.quote_id, q.material, q.system_price_anchor, q.final_quoted_price,
                 q.variance_json, q.pricing_tags_json, q.status, q.created_at, q.user_id,
                 q.quantity, q.target_date, q.notes,
-                q.lead_time_date, q.lead_time_days, q.target_price_per_unit,
+                q.lead_time_date, q.lead_time_days, q.payment_terms_days, q.target_price_per_unit,
                 q.price_breaks_json, q.outside_processing_json, q.quality_requirements_json,
                 q.part_marking_json,
                 p.id as part_id, p.genesis_hash, p.filename, p.fingerprint_json, 
@@ -1423,15 +1597,16 @@ def generate_quote_pdf_endpoint(quote_id: int) -> Any:
         }
         
         # Generate PDF (customer-safe by default)
+        from . import pdf_generator
         pdf_path = pdf_generator.generate_quote_pdf(
             quote_data=quote_data,
-            output_dir="quotes_pdf",
+            output_dir=os.path.join(app.config['PDF_OUTPUT_DIR'], "quotes_pdf"),
             customer_facing=customer_facing
         )
         
         # Serve PDF file
         return send_file(
-            pdf_path,
+            os.path.abspath(pdf_path),
             mimetype='application/pdf',
             as_attachment=True,
             download_name=f"{quote_data['quote_id']}.pdf"
@@ -1541,14 +1716,15 @@ def generate_traveler_pdf_endpoint(quote_id: int) -> Any:
         }
         
         # Generate Traveler PDF (NO PRICING)
+        from . import pdf_generator
         pdf_path = pdf_generator.generate_traveler_pdf(
             quote_data=quote_data,
-            output_dir="travelers_pdf"
+            output_dir=os.path.join(app.config['PDF_OUTPUT_DIR'], "travelers_pdf")
         )
         
         # Serve PDF file
         return send_file(
-            pdf_path,
+            os.path.abspath(pdf_path),
             mimetype='application/pdf',
             as_attachment=True,
             download_name=f"TRAVELER-{quote_data['quote_id']}.pdf"
@@ -1619,14 +1795,18 @@ def get_unclosed_quotes_endpoint():
     Per minimum viable truth spec: Returns quotes WITHOUT outcome events.
     Unclosed = no saved outcome in append-only truth ledger.
     
+    Served from the in-memory worklist (ops_layer/unclosed_worklist.py),
+    which only reads what changed since the last request.
+    
     Returns:
         JSON array of unclosed quotes
     """
     try:
-        unclosed = database.get_unclosed_quotes()
+        version, unclosed = unclosed_worklist.snapshot()
         return jsonify({
             'success': True,
             'count': len(unclosed),
+            'version': version,
             'quotes': unclosed
         }), 200
     except Exception as e:
@@ -1637,6 +1817,29 @@ def get_unclosed_quotes_endpoint():
         }), 500
 
 
+@app.route('/api/unclosed_quotes/stream', methods=['GET'])
+def stream_unclosed_quotes():
+    """
+    GET /api/unclosed_quotes/stream
+    
+    Server-sent events: the worklist as a `snapshot` event, then `delta`
+    events (added, removed, aged) as quotes are created and outcomes saved.
+    """
+    if not event_stream.acquire_slot():
+        return jsonify({
+            'success': False,
+            'error': 'too many open event streams, retry later',
+            'code': 'STREAM_LIMIT'
+        }), 503, {'Retry-After': str(event_stream.RETRY_MILLISECONDS // 1000)}
+
+    response = Response(stream_with_context(unclosed_worklist.stream()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    response.call_on_close(event_stream.release_slot)
+    return response
+
+
 @app.route('/api/quote/<int:quote_id>/outcome', methods=['POST'])
 def save_quote_outcome_endpoint(quote_id: int):
     """
@@ -1912,20 +2115,7 @@ def update_quote_status_endpoint(quote_id: int) -> Dict[str, Any]:
         
         # If Won and final_agreed_price provided, update the price
         if new_status == 'Won' and final_agreed_price is not None:
-            conn = database.get_connection()
-            cursor = conn.cursor()
-            
-            # Read old price before update
-            cursor.execute("SELECT final_quoted_price FROM ops__quotes WHERE id = ?", (quote_id,))
-            old_row = cursor.fetchone()
-            old_final_quoted_price = old_row[0] if old_row else None
-            
-            cursor.execute(
-                "UPDATE ops__quotes SET final_quoted_price = ? WHERE id = ?",
-                (float(final_agreed_price), quote_id)
-            )
-            conn.commit()
-            conn.close()
+            old_final_quoted_price = database.set_final_quoted_price(quote_id, float(final_agreed_price))
             print(f"[UPDATE] Quote {quote_id} final price updated to: ${final_agreed_price}")
             
             # Emit exhaust
@@ -2127,30 +2317,16 @@ def system_health_endpoint() -> Dict[str, Any]:
     System health and telemetry endpoint for monitoring resource usage.
     Designed for Raspberry Pi 5 deployment verification.
     
+    Answers from the newest background sample (ops_layer/metrics.py);
+    without the sampler thread, from a cheap sample that skips the
+    open-file scan.
+    
     Returns:
         JSON with CPU, memory, disk, and database metrics
     """
     try:
         mode = get_ops_mode() or "planning"
-        # Get current process (Python/Flask app)
-        process = psutil.Process(os.getpid())
-        
-        # CPU usage (system-wide snapshot)
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        
-        # Memory usage (Python process RSS - Resident Set Size)
-        memory_info = process.memory_info()
-        memory_usage_mb = memory_info.rss / (1024 * 1024)  # Convert bytes to MB
-        
-        # Disk usage (where the app is running)
-        disk_usage = psutil.disk_usage(BASE_DIR)
-        disk_free_gb = disk_usage.free / (1024 * 1024 * 1024)  # Convert bytes to GB
-        
-        # Database file size
-        db_path = Path("cutter.db")
-        db_size_mb = 0.0
-        if db_path.exists():
-            db_size_mb = db_path.stat().st_size / (1024 * 1024)  # Convert bytes to MB
+        point = metrics.latest()
         
         # Build response
         health_data = {
@@ -2158,15 +2334,13 @@ def system_health_endpoint() -> Dict[str, Any]:
             'ping': 'pong',
             'timestamp': datetime.now().isoformat(),
             'metrics': {
-                'cpu_percent': round(cpu_percent, 2),
-                'memory_usage_mb': round(memory_usage_mb, 2),
-                'disk_free_gb': round(disk_free_gb, 2),
-                'db_size_mb': round(db_size_mb, 2)
+                name: value for name, value in point.items() if name != 'timestamp'
             },
+            'background_jobs': metrics.events(),
             'system_info': {
                 'python_pid': os.getpid(),
                 'platform': os.name,
-                'cpu_count': psutil.cpu_count()
+                'cpu_count': os.cpu_count()
             }
         }
         
@@ -2184,6 +2358,85 @@ def system_health_endpoint() -> Dict[str, Any]:
         }), 500
 
 
+@app.route('/api/system/metrics', methods=['GET'])
+def system_metrics_series() -> Dict[str, Any]:
+    """
+    GET /api/system/metrics?since=<unix seconds>&limit=<n>
+
+    Recent background samples (oldest first) for trend graphs. Each sample
+    has the /api/system/health metrics plus its unix `timestamp`.
+    """
+    try:
+        since_raw = request.args.get('since')
+        limit_raw = request.args.get('limit')
+        since = float(since_raw) if since_raw else None
+        limit = int(limit_raw) if limit_raw else None
+    except ValueError:
+        return jsonify({
+            'error': 'since must be a number and limit an integer',
+            'code': 'INVALID_METRICS_QUERY'
+        }), 400
+
+    samples = metrics.series(since=since, limit=limit)
+    return jsonify({
+        'success': True,
+        'interval_seconds': metrics.get_interval(),
+        'count': len(samples),
+        'samples': samples
+    }), 200
+
+
+@app.route('/api/profiles', methods=['GET'])
+def list_request_profiles() -> Dict[str, Any]:
+    """
+    GET /api/profiles
+
+    Lists stored request profiles (newest first). Planning mode only.
+    Profiles are captured by sending X-Cutter-Profile: 1 (or ?profile=1)
+    with a planning-mode request.
+    """
+    try:
+        mode, error = require_ops_mode()
+        if error:
+            return error
+        if mode != "planning":
+            return jsonify({'error': 'profiles require ops_mode planning'}), 400
+
+        profiles = profiling.list_profiles()
+        return jsonify({
+            'success': True,
+            'profile_dir': str(profiling.get_profile_dir()),
+            'max_profiles': profiling.get_max_profiles(),
+            'profiles': profiles
+        }), 200
+    except Exception as e:
+        return jsonify({'error': f'Failed to list profiles: {str(e)}'}), 500
+
+
+@app.route('/api/profiles/<profile_id>', methods=['GET'])
+def download_request_profile(profile_id: str) -> Any:
+    """
+    GET /api/profiles/<profile_id>
+
+    Downloads a stored .pstats file. Planning mode only.
+    """
+    mode, error = require_ops_mode()
+    if error:
+        return error
+    if mode != "planning":
+        return jsonify({'error': 'profiles require ops_mode planning'}), 400
+
+    profile_path = profiling.get_profile_path(profile_id)
+    if profile_path is None:
+        return jsonify({'error': 'profile not found'}), 404
+    return send_file(
+        str(profile_path.resolve()),
+        mimetype='application/octet-stream',
+        as_attachment=True,
+        download_name=profile_path.name
+    )
+
+
 # --- MVP-12: Explicit, Query-Scoped Reconciliation ---
 @app.route('/api/reconcile', methods=['POST'])
 def reconcile_scope() -> Dict[str, Any]:
@@ -2280,20 +2533,67 @@ def list_cutter_events() -> Dict[str, Any]:
         subject_ref = request.args.get('subject_ref')
         event_type = request.args.get('event_type')
         limit_raw = request.args.get('limit')
+        after_id_raw = request.args.get('after_id')
         limit = None
         if limit_raw:
             limit = int(limit_raw)
-
-        events = get_cutter_events(subject_ref=subject_ref, event_type=event_type)
-        if limit is not None:
-            events = events[-limit:]
-        return jsonify({'success': True, 'events': events}), 200
+        after_id = None
+        if after_id_raw:
+            after_id = int(after_id_raw)
+
+        if after_id is not None:
+            # Keyset page: the next `limit` events after the last id seen
+            events = get_cutter_events(subject_ref=subject_ref, event_type=event_type,
+                                       after_id=after_id, limit=limit)
+        elif limit is not None:
+            events = get_latest_cutter_events(limit, subject_ref=subject_ref, event_type=event_type)
+        else:
+            events = get_cutter_events(subject_ref=subject_ref, event_type=event_type)
+        next_after_id = events[-1]['id'] if events else after_id
+        return jsonify({'success': True, 'events': events, 'next_after_id': next_after_id}), 200
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'Failed to load cutter events: {str(e)}'}), 500
 
 
+@app.route('/api/cutter/events/stream', methods=['GET'])
+def stream_cutter_events() -> Any:
+    """Server-sent events for Cutter Ledger appends (see ops_layer/event_stream.py)."""
+    try:
+        mode, error = require_ops_mode()
+        if error:
+            return error
+        if mode != "planning":
+            return jsonify({'error': 'cutter events require ops_mode planning'}), 400
+
+        # EventSource reconnects send the last id they saw
+        after_id_raw = request.args.get('after_id') or request.headers.get('Last-Event-ID')
+        after_id = int(after_id_raw) if after_id_raw else None
+        filters = {
+            name: request.args.get(name)
+            for name in ('subject_ref', 'event_type', 'subject_kind', 'subject_id')
+            if request.args.get(name)
+        }
+    except ValueError as e:
+        return jsonify({'error': str(e), 'code': 'INVALID_CURSOR'}), 400
+
+    if not event_stream.acquire_slot():
+        return jsonify({
+            'error': 'too many open event streams, retry later',
+            'code': 'STREAM_LIMIT'
+        }), 503, {'Retry-After': str(event_stream.RETRY_MILLISECONDS // 1000)}
+
+    stream = event_stream.stream_cutter_events(after_id=after_id, filters=filters)
+    response = Response(stream_with_context(stream), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # Runs when the server closes the response, even if the client left early
+    response.call_on_close(event_stream.release_slot)
+    return response
+
+
 @app.route('/api/reports/save', methods=['POST'])
 def save_report_definition() -> Dict[str, Any]:
     try:
@@ -2430,13 +2730,9 @@ def run_saved_report() -> Dict[str, Any]:
                 'code': 'INVALID_REPORT_PARAMS'
             }), 400
 
-        if query_type == "entities_time_in_state_over":
-            rows = state_queries.query_entities_time_in_state_over(normalized_params["threshold_days"])
-        elif query_type == "entities_missing_reaffirmation_over":
-            rows = state_queries.query_entities_missing_reaffirmation_over(normalized_params["threshold_days"])
-        elif query_type == "latest_declaration_per_entity":
-            rows = state_queries.query_latest_declaration_per_entity()
-        else:
+        try:
+            rows, cache = report_cache.run_report(report_id, query_type, normalized_params)
+        except ValueError:
             return jsonify({
                 'error': 'query_type is not supported',
                 'code': 'INVALID_QUERY_TYPE'
@@ -2447,7 +2743,8 @@ def run_saved_report() -> Dict[str, Any]:
             'success': True,
             'report': report,
             'last_run_at': last_run_at,
-            'rows': rows
+            'rows': rows,
+            'cache': cache
         }), 200
     except Exception:
         return jsonify({
@@ -2456,6 +2753,77 @@ def run_saved_report() -> Dict[str, Any]:
         }), 500
 
 
+@app.route('/api/reports/snapshot', methods=['POST'])
+def get_report_snapshot() -> Dict[str, Any]:
+    try:
+        mode, error = require_ops_mode()
+        if error:
+            return error
+        if mode != "planning":
+            return jsonify({
+                'error': 'reports require ops_mode planning',
+                'code': 'OPS_MODE_REQUIRED_PLANNING'
+            }), 400
+
+        payload = request.get_json(silent=True) or {}
+        report_id = payload.get('report_id')
+        if report_id is None:
+            return jsonify({
+                'error': 'report_id is required',
+                'code': 'MISSING_REQUIRED_FIELDS'
+            }), 400
+        if not isinstance(report_id, int):
+            return jsonify({
+                'error': 'report_id must be an integer',
+                'code': 'INVALID_REPORT_ID'
+            }), 400
+
+        if not database.get_saved_report(report_id):
+            return jsonify({
+                'error': 'report not found',
+                'code': 'REPORT_NOT_FOUND'
+            }), 404
+
+        snapshot = report_scheduler.latest_snapshot(report_scheduler.report_kind(report_id))
+        if snapshot is None:
+            return jsonify({
+                'error': 'no snapshot yet for this report',
+                'code': 'REPORT_SNAPSHOT_NOT_FOUND'
+            }), 404
+        return jsonify({'success': True, 'snapshot': snapshot}), 200
+    except Exception:
+        return jsonify({
+            'error': 'failed to load report snapshot',
+            'code': 'REPORT_SNAPSHOT_FAILED'
+        }), 500
+
+
+@app.route('/api/reports/ritual_snapshot', methods=['GET'])
+def get_ritual_snapshot() -> Dict[str, Any]:
+    try:
+        mode, error = require_ops_mode()
+        if error:
+            return error
+        if mode != "planning":
+            return jsonify({
+                'error': 'reports require ops_mode planning',
+                'code': 'OPS_MODE_REQUIRED_PLANNING'
+            }), 400
+
+        snapshot = report_scheduler.latest_snapshot(report_scheduler.RITUAL_KIND)
+        if snapshot is None:
+            return jsonify({
+                'error': 'no weekly ritual snapshot yet',
+                'code': 'RITUAL_SNAPSHOT_NOT_FOUND'
+            }), 404
+        return jsonify({'success': True, 'snapshot': snapshot}), 200
+    except Exception:
+        return jsonify({
+            'error': 'failed to load weekly ritual snapshot',
+            'code': 'RITUAL_SNAPSHOT_FAILED'
+        }), 500
+
+
 @app.route('/api/state/assign_owner', methods=['POST'])
 def assign_state_owner() -> Dict[str, Any]:
     try:
@@ -2968,8 +3336,8 @@ def delete_tag(tag_id: int) -> Dict[str, Any]:
         if tag_to_delete['name'] in protected_tags:
             return jsonify({'error': 'Cannot delete system tag (Universal 9)'}), 403
         
-        # Count quotes potentially using this tag
-        approximate_affected_quotes = database.count_quotes_using_tag_name_approx(tag_to_delete['name'])
+        # Count quotes using this tag (event key kept for ledger continuity)
+        approximate_affected_quotes = database.count_quotes_using_tag_name(tag_to_delete['name'])
         
         # Emit exhaust before deletion
         emit_cutter_event(
@@ -3456,7 +3824,7 @@ def get_pattern_suggestions() -> Dict[str, Any]:
                 "success": False,
                 "error": "Planning routes are blocked in execution mode"
             }), 403
-        import pattern_matcher
+        from . import pattern_matcher
         
         data = request.get_json()
         
@@ -0,0 +1,621 @@
+"""
+Online backups: paged SQLite snapshots and incremental ledger exports.
+
+scripts/reset_db.py moves the database aside and the pre-migration
+backups copy the file, which is only safe while nothing is writing and
+misses commits still in the -wal file. This module uses the SQLite backup
+API (sqlite3.Connection.backup) on a read-only connection instead:
+
+- the copy runs in steps of CUTTER_BACKUP_STEP_PAGES pages with a sleep
+  of CUTTER_BACKUP_STEP_SLEEP seconds between them, so the server keeps
+  its I/O and nothing waits for the write lock
+- the source holds one read transaction for the whole copy, so in WAL mode
+  concurrent commits neither restart the backup nor land half in it
+
+Both ledgers (cutter__events, state__declarations) are append-only, so
+between snapshots it is enough to export the rows past the last backup's
+high-water ids. A ledger export is a small SQLite file holding only those
+rows, with the ledgers' own table definitions.
+
+Backups live next to the database (cutter.db -> cutter.db-backups/):
+
+    snapshot-<UTC stamp>.db   full copy (newest CUTTER_BACKUP_KEEP kept)
+    ledger-<UTC stamp>.db     ledger rows in (from_id, to_id]
+    manifest.json             files, their high-water ids, database epoch
+
+Restore = a copy of the newest snapshot plus, in manifest order, every
+ledger export taken after it (apply_ledger_export()). Exports only needed by pruned snapshots are pruned with them.
+After a database reset (new epoch, migration 22) exports start again
+from id 0.
+
+Each run is recorded with metrics.record_event('db_backup' or
+'ledger_export', ...) and shows in /api/system/health. Processes
+coordinate through an flock on the backup directory.
+
+Configuration (environment):
+    CUTTER_BACKUP              seconds between snapshots, or on/1 for the
+                               default (86400); unset/off: on demand only
+    CUTTER_LEDGER_EXPORT       seconds between ledger exports, or on/1 for
+                               the default (3600); unset/off: on demand only
+    CUTTER_BACKUP_DIR          backup directory (default: <db>-backups)
+    CUTTER_BACKUP_KEEP         newest N snapshots kept (default: 7)
+    CUTTER_BACKUP_STEP_PAGES   pages copied per step (default: 512)
+    CUTTER_BACKUP_STEP_SLEEP   seconds between steps (default: 0.05)
+
+Usage:
+    python -m ops_layer.db_backup
+    python -m ops_layer.db_backup --ledger
+    python -m ops_layer.db_backup --interval 86400 --ledger-interval 3600
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: runs are not coordinated across processes
+    fcntl = None
+
+# Add project root to path (python ops_layer/db_backup.py)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import database
+import read_connection
+from ops_layer import metrics
+
+BACKUP_ENV = "CUTTER_BACKUP"
+LEDGER_EXPORT_ENV = "CUTTER_LEDGER_EXPORT"
+BACKUP_DIR_ENV = "CUTTER_BACKUP_DIR"
+BACKUP_KEEP_ENV = "CUTTER_BACKUP_KEEP"
+STEP_PAGES_ENV = "CUTTER_BACKUP_STEP_PAGES"
+STEP_SLEEP_ENV = "CUTTER_BACKUP_STEP_SLEEP"
+DEFAULT_BACKUP_SECONDS = 86400.0
+DEFAULT_LEDGER_EXPORT_SECONDS = 3600.0
+DEFAULT_KEEP = 7
+DEFAULT_STEP_PAGES = 512
+DEFAULT_STEP_SLEEP = 0.05
+BACKUP_SUFFIX = "-backups"
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = ".backup.lock"
+EXPORT_BATCH_ROWS = 5000
+SNAPSHOT_EVENT = "db_backup"
+EXPORT_EVENT = "ledger_export"
+
+# Append-only ledgers and their id columns
+LEDGER_TABLES = {
+    "cutter__events": "id",
+    "state__declarations": "declaration_id",
+}
+
+_TRUTHY = {"1", "true", "yes", "on"}
+_FALSY = {"0", "false", "no", "off"}
+_MIB = 1024 * 1024
+
+_thread: Optional[threading.Thread] = None
+_thread_pid: Optional[int] = None
+_stop = threading.Event()
+_start_lock = threading.Lock()
+
+
+def _get_schedule(name: str, default: float) -> Optional[float]:
+    raw_value = os.environ.get(name, "").strip().lower()
+    if not raw_value or raw_value in _FALSY:
+        return None
+    if raw_value in _TRUTHY:
+        return default
+    try:
+        return max(1.0, float(raw_value))
+    except ValueError:
+        print(f"[BACKUP] Ignoring {name}={raw_value!r} (expected seconds or on/off)")
+        return None
+
+
+def get_backup_interval() -> Optional[float]:
+    """Seconds between scheduled snapshots, or None when not scheduled."""
+    return _get_schedule(BACKUP_ENV, DEFAULT_BACKUP_SECONDS)
+
+
+def get_export_interval() -> Optional[float]:
+    """Seconds between scheduled ledger exports, or None when not scheduled."""
+    return _get_schedule(LEDGER_EXPORT_ENV, DEFAULT_LEDGER_EXPORT_SECONDS)
+
+
+def _get_number(name: str, default: float, minimum: float) -> float:
+    raw_value = os.environ.get(name)
+    if raw_value is None or not raw_value.strip():
+        return default
+    try:
+        return max(minimum, float(raw_value))
+    except ValueError:
+        return default
+
+
+def get_keep() -> int:
+    return int(_get_number(BACKUP_KEEP_ENV, DEFAULT_KEEP, 1))
+
+
+def get_step_pages() -> int:
+    return int(_get_number(STEP_PAGES_ENV, DEFAULT_STEP_PAGES, 1))
+
+
+def get_step_sleep() -> float:
+    return _get_number(STEP_SLEEP_ENV, DEFAULT_STEP_SLEEP, 0.0)
+
+
+def get_backup_dir(db_path: Optional[Path] = None) -> Path:
+    raw_value = os.environ.get(BACKUP_DIR_ENV)
+    if raw_value is not None and raw_value.strip():
+        return Path(raw_value)
+    db_path = Path(db_path) if db_path is not None else database.resolve_db_path()
+    return db_path.with_name(db_path.name + BACKUP_SUFFIX)
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _ms_since(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def _size_mb(path: Path) -> float:
+    try:
+        return round(path.stat().st_size / _MIB, 3)
+    except OSError:
+        return 0.0
+
+
+def load_manifest(directory: Path) -> Dict[str, Any]:
+    """The backup directory's manifest (empty when nothing was backed up yet)."""
+    try:
+        manifest = json.loads((directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.setdefault("db_epoch", None)
+    manifest.setdefault("high_water", {})
+    manifest.setdefault("snapshots", [])
+    manifest.setdefault("exports", [])
+    return manifest
+
+
+def _write_manifest(directory: Path, manifest: Dict[str, Any]) -> None:
+    path = directory / MANIFEST_NAME
+    tmp_path = directory / f".{MANIFEST_NAME}.{os.getpid()}.tmp"
+    try:
+        tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+@contextlib.contextmanager
+def _backup_lock(directory: Path, blocking: bool = True) -> Iterator[bool]:
+    """Exclusive lock on the backup directory; yields False if busy and not blocking."""
+    directory.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield True
+        return
+    with open(directory / LOCK_NAME, "a") as handle:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(handle.fileno(), flags)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+@contextlib.contextmanager
+def _read_snapshot(db_path: Path) -> Iterator[sqlite3.Connection]:
+    """A read-only connection holding one read transaction until the block ends."""
+    conn = read_connection.connect(db_path)
+    try:
+        conn.execute("BEGIN")
+        conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()  # starts the read
+        yield conn
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def _db_epoch(conn: sqlite3.Connection) -> Optional[int]:
+    try:
+        row = conn.execute(
+            "SELECT generation FROM ops__table_generations WHERE table_name = '__epoch__'"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def _ledger_high_water(conn: sqlite3.Connection) -> Dict[str, int]:
+    high_water = {}
+    for table, id_column in LEDGER_TABLES.items():
+        try:
+            high_water[table] = conn.execute(f"SELECT COALESCE(MAX({id_column}), 0) FROM {table}").fetchone()[0]
+        except sqlite3.OperationalError:
+            continue  # ledger not created in this database
+    return high_water
+
+
+def _export_start(manifest: Dict[str, Any], epoch: Optional[int], high_water: Dict[str, int]) -> Dict[str, int]:
+    """Ids already backed up per ledger; 0 after a reset or if the database went backwards."""
+    if manifest["db_epoch"] != epoch:
+        return {table: 0 for table in high_water}
+    start = {}
+    for table, current in high_water.items():
+        previous = manifest["high_water"].get(table, 0)
+        start[table] = previous if previous <= current else 0
+    return start
+
+
+def _stamp() -> str:
+    return _utc_now().strftime("%Y%m%dT%H%M%S%fZ")
+
+
+def _covered(export: Dict[str, Any], snapshot: Dict[str, Any]) -> bool:
+    """True if the snapshot already holds every row of the export."""
+    return export["exported_at"] < snapshot["taken_at"] or (
+        export["db_epoch"] == snapshot["db_epoch"] and all(
+            to_id <= snapshot["high_water"].get(table, 0) for table, to_id in export["to_ids"].items()
+        )
+    )
+
+
+def exports_after(manifest: Dict[str, Any], snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Manifest exports to apply, in order, on top of a restored snapshot entry."""
+    return [entry for entry in manifest["exports"] if not _covered(entry, snapshot)]
+
+
+def _prune(directory: Path, manifest: Dict[str, Any]) -> List[str]:
+    """Keep the newest snapshots, and the exports taken after the oldest kept one."""
+    keep = get_keep()
+    removed = [entry["file"] for entry in manifest["snapshots"][:-keep]]
+    manifest["snapshots"] = manifest["snapshots"][-keep:]
+    if manifest["snapshots"]:
+        oldest = manifest["snapshots"][0]
+        kept_exports = []
+        for entry in manifest["exports"]:
+            if _covered(entry, oldest):
+                removed.append(entry["file"])
+            else:
+                kept_exports.append(entry)
+        manifest["exports"] = kept_exports
+    for name in removed:
+        (directory / name).unlink(missing_ok=True)
+    return removed
+
+
+def _take_snapshot(db_path: Path, directory: Path, step_pages: int, step_sleep: float) -> Dict[str, Any]:
+    """backup_snapshot() body; the caller holds the backup lock."""
+    started = time.perf_counter()
+    taken_at = _utc_now().strftime("%Y-%m-%dT%H:%M:%SZ")
+    steps = 0
+
+    def _pause(status: int, remaining: int, total: int) -> None:
+        nonlocal steps
+        steps += 1
+        if remaining and step_sleep:
+            time.sleep(step_sleep)
+
+    manifest = load_manifest(directory)
+    path = directory / f"snapshot-{_stamp()}.db"
+    tmp_path = directory / f".{path.name}.{os.getpid()}.tmp"
+    try:
+        with _read_snapshot(db_path) as source:
+            epoch = _db_epoch(source)
+            high_water = _ledger_high_water(source)
+            target = sqlite3.connect(tmp_path)
+            try:
+                source.backup(target, pages=step_pages, progress=_pause)
+            finally:
+                target.close()
+        os.replace(tmp_path, path)
+    except (OSError, sqlite3.Error):
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    entry = {"file": path.name, "taken_at": taken_at, "db_epoch": epoch, "high_water": high_water}
+    manifest["snapshots"].append(entry)
+    manifest["db_epoch"] = epoch
+    manifest["high_water"] = high_water
+    removed = _prune(directory, manifest)
+    _write_manifest(directory, manifest)
+
+    summary = dict(entry, path=str(path), size_mb=_size_mb(path), steps=steps,
+                   step_pages=step_pages, pruned=removed, duration_ms=_ms_since(started))
+    metrics.record_event(SNAPSHOT_EVENT, summary)
+    print(f"[BACKUP] Snapshot {path.name}: {summary['size_mb']:.1f}MB in {steps} steps, "
+          f"{summary['duration_ms']:.0f}ms")
+    return summary
+
+
+def backup_snapshot(db_path: Optional[Path] = None, directory: Optional[Path] = None,
+                    step_pages: Optional[int] = None, step_sleep: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Copy the whole database online into a new snapshot file; returns (and records) a summary.
+
+    The copy is consistent as of its start even while the server commits.
+    """
+    db_path = Path(db_path) if db_path is not None else database.resolve_db_path()
+    directory = directory if directory is not None else get_backup_dir(db_path)
+    step_pages = step_pages if step_pages is not None else get_step_pages()
+    step_sleep = step_sleep if step_sleep is not None else get_step_sleep()
+    with _backup_lock(directory):
+        return _take_snapshot(db_path, directory, step_pages, step_sleep)
+
+
+def _create_like(source: sqlite3.Connection, target: sqlite3.Connection, table: str) -> None:
+    sql = source.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()[0]
+    target.execute(sql)
+
+
+def _stored_columns(conn: sqlite3.Connection, table: str, schema: str = "main") -> List[str]:
+    """Columns to copy; table_info omits generated columns (e.g. cutter__events.subject_kind)."""
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def _copy_rows(source: sqlite3.Connection, target: sqlite3.Connection, table: str,
+               from_id: int, to_id: int, step_sleep: float) -> int:
+    """Copy rows with from_id < id <= to_id in batches, pausing between full batches."""
+    id_column = LEDGER_TABLES[table]
+    columns = _stored_columns(source, table)
+    select_sql = (f"SELECT {', '.join(columns)} FROM {table} "
+                  f"WHERE {id_column} > ? AND {id_column} <= ? ORDER BY {id_column} LIMIT ?")
+    insert_sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+    id_index = columns.index(id_column)
+    copied = 0
+    last_id = from_id
+    while True:
+        batch = [tuple(row) for row in source.execute(select_sql, (last_id, to_id, EXPORT_BATCH_ROWS))]
+        if not batch:
+            return copied
+        target.executemany(insert_sql, batch)
+        copied += len(batch)
+        last_id = batch[-1][id_index]
+        if step_sleep and len(batch) == EXPORT_BATCH_ROWS:
+            time.sleep(step_sleep)
+
+
+def _take_export(db_path: Path, directory: Path, step_sleep: float) -> Dict[str, Any]:
+    """export_ledgers() body; the caller holds the backup lock."""
+    started = time.perf_counter()
+    exported_at = _utc_now().strftime("%Y-%m-%dT%H:%M:%SZ")
+    manifest = load_manifest(directory)
+    path = directory / f"ledger-{_stamp()}.db"
+    tmp_path = directory / f".{path.name}.{os.getpid()}.tmp"
+    rows: Dict[str, int] = {}
+    try:
+        with _read_snapshot(db_path) as source:
+            epoch = _db_epoch(source)
+            high_water = _ledger_high_water(source)
+            from_ids = _export_start(manifest, epoch, high_water)
+            appended = [table for table in high_water if high_water[table] > from_ids[table]]
+            if appended:
+                target = sqlite3.connect(tmp_path)
+                try:
+                    for table in appended:
+                        _create_like(source, target, table)
+                        rows[table] = _copy_rows(source, target, table, from_ids[table],
+                                                 high_water[table], step_sleep)
+                    target.commit()
+                finally:
+                    target.close()
+                os.replace(tmp_path, path)
+    except (OSError, sqlite3.Error):
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    entry = {
+        "file": path.name if rows else None,
+        "exported_at": exported_at,
+        "db_epoch": epoch,
+        "from_ids": {table: from_ids[table] for table in rows},
+        "to_ids": {table: high_water[table] for table in rows},
+    }
+    if rows:
+        manifest["exports"].append(entry)
+    manifest["db_epoch"] = epoch
+    manifest["high_water"] = high_water
+    manifest["last_export_at"] = exported_at
+    _write_manifest(directory, manifest)
+
+    summary = dict(entry, path=str(path) if rows else None, rows=rows,
+                   size_mb=_size_mb(path) if rows else 0.0, duration_ms=_ms_since(started))
+    metrics.record_event(EXPORT_EVENT, summary)
+    print(f"[BACKUP] Ledger export: {sum(rows.values())} rows in {summary['duration_ms']:.0f}ms")
+    return summary
+
+
+def export_ledgers(db_path: Optional[Path] = None, directory: Optional[Path] = None,
+                   step_sleep: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Export the ledger rows appended since the last snapshot or export.
+
+    Writes no file when nothing was appended; returns (and records) a summary.
+    """
+    db_path = Path(db_path) if db_path is not None else database.resolve_db_path()
+    directory = directory if directory is not None else get_backup_dir(db_path)
+    step_sleep = step_sleep if step_sleep is not None else get_step_sleep()
+    with _backup_lock(directory):
+        return _take_export(db_path, directory, step_sleep)
+
+
+def apply_ledger_export(conn: sqlite3.Connection, export_path: Path) -> Dict[str, int]:
+    """
+    Append one ledger export to a restored snapshot (exports in manifest order).
+
+    Only rows past the restored ledger's high-water id are inserted, so an
+    export the snapshot already contains (or one applied twice) adds nothing.
+    """
+    conn.execute("ATTACH DATABASE ? AS ledger_export", (str(export_path),))
+    try:
+        exported = [row[0] for row in conn.execute(
+            "SELECT name FROM ledger_export.sqlite_master WHERE type = 'table'")]
+        rows = {}
+        for table, id_column in LEDGER_TABLES.items():
+            if table not in exported:
+                continue
+            columns = ", ".join(_stored_columns(conn, table, "ledger_export"))
+            rows[table] = conn.execute(f"""
+                INSERT INTO main.{table} ({columns})
+                SELECT {columns} FROM ledger_export.{table}
+                WHERE {id_column} > (SELECT COALESCE(MAX({id_column}), 0) FROM main.{table})
+                ORDER BY {id_column}
+            """).rowcount
+        conn.commit()
+    finally:
+        conn.execute("DETACH DATABASE ledger_export")
+    return rows
+
+
+def _due(last_at: Optional[str], interval: float) -> bool:
+    if not last_at:
+        return True
+    try:
+        last = datetime.strptime(last_at, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return True
+    return (_utc_now() - last).total_seconds() >= interval
+
+
+def run_scheduled(backup_interval: Optional[float],
+                  export_interval: Optional[float]) -> Optional[Dict[str, Any]]:
+    """
+    Take whatever is due: a snapshot when the newest is older than
+    backup_interval, else a ledger export when the last snapshot or export
+    is older than export_interval. None when nothing was due or another
+    process is backing up.
+    """
+    db_path = database.resolve_db_path()
+    if not db_path.exists():
+        return None
+    directory = get_backup_dir(db_path)
+    with _backup_lock(directory, blocking=False) as acquired:
+        if not acquired:
+            return None
+        manifest = load_manifest(directory)
+        last_snapshot = manifest["snapshots"][-1]["taken_at"] if manifest["snapshots"] else None
+        if backup_interval is not None and _due(last_snapshot, backup_interval):
+            return _take_snapshot(db_path, directory, get_step_pages(), get_step_sleep())
+        # A snapshot also moves the high-water mark
+        last_backup = max(filter(None, [last_snapshot, manifest.get("last_export_at")]), default=None)
+        if export_interval is not None and _due(last_backup, export_interval):
+            return _take_export(db_path, directory, get_step_sleep())
+    return None
+
+
+def _loop(backup_interval: Optional[float], export_interval: Optional[float]) -> None:
+    step = min(filter(None, [backup_interval, export_interval, 60.0]))
+    while not _stop.is_set():
+        try:
+            run_scheduled(backup_interval, export_interval)
+        except Exception as e:
+            print(f"[BACKUP] Run failed: {e}")
+        _stop.wait(step)
+
+
+def start_backup_thread(backup_interval: Optional[float] = None,
+                        export_interval: Optional[float] = None) -> Optional[threading.Thread]:
+    """Start the backup thread once per process when scheduled (or given intervals)."""
+    global _thread, _thread_pid
+    backup_interval = backup_interval if backup_interval is not None else get_backup_interval()
+    export_interval = export_interval if export_interval is not None else get_export_interval()
+    if backup_interval is None and export_interval is None:
+        return None
+    with _start_lock:
+        # A forked worker does not inherit the parent's thread
+        if _thread is None or _thread_pid != os.getpid() or not _thread.is_alive():
+            _stop.clear()
+            _thread = threading.Thread(target=_loop, args=(backup_interval, export_interval),
+                                       name="cutter-backup", daemon=True)
+            _thread_pid = os.getpid()
+            _thread.start()
+    return _thread
+
+
+def stop_backup_thread(timeout: float = 10.0) -> None:
+    global _thread
+    with _start_lock:
+        thread, _thread = _thread, None
+    _stop.set()
+    if thread is not None and _thread_pid == os.getpid():
+        thread.join(timeout)
+
+
+def install(app: Any) -> None:
+    """Start scheduled backups on the first request each process serves (never at import)."""
+    backup_interval = get_backup_interval()
+    export_interval = get_export_interval()
+    if backup_interval is None and export_interval is None:
+        return
+
+    @app.before_request
+    def _start_db_backup() -> None:
+        if _thread_pid != os.getpid():
+            start_backup_thread(backup_interval, export_interval)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Online SQLite snapshots and incremental ledger exports",
+        epilog="""
+Examples:
+  python -m ops_layer.db_backup
+  python -m ops_layer.db_backup --ledger
+  python -m ops_layer.db_backup --interval 86400 --ledger-interval 3600
+  TEST_DB_PATH=./data/test_scale.db python -m ops_layer.db_backup --dir /mnt/backups
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--ledger', action='store_true',
+                        help='Export the ledger rows since the last backup instead of a full snapshot')
+    parser.add_argument('--dir', type=Path, default=None,
+                        help=f'Backup directory (default: ${BACKUP_DIR_ENV} or <db>{BACKUP_SUFFIX})')
+    parser.add_argument('--interval', type=float, default=None,
+                        help=f'Snapshot every N seconds instead of once (default: ${BACKUP_ENV})')
+    parser.add_argument('--ledger-interval', type=float, default=None,
+                        help=f'With a schedule, export ledgers every N seconds (default: ${LEDGER_EXPORT_ENV})')
+    args = parser.parse_args(argv)
+
+    db_path = database.resolve_db_path()
+    if not db_path.exists():
+        print(json.dumps({"error": "Database not found", "db_path": str(db_path)}, indent=2), file=sys.stderr)
+        return 1
+    if args.dir is not None:
+        os.environ[BACKUP_DIR_ENV] = str(args.dir)
+
+    backup_interval = args.interval or get_backup_interval()
+    export_interval = args.ledger_interval or get_export_interval()
+    if args.interval is None and args.ledger_interval is None:
+        if args.ledger:
+            summary = export_ledgers(db_path)
+        else:
+            summary = backup_snapshot(db_path)
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    print(f"[BACKUP] Snapshots every {backup_interval or 0:g}s, ledger exports every "
+          f"{export_interval or 0:g}s -> {get_backup_dir(db_path)}")
+    try:
+        _loop(backup_interval, export_interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
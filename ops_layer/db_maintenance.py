@@ -0,0 +1,367 @@
+"""
+Scheduled SQLite maintenance: WAL checkpoint, planner statistics, vacuum.
+
+The database runs in WAL mode. Autocheckpointing never truncates the WAL
+file, and nothing ever refreshed the query planner's statistics. A
+maintenance run does, in order:
+
+1. Statistics: full ANALYZE the first time (no sqlite_stat1 yet) or when
+   asked, otherwise PRAGMA optimize, which re-analyzes only the tables
+   whose statistics have drifted.
+2. Incremental vacuum: returns free pages to the filesystem when the
+   database was created with auto_vacuum=INCREMENTAL. Otherwise it only
+   reports the freelist, since switching modes needs a full VACUUM.
+3. wal_checkpoint(TRUNCATE): copies the WAL into the database and resets
+   it to zero bytes. Scheduled runs do this only in an idle window: no
+   commit for CUTTER_DB_MAINTENANCE_IDLE seconds and no queued writes. A
+   reader that holds an old snapshot makes it report busy instead of
+   waiting.
+
+Connections are tuned where they are opened: write_queue.connect() sets
+temp_store, cache_size and journal_size_limit, and read_connection.connect()
+sets cache_size, mmap_size and temp_store. The effective values are part
+of each run's summary.
+
+Each run's durations and size deltas are recorded with
+metrics.record_event('db_maintenance', ...) and appear in
+/api/system/health under background_jobs. Processes coordinate through
+an flock on <db>-maintenance.lock: a scheduled run is skipped if another
+process ran less than an interval ago.
+
+Configuration (environment):
+    CUTTER_DB_MAINTENANCE       seconds between runs, or on/1 for the default
+                                (3600); unset/off: on demand only
+    CUTTER_DB_MAINTENANCE_IDLE  seconds without commits that count as idle
+                                (default: 30)
+
+Usage:
+    python -m ops_layer.db_maintenance
+    python -m ops_layer.db_maintenance --analyze
+    python -m ops_layer.db_maintenance --interval 3600
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: runs are not coordinated across processes
+    fcntl = None
+
+# Add project root to path (python ops_layer/db_maintenance.py)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import database
+import write_queue
+from ops_layer import metrics
+
+SCHEDULE_ENV = "CUTTER_DB_MAINTENANCE"
+IDLE_ENV = "CUTTER_DB_MAINTENANCE_IDLE"
+DEFAULT_INTERVAL_SECONDS = 3600.0
+DEFAULT_IDLE_SECONDS = 30.0
+LOCK_SUFFIX = "-maintenance.lock"
+CHECKPOINT_BUSY_TIMEOUT_MS = 2000
+METRICS_EVENT = "db_maintenance"
+
+_TRUTHY = {"1", "true", "yes", "on"}
+_FALSY = {"0", "false", "no", "off"}
+_AUTO_VACUUM_MODES = {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}
+_MIB = 1024 * 1024
+
+_thread: Optional[threading.Thread] = None
+_thread_pid: Optional[int] = None
+_stop = threading.Event()
+_start_lock = threading.Lock()
+
+
+def get_interval() -> Optional[float]:
+    """Seconds between scheduled runs, or None when not scheduled."""
+    raw_value = os.environ.get(SCHEDULE_ENV, "").strip().lower()
+    if not raw_value or raw_value in _FALSY:
+        return None
+    if raw_value in _TRUTHY:
+        return DEFAULT_INTERVAL_SECONDS
+    try:
+        return max(1.0, float(raw_value))
+    except ValueError:
+        print(f"[MAINTENANCE] Ignoring {SCHEDULE_ENV}={raw_value!r} (expected seconds or on/off)")
+        return None
+
+
+def get_idle_seconds() -> float:
+    raw_value = os.environ.get(IDLE_ENV)
+    if raw_value is None or not raw_value.strip():
+        return DEFAULT_IDLE_SECONDS
+    try:
+        return max(0.0, float(raw_value))
+    except ValueError:
+        return DEFAULT_IDLE_SECONDS
+
+
+def _wal_path(db_path: Path) -> Path:
+    return db_path.with_name(db_path.name + "-wal")
+
+
+def _size_mb(path: Path) -> float:
+    try:
+        return round(path.stat().st_size / _MIB, 3)
+    except OSError:
+        return 0.0
+
+
+def _ms_since(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def is_idle(db_path: Optional[Path] = None, idle_seconds: Optional[float] = None) -> bool:
+    """No commit (WAL untouched) for idle_seconds and no writes queued in this process."""
+    db_path = Path(db_path) if db_path is not None else database.resolve_db_path()
+    idle_seconds = get_idle_seconds() if idle_seconds is None else idle_seconds
+    if write_queue.depth() > 0:
+        return False
+    try:
+        quiet_for = time.time() - _wal_path(db_path).stat().st_mtime
+    except OSError:
+        return True  # no WAL: nothing written since the last truncate
+    return quiet_for >= idle_seconds
+
+
+def _settings(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Effective tuning on a write connection and the read connection values."""
+    from read_connection import CACHE_SIZE_KIB, MMAP_SIZE
+    return {
+        "journal_mode": conn.execute("PRAGMA journal_mode").fetchone()[0],
+        "temp_store": write_queue.TEMP_STORE,
+        "write_cache_size_kib": -conn.execute("PRAGMA cache_size").fetchone()[0],
+        "journal_size_limit": conn.execute("PRAGMA journal_size_limit").fetchone()[0],
+        "wal_autocheckpoint": conn.execute("PRAGMA wal_autocheckpoint").fetchone()[0],
+        "read_cache_size_kib": CACHE_SIZE_KIB,
+        "read_mmap_size": MMAP_SIZE,
+    }
+
+
+def _update_statistics(conn: sqlite3.Connection, analyze: bool) -> Dict[str, Any]:
+    started = time.perf_counter()
+    has_stats = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    ).fetchone() is not None
+    mode = "ANALYZE" if analyze or not has_stats else "optimize"
+    conn.execute("ANALYZE" if mode == "ANALYZE" else "PRAGMA optimize")
+    return {"mode": mode, "duration_ms": _ms_since(started)}
+
+
+def _incremental_vacuum(conn: sqlite3.Connection) -> Dict[str, Any]:
+    started = time.perf_counter()
+    auto_vacuum = _AUTO_VACUUM_MODES.get(conn.execute("PRAGMA auto_vacuum").fetchone()[0], "UNKNOWN")
+    before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    if auto_vacuum == "INCREMENTAL" and before:
+        # execute() steps the pragma once (one page); executescript runs it to completion
+        conn.executescript("PRAGMA incremental_vacuum;")
+    after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return {
+        "auto_vacuum": auto_vacuum,
+        "ran": auto_vacuum == "INCREMENTAL",
+        "freelist_pages_before": before,
+        "freelist_pages_after": after,
+        "duration_ms": _ms_since(started),
+    }
+
+
+def _checkpoint(conn: sqlite3.Connection) -> Dict[str, Any]:
+    started = time.perf_counter()
+    conn.execute(f"PRAGMA busy_timeout = {CHECKPOINT_BUSY_TIMEOUT_MS}")
+    busy, log_frames, checkpointed = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    return {
+        "mode": "TRUNCATE",
+        "busy": bool(busy),
+        "log_frames": log_frames,
+        "checkpointed_frames": checkpointed,
+        "duration_ms": _ms_since(started),
+    }
+
+
+def run_maintenance(db_path: Optional[Path] = None, analyze: bool = False,
+                    checkpoint: bool = True) -> Dict[str, Any]:
+    """
+    One maintenance pass over the database; returns (and records) a summary.
+
+    checkpoint=False skips wal_checkpoint(TRUNCATE) (used outside idle windows).
+    """
+    db_path = Path(db_path) if db_path is not None else database.resolve_db_path()
+    started = time.perf_counter()
+    summary: Dict[str, Any] = {
+        "db_path": str(db_path),
+        "started_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "db_size_before_mb": _size_mb(db_path),
+        "wal_size_before_mb": _size_mb(_wal_path(db_path)),
+    }
+    conn = write_queue.connect(db_path)
+    try:
+        summary["settings"] = _settings(conn)
+        summary["statistics"] = _update_statistics(conn, analyze)
+        summary["incremental_vacuum"] = _incremental_vacuum(conn)
+        summary["checkpoint"] = _checkpoint(conn) if checkpoint else {"mode": "skipped (not idle)"}
+    finally:
+        conn.close()
+    summary["db_size_after_mb"] = _size_mb(db_path)
+    summary["wal_size_after_mb"] = _size_mb(_wal_path(db_path))
+    summary["db_size_delta_mb"] = round(summary["db_size_after_mb"] - summary["db_size_before_mb"], 3)
+    summary["wal_size_delta_mb"] = round(summary["wal_size_after_mb"] - summary["wal_size_before_mb"], 3)
+    summary["duration_ms"] = _ms_since(started)
+    metrics.record_event(METRICS_EVENT, summary)
+    print(f"[MAINTENANCE] {summary['statistics']['mode']}, "
+          f"WAL {summary['wal_size_before_mb']:.1f}MB -> {summary['wal_size_after_mb']:.1f}MB "
+          f"in {summary['duration_ms']:.0f}ms")
+    return summary
+
+
+@contextlib.contextmanager
+def _run_lock(db_path: Path) -> Iterator[Optional[Path]]:
+    """Yield the lock path if this process may run now, else None."""
+    lock_path = db_path.with_name(db_path.name + LOCK_SUFFIX)
+    if fcntl is None:
+        yield lock_path
+        return
+    with open(lock_path, "a") as handle:
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield None
+            return
+        try:
+            yield lock_path
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def run_scheduled(interval: float, idle_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    A scheduled pass: None when another process holds the lock or ran less
+    than interval seconds ago. The checkpoint waits for an idle window.
+    """
+    db_path = database.resolve_db_path()
+    if not db_path.exists():
+        return None
+    with _run_lock(db_path) as lock_path:
+        if lock_path is None:
+            return None
+        try:
+            since_last = time.time() - lock_path.stat().st_mtime
+        except OSError:
+            since_last = None
+        # Each run writes its start time into the lock file; empty means never run
+        if since_last is not None and lock_path.stat().st_size > 0 and since_last < interval:
+            return None
+        summary = run_maintenance(db_path, checkpoint=is_idle(db_path, idle_seconds))
+        lock_path.write_text(summary["started_at"] + "\n")
+        return summary
+
+
+def _loop(interval: float) -> None:
+    # Check for an idle window more often than the full interval
+    step = min(interval, max(get_idle_seconds(), 1.0))
+    pending_checkpoint = False
+    while not _stop.is_set():
+        try:
+            db_path = database.resolve_db_path()
+            if pending_checkpoint and is_idle(db_path):
+                summary = run_maintenance(db_path, checkpoint=True)
+                pending_checkpoint = summary["checkpoint"].get("busy", False)
+            else:
+                summary = run_scheduled(interval)
+                if summary is not None:
+                    # Not idle or readers in the way: retry the checkpoint next idle window
+                    pending_checkpoint = summary["checkpoint"].get("busy", True)
+        except Exception as e:
+            print(f"[MAINTENANCE] Run failed: {e}")
+        _stop.wait(step)
+
+
+def start_maintenance_thread(interval: Optional[float] = None) -> Optional[threading.Thread]:
+    """Start the maintenance thread once per process when scheduled (or given an interval)."""
+    global _thread, _thread_pid
+    interval = interval if interval is not None else get_interval()
+    if interval is None:
+        return None
+    with _start_lock:
+        # A forked worker does not inherit the parent's thread
+        if _thread is None or _thread_pid != os.getpid() or not _thread.is_alive():
+            _stop.clear()
+            _thread = threading.Thread(target=_loop, args=(interval,), name="cutter-maintenance", daemon=True)
+            _thread_pid = os.getpid()
+            _thread.start()
+    return _thread
+
+
+def stop_maintenance_thread(timeout: float = 10.0) -> None:
+    global _thread
+    with _start_lock:
+        thread, _thread = _thread, None
+    _stop.set()
+    if thread is not None and _thread_pid == os.getpid():
+        thread.join(timeout)
+
+
+def install(app: Any) -> None:
+    """Start scheduled maintenance on the first request each process serves (never at import)."""
+    interval = get_interval()
+    if interval is None:
+        return
+
+    @app.before_request
+    def _start_db_maintenance() -> None:
+        if _thread_pid != os.getpid():
+            start_maintenance_thread(interval)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="SQLite maintenance: statistics, incremental vacuum, WAL checkpoint",
+        epilog="""
+Examples:
+  python -m ops_layer.db_maintenance
+  python -m ops_layer.db_maintenance --analyze
+  python -m ops_layer.db_maintenance --interval 3600
+  TEST_DB_PATH=./data/test_scale.db python -m ops_layer.db_maintenance
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--analyze', action='store_true',
+                        help='Full ANALYZE instead of PRAGMA optimize')
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help='Skip wal_checkpoint(TRUNCATE)')
+    parser.add_argument('--interval', type=float, default=None,
+                        help=f'Run every N seconds (idle-window checkpoints) instead of once '
+                             f'(default: ${SCHEDULE_ENV})')
+    args = parser.parse_args(argv)
+
+    db_path = database.resolve_db_path()
+    if not db_path.exists():
+        print(json.dumps({"error": "Database not found", "db_path": str(db_path)}, indent=2), file=sys.stderr)
+        return 1
+
+    interval = args.interval or get_interval()
+    if interval is None:
+        summary = run_maintenance(db_path, analyze=args.analyze, checkpoint=not args.no_checkpoint)
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    print(f"[MAINTENANCE] Every {interval:g}s -> {db_path}")
+    try:
+        _loop(interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Server-sent event streams over the ledger (/api/cutter/events/stream).
+
+Dashboards used to poll /api/cutter/events and re-download the ledger.
+A stream instead keeps one read-only connection open and sleeps until
+another connection commits: `PRAGMA data_version` changes on every
+foreign commit, so an idle stream costs one PRAGMA per poll interval and
+no table reads. When it moves, only events past the stream's cursor are
+read (keyset on id, cutter_ledger.boundary.get_events(after_id=...)).
+
+Each event is sent as
+
+    id: <event id>
+    event: cutter_event
+    data: <event JSON>
+
+so a reconnecting EventSource resumes from Last-Event-ID. A stream ends
+after CUTTER_SSE_MAX_SECONDS (the client reconnects; no worker thread is
+held forever) and sends a comment line every HEARTBEAT_SECONDS so proxies
+keep it open. Streams hold a server thread each, so at most
+CUTTER_SSE_MAX_STREAMS run per process; past that the endpoint answers
+503 and the client retries.
+
+Configuration (environment):
+    CUTTER_SSE_POLL_SECONDS  data_version poll interval (default: 0.5)
+    CUTTER_SSE_MAX_SECONDS   stream lifetime before a reconnect (default: 300)
+    CUTTER_SSE_MAX_STREAMS   concurrent streams per process (default: 4)
+
+Usage:
+    curl -N \\
+        'http://localhost:5000/api/cutter/events/stream?ops_mode=planning&after_id=0'
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import database
+from cutter_ledger import boundary as cutter_boundary
+
+POLL_ENV = "CUTTER_SSE_POLL_SECONDS"
+MAX_SECONDS_ENV = "CUTTER_SSE_MAX_SECONDS"
+MAX_STREAMS_ENV = "CUTTER_SSE_MAX_STREAMS"
+DEFAULT_POLL_SECONDS = 0.5
+DEFAULT_MAX_SECONDS = 300.0
+DEFAULT_MAX_STREAMS = 4
+HEARTBEAT_SECONDS = 15.0
+RETRY_MILLISECONDS = 2000
+BATCH_SIZE = 500
+EVENT_NAME = "cutter_event"
+
+_slots_lock = threading.Lock()
+_active_streams = 0
+
+
+def _env_float(name: str, default: float, minimum: float) -> float:
+    raw_value = os.environ.get(name)
+    if raw_value is None or not raw_value.strip():
+        return default
+    try:
+        return max(minimum, float(raw_value))
+    except ValueError:
+        return default
+
+
+def get_poll_interval() -> float:
+    return _env_float(POLL_ENV, DEFAULT_POLL_SECONDS, 0.05)
+
+
+def get_max_seconds() -> float:
+    return _env_float(MAX_SECONDS_ENV, DEFAULT_MAX_SECONDS, 0.0)
+
+
+def get_max_streams() -> int:
+    return int(_env_float(MAX_STREAMS_ENV, DEFAULT_MAX_STREAMS, 1))
+
+
+def format_event(data: Any, event: Optional[str] = None, event_id: Optional[Any] = None) -> str:
+    """One SSE message (data is JSON-encoded on a single line)."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def acquire_slot() -> bool:
+    """Reserve a stream slot; False when the process is at CUTTER_SSE_MAX_STREAMS."""
+    global _active_streams
+    with _slots_lock:
+        if _active_streams >= get_max_streams():
+            return False
+        _active_streams += 1
+        return True
+
+
+def release_slot() -> None:
+    global _active_streams
+    with _slots_lock:
+        _active_streams = max(0, _active_streams - 1)
+
+
+class ChangeWatcher:
+    """A read-only connection that waits for commits by other connections."""
+
+    def __init__(self, poll_interval: Optional[float] = None) -> None:
+        self.conn = database.get_read_connection()
+        self.poll_interval = poll_interval if poll_interval is not None else get_poll_interval()
+        self.version = self._data_version()
+
+    def _data_version(self) -> int:
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def mark(self) -> None:
+        """Remember the current version; call before reading a snapshot."""
+        self.version = self._data_version()
+
+    def wait(self, timeout: float) -> bool:
+        """True as soon as another connection committed since mark(), False on timeout."""
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._data_version() != self.version:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.poll_interval, remaining))
+
+    def close(self) -> None:
+        try:
+            self.conn.close()
+        except sqlite3.Error:
+            pass
+
+
+def run_stream(read_batch: Callable[[ChangeWatcher], Iterator[str]],
+               max_seconds: Optional[float] = None,
+               poll_interval: Optional[float] = None,
+               wake_in: Optional[Callable[[], Optional[float]]] = None) -> Iterator[str]:
+    """
+    Drive an SSE stream: read_batch(watcher) yields messages for everything
+    new since the last call; between calls the stream sleeps on data_version.
+
+    wake_in() (optional) gives the seconds until read_batch must run even
+    without a commit (e.g. a clock-driven change), or None.
+    """
+    max_seconds = get_max_seconds() if max_seconds is None else max_seconds
+    yield f"retry: {RETRY_MILLISECONDS}\n\n"
+    watcher = ChangeWatcher(poll_interval)
+    try:
+        deadline = time.monotonic() + max_seconds
+        last_sent = time.monotonic()
+        pending = True
+        while True:
+            if pending:
+                watcher.mark()
+                for message in read_batch(watcher):
+                    last_sent = time.monotonic()
+                    yield message
+            now = time.monotonic()
+            if now >= deadline:
+                return
+            if now - last_sent >= HEARTBEAT_SECONDS:
+                last_sent = now
+                yield ": keepalive\n\n"
+            timeout = min(deadline - now, last_sent + HEARTBEAT_SECONDS - now)
+            wake = wake_in() if wake_in is not None else None
+            if wake is not None and wake <= timeout:
+                watcher.wait(wake)
+                pending = True
+            else:
+                pending = watcher.wait(timeout)
+    finally:
+        watcher.close()
+
+
+def stream_cutter_events(after_id: Optional[int] = None,
+                         filters: Optional[Dict[str, Any]] = None,
+                         max_seconds: Optional[float] = None,
+                         poll_interval: Optional[float] = None) -> Iterator[str]:
+    """
+    SSE messages for Cutter Ledger events with id > after_id, then for each
+    event appended while the stream is open. after_id=None starts at the
+    current end of the ledger (new events only); 0 replays it all.
+
+    filters: get_events() filters (subject_ref, event_type, subject_kind, subject_id).
+    """
+    filters = dict(filters or {})
+    cursor = {"after_id": after_id}
+
+    def read_batch(watcher: ChangeWatcher) -> Iterator[str]:
+        while True:
+            conn = watcher.conn
+            # One snapshot: the page and the high-water mark it is read against
+            conn.execute("BEGIN")
+            try:
+                high_water = conn.execute("SELECT COALESCE(MAX(id), 0) FROM cutter__events").fetchone()[0]
+                if cursor["after_id"] is None:
+                    events = []
+                else:
+                    events = cutter_boundary.get_events(
+                        after_id=cursor["after_id"], limit=BATCH_SIZE, conn=conn, **filters
+                    )
+            finally:
+                conn.execute("COMMIT")
+            for event in events:
+                yield format_event(event, EVENT_NAME, event["id"])
+            if len(events) < BATCH_SIZE:
+                # Skip past non-matching events too, so they are not re-read
+                cursor["after_id"] = high_water
+                return
+            cursor["after_id"] = events[-1]["id"]
+
+    return run_stream(read_batch, max_seconds=max_seconds, poll_interval=poll_interval)
@@ -0,0 +1,258 @@
+"""
+Background metrics sampler for /api/system/health and /api/system/metrics.
+
+The health endpoint used to call psutil.cpu_percent(interval=0.1), which
+slept the request thread for 100 ms on every probe, and it stat()ed a
+relative cutter.db instead of the configured database. A daemon thread now
+samples once per interval into a fixed-size ring buffer:
+
+    cpu_percent          system-wide, since the previous sample (non-blocking)
+    memory_usage_mb      this process's RSS
+    disk_free_gb         free space on the database's filesystem
+    db_size_mb           database file (database.resolve_db_path())
+    wal_size_mb          its -wal file
+    db_connections       SQLite handles this process holds on the database
+    requests_in_flight   requests being served by this process
+    write_queue_depth    writes waiting for the writer thread (write_queue.py)
+
+The health endpoint answers from the newest sample; /api/system/metrics
+returns the buffer for trend graphs. Without a running sampler, latest()
+takes a cheap sample instead (no open-file scan: db_connections is None). Each process (server worker) samples
+itself. psutil is optional: without it the process fields are None.
+
+Other subsystems report one-off runs with record_event() (e.g. database
+maintenance); the last run of each kind is returned with the health data.
+
+Configuration (environment):
+    CUTTER_METRICS_INTERVAL  seconds between samples (default: 5; off disables)
+    CUTTER_METRICS_SAMPLES   ring buffer size (default: 720, one hour at 5s)
+
+Usage:
+    from ops_layer import metrics
+    metrics.install(app)
+    metrics.latest()
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+import database
+import write_queue
+
+INTERVAL_ENV = "CUTTER_METRICS_INTERVAL"
+SAMPLES_ENV = "CUTTER_METRICS_SAMPLES"
+DEFAULT_INTERVAL_SECONDS = 5.0
+DEFAULT_SAMPLES = 720
+
+_FALSY = {"0", "false", "no", "off"}
+_MIB = 1024 * 1024
+_GIB = 1024 * 1024 * 1024
+
+_lock = threading.Lock()
+_samples: Deque[Dict[str, Any]] = deque(maxlen=DEFAULT_SAMPLES)
+_events: Dict[str, Dict[str, Any]] = {}
+_in_flight = 0
+_thread: Optional[threading.Thread] = None
+_thread_pid: Optional[int] = None
+_stop = threading.Event()
+_start_lock = threading.Lock()
+
+
+def get_interval() -> Optional[float]:
+    """Seconds between samples, or None when sampling is disabled."""
+    raw_value = os.environ.get(INTERVAL_ENV, "").strip().lower()
+    if not raw_value:
+        return DEFAULT_INTERVAL_SECONDS
+    if raw_value in _FALSY:
+        return None
+    try:
+        return max(0.1, float(raw_value))
+    except ValueError:
+        print(f"[METRICS] Ignoring {INTERVAL_ENV}={raw_value!r} (expected seconds or off)")
+        return DEFAULT_INTERVAL_SECONDS
+
+
+def get_max_samples() -> int:
+    raw_value = os.environ.get(SAMPLES_ENV)
+    if raw_value is None or not raw_value.strip():
+        return DEFAULT_SAMPLES
+    try:
+        return max(1, int(raw_value))
+    except ValueError:
+        return DEFAULT_SAMPLES
+
+
+def _file_mb(path: Path) -> float:
+    try:
+        return round(path.stat().st_size / _MIB, 2)
+    except OSError:
+        return 0.0
+
+
+def _db_connections(process: Any, db_path: Path) -> Optional[int]:
+    """Open handles on the database file (one per SQLite connection)."""
+    try:
+        target = str(db_path.resolve())
+        return sum(1 for handle in process.open_files() if handle.path == target)
+    except Exception:
+        return None
+
+
+def sample(count_connections: bool = True) -> Dict[str, Any]:
+    """
+    Take one sample now (never blocks on CPU measurement) and store it.
+
+    count_connections=False skips db_connections, which scans every file
+    this process has open.
+    """
+    db_path = database.resolve_db_path()
+    point: Dict[str, Any] = {
+        'timestamp': time.time(),
+        'sampled_at': datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        'cpu_percent': None,
+        'memory_usage_mb': None,
+        'disk_free_gb': None,
+        'db_size_mb': _file_mb(db_path),
+        'wal_size_mb': _file_mb(db_path.with_name(db_path.name + "-wal")),
+        'db_connections': None,
+        'requests_in_flight': _in_flight,
+        'write_queue_depth': write_queue.depth(),
+    }
+    try:
+        import psutil  # deferred (scripts/import_time_budget.py)
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        process = psutil.Process(os.getpid())
+        # interval=None: utilisation since the previous call, no sleep
+        point['cpu_percent'] = round(psutil.cpu_percent(interval=None), 2)
+        point['memory_usage_mb'] = round(process.memory_info().rss / _MIB, 2)
+        try:
+            disk_root = db_path.resolve().parent if db_path.exists() else Path.cwd()
+            point['disk_free_gb'] = round(psutil.disk_usage(str(disk_root)).free / _GIB, 2)
+        except OSError:
+            pass
+        if count_connections:
+            point['db_connections'] = _db_connections(process, db_path)
+
+    with _lock:
+        if _samples.maxlen != get_max_samples():
+            _resize(get_max_samples())
+        _samples.append(point)
+    return dict(point)
+
+
+def _resize(max_samples: int) -> None:
+    global _samples
+    _samples = deque(_samples, maxlen=max_samples)
+
+
+def latest() -> Dict[str, Any]:
+    """
+    The newest sample from the sampler thread.
+
+    If the sampler is not running in this process (or has not sampled yet),
+    a cheap sample is taken now, without the db_connections file scan.
+    """
+    running = _thread is not None and _thread_pid == os.getpid() and _thread.is_alive()
+    with _lock:
+        point = _samples[-1] if _samples else None
+    if point is None or not running:
+        return sample(count_connections=False)
+    return dict(point)
+
+
+def series(since: Optional[float] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Samples oldest first; since is a unix timestamp (exclusive)."""
+    with _lock:
+        points = [dict(point) for point in _samples if since is None or point['timestamp'] > since]
+    if limit is not None:
+        points = points[-limit:] if limit > 0 else []
+    return points
+
+
+def record_event(name: str, data: Dict[str, Any]) -> None:
+    """Remember the last run of a background job (shown by /api/system/health)."""
+    entry = dict(data)
+    entry.setdefault('recorded_at', datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"))
+    with _lock:
+        _events[name] = entry
+
+
+def events() -> Dict[str, Dict[str, Any]]:
+    with _lock:
+        return {name: dict(entry) for name, entry in _events.items()}
+
+
+def clear() -> None:
+    with _lock:
+        _samples.clear()
+        _events.clear()
+
+
+def _loop(interval: float) -> None:
+    while not _stop.is_set():
+        try:
+            sample()
+        except Exception as e:
+            print(f"[METRICS] Sample failed: {e}")
+        _stop.wait(interval)
+
+
+def start_sampler_thread(interval: Optional[float] = None) -> Optional[threading.Thread]:
+    """Start the sampler thread once per process when enabled (or given an interval)."""
+    global _thread, _thread_pid
+    interval = interval if interval is not None else get_interval()
+    if interval is None:
+        return None
+    with _start_lock:
+        # A forked worker does not inherit the parent's thread
+        if _thread is None or _thread_pid != os.getpid() or not _thread.is_alive():
+            _stop.clear()
+            _thread = threading.Thread(target=_loop, args=(interval,), name="cutter-metrics", daemon=True)
+            _thread_pid = os.getpid()
+            _thread.start()
+    return _thread
+
+
+def stop_sampler_thread(timeout: float = 5.0) -> None:
+    global _thread
+    with _start_lock:
+        thread, _thread = _thread, None
+    _stop.set()
+    if thread is not None and _thread_pid == os.getpid():
+        thread.join(timeout)
+
+
+def install(app: Any) -> None:
+    """
+    Count in-flight requests and start the sampler on each process's first request.
+
+    Never at import: forked workers must not inherit a running thread.
+    """
+    from flask import g
+
+    interval = get_interval()
+
+    @app.before_request
+    def _metrics_request_started() -> None:
+        global _in_flight
+        with _lock:
+            _in_flight += 1
+        g.metrics_counted = True
+        if interval is not None and _thread_pid != os.getpid():
+            start_sampler_thread(interval)
+
+    @app.teardown_request
+    def _metrics_request_finished(exc: Optional[BaseException] = None) -> None:
+        global _in_flight
+        # An earlier before_request hook may have answered before ours ran
+        if not g.pop('metrics_counted', False):
+            return
+        with _lock:
+            _in_flight -= 1
@@ -15,7 +15,6 @@ Output: Suggested variance tags with confidence scores for "Ted View" UI banner.
 """
 
 import sqlite3
-import json
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import sys
@@ -108,39 +107,64 @@ def detect_patterns(
 # PATTERN DETECTION FUNCTIONS
 # ============================================================================
 
+def _count_active_tags(
+    cursor,
+    where_sql: str,
+    params: Tuple,
+    joins_sql: str = "",
+    tag_name_like: Tuple[str, ...] = ()
+) -> Tuple[int, List[Tuple[str, int]]]:
+    """
+    Count quotes per active tag (numeric value > 0) via ops__quote_tags.
+
+    where_sql/joins_sql select the candidate quotes (alias q); tag_name_like
+    optionally keeps tags matching any LIKE pattern (case-insensitive).
+
+    Returns (total candidate quotes with tags, [(tag_name, quote_count), ...]).
+    """
+    base_sql = f"""
+        FROM ops__quotes q
+        {joins_sql}
+        {{tag_join}}
+        WHERE {where_sql}
+        AND q.pricing_tags_json IS NOT NULL
+        AND q.status IN ('Sent', 'Won')
+    """
+    cursor.execute("SELECT COUNT(*) " + base_sql.format(tag_join=""), params)
+    total_quotes = cursor.fetchone()[0]
+    if not total_quotes:
+        return 0, []
+
+    name_clause = ""
+    if tag_name_like:
+        name_clause = "AND (" + " OR ".join("t.tag_name LIKE ?" for _ in tag_name_like) + ")"
+
+    cursor.execute(f"""
+        SELECT t.tag_name, COUNT(*) AS quote_count
+        {base_sql.format(tag_join="JOIN ops__quote_tags t ON t.quote_id = q.id")}
+        AND typeof(t.value) IN ('integer', 'real') AND t.value > 0
+        {name_clause}
+        GROUP BY t.tag_name
+        ORDER BY MIN(q.id), t.tag_name
+    """, params + tag_name_like)
+    return total_quotes, [(row[0], row[1]) for row in cursor.fetchall()]
+
+
 def _detect_genesis_patterns(cursor, genesis_hash: str) -> List[Dict]:
     """Detect patterns for this exact geometry (The Gold Standard)."""
     suggestions = []
     
-    # Find all quotes for this geometry
-    cursor.execute("""
-        SELECT q.pricing_tags_json, q.variance_json
-        FROM ops__quotes q
-        JOIN ops__parts p ON q.part_id = p.id
-        WHERE p.genesis_hash = ?
-        AND q.pricing_tags_json IS NOT NULL
-        AND q.status IN ('Sent', 'Won')
-    """, (genesis_hash,))
+    # Count tag occurrences across all quotes for this geometry
+    total_quotes, tag_counts = _count_active_tags(
+        cursor, "p.genesis_hash = ?", (genesis_hash,),
+        joins_sql="JOIN ops__parts p ON q.part_id = p.id"
+    )
     
-    rows = cursor.fetchall()
-    if not rows:
+    if not total_quotes:
         return suggestions
     
-    # Count tag occurrences
-    tag_counts = {}
-    total_quotes = len(rows)
-    
-    for row in rows:
-        try:
-            tags = json.loads(row['pricing_tags_json'])
-            for tag_name, tag_value in tags.items():
-                if tag_value > 0:  # Only count active tags
-                    tag_counts[tag_name] = tag_counts.get(tag_name, 0) + 1
-        except (json.JSONDecodeError, TypeError):
-            continue
-    
     # Generate suggestions for tags that appear in >50% of quotes
-    for tag_name, count in tag_counts.items():
+    for tag_name, count in tag_counts:
         confidence = count / total_quotes
         if confidence >= 0.5:  # 50% threshold
             suggestions.append({
@@ -157,32 +181,13 @@ def _detect_customer_patterns(cursor, customer_id: int) -> List[Dict]:
     """Detect patterns for this specific customer."""
     suggestions = []
     
-    cursor.execute("""
-        SELECT pricing_tags_json
-        FROM ops__quotes
-        WHERE customer_id = ?
-        AND pricing_tags_json IS NOT NULL
-        AND status IN ('Sent', 'Won')
-    """, (customer_id,))
+    total_quotes, tag_counts = _count_active_tags(cursor, "q.customer_id = ?", (customer_id,))
     
-    rows = cursor.fetchall()
-    if not rows or len(rows) < 3:  # Need at least 3 quotes for pattern
+    if total_quotes < 3:  # Need at least 3 quotes for pattern
         return suggestions
     
-    tag_counts = {}
-    total_quotes = len(rows)
-    
-    for row in rows:
-        try:
-            tags = json.loads(row['pricing_tags_json'])
-            for tag_name, tag_value in tags.items():
-                if tag_value > 0:
-                    tag_counts[tag_name] = tag_counts.get(tag_name, 0) + 1
-        except (json.JSONDecodeError, TypeError):
-            continue
-    
     # Generate suggestions for tags that appear in >60% of customer quotes
-    for tag_name, count in tag_counts.items():
+    for tag_name, count in tag_counts:
         confidence = count / total_quotes
         if confidence >= 0.6:  # 60% threshold for customer patterns
             suggestions.append({
@@ -202,32 +207,13 @@ def _detect_material_patterns(cursor, material: str) -> List[Dict]:
     # Normalize material name
     material_normalized = material.strip().lower()
     
-    cursor.execute("""
-        SELECT pricing_tags_json
-        FROM ops__quotes
-        WHERE LOWER(material) = ?
-        AND pricing_tags_json IS NOT NULL
-        AND status IN ('Sent', 'Won')
-    """, (material_normalized,))
+    total_quotes, tag_counts = _count_active_tags(cursor, "LOWER(q.material) = ?", (material_normalized,))
     
-    rows = cursor.fetchall()
-    if not rows or len(rows) < 5:  # Need at least 5 quotes for material pattern
+    if total_quotes < 5:  # Need at least 5 quotes for material pattern
         return suggestions
     
-    tag_counts = {}
-    total_quotes = len(rows)
-    
-    for row in rows:
-        try:
-            tags = json.loads(row['pricing_tags_json'])
-            for tag_name, tag_value in tags.items():
-                if tag_value > 0:
-                    tag_counts[tag_name] = tag_counts.get(tag_name, 0) + 1
-        except (json.JSONDecodeError, TypeError):
-            continue
-    
     # Generate suggestions for tags that appear in >70% of material quotes
-    for tag_name, count in tag_counts.items():
+    for tag_name, count in tag_counts:
         confidence = count / total_quotes
         if confidence >= 0.7:  # 70% threshold for material patterns
             suggestions.append({
@@ -246,29 +232,12 @@ def _detect_quantity_patterns(cursor, quantity: int) -> List[Dict]:
     
     # Prototype pattern (qty 1-5)
     if quantity <= 5:
-        cursor.execute("""
-            SELECT pricing_tags_json
-            FROM ops__quotes
-            WHERE quantity <= 5
-            AND pricing_tags_json IS NOT NULL
-            AND status IN ('Sent', 'Won')
-        """)
+        total_quotes, tag_counts = _count_active_tags(
+            cursor, "q.quantity <= 5", (), tag_name_like=('%proto%',)
+        )
         
-        rows = cursor.fetchall()
-        if rows and len(rows) >= 10:
-            tag_counts = {}
-            total_quotes = len(rows)
-            
-            for row in rows:
-                try:
-                    tags = json.loads(row['pricing_tags_json'])
-                    for tag_name, tag_value in tags.items():
-                        if tag_value > 0 and 'proto' in tag_name.lower():
-                            tag_counts[tag_name] = tag_counts.get(tag_name, 0) + 1
-                except (json.JSONDecodeError, TypeError):
-                    continue
-            
-            for tag_name, count in tag_counts.items():
+        if total_quotes >= 10:
+            for tag_name, count in tag_counts:
                 confidence = count / total_quotes
                 if confidence >= 0.5:
                     suggestions.append({
@@ -287,29 +256,12 @@ def _detect_lead_time_patterns(cursor, lead_time_days: int) -> List[Dict]:
     
     # Rush pattern (< 7 days)
     if lead_time_days < 7:
-        cursor.execute("""
-            SELECT pricing_tags_json
-            FROM ops__quotes
-            WHERE lead_time_days < 7
-            AND pricing_tags_json IS NOT NULL
-            AND status IN ('Sent', 'Won')
-        """)
+        total_quotes, tag_counts = _count_active_tags(
+            cursor, "q.lead_time_days < 7", (), tag_name_like=('%rush%', '%expedite%')
+        )
         
-        rows = cursor.fetchall()
-        if rows and len(rows) >= 5:
-            tag_counts = {}
-            total_quotes = len(rows)
-            
-            for row in rows:
-                try:
-                    tags = json.loads(row['pricing_tags_json'])
-                    for tag_name, tag_value in tags.items():
-                        if tag_value > 0 and ('rush' in tag_name.lower() or 'expedite' in tag_name.lower()):
-                            tag_counts[tag_name] = tag_counts.get(tag_name, 0) + 1
-                except (json.JSONDecodeError, TypeError):
-                    continue
-            
-            for tag_name, count in tag_counts.items():
+        if total_quotes >= 5:
+            for tag_name, count in tag_counts:
                 confidence = count / total_quotes
                 if confidence >= 0.6:
                     suggestions.append({
@@ -588,46 +588,52 @@ class QuotePDFGenerator:
         # Calculate per-unit costs for each quantity tier
         table_data = [['Quantity', 'Per Unit', 'Total', 'Setup %']]
         
-        for qty in quantity_tiers:
-            if qty < 1:
-                continue  # Skip invalid quantities
+        # Exact tiers from the price curve when the quote saved its pricing inputs
+        curve_rows = self._price_break_rows_from_curve(quantity_tiers, physics_snapshot.get('pricing_inputs'))
+        if curve_rows is not None:
+            table_data.extend(curve_rows)
+        else:
+            # Older quotes: approximate from the snapshot totals at the quoted quantity
+            for qty in quantity_tiers:
+                if qty < 1:
+                    continue  # Skip invalid quantities
             
-            # Recalculate material cost for this quantity
-            if quoted_quantity > 0:
-                material_per_unit = material_cost_total / quoted_quantity
-            else:
-                material_per_unit = 0
+                # Recalculate material cost for this quantity
+                if quoted_quantity > 0:
+                    material_per_unit = material_cost_total / quoted_quantity
+                else:
+                    material_per_unit = 0
             
-            material_cost_qty = material_per_unit * qty
+                material_cost_qty = material_per_unit * qty
             
-            # Recalculate labor with setup amortization
-            if setup_cost_total > 0 and quoted_quantity > 0:
-                # Extract runtime without setup (approximate)
-                runtime_per_unit = (labor_cost_total / quoted_quantity) if quoted_quantity > 0 else 0
-                labor_without_setup = runtime_per_unit * qty
-                setup_per_unit = setup_cost_total / qty
-                labor_cost_qty = labor_without_setup + setup_cost_total
-            else:
-                labor_per_unit = labor_cost_total / quoted_quantity if quoted_quantity > 0 else 0
-                labor_cost_qty = labor_per_unit * qty
-                setup_per_unit = 0
+                # Recalculate labor with setup amortization
+                if setup_cost_total > 0 and quoted_quantity > 0:
+                    # Extract runtime without setup (approximate)
+                    runtime_per_unit = (labor_cost_total / quoted_quantity) if quoted_quantity > 0 else 0
+                    labor_without_setup = runtime_per_unit * qty
+                    setup_per_unit = setup_cost_total / qty
+                    labor_cost_qty = labor_without_setup + setup_cost_total
+                else:
+                    labor_per_unit = labor_cost_total / quoted_quantity if quoted_quantity > 0 else 0
+                    labor_cost_qty = labor_per_unit * qty
+                    setup_per_unit = 0
             
-            total_cost_qty = material_cost_qty + labor_cost_qty
-            per_unit_price = total_cost_qty / qty if qty > 0 else 0
+                total_cost_qty = material_cost_qty + labor_cost_qty
+                per_unit_price = total_cost_qty / qty if qty > 0 else 0
             
-            # Calculate setup percentage
-            if labor_cost_qty > 0:
-                setup_percent = (setup_cost_total / labor_cost_qty) * 100
-            else:
-                setup_percent = 0
+                # Calculate setup percentage
+                if labor_cost_qty > 0:
+                    setup_percent = (setup_cost_total / labor_cost_qty) * 100
+                else:
+                    setup_percent = 0
             
-            # Format row data
-            qty_str = str(qty)
-            per_unit_str = f"${per_unit_price:,.2f}"
-            total_str = f"${total_cost_qty:,.2f}"
-            setup_pct_str = f"{setup_percent:.1f}%"
+                # Format row data
+                qty_str = str(qty)
+                per_unit_str = f"${per_unit_price:,.2f}"
+                total_str = f"${total_cost_qty:,.2f}"
+                setup_pct_str = f"{setup_percent:.1f}%"
             
-            table_data.append([qty_str, per_unit_str, total_str, setup_pct_str])
+                table_data.append([qty_str, per_unit_str, total_str, setup_pct_str])
         
         # Section header
         elements.append(Paragraph("Price Breaks (Economy of Scale)", self.styles['SectionHeader']))
@@ -675,6 +681,31 @@ class QuotePDFGenerator:
         
         return elements
     
+    def _price_break_rows_from_curve(self, quantity_tiers: list, inputs: Any) -> Optional[list]:
+        """
+        Price-breaks rows from pricing_engine.price_curve (same formula as the anchor).
+        
+        Returns None when the quote has no usable pricing inputs.
+        """
+        if not isinstance(inputs, dict):
+            return None
+        from .pricing_engine import price_curve
+        try:
+            tiers = [int(qty) for qty in quantity_tiers if int(qty) >= 1]
+            curve = price_curve(tiers, **inputs)
+            setup_cost = float(inputs['setup_time_mins']) / 60.0 * float(inputs['shop_rate_hour'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        
+        rows = []
+        for qty, per_unit_price, total_cost_qty, labor_cost_qty in zip(
+            curve['quantity'].tolist(), curve['unit_price'].tolist(),
+            curve['total_price'].tolist(), curve['labor_cost'].tolist()
+        ):
+            setup_percent = (setup_cost / labor_cost_qty) * 100 if labor_cost_qty > 0 else 0
+            rows.append([str(qty), f"${per_unit_price:,.2f}", f"${total_cost_qty:,.2f}", f"{setup_percent:.1f}%"])
+        return rows
+    
     def _build_requirements_section(self, data: Dict[str, Any]) -> list:
         """Build outside processing and quality requirements section."""
         elements = []
@@ -1,7 +1,12 @@
 """
 Pricing Engine for calculating material and labor costs.
+
+The anchor formula lives in price_curve(), which evaluates any number of
+quantities in one NumPy pass. calculate_anchor(), calculate_price_breaks()
+and the PDF price-breaks table are all slices of the same curve.
 """
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List, Sequence
+import numpy as np
 import database
 
 
@@ -15,6 +20,122 @@ def MATERIAL_MARKUP() -> float:
 # Specific quantity breaks for pricing (kept as constant - not shop-specific)
 QUANTITY_BREAKS = [1, 5, 25, 100, 250]
 
+# Full curve for plotting: quantities 1..CURVE_MAX_QUANTITY
+CURVE_MAX_QUANTITY = 10000
+# Largest custom quantity /api/pricing/curve prices
+CURVE_QUANTITY_LIMIT = 1000000
+
+# Setup scrap rule: below SCRAP_UNIT_BELOW pieces bill one extra stock block,
+# from there on a flat SCRAP_FACTOR
+SCRAP_UNIT_BELOW = 10
+SCRAP_FACTOR = 1.02
+DEFAULT_HANDLING_TIME_MINS = 0.5
+# Largest difference between a client-computed and a server-computed anchor
+# (cent rounding in the browser can differ from Python's round())
+ANCHOR_TOLERANCE = 0.011
+
+
+def price_curve(
+    quantities: Sequence[int],
+    material_cost_per_unit: float,
+    per_part_time_mins: float,
+    setup_time_mins: float,
+    shop_rate_hour: float,
+    handling_time_mins: float = DEFAULT_HANDLING_TIME_MINS
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate the anchor formula for every quantity at once.
+    
+    Formula per quantity Q:
+        Material = MaterialCostPerUnit × (Q + 1)            if Q < 10 (setup scrap unit)
+                 = MaterialCostPerUnit × Q × 1.02           otherwise (2% scrap)
+        Labor    = (Setup + (Per-Part + Handling) × Q) / 60 × ShopRate
+    
+    Args:
+        quantities: Quantities to price (each >= 1)
+        material_cost_per_unit: Stock block cost with markup (PriceCalculator.material_cost_per_unit)
+        per_part_time_mins: Runtime per part in minutes (WITHOUT setup or handling)
+        setup_time_mins: One-time setup time in minutes
+        shop_rate_hour: Shop rate per hour
+        handling_time_mins: Time to swap parts between cycles in minutes
+    
+    Returns:
+        Arrays aligned with quantities: quantity, material_cost, labor_cost,
+        total_price, unit_price, total_runtime_mins
+    
+    Raises:
+        ValueError: If a quantity is below 1
+    """
+    quantity = np.asarray(quantities, dtype=np.int64).reshape(-1)
+    if quantity.size and quantity.min() < 1:
+        raise ValueError("Quantities must be at least 1")
+    material_cost = np.where(
+        quantity < SCRAP_UNIT_BELOW,
+        material_cost_per_unit * (quantity + 1),
+        material_cost_per_unit * quantity * SCRAP_FACTOR
+    )
+    total_runtime_mins = setup_time_mins + (per_part_time_mins + handling_time_mins) * quantity
+    labor_cost = (total_runtime_mins / 60.0) * shop_rate_hour
+    total_price = material_cost + labor_cost
+    return {
+        'quantity': quantity,
+        'material_cost': material_cost,
+        'labor_cost': labor_cost,
+        'total_price': total_price,
+        'unit_price': total_price / quantity,
+        'total_runtime_mins': total_runtime_mins
+    }
+
+
+def reproduces_anchor(inputs: Dict[str, float], quantity: int, anchor: Any) -> bool:
+    """
+    True if pricing_inputs() reproduce a saved anchor at the quote's quantity.
+    
+    The anchor may be the total at that quantity (anchor_price) or the same
+    total per unit (the glass box's system_price_anchor).
+    """
+    try:
+        anchor = float(anchor)
+        total = float(price_curve([quantity], **inputs)['total_price'][0])
+    except (TypeError, ValueError):
+        return False
+    return abs(anchor - total) <= ANCHOR_TOLERANCE or abs(anchor - total / quantity) <= ANCHOR_TOLERANCE
+
+
+def curve_quantities(max_quantity: int = CURVE_MAX_QUANTITY) -> np.ndarray:
+    """Every quantity from 1 to max_quantity (the plotted curve)."""
+    return np.arange(1, max(1, int(max_quantity)) + 1, dtype=np.int64)
+
+
+def pricing_inputs(
+    material_cost_per_unit: float,
+    per_part_time_mins: float,
+    setup_time_mins: float,
+    shop_rate_hour: float,
+    handling_time_mins: float = DEFAULT_HANDLING_TIME_MINS
+) -> Dict[str, float]:
+    """
+    The price_curve() arguments, as returned by the quote endpoints.
+    
+    Saved with a quote (physics snapshot) so its price breaks can be
+    recomputed later without re-reading material costs that may have moved.
+    """
+    return {
+        'material_cost_per_unit': material_cost_per_unit,
+        'per_part_time_mins': per_part_time_mins,
+        'setup_time_mins': setup_time_mins,
+        'shop_rate_hour': shop_rate_hour,
+        'handling_time_mins': handling_time_mins
+    }
+
+
+def curve_to_lists(curve: Dict[str, np.ndarray], decimals: int = 2) -> Dict[str, List[Any]]:
+    """JSON-ready curve: quantities as ints, money rounded to cents (as round() did per quantity)."""
+    return {
+        key: values.tolist() if key == 'quantity' else [round(value, decimals) for value in values.tolist()]
+        for key, values in curve.items()
+    }
+
 
 class PriceCalculator:
     """
@@ -26,7 +147,6 @@ class PriceCalculator:
         Initialize the price calculator and ensure database is ready.
         """
         database.initialize_database()
-        database.seed_default_data()
     
     def calculate_anchor(
         self,
@@ -63,6 +183,33 @@ class PriceCalculator:
         Raises:
             ValueError: If material is not found in database
         """
+        base_material_cost_per_unit = self.material_cost_per_unit(stock_volume_in3, material_name)
+        curve = price_curve(
+            [quantity],
+            material_cost_per_unit=base_material_cost_per_unit,
+            per_part_time_mins=per_part_time_mins,
+            setup_time_mins=setup_time_mins,
+            shop_rate_hour=shop_rate_hour,
+            handling_time_mins=handling_time_mins
+        )
+        total_labor_cost = float(curve['labor_cost'][0])
+        
+        return {
+            'material_cost': float(curve['material_cost'][0]),
+            'labor_cost': total_labor_cost,
+            'total_price': float(curve['total_price'][0]),
+            'material_cost_per_unit': base_material_cost_per_unit,
+            'labor_cost_per_unit': total_labor_cost / quantity,
+            'total_runtime_mins': float(curve['total_runtime_mins'][0])  # For transparency
+        }
+    
+    def material_cost_per_unit(self, stock_volume_in3: float, material_name: str) -> float:
+        """
+        Stock block cost per part with markup (billed for stock volume, not part volume).
+        
+        Reads the material cost and MATERIAL_MARKUP() once; price a whole curve
+        from the result instead of calling calculate_anchor per quantity.
+        """
         # Look up material cost from database
         material_cost_per_in3 = database.get_material_cost(material_name)
         
@@ -71,39 +218,32 @@ class PriceCalculator:
             print(f"WARNING: Material '{material_name}' not found. Using fallback pricing.")
             material_cost_per_in3 = 0.30  # Aluminum 6061 cost
         
-        # Calculate base material cost per unit (billed for stock volume, not part volume)
         # Apply material markup (The Anchor)
-        base_material_cost_per_unit = stock_volume_in3 * material_cost_per_in3 * MATERIAL_MARKUP()
-        
-        # Apply setup scrap logic
-        if quantity < 10:
-            # For low quantities: add 1 extra unit for setup scrap
-            material_units = quantity + 1
-            total_material_cost = base_material_cost_per_unit * material_units
-        else:
-            # For higher quantities: add 2% scrap factor
-            total_material_cost = base_material_cost_per_unit * quantity * 1.02
-        
-        # Calculate labor cost: ONE-TIME setup + ((per-part time + handling time) × quantity)
-        # FIX: This prevents multiplying setup time by quantity
-        # NEW: Includes handling time (load/unload between cycles) per part
-        total_runtime_mins = setup_time_mins + ((per_part_time_mins + handling_time_mins) * quantity)
-        total_labor_cost = (total_runtime_mins / 60.0) * shop_rate_hour
-        
-        # Calculate per-unit costs for display
-        labor_cost_per_unit = total_labor_cost / quantity
-        
-        # Calculate total
-        total_price = total_material_cost + total_labor_cost
+        return stock_volume_in3 * material_cost_per_in3 * MATERIAL_MARKUP()
+    
+    def calculate_price_curve(
+        self,
+        stock_volume_in3: float,
+        material_name: str,
+        per_part_time_mins: float,
+        setup_time_mins: float,
+        shop_rate_hour: float,
+        quantities: Optional[Sequence[int]] = None,
+        handling_time_mins: float = DEFAULT_HANDLING_TIME_MINS
+    ) -> Dict[str, np.ndarray]:
+        """
+        Price a list of quantities (default: 1..CURVE_MAX_QUANTITY) in one pass.
         
-        return {
-            'material_cost': total_material_cost,
-            'labor_cost': total_labor_cost,
-            'total_price': total_price,
-            'material_cost_per_unit': base_material_cost_per_unit,
-            'labor_cost_per_unit': labor_cost_per_unit,
-            'total_runtime_mins': total_runtime_mins  # For transparency
-        }
+        Returns the price_curve() arrays.
+        """
+        return price_curve(
+            quantities if quantities is not None else curve_quantities(),
+            material_cost_per_unit=self.material_cost_per_unit(stock_volume_in3, material_name),
+            per_part_time_mins=per_part_time_mins,
+            setup_time_mins=setup_time_mins,
+            shop_rate_hour=shop_rate_hour,
+            handling_time_mins=handling_time_mins
+        )
     
     def calculate_price_breaks(
         self,
@@ -111,10 +251,11 @@ class PriceCalculator:
         material_name: str,
         per_part_time_mins: float,
         setup_time_mins: float,
-        shop_rate_hour: float
+        shop_rate_hour: float,
+        quantities: Optional[Sequence[int]] = None
     ) -> Dict[int, Dict[str, float]]:
         """
-        Calculate pricing for specific quantity breaks: [1, 5, 25, 100, 250].
+        Calculate pricing for specific quantity breaks (default: [1, 5, 25, 100, 250]).
         
         Args:
             stock_volume_in3: Stock volume in cubic inches
@@ -122,6 +263,7 @@ class PriceCalculator:
             per_part_time_mins: Runtime per part in minutes (WITHOUT setup)
             setup_time_mins: One-time setup time in minutes
             shop_rate_hour: Shop rate per hour
+            quantities: Custom tiers instead of QUANTITY_BREAKS
             
         Returns:
             Dictionary mapping quantity to price breakdown:
@@ -131,24 +273,27 @@ class PriceCalculator:
                 ...
             }
         """
-        price_breaks = {}
-        
-        for qty in QUANTITY_BREAKS:
-            price_result = self.calculate_anchor(
-                stock_volume_in3=stock_volume_in3,
-                material_name=material_name,
-                per_part_time_mins=per_part_time_mins,
-                setup_time_mins=setup_time_mins,
-                shop_rate_hour=shop_rate_hour,
-                quantity=qty
-            )
-            
-            price_breaks[qty] = {
-                'total_price': round(price_result['total_price'], 2),
-                'material_cost': round(price_result['material_cost'], 2),
-                'labor_cost': round(price_result['labor_cost'], 2),
-                'price_per_unit': round(price_result['total_price'] / qty, 2)
-            }
-        
-        return price_breaks
+        curve = self.calculate_price_curve(
+            stock_volume_in3=stock_volume_in3,
+            material_name=material_name,
+            per_part_time_mins=per_part_time_mins,
+            setup_time_mins=setup_time_mins,
+            shop_rate_hour=shop_rate_hour,
+            quantities=quantities if quantities is not None else QUANTITY_BREAKS
+        )
+        return price_breaks_from_curve(curve)
+    
+
+def price_breaks_from_curve(curve: Dict[str, np.ndarray]) -> Dict[int, Dict[str, float]]:
+    """The calculate_price_breaks() mapping for the quantities of a curve."""
+    rounded = curve_to_lists(curve)
+    price_breaks = {}
+    for i, qty in enumerate(rounded['quantity']):
+        price_breaks[qty] = {
+            'total_price': rounded['total_price'][i],
+            'material_cost': rounded['material_cost'][i],
+            'labor_cost': rounded['labor_cost'][i],
+            'price_per_unit': rounded['unit_price'][i]
+        }
+    return price_breaks
 
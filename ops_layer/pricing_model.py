@@ -0,0 +1,169 @@
+"""
+Pricing model document for client-side recalculation.
+
+Every stock, setup, shop-rate or quantity edit in the quote UI used to post
+to /recalculate, although the answer is a pure function of a few numbers:
+the material's cost and machinability, the shop config and the anchor
+formula. GET /api/pricing/model publishes all of them as one document;
+static/js/modules/pricing_model.js evaluates it in the browser exactly as
+recalculate() does here.
+
+The document carries a version: a hash of its content, so it changes
+whenever a material or config value does (and only then). It is served
+with that version as ETag and Cache-Control: no-cache, so browsers
+revalidate with If-None-Match and get a 304 until something moves.
+
+/recalculate and /save_quote share recalculate(). When /save_quote is sent
+the inputs a price was computed from (recalc_inputs), it recomputes the
+anchor and rejects the save if the anchor being stored (system_price_anchor,
+per unit, or anchor_price) does not match. Without recalc_inputs, client
+pricing_inputs and stock_volume_in3 are only kept if they reproduce that
+anchor (pricing_engine.reproduces_anchor, stock_matches_inputs()).
+"""
+
+import hashlib
+import json
+import math
+from typing import Any, Dict, Optional
+
+import database
+from ops_layer import estimator
+from ops_layer.pricing_engine import (
+    ANCHOR_TOLERANCE,
+    DEFAULT_HANDLING_TIME_MINS,
+    MATERIAL_MARKUP,
+    SCRAP_FACTOR,
+    SCRAP_UNIT_BELOW,
+    PriceCalculator,
+    pricing_inputs,
+)
+
+FORMAT_VERSION = 1
+MIN_MACHINE_TIME_MINS = 0.1
+FALLBACK_MATERIAL_COST = 0.30  # PriceCalculator.material_cost_per_unit fallback (Aluminum 6061)
+FALLBACK_MACHINABILITY = 1.0
+
+
+def build_pricing_model() -> Dict[str, Any]:
+    """The pricing model document, with 'version' set to a hash of its content."""
+    materials = {
+        name: {
+            'cost_per_cubic_inch': database.get_material_cost(name),
+            'machinability_score': database.get_material_score(name),
+        }
+        for name in database.get_all_materials()
+    }
+    model = {
+        'format': FORMAT_VERSION,
+        'materials': materials,
+        'config': {
+            'shop_rate_hour': database.get_config('shop_rate_standard', 75.0),
+            'material_markup': MATERIAL_MARKUP(),
+            'setup_time_mins': estimator.SETUP_TIME(),
+            'handling_time_mins': DEFAULT_HANDLING_TIME_MINS,
+            'base_mrr': estimator.BASE_MRR(),
+            'min_hand_time_mins': estimator.MIN_HAND_TIME_PER_PART(),
+            'saw_kerf': estimator.SAW_KERF(),
+        },
+        'formula': {
+            'scrap_unit_below': SCRAP_UNIT_BELOW,
+            'scrap_factor': SCRAP_FACTOR,
+            'min_machine_time_mins': MIN_MACHINE_TIME_MINS,
+            'fallback_material_cost': FALLBACK_MATERIAL_COST,
+            'fallback_machinability': FALLBACK_MACHINABILITY,
+            'anchor_tolerance': ANCHOR_TOLERANCE,
+        },
+    }
+    model['version'] = hashlib.sha256(json.dumps(model, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    return model
+
+
+def recalculation_inputs(data: Dict[str, Any], default_material: str,
+                         default_shop_rate: Optional[float] = None) -> Dict[str, Any]:
+    """
+    recalculate() keyword arguments from a /recalculate request body.
+
+    Raises:
+        TypeError, ValueError: If a number is malformed
+    """
+    if default_shop_rate is None:
+        default_shop_rate = database.get_config('shop_rate_standard', 75.0)
+    return {
+        'material_name': data.get('material_name', default_material),
+        'stock_volume_in3': (float(data.get('stock_x', 0)) * float(data.get('stock_y', 0))
+                             * float(data.get('stock_z', 0))),
+        'part_volume_in3': float(data.get('part_volume', 0)),
+        'setup_time_mins': float(data.get('setup_time', 60.0)),
+        'shop_rate_hour': float(data.get('shop_rate', default_shop_rate)),
+        'quantity': int(data.get('quantity', 1)),
+        'handling_time_mins': float(data.get('handling_time', DEFAULT_HANDLING_TIME_MINS)),
+    }
+
+
+def recalculate(
+    material_name: str,
+    stock_volume_in3: float,
+    part_volume_in3: float,
+    setup_time_mins: float,
+    shop_rate_hour: float,
+    quantity: int = 1,
+    handling_time_mins: float = DEFAULT_HANDLING_TIME_MINS
+) -> Dict[str, Any]:
+    """
+    Pure physics anchor for edited stock / setup / rate / quantity (the /recalculate response).
+
+    Complexity is always 1.0: the anchor must be pure physics (Phase 5).
+    """
+    # Calculate Runtime
+    score = database.get_material_score(material_name)
+    if score is None:
+        print(f"WARNING: Material '{material_name}' not found. Using fallback pricing.")
+        score = FALLBACK_MACHINABILITY  # Aluminum 6061 machinability score
+    adjusted_mrr = estimator.BASE_MRR() / score
+    removal_vol = max(0, stock_volume_in3 - part_volume_in3)
+    # FIX: Lowered minimum from 1.0 to 0.1 to allow price sensitivity on small parts
+    machine_time = max(removal_vol / adjusted_mrr, MIN_MACHINE_TIME_MINS)
+    hand_time = estimator.MIN_HAND_TIME_PER_PART()
+    per_part_time = machine_time + hand_time
+
+    # Pricing - Include handling time in per-part calculation
+    price_result = PriceCalculator().calculate_anchor(
+        stock_volume_in3=stock_volume_in3,
+        material_name=material_name,
+        per_part_time_mins=per_part_time,
+        setup_time_mins=setup_time_mins,
+        shop_rate_hour=shop_rate_hour,
+        quantity=quantity,
+        handling_time_mins=handling_time_mins
+    )
+
+    return {
+        'total_price': round(price_result['total_price'], 2),
+        'material_cost': round(price_result['material_cost'], 2),
+        'labor_cost': round(price_result['labor_cost'], 2),
+        'total_runtime_mins': round(price_result['total_runtime_mins'], 2),
+        'per_part_time_mins': round(per_part_time, 2),
+        'setup_time_mins': round(setup_time_mins, 2),
+        'machine_time_mins': round(machine_time, 2),
+        'hand_time_mins': round(hand_time, 2),
+        'quantity': quantity,
+        'pricing_inputs': pricing_inputs(
+            material_cost_per_unit=price_result['material_cost_per_unit'],
+            per_part_time_mins=per_part_time,
+            setup_time_mins=setup_time_mins,
+            shop_rate_hour=shop_rate_hour,
+            handling_time_mins=handling_time_mins
+        )
+    }
+
+
+def stock_matches_inputs(stock_volume_in3: Any, material_name: str,
+                         inputs: Optional[Dict[str, float]]) -> bool:
+    """True if a stock volume explains pricing_inputs' material_cost_per_unit at today's cost and markup."""
+    if not inputs:
+        return False
+    try:
+        expected = PriceCalculator().material_cost_per_unit(float(stock_volume_in3), material_name)
+    except (TypeError, ValueError):
+        return False
+    return math.isclose(expected, inputs['material_cost_per_unit'], rel_tol=1e-6, abs_tol=1e-9)
@@ -0,0 +1,178 @@
+"""
+Opt-in request profiling (planning mode only).
+
+A request is profiled when it carries `X-Cutter-Profile: 1` (or `?profile=1`)
+and resolves to ops_mode planning. The request runs under cProfile and the
+stats are dumped as a `.pstats` file into a bounded profile directory; the
+oldest files are pruned once the directory exceeds its cap.
+
+Profiles never touch the database and never change the response body. The
+only visible effect is the `X-Cutter-Profile-Id` response header naming the
+stored file.
+
+Configuration (environment):
+    CUTTER_PROFILE_DIR        profile directory (default: data/profiles)
+    CUTTER_PROFILE_MAX_FILES  newest N files kept (default: 50)
+
+Usage:
+    python -m pstats data/profiles/<profile_id>
+"""
+
+import cProfile
+import os
+import re
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROFILE_HEADER = "X-Cutter-Profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_ID_HEADER = "X-Cutter-Profile-Id"
+PROFILE_SUFFIX = ".pstats"
+# Anchored to the repo root (like database.PROD_DB_PATH), not the working directory
+DEFAULT_PROFILE_DIR = Path(__file__).resolve().parent.parent / "data" / "profiles"
+DEFAULT_MAX_PROFILES = 50
+
+_TRUTHY = {"1", "true", "yes", "on"}
+_PROFILE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+\.pstats$")
+
+
+def get_profile_dir() -> Path:
+    return Path(os.environ.get("CUTTER_PROFILE_DIR") or DEFAULT_PROFILE_DIR)
+
+
+def get_max_profiles() -> int:
+    raw_value = os.environ.get("CUTTER_PROFILE_MAX_FILES")
+    if not raw_value:
+        return DEFAULT_MAX_PROFILES
+    try:
+        return max(1, int(raw_value))
+    except ValueError:
+        return DEFAULT_MAX_PROFILES
+
+
+def is_profile_requested(headers: Any, args: Any) -> bool:
+    """Return True when the request opted in via header or query flag."""
+    flag = headers.get(PROFILE_HEADER) or args.get(PROFILE_QUERY_PARAM)
+    return str(flag or "").strip().lower() in _TRUTHY
+
+
+def is_valid_profile_id(profile_id: str) -> bool:
+    return bool(profile_id) and bool(_PROFILE_ID_PATTERN.match(profile_id))
+
+
+def _slug(value: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", value or "").strip("-")
+    return (slug or "root")[:60]
+
+
+def start_profile() -> Optional[cProfile.Profile]:
+    """Start a profiler for the current request, or None if one is already active."""
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Another profiler is active on this thread (nested tooling, debugger)
+        print(f"[PROFILE] Skipped: {e}")
+        return None
+    return profiler
+
+
+def stop_profile(profiler: cProfile.Profile, method: str, path: str,
+                 elapsed_ms: float) -> Optional[str]:
+    """Stop the profiler, write its stats, prune old files, and return the profile id."""
+    profiler.disable()
+    profile_dir = get_profile_dir()
+    try:
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        profile_id = (
+            f"{timestamp}_{method.upper()}_{_slug(path)}_"
+            f"{int(round(elapsed_ms))}ms_{uuid.uuid4().hex[:8]}{PROFILE_SUFFIX}"
+        )
+        profiler.dump_stats(str(profile_dir / profile_id))
+    except OSError as e:
+        print(f"[PROFILE] Failed to write profile: {e}")
+        return None
+    prune_profiles(profile_dir, get_max_profiles())
+    print(f"[PROFILE] {method.upper()} {path} -> {profile_id}")
+    return profile_id
+
+
+def prune_profiles(profile_dir: Path, max_files: int) -> int:
+    """Delete the oldest profiles beyond max_files. Returns number removed."""
+    files = sorted(
+        profile_dir.glob(f"*{PROFILE_SUFFIX}"),
+        key=lambda p: (p.stat().st_mtime, p.name)
+    )
+    removed = 0
+    for stale in files[:max(0, len(files) - max_files)]:
+        try:
+            stale.unlink()
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """List stored profiles, newest first."""
+    profile_dir = get_profile_dir()
+    if not profile_dir.exists():
+        return []
+    profiles = []
+    for path in profile_dir.glob(f"*{PROFILE_SUFFIX}"):
+        stat = path.stat()
+        profiles.append({
+            "profile_id": path.name,
+            "size_bytes": stat.st_size,
+            "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat()
+        })
+    profiles.sort(key=lambda p: (p["created_at"], p["profile_id"]), reverse=True)
+    return profiles
+
+
+def get_profile_path(profile_id: str) -> Optional[Path]:
+    """Resolve a profile id to its file, refusing anything outside the profile directory."""
+    if not is_valid_profile_id(profile_id):
+        return None
+    path = get_profile_dir() / profile_id
+    if not path.is_file():
+        return None
+    return path
+
+
+def install(app: Any, get_ops_mode: Any) -> None:
+    """Register the profiling hooks on a Flask app."""
+    from flask import g, request
+
+    @app.before_request
+    def _start_request_profile() -> None:
+        if not is_profile_requested(request.headers, request.args):
+            return
+        if get_ops_mode() != "planning":
+            return
+        profiler = start_profile()
+        if profiler is not None:
+            g.cutter_profiler = profiler
+            g.cutter_profile_started = time.perf_counter()
+
+    @app.after_request
+    def _finish_request_profile(response: Any) -> Any:
+        profiler = g.pop("cutter_profiler", None)
+        if profiler is None:
+            return response
+        elapsed_ms = (time.perf_counter() - g.pop("cutter_profile_started")) * 1000
+        profile_id = stop_profile(profiler, request.method, request.path, elapsed_ms)
+        if profile_id:
+            response.headers[PROFILE_ID_HEADER] = profile_id
+        return response
+
+    @app.teardown_request
+    def _discard_request_profile(exc: Optional[BaseException]) -> None:
+        # after_request is skipped on unhandled errors; never leave a profiler enabled
+        profiler = g.pop("cutter_profiler", None)
+        if profiler is not None:
+            profiler.disable()
@@ -0,0 +1,225 @@
+"""
+Saved-report result cache (/api/reports/run).
+
+Report results depend on two things only: the State Ledger rows and the
+clock (days_since_declaration in view_state_time_in_state). Both are
+tracked exactly, so a re-run with nothing new is served from memory:
+
+- Ledger: state__declarations is append-only, so MAX(declaration_id) is a
+  high-water mark. When it moved, only the new declarations are read: the
+  answer changed iff one of them is now the latest for an (entity, scope)
+  pair already in the result, or qualifies for the result itself.
+  Otherwise the entry is kept and its mark advanced.
+- Clock: days_since_declaration is CAST(now - declared_at AS INTEGER), so
+  each latest row changes (or crosses threshold_days) at a known instant.
+  The earliest of those instants is the entry's valid_until.
+
+Entries are keyed by (database, report_id, query_type, normalized params)
+and stamped with the database epoch (ops__table_generations, migration
+22), so a rebuilt database never serves old rows. Databases without the
+epoch are not cached.
+
+Each result carries provenance: hit, computed_at, declaration_high_water
+and valid_until.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+import database
+from state_ledger import queries as state_queries
+
+MAX_ENTRIES = 256
+_UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+# Instant a latest row next changes the answer; ? is the threshold
+# (-1: every day boundary). Future-dated rows are never cacheable.
+_BOUNDARY_SQL = """
+    CASE
+        WHEN JULIANDAY({declared_at}) > JULIANDAY('now') THEN JULIANDAY('now')
+        ELSE JULIANDAY({declared_at}) + MAX({days}, ?) + 1
+    END
+"""
+
+_VALID_UNTIL_SQL = f"""
+    SELECT MIN({_BOUNDARY_SQL.format(declared_at="declared_at", days="days_since_declaration")})
+    FROM view_state_time_in_state
+    WHERE declared_at IS NOT NULL
+"""
+
+_DAYS_SQL = "CAST((JULIANDAY('now') - JULIANDAY(d.declared_at)) AS INTEGER)"
+
+# Declarations past the high-water mark that are now the latest for their pair
+_NEW_LATEST_SQL = f"""
+    SELECT
+        d.entity_ref,
+        d.scope_ref,
+        {_DAYS_SQL} AS days_since_declaration,
+        {_BOUNDARY_SQL.format(declared_at="d.declared_at", days=_DAYS_SQL)} AS boundary
+    FROM state__declarations d
+    WHERE d.declaration_id > ?
+    AND NOT EXISTS (
+        SELECT 1
+        FROM state__declarations o
+        WHERE o.entity_ref = d.entity_ref
+        AND o.scope_ref = d.scope_ref
+        AND o.declared_at > d.declared_at
+    )
+"""
+
+
+class _Entry(NamedTuple):
+    epoch: int
+    high_water: int
+    valid_until: float          # julian day; inf when no row can age
+    pairs: FrozenSet[Tuple[str, str]]
+    rows: List[Dict[str, Any]]
+    computed_at: float          # julian day
+
+
+_lock = threading.Lock()
+_entries: "OrderedDict[Tuple[Any, ...], _Entry]" = OrderedDict()
+
+
+def normalize_report_params(query_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    if not isinstance(params, dict):
+        raise ValueError("params must be an object")
+    if query_type == "latest_declaration_per_entity":
+        if params:
+            raise ValueError("params must be empty for latest_declaration_per_entity")
+        return {}
+    if query_type == "entities_time_in_state_over":
+        threshold_days = params.get("threshold_days")
+        cadence_days = params.get("cadence_days")
+        raw_value = threshold_days if threshold_days is not None else cadence_days
+        if raw_value is None:
+            raise ValueError("threshold_days or cadence_days is required")
+        if not isinstance(raw_value, int) or raw_value < 0:
+            raise ValueError("threshold_days must be a non-negative integer")
+        return {"threshold_days": raw_value}
+    if query_type == "entities_missing_reaffirmation_over":
+        threshold_days = params.get("threshold_days")
+        if threshold_days is None:
+            raise ValueError("threshold_days is required")
+        if not isinstance(threshold_days, int) or threshold_days < 0:
+            raise ValueError("threshold_days must be a non-negative integer")
+        return {"threshold_days": threshold_days}
+    raise ValueError("query_type is not supported")
+
+
+def _report_query(query_type: str, params: Dict[str, Any]) -> Tuple[Callable[..., List[Dict[str, Any]]], Optional[int]]:
+    """(query function over conn, threshold_days or None for every row)."""
+    if query_type == "entities_time_in_state_over":
+        threshold = params["threshold_days"]
+        return (lambda conn: state_queries.query_entities_time_in_state_over(threshold, conn=conn)), threshold
+    if query_type == "entities_missing_reaffirmation_over":
+        threshold = params["threshold_days"]
+        return (lambda conn: state_queries.query_entities_missing_reaffirmation_over(threshold, conn=conn)), threshold
+    if query_type == "latest_declaration_per_entity":
+        return (lambda conn: state_queries.query_latest_declaration_per_entity(conn=conn)), None
+    raise ValueError("query_type is not supported")
+
+
+def _julian_to_iso(julian_day: float) -> Optional[str]:
+    if julian_day == float("inf"):
+        return None
+    seconds = (julian_day - _UNIX_EPOCH_JULIAN_DAY) * 86400.0
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _epoch(conn: sqlite3.Connection) -> Optional[int]:
+    try:
+        row = conn.execute(
+            "SELECT generation FROM ops__table_generations WHERE table_name = '__epoch__'"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def _advance(conn: sqlite3.Connection, entry: _Entry, high_water: int,
+             threshold: Optional[int]) -> Optional[_Entry]:
+    """entry moved to high_water, or None if the new declarations change the answer."""
+    valid_until = entry.valid_until
+    bound = -1 if threshold is None else threshold
+    for row in conn.execute(_NEW_LATEST_SQL, (bound, entry.high_water)):
+        days = row["days_since_declaration"]
+        if (row["entity_ref"], row["scope_ref"]) in entry.pairs:
+            return None
+        if threshold is None or (days is not None and days > threshold):
+            return None
+        if row["boundary"] is not None:
+            valid_until = min(valid_until, row["boundary"])
+    return entry._replace(high_water=high_water, valid_until=valid_until)
+
+
+def run_report(report_id: int, query_type: str,
+               params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Rows for a saved report plus cache provenance.
+
+    params must already be normalized (normalize_report_params).
+    Raises ValueError for an unsupported query_type.
+    """
+    query, threshold = _report_query(query_type, params)
+    key = (str(database.resolve_db_path()), report_id, query_type, json.dumps(params, sort_keys=True))
+    conn = database.get_read_connection()
+    try:
+        # One snapshot for the mark, the rows and the boundaries
+        conn.execute("BEGIN")
+        epoch = _epoch(conn)
+        high_water, now = conn.execute(
+            "SELECT COALESCE(MAX(declaration_id), 0), JULIANDAY('now') FROM state__declarations"
+        ).fetchone()
+
+        with _lock:
+            entry = _entries.get(key)
+        if entry is not None and epoch is not None and entry.epoch == epoch:
+            if entry.high_water != high_water:
+                entry = _advance(conn, entry, high_water, threshold)
+            if entry is not None and now < entry.valid_until:
+                with _lock:
+                    _entries[key] = entry
+                    _entries.move_to_end(key)
+                return entry.rows, _provenance(entry, hit=True)
+
+        bound = -1 if threshold is None else threshold
+        valid_until = conn.execute(_VALID_UNTIL_SQL, (bound,)).fetchone()[0]
+        rows = query(conn)
+        finished = conn.execute("SELECT JULIANDAY('now')").fetchone()[0]
+        entry = _Entry(
+            epoch=epoch if epoch is not None else 0,
+            high_water=high_water,
+            valid_until=valid_until if valid_until is not None else float("inf"),
+            pairs=frozenset((row["entity_ref"], row["scope_ref"]) for row in rows),
+            rows=rows,
+            computed_at=now,
+        )
+        # A boundary passed while the query ran: serve the rows, do not keep them
+        if epoch is not None and finished < entry.valid_until:
+            with _lock:
+                _entries[key] = entry
+                _entries.move_to_end(key)
+                while len(_entries) > MAX_ENTRIES:
+                    _entries.popitem(last=False)
+        return rows, _provenance(entry, hit=False)
+    finally:
+        conn.close()
+
+
+def _provenance(entry: _Entry, hit: bool) -> Dict[str, Any]:
+    return {
+        "hit": hit,
+        "computed_at": _julian_to_iso(entry.computed_at),
+        "declaration_high_water": entry.high_water,
+        "valid_until": _julian_to_iso(entry.valid_until),
+    }
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,349 @@
+"""
+Background snapshots of saved reports and the weekly ritual.
+
+Saved reports (ops__saved_reports) and scripts/weekly_ritual.py scan the
+slow state views. This module re-runs every saved report and the ritual
+bundle on a fixed cadence and writes each result as a timestamped JSON
+snapshot, so /api/reports/snapshot and /api/reports/ritual_snapshot
+answer instantly from the newest file instead of running the query inside
+the request.
+
+Snapshots live next to the database (cutter.db -> cutter.db-snapshots/):
+
+    report-<report_id>-<UTC stamp>.json
+    weekly_ritual-<UTC stamp>.json
+
+Each file is written to a temp name and os.replace()d, and the newest
+CUTTER_SNAPSHOT_KEEP per report are kept. Files are stamped with the
+database epoch (migration 22); after a reset the old ones are ignored. Scheduled runs never call
+mark_report_run(): last_run_at stays the last interactive run.
+
+Any number of processes may host the scheduler (server workers, the
+standalone daemon): a cycle takes an exclusive lock on the snapshot
+directory and is skipped if another process finished one less than an
+interval ago.
+
+Configuration (environment):
+    CUTTER_REPORT_SCHEDULER  seconds between cycles, or on/1 for the default
+                             (900); unset/off leaves the scheduler stopped
+    CUTTER_SNAPSHOT_DIR      snapshot directory (default: <db>-snapshots)
+    CUTTER_SNAPSHOT_KEEP     newest N snapshots kept per report (default: 24)
+
+Usage:
+    python -m ops_layer.report_scheduler --once
+    python -m ops_layer.report_scheduler --interval 900
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: cycles are not coordinated across processes
+    fcntl = None
+
+# Add project root to path (python ops_layer/report_scheduler.py)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import database
+from ops_layer import report_cache
+
+SCHEDULER_ENV = "CUTTER_REPORT_SCHEDULER"
+SNAPSHOT_DIR_ENV = "CUTTER_SNAPSHOT_DIR"
+SNAPSHOT_KEEP_ENV = "CUTTER_SNAPSHOT_KEEP"
+DEFAULT_INTERVAL_SECONDS = 900.0
+DEFAULT_KEEP = 24
+SNAPSHOT_SUFFIX = "-snapshots"
+RITUAL_KIND = "weekly_ritual"
+RITUAL_EVENTS = 20
+LOCK_NAME = ".scheduler.lock"
+STAMP_NAME = ".last_cycle"
+
+_TRUTHY = {"1", "true", "yes", "on"}
+_FALSY = {"0", "false", "no", "off"}
+
+_thread: Optional[threading.Thread] = None
+_thread_pid: Optional[int] = None
+_stop = threading.Event()
+_start_lock = threading.Lock()
+
+
+def get_interval() -> Optional[float]:
+    """Seconds between cycles, or None when the scheduler is disabled."""
+    raw_value = os.environ.get(SCHEDULER_ENV, "").strip().lower()
+    if not raw_value or raw_value in _FALSY:
+        return None
+    if raw_value in _TRUTHY:
+        return DEFAULT_INTERVAL_SECONDS
+    try:
+        return max(1.0, float(raw_value))
+    except ValueError:
+        print(f"[SCHEDULER] Ignoring {SCHEDULER_ENV}={raw_value!r} (expected seconds or on/off)")
+        return None
+
+
+def get_keep() -> int:
+    raw_value = os.environ.get(SNAPSHOT_KEEP_ENV)
+    if raw_value is None or not raw_value.strip():
+        return DEFAULT_KEEP
+    try:
+        return max(1, int(raw_value))
+    except ValueError:
+        return DEFAULT_KEEP
+
+
+def get_snapshot_dir(db_path: Optional[Path] = None) -> Path:
+    raw_value = os.environ.get(SNAPSHOT_DIR_ENV)
+    if raw_value is not None and raw_value.strip():
+        return Path(raw_value)
+    db_path = Path(db_path) if db_path is not None else database.resolve_db_path()
+    return db_path.with_name(db_path.name + SNAPSHOT_SUFFIX)
+
+
+def report_kind(report_id: int) -> str:
+    return f"report-{report_id}"
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _db_epoch() -> Optional[int]:
+    generations = database.get_table_generations([])
+    return generations.get("__epoch__") if generations else None
+
+
+def write_snapshot(kind: str, payload: Dict[str, Any], directory: Optional[Path] = None) -> Path:
+    """Atomically write payload as the newest snapshot of kind; prune old ones."""
+    directory = directory if directory is not None else get_snapshot_dir()
+    payload = dict(payload, db_epoch=_db_epoch())
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = _utc_now().strftime("%Y%m%dT%H%M%S%fZ")
+    path = directory / f"{kind}-{stamp}.json"
+    tmp_path = directory / f".{path.name}.{os.getpid()}.tmp"
+    try:
+        tmp_path.write_text(json.dumps(payload, default=str), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    for old_path in _snapshot_paths(kind, directory)[get_keep():]:
+        old_path.unlink(missing_ok=True)
+    return path
+
+
+def _snapshot_paths(kind: str, directory: Path) -> List[Path]:
+    """Snapshots of kind, newest first (stamps sort lexically)."""
+    if not directory.exists():
+        return []
+    prefix = f"{kind}-"
+    paths = [
+        path for path in directory.glob(f"{kind}-*.json")
+        if path.name[len(prefix):-len(".json")][:1].isdigit()
+    ]
+    return sorted(paths, key=lambda path: path.name, reverse=True)
+
+
+def latest_snapshot(kind: str, directory: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Newest readable snapshot of kind taken from this database, or None."""
+    directory = directory if directory is not None else get_snapshot_dir()
+    epoch = _db_epoch()
+    for path in _snapshot_paths(kind, directory):
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue  # pruned or replaced under us: try the next one
+        if payload.get("db_epoch") != epoch:
+            continue  # written before the database was reset
+        payload["snapshot_file"] = path.name
+        return payload
+    return None
+
+
+@contextlib.contextmanager
+def _cycle_lock(directory: Path) -> Iterator[bool]:
+    """Yield True if this process may run a cycle now (non-blocking)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield True
+        return
+    with open(directory / LOCK_NAME, "a") as handle:
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def snapshot_report(report: Dict[str, Any], directory: Optional[Path] = None) -> Optional[Path]:
+    """Run one saved report and store the result; None if its params are invalid."""
+    try:
+        params = json.loads(report.get("params_json") or "{}")
+        normalized_params = report_cache.normalize_report_params(report.get("query_type"), params)
+    except ValueError as e:
+        print(f"[SCHEDULER] Skipping report {report.get('report_id')}: {e}")
+        return None
+    started = time.perf_counter()
+    rows, cache = report_cache.run_report(report["report_id"], report["query_type"], normalized_params)
+    return write_snapshot(report_kind(report["report_id"]), {
+        "kind": "report",
+        "report_id": report["report_id"],
+        "report_name": report.get("report_name"),
+        "query_type": report["query_type"],
+        "params": normalized_params,
+        "generated_at": _utc_now().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        "cache": cache,
+        "rows": rows,
+    }, directory)
+
+
+def snapshot_ritual(directory: Optional[Path] = None, events: int = RITUAL_EVENTS) -> Path:
+    """Build the weekly ritual bundle and store it."""
+    from scripts import weekly_ritual  # lazy: only the scheduler needs the script's queries
+    started = time.perf_counter()
+    ritual = weekly_ritual.build_ritual_data(events=events)
+    return write_snapshot(RITUAL_KIND, {
+        "kind": RITUAL_KIND,
+        "generated_at": _utc_now().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        "ritual": ritual,
+    }, directory)
+
+
+def run_cycle(force: bool = False, interval: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Snapshot every saved report and the ritual bundle.
+
+    Skipped (skipped=True) when another process holds the cycle lock or,
+    unless force, finished a cycle less than interval seconds ago.
+    """
+    directory = get_snapshot_dir()
+    interval = interval if interval is not None else (get_interval() or DEFAULT_INTERVAL_SECONDS)
+    summary: Dict[str, Any] = {"skipped": True, "reports": 0, "ritual": False, "directory": str(directory)}
+    with _cycle_lock(directory) as acquired:
+        if not acquired:
+            return summary
+        stamp_path = directory / STAMP_NAME
+        try:
+            since_last = time.time() - stamp_path.stat().st_mtime
+        except OSError:
+            since_last = None
+        if not force and since_last is not None and since_last < interval:
+            return summary
+
+        started = time.perf_counter()
+        summary["skipped"] = False
+        for report in database.list_saved_reports():
+            try:
+                if snapshot_report(report, directory) is not None:
+                    summary["reports"] += 1
+            except Exception as e:
+                print(f"[SCHEDULER] Report {report.get('report_id')} failed: {e}")
+        try:
+            snapshot_ritual(directory)
+            summary["ritual"] = True
+        except Exception as e:
+            print(f"[SCHEDULER] Weekly ritual failed: {e}")
+        stamp_path.touch()
+        summary["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    print(f"[SCHEDULER] Snapshotted {summary['reports']} report(s)"
+          f"{' and the weekly ritual' if summary['ritual'] else ''} in {summary['duration_ms']:.0f}ms")
+    return summary
+
+
+def _loop(interval: float) -> None:
+    while not _stop.is_set():
+        try:
+            run_cycle(interval=interval)
+        except Exception as e:
+            print(f"[SCHEDULER] Cycle failed: {e}")
+        _stop.wait(interval)
+
+
+def start_scheduler_thread(interval: Optional[float] = None) -> Optional[threading.Thread]:
+    """Start the scheduler thread once per process when enabled (or given an interval)."""
+    global _thread, _thread_pid
+    interval = interval if interval is not None else get_interval()
+    if interval is None:
+        return None
+    with _start_lock:
+        # A forked worker does not inherit the parent's thread
+        if _thread is None or _thread_pid != os.getpid() or not _thread.is_alive():
+            _stop.clear()
+            _thread = threading.Thread(target=_loop, args=(interval,), name="cutter-scheduler", daemon=True)
+            _thread_pid = os.getpid()
+            _thread.start()
+    return _thread
+
+
+def install(app: Any) -> None:
+    """
+    Start the scheduler on the first request each process serves.
+
+    Never at import: a pre-forking server imports the app in a parent that
+    serves no requests, and forked workers must not inherit a running thread.
+    """
+    interval = get_interval()
+    if interval is None:
+        return
+
+    @app.before_request
+    def _start_report_scheduler() -> None:
+        if _thread_pid != os.getpid():
+            start_scheduler_thread(interval)
+
+
+def stop_scheduler_thread(timeout: float = 10.0) -> None:
+    global _thread
+    with _start_lock:
+        thread, _thread = _thread, None
+    _stop.set()
+    if thread is not None and _thread_pid == os.getpid():
+        thread.join(timeout)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Precompute saved reports and the weekly ritual into snapshot files",
+        epilog="""
+Examples:
+  python -m ops_layer.report_scheduler --once
+  python -m ops_layer.report_scheduler --interval 900
+  TEST_DB_PATH=./data/test_scale.db python -m ops_layer.report_scheduler --once
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--once', action='store_true', help='Run one cycle now and exit')
+    parser.add_argument('--interval', type=float, default=None,
+                        help=f'Seconds between cycles (default: ${SCHEDULER_ENV} or {DEFAULT_INTERVAL_SECONDS:g})')
+    args = parser.parse_args(argv)
+
+    if args.once:
+        summary = run_cycle(force=True)
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    interval = args.interval or get_interval() or DEFAULT_INTERVAL_SECONDS
+    print(f"[SCHEDULER] Every {interval:g}s -> {get_snapshot_dir()}")
+    try:
+        _loop(interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
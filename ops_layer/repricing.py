@@ -0,0 +1,432 @@
+"""
+What-if repricing of open quotes.
+
+When the shop rate (ops__shop_config) or a material's cost_per_cubic_inch
+moves, every open quote's physics anchor moves with it. Instead of running
+/recalculate once per quote, a repricing run:
+
+1. Loads every Draft / Sent, non-deleted quote with its part in one read
+   query (quantity, material, system_price_anchor, physics_snapshot_json,
+   part volume and dimensions).
+2. Builds per-quote input arrays from the saved physics snapshot:
+   - stock volume: snapshot stock_volume_in3, else estimated from the part
+     dimensions with the suggest_stock() kerf and rounding rules
+   - material cost per unit: stock volume x scenario cost x markup; without
+     a snapshot stock volume, the saved pricing_inputs material cost scaled
+     by the scenario / current cost and markup ratios (the estimated stock
+     only when there is no saved material cost)
+   - per-part, setup and handling minutes and the shop rate: snapshot
+     pricing_inputs, else the estimate_runtime() formula and the
+     configured defaults
+3. Prices all of them at their own quantity in one price_curve() call
+   (NumPy broadcasts the per-quote arrays).
+4. Writes a result set (migration 25): one ops__reprice_runs row with the
+   scenario and totals, one ops__reprice_results row per quote with the
+   anchor before and after.
+
+system_price_anchor is stored per unit by the quote UI (the glass box) and
+as the total by anchor_price-only callers. Each quote's anchor_after is
+reported on the same basis as its anchor_before: per unit when the saved
+anchor is closer to the quote's own price per unit than to its total (the
+two forms pricing_engine.reproduces_anchor() accepts). Run totals are
+always quote totals.
+
+Quotes are never modified. The scenario defaults to each quote's saved
+shop rate and times and to the current markup and material costs;
+shop_rate_hour, material_markup, setup_time_mins, handling_time_mins and
+per-material material_costs can be overridden to ask "what if".
+
+Quotes whose material cost cannot be determined (no snapshot volume, no
+saved material cost and no part dimensions) are counted but not repriced.
+
+Usage:
+    python -m ops_layer.repricing
+    python -m ops_layer.repricing --shop-rate 85 --material-cost "Aluminum 6061=0.35"
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Add project root to path (python ops_layer/repricing.py)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import database
+import write_queue
+from ops_layer import estimator
+from ops_layer.pricing_engine import DEFAULT_HANDLING_TIME_MINS, MATERIAL_MARKUP, price_curve
+
+OPEN_STATUSES = ("Draft", "Sent")
+FALLBACK_MATERIAL_COST = 0.30  # Aluminum 6061, as PriceCalculator.material_cost_per_unit
+STOCK_SNAPSHOT = "snapshot"
+STOCK_ESTIMATED = "estimated"
+
+_SCENARIO_KEYS = ("shop_rate_hour", "material_markup", "setup_time_mins", "handling_time_mins")
+
+_OPEN_QUOTES_SQL = f"""
+    SELECT
+        q.id, q.quote_id, q.status, q.material, q.quantity,
+        q.system_price_anchor, q.physics_snapshot_json,
+        p.volume, p.dimensions_json
+    FROM ops__quotes q
+    LEFT JOIN ops__parts p ON p.id = q.part_id
+    WHERE q.status IN ({", ".join("?" for _ in OPEN_STATUSES)})
+      AND COALESCE(q.is_deleted, 0) = 0
+    ORDER BY q.id
+"""
+
+
+def resolve_scenario(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Current markup and material costs with overrides applied (None: per-quote value).
+
+    Raises:
+        ValueError: Unknown keys, or values that are not positive numbers
+    """
+    overrides = dict(overrides or {})
+    unknown = set(overrides) - set(_SCENARIO_KEYS) - {"material_costs"}
+    if unknown:
+        raise ValueError(f"Unknown scenario keys: {', '.join(sorted(unknown))}")
+
+    scenario = {
+        "shop_rate_hour": None,      # None: keep each quote's saved shop rate
+        "material_markup": MATERIAL_MARKUP(),
+        "setup_time_mins": None,     # None: keep each quote's saved setup time
+        "handling_time_mins": None,  # None: keep each quote's saved handling time
+        "material_costs": {},
+    }
+    for key in _SCENARIO_KEYS:
+        if overrides.get(key) is not None:
+            scenario[key] = _non_negative(key, overrides[key])
+
+    material_costs = overrides.get("material_costs") or {}
+    if not isinstance(material_costs, dict):
+        raise ValueError("material_costs must map material names to cost_per_cubic_inch")
+    scenario["material_costs"] = {
+        str(name): _non_negative(f"material_costs[{name}]", cost) for name, cost in material_costs.items()
+    }
+    return scenario
+
+
+def _non_negative(name: str, value: Any) -> float:
+    number = float(value)
+    if not np.isfinite(number) or number < 0:
+        raise ValueError(f"{name} must be a non-negative number")
+    return number
+
+
+def load_open_quotes(db_path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Every open quote with the inputs its anchor depends on (one query)."""
+    conn = database.get_read_connection(db_path)
+    try:
+        rows = conn.execute(_OPEN_QUOTES_SQL, OPEN_STATUSES).fetchall()
+    finally:
+        conn.close()
+
+    quotes = []
+    for row in rows:
+        try:
+            snapshot = json.loads(row["physics_snapshot_json"] or "{}")
+        except (TypeError, ValueError):
+            snapshot = {}
+        try:
+            dims = json.loads(row["dimensions_json"] or "{}")
+        except (TypeError, ValueError):
+            dims = {}
+        inputs = snapshot.get("pricing_inputs") if isinstance(snapshot, dict) else None
+        quotes.append({
+            "id": row["id"],
+            "quote_id": row["quote_id"],
+            "status": row["status"],
+            "material": row["material"],
+            "quantity": max(int(row["quantity"] or 1), 1),
+            "anchor_before": float(row["system_price_anchor"] or 0.0),
+            "snapshot_stock_volume": (snapshot.get("stock_volume_in3") if isinstance(snapshot, dict) else None),
+            "pricing_inputs": inputs if isinstance(inputs, dict) else {},
+            "part_volume": row["volume"],
+            "dims": dims if isinstance(dims, dict) else {},
+        })
+    return quotes
+
+
+def _column(quotes: List[Dict[str, Any]], getter) -> np.ndarray:
+    """Float array of getter(quote); missing or malformed values become NaN."""
+    values = np.full(len(quotes), np.nan)
+    for i, quote in enumerate(quotes):
+        try:
+            value = getter(quote)
+            if value is not None:
+                values[i] = float(value)
+        except (TypeError, ValueError, KeyError):
+            pass
+    return values
+
+
+def suggest_stock_volumes(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """estimator.suggest_stock() volume for arrays of part dimensions."""
+    kerf = estimator.SAW_KERF()
+    volume = np.ones_like(x)
+    for dim in (x + kerf, y + kerf, z + kerf):
+        increment = np.where(dim < 1.0, 0.0625, np.where(dim < 3.0, 0.125, 0.25))
+        volume = volume * (np.ceil(dim / increment) * increment)
+    return volume
+
+
+def reprice(quotes: List[Dict[str, Any]], scenario: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Recompute the anchor of every quote under a scenario (resolve_scenario()).
+
+    Returns arrays aligned with quotes: stock_volume_in3, stock_source
+    (object: 'snapshot', 'estimated' or None), per_unit (anchor_before is a
+    unit price), anchor_after (on anchor_before's basis; NaN where the
+    stock volume is unknown), delta and delta_pct.
+    """
+    quantity = np.array([quote["quantity"] for quote in quotes], dtype=np.int64)
+    anchor_before = np.array([quote["anchor_before"] for quote in quotes], dtype=float)
+
+    snapshot_stock = _column(quotes, lambda q: q["snapshot_stock_volume"])
+    estimated_stock = suggest_stock_volumes(
+        _column(quotes, lambda q: q["dims"]["x"]),
+        _column(quotes, lambda q: q["dims"]["y"]),
+        _column(quotes, lambda q: q["dims"]["z"]),
+    )
+    has_snapshot = np.isfinite(snapshot_stock) & (snapshot_stock > 0)
+    stock_volume = np.where(has_snapshot, snapshot_stock, estimated_stock)
+    stock_source = np.where(
+        has_snapshot, STOCK_SNAPSHOT, np.where(np.isfinite(estimated_stock), STOCK_ESTIMATED, None)
+    ).astype(object)
+
+    # Material cost and machinability per distinct material
+    materials = sorted({quote["material"] for quote in quotes})
+    current_costs = {}
+    costs = {}
+    scores = {}
+    for name in materials:
+        cost = database.get_material_cost(name)
+        current_costs[name] = FALLBACK_MATERIAL_COST if cost is None else cost
+        costs[name] = scenario["material_costs"].get(name, current_costs[name])
+        scores[name] = database.get_material_score(name) or 1.0
+    current_cost_per_in3 = np.array([current_costs[quote["material"]] for quote in quotes], dtype=float)
+    cost_per_in3 = np.array([costs[quote["material"]] for quote in quotes], dtype=float)
+    score = np.array([scores[quote["material"]] for quote in quotes], dtype=float)
+
+    # Runtime: saved pricing inputs first, the estimate_runtime() formula otherwise
+    part_volume = np.nan_to_num(_column(quotes, lambda q: q["part_volume"]))
+    adjusted_mrr = estimator.BASE_MRR() / score
+    estimated_per_part = (
+        np.maximum((stock_volume - part_volume) / adjusted_mrr, 0.1) + estimator.MIN_HAND_TIME_PER_PART()
+    )
+    per_part = _column(quotes, lambda q: q["pricing_inputs"]["per_part_time_mins"])
+    per_part = np.where(np.isfinite(per_part), per_part, estimated_per_part)
+
+    setup = _column(quotes, lambda q: q["pricing_inputs"]["setup_time_mins"])
+    setup = np.where(np.isfinite(setup), setup, estimator.SETUP_TIME())
+
+    handling = _column(quotes, lambda q: q["pricing_inputs"]["handling_time_mins"])
+    handling = np.where(
+        np.isfinite(handling), handling,
+        database.get_config('default_handling_time', DEFAULT_HANDLING_TIME_MINS)
+    )
+
+    shop_rate = _column(quotes, lambda q: q["pricing_inputs"]["shop_rate_hour"])
+    shop_rate = np.where(np.isfinite(shop_rate), shop_rate, database.get_config('shop_rate_standard', 75.0))
+
+    def _override(values: np.ndarray, key: str) -> np.ndarray:
+        return values if scenario[key] is None else np.full_like(values, scenario[key])
+
+    # Without a snapshot stock volume the saved material cost is the quote's
+    # own; scale it to the scenario rather than trusting the dimensional estimate
+    saved_material = _column(quotes, lambda q: q["pricing_inputs"]["material_cost_per_unit"])
+    current_markup = MATERIAL_MARKUP()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cost_ratio = np.where(cost_per_in3 == current_cost_per_in3, 1.0, cost_per_in3 / current_cost_per_in3)
+        markup_ratio = (1.0 if scenario["material_markup"] == current_markup
+                        else np.float64(scenario["material_markup"]) / current_markup)
+        scaled_material = saved_material * cost_ratio * markup_ratio
+    material = np.where(
+        ~has_snapshot & np.isfinite(scaled_material), scaled_material,
+        stock_volume * cost_per_in3 * scenario["material_markup"]
+    )
+
+    curve = price_curve(
+        quantity,
+        material_cost_per_unit=material,
+        per_part_time_mins=per_part,
+        setup_time_mins=_override(setup, "setup_time_mins"),
+        shop_rate_hour=_override(shop_rate, "shop_rate_hour"),
+        handling_time_mins=_override(handling, "handling_time_mins"),
+    )
+
+    # Per unit or total: whichever the quote's own price (saved inputs, no
+    # scenario) is closer to, as in pricing_engine.reproduces_anchor()
+    own_total = price_curve(
+        quantity,
+        material_cost_per_unit=np.where(
+            np.isfinite(saved_material), saved_material, stock_volume * current_cost_per_in3 * current_markup
+        ),
+        per_part_time_mins=per_part,
+        setup_time_mins=setup,
+        shop_rate_hour=shop_rate,
+        handling_time_mins=handling,
+    )["total_price"]
+    per_unit = np.abs(anchor_before - own_total / quantity) < np.abs(anchor_before - own_total)
+    anchor_after = np.where(per_unit, curve["unit_price"], curve["total_price"])
+    delta = anchor_after - anchor_before
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta_pct = np.where(anchor_before > 0, delta / anchor_before * 100.0, np.nan)
+    return {
+        "stock_volume_in3": stock_volume,
+        "stock_source": stock_source,
+        "per_unit": per_unit,
+        "anchor_after": anchor_after,
+        "delta": delta,
+        "delta_pct": delta_pct,
+    }
+
+
+def _optional(value: float, decimals: int = 2) -> Optional[float]:
+    return round(float(value), decimals) if np.isfinite(value) else None
+
+
+def run_reprice(overrides: Optional[Dict[str, Any]] = None, db_path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Reprice every open quote under a scenario and store the result set.
+
+    Returns the run summary (see get_run() for the per-quote results).
+
+    Raises:
+        ValueError: If the scenario is invalid
+    """
+    started = time.perf_counter()
+    scenario = resolve_scenario(overrides)
+    quotes = load_open_quotes(db_path)
+    result = reprice(quotes, scenario) if quotes else None
+
+    rows = []
+    before_total = after_total = 0.0
+    for i, quote in enumerate(quotes):
+        anchor_after = _optional(result["anchor_after"][i])
+        if anchor_after is not None:
+            units = quote["quantity"] if result["per_unit"][i] else 1
+            before_total += quote["anchor_before"] * units
+            after_total += anchor_after * units
+        rows.append((
+            quote["id"], quote["quote_id"], quote["status"], quote["material"], quote["quantity"],
+            _optional(result["stock_volume_in3"][i], 6), result["stock_source"][i],
+            quote["anchor_before"], anchor_after,
+            _optional(result["delta"][i]), _optional(result["delta_pct"][i]),
+        ))
+    repriced = sum(1 for row in rows if row[8] is not None)
+    duration_ms = round((time.perf_counter() - started) * 1000.0, 2)
+
+    def _write(conn):
+        cursor = conn.execute("""
+            INSERT INTO ops__reprice_runs
+            (scenario_json, quote_count, repriced_count, anchor_before_total, anchor_after_total, duration_ms)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (json.dumps(scenario), len(rows), repriced, round(before_total, 2), round(after_total, 2), duration_ms))
+        run_id = cursor.lastrowid
+        conn.executemany("""
+            INSERT INTO ops__reprice_results
+            (run_id, quote_row_id, quote_id, status, material, quantity, stock_volume_in3, stock_source,
+             anchor_before, anchor_after, delta, delta_pct)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(run_id,) + row for row in rows])
+        return run_id
+
+    run_id = write_queue.run(_write, db_path=db_path)
+    print(f"[REPRICE] Run {run_id}: {repriced}/{len(rows)} open quotes repriced in {duration_ms:.0f} ms")
+
+    return {
+        "run_id": run_id,
+        "scenario": scenario,
+        "quote_count": len(rows),
+        "repriced_count": repriced,
+        "skipped_count": len(rows) - repriced,
+        "anchor_before_total": round(before_total, 2),
+        "anchor_after_total": round(after_total, 2),
+        "delta_total": round(after_total - before_total, 2),
+        "duration_ms": duration_ms,
+    }
+
+
+def get_run(run_id: int, limit: Optional[int] = None, db_path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """A stored run and its results, largest absolute change first."""
+    conn = database.get_read_connection(db_path)
+    try:
+        run = conn.execute("SELECT * FROM ops__reprice_runs WHERE run_id = ?", (run_id,)).fetchone()
+        if run is None:
+            return None
+        sql = """
+            SELECT quote_row_id, quote_id, status, material, quantity, stock_volume_in3, stock_source,
+                   anchor_before, anchor_after, delta, delta_pct
+            FROM ops__reprice_results
+            WHERE run_id = ?
+            ORDER BY anchor_after IS NULL, ABS(delta) DESC, quote_row_id
+        """
+        params: tuple = (run_id,)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (int(limit),)
+        results = [dict(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+    summary = dict(run)
+    summary["scenario"] = json.loads(summary.pop("scenario_json"))
+    summary["delta_total"] = round(summary["anchor_after_total"] - summary["anchor_before_total"], 2)
+    summary["results"] = results
+    return summary
+
+
+def _material_cost(text: str) -> tuple:
+    name, _, cost = text.rpartition("=")
+    if not name:
+        raise argparse.ArgumentTypeError("expected NAME=COST")
+    return name, float(cost)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="What-if repricing of open (Draft/Sent) quotes; quotes are not modified",
+        epilog="""
+Examples:
+  python -m ops_layer.repricing
+  python -m ops_layer.repricing --shop-rate 85
+  python -m ops_layer.repricing --material-cost "Aluminum 6061=0.35" --top 20
+  TEST_DB_PATH=./data/test_scale.db python -m ops_layer.repricing --markup 1.3
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--shop-rate', type=float, default=None,
+                        help="Shop rate per hour for every quote (default: each quote's saved rate)")
+    parser.add_argument('--markup', type=float, default=None,
+                        help='Material markup multiplier (default: material_markup)')
+    parser.add_argument('--material-cost', type=_material_cost, action='append', default=[],
+                        metavar='NAME=COST', help='cost_per_cubic_inch override (repeatable)')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Largest changes to print (default: 10)')
+    args = parser.parse_args(argv)
+
+    db_path = database.resolve_db_path()
+    if not db_path.exists():
+        print(json.dumps({"error": "Database not found", "db_path": str(db_path)}, indent=2), file=sys.stderr)
+        return 1
+
+    summary = run_reprice({
+        "shop_rate_hour": args.shop_rate,
+        "material_markup": args.markup,
+        "material_costs": dict(args.material_cost),
+    })
+    summary["top_changes"] = get_run(summary["run_id"], limit=args.top)["results"]
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,348 @@
+"""
+Production server entry point.
+
+`python app.py` runs Flask's single-process debug server with the reloader.
+This module serves the same WSGI app with real concurrency:
+
+    python -m ops_layer.server                       # auto backend, tuned defaults
+    python -m ops_layer.server --workers 4 --threads 8 --port 8000
+
+Backends (--backend, default auto):
+- gunicorn  (optional, POSIX): gthread workers, preload_app=True
+- waitress  (optional, Windows-friendly): one process, thread pool
+- builtin   (always available): pre-forked werkzeug workers sharing one
+            listening socket, each with a bounded thread pool (a worker
+            with every thread busy stops accepting, so new connections wait
+            in the listen backlog for a worker with a free thread)
+
+The app is imported once in the parent before workers fork (preload), so
+imports, warmed heavy modules and caches are shared copy-on-write. Per-
+process caches re-validate after fork (cache_invalidation) and the
+fingerprint matrix is a shared mapped file (fingerprint_index).
+
+SQLite WAL sizing: readers run in parallel, but there is one writer at a
+time per database. Beyond ~4 processes extra workers mostly queue on the
+write lock, so the default is min(cpu_count, 4) processes x 8 threads
+(threads release the GIL inside sqlite and file I/O). Within each process
+writes go through one writer thread (write_queue.py, CUTTER_WRITE_QUEUE=1)
+that group-commits them; --no-write-queue turns it off.
+
+SIGTERM / SIGINT stop accepting connections, let in-flight requests finish
+(up to --graceful-timeout seconds), then exit.
+"""
+import argparse
+import os
+import select
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add project root to path (python ops_layer/server.py)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 5000
+DEFAULT_THREADS = 8
+DEFAULT_GRACEFUL_TIMEOUT = 30.0
+MAX_DEFAULT_WORKERS = 4
+BACKENDS = ("auto", "gunicorn", "waitress", "builtin")
+
+
+def default_workers() -> int:
+    """Processes for SQLite WAL: many readers, one writer -> small process count."""
+    if not hasattr(os, "fork"):
+        return 1
+    return max(1, min(os.cpu_count() or 1, MAX_DEFAULT_WORKERS))
+
+
+def resolve_backend(requested: str, workers: int) -> str:
+    if requested != "auto":
+        return requested
+    if hasattr(os, "fork") and _importable("gunicorn"):
+        return "gunicorn"
+    if _importable("waitress") and (workers <= 1 or not hasattr(os, "fork")):
+        return "waitress"
+    return "builtin"
+
+
+def _importable(module_name: str) -> bool:
+    import importlib.util
+    return importlib.util.find_spec(module_name) is not None
+
+
+def load_app(warm: bool = True) -> Any:
+    """Import the app (initializes DB, runs preflight) and warm heavy modules."""
+    from ops_layer.app import app
+    if warm:
+        from ops_layer import warmup
+        timings = warmup.warm_imports()
+        print(f"[SERVER] Preloaded app and {len(timings)} heavy module(s)")
+    return app
+
+
+# ============================================================================
+# BUILTIN BACKEND (werkzeug, pre-fork + thread pool)
+# ============================================================================
+
+def _make_pooled_server(host: str, port: int, app: Any, threads: int, fd: Optional[int] = None) -> Any:
+    from werkzeug.serving import BaseWSGIServer
+
+    class PooledWSGIServer(BaseWSGIServer):
+        """werkzeug server dispatching connections to a bounded thread pool."""
+
+        multithread = True
+        multiprocess = fd is not None
+
+        def __init__(self) -> None:
+            self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="cutter-http")
+            # One slot per thread, taken before accept() and released when the
+            # request is done: the executor's queue never holds waiting sockets
+            self._slots = threading.BoundedSemaphore(threads)
+            # werkzeug calls server_close() on its placeholder socket while adopting fd
+            self._serving = False
+            super().__init__(host, port, app, fd=fd)
+            self._serving = True
+
+        def get_request(self) -> Any:
+            self._slots.acquire()
+            try:
+                # Another worker may have taken the connection while this one waited
+                if not select.select([self.socket], [], [], 0)[0]:
+                    raise BlockingIOError("no pending connection")
+                return super().get_request()
+            except BaseException:
+                self._slots.release()
+                raise
+
+        def shutdown_request(self, request: Any) -> None:
+            try:
+                super().shutdown_request(request)
+            finally:
+                self._slots.release()
+
+        def process_request(self, request: Any, client_address: Any) -> None:
+            self._pool.submit(self._process_request_in_thread, request, client_address)
+
+        def _process_request_in_thread(self, request: Any, client_address: Any) -> None:
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+        def server_close(self) -> None:
+            super().server_close()
+            if self._serving:
+                # Let in-flight requests finish before the process exits
+                self._pool.shutdown(wait=True)
+
+    return PooledWSGIServer()
+
+
+def _serve_in_process(server: Any, graceful_timeout: float) -> None:
+    """serve_forever() until SIGTERM/SIGINT, then drain in-flight requests."""
+    stopping = threading.Event()
+
+    def _stop(signum: int, frame: Any) -> None:
+        if stopping.is_set():
+            return
+        stopping.set()
+        # shutdown() blocks until serve_forever returns: never call it on that thread
+        threading.Thread(target=server.shutdown, name="cutter-shutdown", daemon=True).start()
+        watchdog = threading.Timer(graceful_timeout, lambda: os._exit(1))
+        watchdog.daemon = True
+        watchdog.start()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    server.serve_forever()
+
+
+def _bind_socket(host: str, port: int, backlog: int = 1024) -> socket.socket:
+    from werkzeug.serving import get_sockaddr, select_address_family
+    family = select_address_family(host, port)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(get_sockaddr(host, port, family))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _spawn_worker(sock: socket.socket, host: str, port: int, app: Any, threads: int,
+                  graceful_timeout: float) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    # Child: default signal handling until the server installs its own
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    exit_code = 0
+    try:
+        server = _make_pooled_server(host, port, app, threads, fd=sock.fileno())
+        _serve_in_process(server, graceful_timeout)
+    except Exception as e:
+        print(f"[SERVER] Worker {os.getpid()} failed: {e}")
+        exit_code = 1
+    finally:
+        os._exit(exit_code)
+
+
+def serve_builtin(app: Any, host: str, port: int, workers: int, threads: int,
+                  graceful_timeout: float) -> int:
+    if workers <= 1 or not hasattr(os, "fork"):
+        if workers > 1:
+            print("[SERVER] os.fork unavailable: running 1 process (install waitress for Windows)")
+        server = _make_pooled_server(host, port, app, threads)
+        print(f"[SERVER] builtin: http://{host}:{server.port} (1 process x {threads} threads)")
+        _serve_in_process(server, graceful_timeout)
+        return 0
+
+    sock = _bind_socket(host, port)
+    bound_port = sock.getsockname()[1]
+    children: Dict[int, float] = {}
+    stopping = threading.Event()
+
+    def _stop(signum: int, frame: Any) -> None:
+        stopping.set()
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    for _ in range(workers):
+        children[_spawn_worker(sock, host, bound_port, app, threads, graceful_timeout)] = time.monotonic()
+    print(f"[SERVER] builtin: http://{host}:{bound_port} ({workers} processes x {threads} threads, "
+          f"parent {os.getpid()})")
+
+    deadline: Optional[float] = None
+    while children:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid == 0:
+            if stopping.is_set():
+                deadline = deadline or time.monotonic() + graceful_timeout
+                if time.monotonic() > deadline:
+                    for child in list(children):
+                        try:
+                            os.kill(child, signal.SIGKILL)
+                        except ProcessLookupError:
+                            pass
+            time.sleep(0.1)
+            continue
+        started = children.pop(pid, None)
+        if started is not None and not stopping.is_set():
+            print(f"[SERVER] Worker {pid} exited (status {status}); restarting")
+            if time.monotonic() - started < 1.0:
+                time.sleep(1.0)  # crash loop: do not spin
+            children[_spawn_worker(sock, host, bound_port, app, threads, graceful_timeout)] = time.monotonic()
+    sock.close()
+    print("[SERVER] Stopped")
+    return 0
+
+
+# ============================================================================
+# OPTIONAL BACKENDS
+# ============================================================================
+
+def serve_gunicorn(app: Any, host: str, port: int, workers: int, threads: int,
+                   graceful_timeout: float) -> int:
+    from gunicorn.app.base import BaseApplication
+
+    class CutterGunicorn(BaseApplication):
+        def __init__(self) -> None:
+            self.options = {
+                "bind": f"{host}:{port}",
+                "workers": workers,
+                "threads": threads,
+                "worker_class": "gthread",
+                "preload_app": True,
+                "graceful_timeout": int(graceful_timeout),
+                "timeout": 120,
+            }
+            super().__init__()
+
+        def load_config(self) -> None:
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self) -> Any:
+            return app
+
+    print(f"[SERVER] gunicorn: http://{host}:{port} ({workers} processes x {threads} threads)")
+    CutterGunicorn().run()
+    return 0
+
+
+def serve_waitress(app: Any, host: str, port: int, workers: int, threads: int,
+                   graceful_timeout: float) -> int:
+    import waitress
+    if workers > 1:
+        print("[SERVER] waitress runs one process; use --threads to scale")
+    print(f"[SERVER] waitress: http://{host}:{port} (1 process x {threads} threads)")
+    waitress.serve(app, host=host, port=port, threads=threads)
+    return 0
+
+
+SERVERS = {
+    "gunicorn": serve_gunicorn,
+    "waitress": serve_waitress,
+    "builtin": serve_builtin,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run the Cutter app under a multi-process, multi-threaded WSGI server",
+        epilog="""
+Examples:
+  python -m ops_layer.server
+  python -m ops_layer.server --workers 4 --threads 8 --port 8000
+  python -m ops_layer.server --backend builtin --workers 2
+  TEST_DB_PATH=./data/test_scale.db python -m ops_layer.server --port 5050
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Bind address (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'Processes (default: min(cpu_count, {MAX_DEFAULT_WORKERS}))')
+    parser.add_argument('--threads', type=int, default=DEFAULT_THREADS,
+                        help=f'Threads per process (default: {DEFAULT_THREADS})')
+    parser.add_argument('--backend', choices=BACKENDS, default="auto", help='Server backend (default: auto)')
+    parser.add_argument('--graceful-timeout', type=float, default=DEFAULT_GRACEFUL_TIMEOUT,
+                        help=f'Seconds to drain in-flight requests on shutdown (default: {DEFAULT_GRACEFUL_TIMEOUT:g})')
+    parser.add_argument('--no-warm', action='store_true', help='Do not preload heavy modules (trimesh, reportlab)')
+    parser.add_argument('--no-write-queue', action='store_true',
+                        help='Let request threads write directly instead of through the writer thread')
+    args = parser.parse_args(argv)
+
+    workers = max(1, args.workers if args.workers is not None else default_workers())
+    threads = max(1, args.threads)
+    backend = resolve_backend(args.backend, workers)
+    if backend != "builtin" and not _importable(backend):
+        print(f"[ERROR] Backend '{backend}' is not installed (pip install {backend})")
+        return 1
+
+    # Environment, not write_queue.enable(): gunicorn/forked workers inherit it
+    import write_queue
+    os.environ[write_queue.ENV_VAR] = "0" if args.no_write_queue else "1"
+
+    app = load_app(warm=not args.no_warm)
+    return SERVERS[backend](app, args.host, args.port, workers, threads, args.graceful_timeout)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -91,8 +91,9 @@ document.addEventListener('DOMContentLoaded', async () => {
     await api.loadMaterials();
     await api.fetchTags();
     
-    // Load unclosed quotes for landing page
+    // Load unclosed quotes for landing page, then follow changes live
     await outcome.loadUnclosedQuotes();
+    outcome.subscribeUnclosedQuotes();
     ui.loadHistory();
     // PHASE 1 REMEDIATION: ui.loadGuildCredits() removed - Guild display violates firewall
     
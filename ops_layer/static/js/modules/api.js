@@ -4,6 +4,7 @@
 
 import * as state from './state.js';
 import * as rfq from './rfq.js';
+import * as pricingModel from './pricing_model.js';
 
 export async function calculateQuote(formData) {
     formData.append('ops_mode', state.getOpsMode());
@@ -34,14 +35,33 @@ export async function recalculateQuote(data) {
         ops_mode: state.getOpsMode()
     };
     
-    const response = await fetch('/recalculate', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(payload)
-    });
-    
-    if (!response.ok) throw new Error('Recalculation failed');
-    const newPrices = await response.json();
+    // Evaluate locally from the pricing model; /recalculate only if it cannot be loaded
+    let newPrices;
+    let model = pricingModel.getCachedPricingModel();
+    if (!model) {
+        try {
+            model = await pricingModel.getPricingModel();
+        } catch (error) {
+            console.warn('[API] Pricing model unavailable, using /recalculate:', error);
+        }
+    }
+    if (model) {
+        newPrices = pricingModel.evaluate(model, payload);
+        // /save_quote recomputes the anchor from these
+        newPrices.recalc_inputs = payload;
+        newPrices.pricing_model_version = model.version;
+    } else {
+        const response = await fetch('/recalculate', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(payload)
+        });
+        
+        if (!response.ok) throw new Error('Recalculation failed');
+        newPrices = await response.json();
+        newPrices.recalc_inputs = null;
+        newPrices.pricing_model_version = null;
+    }
     
     // FIX BUG 1: Update stock dimensions with CURRENT DOM values (don't revert to old values)
     return { 
@@ -57,6 +77,21 @@ export async function recalculateQuote(data) {
     };
 }
 
+export async function fetchPriceCurve(pricingInputs, options = {}) {
+    // Full price curve for plotting: arrays aligned with curve.quantity
+    const response = await fetch('/api/pricing/curve', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+            pricing_inputs: pricingInputs,
+            quantities: options.quantities,
+            max_quantity: options.maxQuantity
+        })
+    });
+    if (!response.ok) throw new Error('Price curve failed');
+    return (await response.json()).curve;
+}
+
 export async function saveQuote(data, options) {
     // 1. Get Quote ID
     const quoteIdInput = document.getElementById('quote-id-input');
@@ -106,6 +141,12 @@ export async function saveQuote(data, options) {
         contact_id: contactId,
         contact_name: contactName,
         contact_email: contactEmail,
+        // Price curve inputs (PDF price breaks are recomputed from these)
+        pricing_inputs: data.pricing_inputs || null,
+        stock_volume_in3: data.stock?.volume || null,  // Repricing applies new material costs to it
+        // Locally evaluated prices: the server re-checks anchor_price against these
+        recalc_inputs: data.recalc_inputs || null,
+        pricing_model_version: data.pricing_model_version || null,
         // PHASE 5: RFQ-First Fields
         ...rfq.getRFQData()
     };
@@ -140,6 +181,8 @@ export async function saveQuote(data, options) {
     });
     
     if (!response.ok) {
+        // 409: anchor did not match the server's pricing model; refetch it on the next edit
+        if (response.status === 409) pricingModel.invalidatePricingModel();
         const text = await response.text();
         throw new Error(`Save failed: ${text}`);
     }
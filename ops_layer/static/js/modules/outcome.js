@@ -23,10 +23,20 @@ let originalPrice = null;
 let originalLeadtime = null;
 let originalTerms = null;
 
+// Live worklist (server-sent events); null when not subscribed
+let worklistSource = null;
+const worklistRows = new Map();
+// Polling fallback once the stream is closed for good (e.g. 503 STREAM_LIMIT)
+const WORKLIST_POLL_MS = 60000;
+let worklistPoll = null;
+
 /**
  * Load and display unclosed quotes on landing page
  */
 export async function loadUnclosedQuotes() {
+    // While subscribed the stream keeps the table current
+    if (worklistSource) return;
+    
     try {
         const response = await fetch('/api/unclosed_quotes');
         const data = await response.json();
@@ -36,7 +46,64 @@ export async function loadUnclosedQuotes() {
             return;
         }
         
-        const quotes = data.quotes || [];
+        renderUnclosedQuotes(data.quotes || []);
+    } catch (error) {
+        console.error('[Outcome] Error loading unclosed quotes:', error);
+    }
+}
+
+/**
+ * Subscribe to /api/unclosed_quotes/stream: a snapshot, then deltas
+ * (added, removed, aged) as quotes are created and outcomes saved.
+ * Falls back to loadUnclosedQuotes() where EventSource is unavailable,
+ * and to polling it if the server refuses or ends the stream.
+ */
+export function subscribeUnclosedQuotes() {
+    if (worklistSource || typeof EventSource === 'undefined') return;
+    
+    const source = new EventSource('/api/unclosed_quotes/stream');
+    worklistSource = source;
+    
+    source.onerror = () => {
+        // CONNECTING: the browser reconnects by itself (server sends retry:)
+        if (source.readyState !== EventSource.CLOSED) return;
+        // CLOSED (non-200 such as 503 STREAM_LIMIT): no reconnect, so poll instead
+        console.warn('[Outcome] Worklist stream closed; polling /api/unclosed_quotes');
+        source.close();
+        if (worklistSource === source) worklistSource = null;
+        loadUnclosedQuotes();
+        if (!worklistPoll) worklistPoll = setInterval(loadUnclosedQuotes, WORKLIST_POLL_MS);
+    };
+    
+    source.addEventListener('snapshot', (e) => {
+        const data = JSON.parse(e.data);
+        worklistRows.clear();
+        (data.quotes || []).forEach(quote => worklistRows.set(quote.id, quote));
+        renderWorklist();
+    });
+    
+    source.addEventListener('delta', (e) => {
+        const delta = JSON.parse(e.data);
+        delta.removed.forEach(id => worklistRows.delete(id));
+        delta.added.forEach(quote => worklistRows.set(quote.id, quote));
+        delta.aged.forEach(({ id, age_days }) => {
+            const quote = worklistRows.get(id);
+            if (quote) quote.age_days = age_days;
+        });
+        renderWorklist();
+    });
+}
+
+function renderWorklist() {
+    // Oldest first, as /api/unclosed_quotes orders them
+    const quotes = Array.from(worklistRows.values()).sort((a, b) =>
+        (a.created_at || '').localeCompare(b.created_at || '') || a.id - b.id
+    );
+    renderUnclosedQuotes(quotes);
+}
+
+function renderUnclosedQuotes(quotes) {
+    try {
         const count = quotes.length;
         
         // Update count badge (landing page)
@@ -131,7 +198,7 @@ export async function loadUnclosedQuotes() {
         });
         
     } catch (error) {
-        console.error('[Outcome] Error loading unclosed quotes:', error);
+        console.error('[Outcome] Error rendering unclosed quotes:', error);
     }
 }
 
@@ -0,0 +1,99 @@
+/**
+ * pricing_model.js - Client-side recalculation
+ *
+ * Evaluates the /recalculate formula in the browser from the pricing model
+ * document (GET /api/pricing/model, see ops_layer/pricing_model.py), so
+ * stock / setup / rate / quantity edits need no server round trip.
+ * The server re-checks the anchor on /save_quote (recalc_inputs).
+ */
+
+let cachedModel = null;
+
+export async function getPricingModel() {
+    // Revalidated with If-None-Match by the browser cache (ETag = model version)
+    const response = await fetch('/api/pricing/model', { cache: 'no-cache' });
+    if (!response.ok) throw new Error('Pricing model unavailable');
+    cachedModel = await response.json();
+    return cachedModel;
+}
+
+export function getCachedPricingModel() {
+    return cachedModel;
+}
+
+export function invalidatePricingModel() {
+    cachedModel = null;
+}
+
+function round2(value) {
+    // Python round(value, 2); the server allows model.formula.anchor_tolerance for ties
+    return Math.round((value + Number.EPSILON) * 100) / 100;
+}
+
+function toNumber(value, fallback, name) {
+    // Same defaults as pricing_model.recalculation_inputs(): missing -> fallback, malformed -> error.
+    // As strict as Python float(): "12abc" and "" are errors, not 12 and 0
+    if (value === undefined || value === null) return fallback;
+    const number = typeof value === 'string' && value.trim() === '' ? NaN : Number(value);
+    if (!Number.isFinite(number)) throw new Error(`Invalid ${name}: ${value}`);
+    return number;
+}
+
+function toInteger(value, fallback, name) {
+    // As strict as Python int(): "2.5" is an error, not 2
+    const number = toNumber(value, fallback, name);
+    if (!Number.isInteger(number)) throw new Error(`Invalid ${name}: ${value}`);
+    return number;
+}
+
+export function evaluate(model, inputs) {
+    // Mirrors pricing_model.recalculate(); inputs use the /recalculate body keys
+    const config = model.config;
+    const formula = model.formula;
+    const material = model.materials[inputs.material_name] || {};
+    const costPerIn3 = material.cost_per_cubic_inch ?? formula.fallback_material_cost;
+    const score = material.machinability_score ?? formula.fallback_machinability;
+
+    const stockVolume = toNumber(inputs.stock_x, 0, 'stock_x') * toNumber(inputs.stock_y, 0, 'stock_y')
+        * toNumber(inputs.stock_z, 0, 'stock_z');
+    const partVolume = toNumber(inputs.part_volume, 0, 'part_volume');
+    const setupTime = toNumber(inputs.setup_time, 60.0, 'setup_time');
+    const shopRate = toNumber(inputs.shop_rate, config.shop_rate_hour, 'shop_rate');
+    const quantity = toInteger(inputs.quantity, 1, 'quantity');
+    const handlingTime = toNumber(inputs.handling_time, config.handling_time_mins, 'handling_time');
+    if (quantity < 1) throw new Error('Quantities must be at least 1');
+
+    // Runtime (pure physics, complexity 1.0)
+    const adjustedMrr = config.base_mrr / score;
+    const removalVolume = Math.max(0, stockVolume - partVolume);
+    const machineTime = Math.max(removalVolume / adjustedMrr, formula.min_machine_time_mins);
+    const handTime = config.min_hand_time_mins;
+    const perPartTime = machineTime + handTime;
+
+    // Anchor: setup scrap unit below scrap_unit_below pieces, scrap_factor from there on
+    const materialCostPerUnit = stockVolume * costPerIn3 * config.material_markup;
+    const materialCost = quantity < formula.scrap_unit_below
+        ? materialCostPerUnit * (quantity + 1)
+        : materialCostPerUnit * quantity * formula.scrap_factor;
+    const totalRuntime = setupTime + (perPartTime + handlingTime) * quantity;
+    const laborCost = (totalRuntime / 60.0) * shopRate;
+
+    return {
+        total_price: round2(materialCost + laborCost),
+        material_cost: round2(materialCost),
+        labor_cost: round2(laborCost),
+        total_runtime_mins: round2(totalRuntime),
+        per_part_time_mins: round2(perPartTime),
+        setup_time_mins: round2(setupTime),
+        machine_time_mins: round2(machineTime),
+        hand_time_mins: round2(handTime),
+        quantity: quantity,
+        pricing_inputs: {
+            material_cost_per_unit: materialCostPerUnit,
+            per_part_time_mins: perPartTime,
+            setup_time_mins: setupTime,
+            shop_rate_hour: shopRate,
+            handling_time_mins: handlingTime
+        }
+    };
+}
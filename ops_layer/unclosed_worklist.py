@@ -0,0 +1,281 @@
+"""
+Incrementally maintained unclosed-quotes worklist (/api/unclosed_quotes).
+
+The outcome wizard's exception list is view_ops_unclosed_quotes: every
+quote without a saved outcome (NO_RESPONSE keeps it on the list). Polling
+the view re-joins all outcome events and recomputes every age. This module
+keeps the list in memory per process and brings it up to date from what
+changed since the last sync:
+
+- new quotes: ops__quotes rows past the quote id high-water mark
+- closed quotes: outcome events past the outcome id high-water mark
+- edits and deletes: the 'view_ops_unclosed_quotes' generation counter
+  (migrations 24 and 26) moved, so the view is reloaded once and diffed.
+  Closing a quote (status 'Won' / 'Lost' set with its outcome) does not
+  move it; the outcome high-water mark removes the row.
+- ages: age_days is CAST(now - created_at AS INTEGER), so each row's next
+  tick is known; rows are re-aged only when the earliest tick has passed
+
+Every sync that changes the list records a delta with a new version:
+
+    {"version": 7, "added": [row, ...], "removed": [id, ...],
+     "aged": [{"id": 3, "age_days": 8}, ...]}
+
+"added" rows replace any row with the same id (edits arrive that way).
+/api/unclosed_quotes/stream sends the full list as a `snapshot` event,
+then each delta as a `delta` event; an idle stream reads nothing until
+another connection commits or a row's age ticks over. The database epoch
+(migration 22) guards against serving a list from a rebuilt database.
+
+Usage:
+    from ops_layer import unclosed_worklist
+    version, quotes = unclosed_worklist.snapshot()
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import database
+from ops_layer import event_stream
+
+WORKLIST_KEY = "view_ops_unclosed_quotes"
+EPOCH_KEY = "__epoch__"
+MAX_LOG = 256
+_UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+_MARKS_SQL = f"""
+    SELECT
+        (SELECT generation FROM ops__table_generations WHERE table_name = '{EPOCH_KEY}'),
+        (SELECT generation FROM ops__table_generations WHERE table_name = '{WORKLIST_KEY}'),
+        (SELECT COALESCE(MAX(id), 0) FROM ops__quotes),
+        (SELECT COALESCE(MAX(id), 0) FROM ops__quote_outcome_events)
+"""
+
+# view_ops_unclosed_quotes without the per-row JULIANDAY('now')
+_ROWS_SQL = """
+    SELECT
+        q.id,
+        q.quote_id,
+        q.final_quoted_price,
+        q.lead_time_days,
+        q.payment_terms_days,
+        q.status,
+        q.created_at,
+        cu.name AS customer_name,
+        JULIANDAY(q.created_at) AS created_jd
+    FROM ops__quotes q
+    LEFT JOIN ops__customers cu ON q.customer_id = cu.id
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM ops__quote_outcome_events e
+        WHERE e.quote_id = q.id
+        AND e.outcome_type != 'NO_RESPONSE'
+    )
+"""
+
+_CLOSED_SQL = """
+    SELECT DISTINCT quote_id
+    FROM ops__quote_outcome_events
+    WHERE id > ?
+    AND outcome_type != 'NO_RESPONSE'
+"""
+
+
+class _State:
+    def __init__(self, db_path: str, marks: Tuple[Any, ...]) -> None:
+        self.db_path = db_path
+        self.epoch, self.generation, self.quote_high_water, self.outcome_high_water = marks
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.created: Dict[int, Optional[float]] = {}   # julian day per row
+        self.next_tick = math.inf
+        self.version = 0
+        self.log: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=MAX_LOG)
+
+
+_lock = threading.Lock()
+_state: Optional[_State] = None
+
+
+def _now_julian() -> float:
+    return time.time() / 86400.0 + _UNIX_EPOCH_JULIAN_DAY
+
+
+def _age(created_jd: Optional[float], now: float) -> Optional[int]:
+    if created_jd is None:
+        return None
+    return int(now - created_jd)
+
+
+def _next_tick(created_jd: Optional[float], now: float) -> float:
+    if created_jd is None:
+        return math.inf
+    return created_jd + math.floor(now - created_jd) + 1
+
+
+def _public_row(row: Any, age_days: Optional[int]) -> Dict[str, Any]:
+    """database.get_unclosed_quotes() row shape, plus created_at for ordering."""
+    return {
+        'id': row['id'],
+        'quote_id': row['quote_id'],
+        'final_quoted_price': row['final_quoted_price'],
+        'lead_time_days': row['lead_time_days'] or 0,
+        'payment_terms_days': row['payment_terms_days'] or 30,
+        'status': row['status'],
+        'age_days': age_days,
+        'customer_name': row['customer_name'] or 'Unknown',
+        'created_at': row['created_at'],
+    }
+
+
+def _load(state: _State, conn: Any, now: float, where: str = "", params: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+    """Read rows into state; returns the rows read."""
+    loaded = []
+    for row in conn.execute(_ROWS_SQL + where, params):
+        created_jd = row['created_jd']
+        state.created[row['id']] = created_jd
+        state.next_tick = min(state.next_tick, _next_tick(created_jd, now))
+        public = _public_row(row, _age(created_jd, now))
+        state.rows[row['id']] = public
+        loaded.append(dict(public))
+    return loaded
+
+
+def _reload(previous: _State, conn: Any, marks: Tuple[Any, ...], now: float) -> Tuple[_State, Dict[str, Any]]:
+    """Full read of the view, diffed against the previous list."""
+    state = _State(previous.db_path, marks)
+    state.version, state.log = previous.version, previous.log
+    _load(state, conn, now)
+    added = [dict(row) for quote_id, row in state.rows.items() if previous.rows.get(quote_id) != row]
+    removed = [quote_id for quote_id in previous.rows if quote_id not in state.rows]
+    return state, {"added": added, "removed": removed, "aged": []}
+
+
+def _reage(state: _State, now: float) -> List[Dict[str, Any]]:
+    aged = []
+    state.next_tick = math.inf
+    for quote_id, row in state.rows.items():
+        created_jd = state.created.get(quote_id)
+        age_days = _age(created_jd, now)
+        if age_days != row['age_days']:
+            row['age_days'] = age_days
+            aged.append({"id": quote_id, "age_days": age_days})
+        state.next_tick = min(state.next_tick, _next_tick(created_jd, now))
+    return aged
+
+
+def sync(conn: Optional[Any] = None) -> int:
+    """
+    Bring the worklist up to date with the database; returns its version.
+
+    conn: an open read connection (a stream's); one is opened if omitted.
+    """
+    global _state
+    owns_conn = conn is None
+    if owns_conn:
+        conn = database.get_read_connection()
+    db_path = str(database.resolve_db_path())
+    try:
+        with _lock:
+            # One snapshot for the marks and the rows read against them
+            conn.execute("BEGIN")
+            try:
+                marks = tuple(conn.execute(_MARKS_SQL).fetchone())
+                now = _now_julian()
+                state = _state
+                if (state is None or state.db_path != db_path or marks[0] is None
+                        or state.epoch != marks[0]):
+                    # First sync, another database, or a rebuilt one: start over
+                    state = _State(db_path, marks)
+                    _load(state, conn, now)
+                    if _state is not None:
+                        state.version = _state.version + 1
+                    _state = state
+                    return state.version
+
+                if marks[1] is None or state.generation != marks[1]:
+                    state, delta = _reload(state, conn, marks, now)
+                else:
+                    delta = {"added": [], "removed": [], "aged": []}
+                    if marks[3] != state.outcome_high_water:
+                        for (quote_id,) in conn.execute(_CLOSED_SQL, (state.outcome_high_water,)):
+                            if state.rows.pop(quote_id, None) is not None:
+                                state.created.pop(quote_id, None)
+                                delta["removed"].append(quote_id)
+                    if marks[2] != state.quote_high_water:
+                        delta["added"] = _load(state, conn, now, " AND q.id > ?", (state.quote_high_water,))
+                    state.generation, state.quote_high_water, state.outcome_high_water = marks[1:]
+            finally:
+                conn.execute("COMMIT")
+
+            if now >= state.next_tick:
+                delta["aged"] = _reage(state, now)
+            if delta["added"] or delta["removed"] or delta["aged"]:
+                state.version += 1
+                delta["version"] = state.version
+                state.log.append((state.version, delta))
+            _state = state
+            return state.version
+    finally:
+        if owns_conn:
+            conn.close()
+
+
+def snapshot(conn: Optional[Any] = None) -> Tuple[int, List[Dict[str, Any]]]:
+    """(version, rows oldest first) after a sync."""
+    sync(conn)
+    with _lock:
+        rows = sorted(_state.rows.values(), key=lambda row: (row['created_at'] or "", row['id']))
+        return _state.version, [dict(row) for row in rows]
+
+
+def changes_since(version: int) -> Optional[List[Dict[str, Any]]]:
+    """Deltas after version, oldest first; None when the log no longer reaches back."""
+    with _lock:
+        if _state is None:
+            return None
+        if version == _state.version:
+            return []
+        deltas = [delta for logged_version, delta in _state.log if logged_version > version]
+        if not deltas or deltas[0]["version"] != version + 1:
+            return None
+        return deltas
+
+
+def seconds_until_tick() -> Optional[float]:
+    """Seconds until the earliest row's age_days changes (None when none can)."""
+    with _lock:
+        if _state is None or _state.next_tick == math.inf:
+            return None
+        return max(0.0, (_state.next_tick - _now_julian()) * 86400.0)
+
+
+def stream(max_seconds: Optional[float] = None, poll_interval: Optional[float] = None) -> Iterator[str]:
+    """SSE messages: the current list as `snapshot`, then each change as `delta`."""
+    cursor: Dict[str, Optional[int]] = {"version": None}
+
+    def read_batch(watcher: event_stream.ChangeWatcher) -> Iterator[str]:
+        sync(watcher.conn)
+        deltas = None if cursor["version"] is None else changes_since(cursor["version"])
+        if deltas is None:
+            version, quotes = snapshot(watcher.conn)
+            cursor["version"] = version
+            yield event_stream.format_event(
+                {"version": version, "count": len(quotes), "quotes": quotes}, "snapshot", version
+            )
+            return
+        for delta in deltas:
+            yield event_stream.format_event(delta, "delta", delta["version"])
+        if deltas:
+            cursor["version"] = deltas[-1]["version"]
+
+    return event_stream.run_stream(read_batch, max_seconds=max_seconds, poll_interval=poll_interval,
+                                   wake_in=seconds_until_tick)
+
+
+def clear() -> None:
+    global _state
+    with _lock:
+        _state = None
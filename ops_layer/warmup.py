@@ -0,0 +1,62 @@
+"""
+Deferred heavy imports and optional background warm-up.
+
+trimesh (pulls in scipy), reportlab/qrcode (via pdf_generator) and psutil
+dominate `import ops_layer.app` time, yet only mesh upload, PDF and health
+endpoints need them. app.py imports them on first use so CLI tools and tests
+that import the app do not pay for them.
+
+A long-running server can set CUTTER_WARMUP=1 to import them on a daemon
+thread right after boot, so the first real request is not the slow one.
+"""
+import importlib
+import os
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+WARMUP_ENV = "CUTTER_WARMUP"
+HEAVY_MODULES = (
+    "trimesh",
+    "ops_layer.pdf_generator",
+    "psutil",
+)
+
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_lock = threading.Lock()
+
+
+def is_warmup_enabled() -> bool:
+    return os.environ.get(WARMUP_ENV, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def warm_imports(modules: Sequence[str] = HEAVY_MODULES) -> Dict[str, float]:
+    """Import each module (no-op if already loaded); return seconds per module."""
+    timings: Dict[str, float] = {}
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"[WARMUP] Failed to import {name}: {e}")
+            continue
+        timings[name] = time.perf_counter() - started
+    return timings
+
+
+def _run_warmup() -> None:
+    timings = warm_imports()
+    total_ms = sum(timings.values()) * 1000
+    print(f"[WARMUP] Heavy modules ready in {total_ms:.0f}ms: {', '.join(timings)}")
+
+
+def start_warmup_thread(force: bool = False) -> Optional[threading.Thread]:
+    """Start the warm-up thread once per process when enabled (or forced)."""
+    global _warmup_thread
+    if not (force or is_warmup_enabled()):
+        return None
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_run_warmup, name="cutter-warmup", daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
@@ -12,16 +12,21 @@ CONSTITUTIONAL NOTE: This script OBSERVES the ledger, it does NOT:
 All output is purely descriptive.
 """
 
-import sqlite3
 import json
 from datetime import datetime
 
+import database
+
+
+def get_connection():
+    """Read-only connection to the active database (database.resolve_db_path())."""
+    return database.get_read_connection()
+
 
 def query_all_override_events():
     """Query all QUOTE_OVERRIDDEN events in the ledger."""
     
-    conn = sqlite3.connect('cutter.db')
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -35,12 +40,9 @@ def query_all_override_events():
             q.material,
             q.quantity
         FROM cutter__events oe
-        LEFT JOIN ops__quotes q ON 
-            CASE 
-                WHEN oe.subject_ref LIKE 'quote:%' THEN 
-                    CAST(SUBSTR(oe.subject_ref, 7) AS INTEGER)
-                ELSE NULL 
-            END = q.id
+        LEFT JOIN ops__quotes q ON
+            oe.subject_kind = 'quote'
+            AND q.id = oe.subject_id
         WHERE oe.event_type = 'QUOTE_OVERRIDDEN'
         ORDER BY oe.created_at DESC
     """)
@@ -51,10 +53,40 @@ def query_all_override_events():
     return rows
 
 
+def query_override_events_for_customer(customer_id):
+    """Query QUOTE_OVERRIDDEN events for all quotes of one customer."""
+    
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    # Indexed both ways: quotes by customer, events by (subject_kind, subject_id)
+    cursor.execute("""
+        SELECT 
+            oe.id,
+            oe.subject_ref,
+            oe.event_data,
+            oe.created_at,
+            q.id as quote_record_id,
+            q.quote_id as quote_id_human
+        FROM ops__quotes q
+        JOIN cutter__events oe ON
+            oe.subject_kind = 'quote'
+            AND oe.subject_id = CAST(q.id AS TEXT)
+        WHERE q.customer_id = ?
+        AND oe.event_type = 'QUOTE_OVERRIDDEN'
+        ORDER BY oe.created_at DESC
+    """, (customer_id,))
+    
+    rows = cursor.fetchall()
+    conn.close()
+    
+    return rows
+
+
 def query_override_frequency_by_quote():
     """Count how many times each quote has been overridden."""
     
-    conn = sqlite3.connect('cutter.db')
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -78,8 +110,7 @@ def query_override_frequency_by_quote():
 def query_override_magnitude_distribution():
     """Analyze the distribution of override magnitudes."""
     
-    conn = sqlite3.connect('cutter.db')
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -0,0 +1,42 @@
+"""
+read_connection.py
+Read-Only Connections - queries, reports and CLIs never write
+
+Every read path (state_ledger.queries, the ledger boundaries' query
+functions, saved reports, the ledger query CLI, the weekly ritual) used to
+open the same read-write connection as quoting. This module opens them
+with mode=ro and PRAGMA query_only instead:
+
+- a read can never write, migrate or set journal_mode, even by accident
+- a missing database is an error instead of a new empty file
+- in WAL mode a long analytical read never takes or waits for the write
+  lock, so it runs beside save_quote instead of queueing with it
+
+Read connections also get a larger page cache, memory-mapped I/O and
+in-memory temp storage, which help the scans and sorts behind reports.
+
+No side effects on import (unlike database.py), so the ledger packages
+can use it directly. database.get_read_connection() is the
+TEST_DB_PATH-aware wrapper.
+"""
+import sqlite3
+from pathlib import Path
+from typing import Union
+
+import write_queue
+
+# 64 MiB page cache, up to 256 MiB of the file memory-mapped
+CACHE_SIZE_KIB = 65536
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+def connect(db_path: Union[str, Path]) -> sqlite3.Connection:
+    """A read-only connection with row factory; raises if db_path does not exist."""
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, timeout=write_queue.BUSY_TIMEOUT_SECONDS)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA query_only = ON;")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB};")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE};")
+    conn.execute(f"PRAGMA temp_store = {write_queue.TEMP_STORE};")
+    return conn
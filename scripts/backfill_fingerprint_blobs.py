@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Fingerprint BLOB Backfill
+
+Fills ops__parts.fingerprint_blob (migration 21) from fingerprint_json for
+parts written before the column existed. Only rows with a NULL BLOB are
+touched, in batches, so the script is safe to re-run and to stop midway.
+Rows whose JSON is not a 5-number vector are left NULL and reported.
+
+Usage:
+    python scripts/backfill_fingerprint_blobs.py
+    python scripts/backfill_fingerprint_blobs.py --db-path ./data/test_scale.db --batch-size 5000
+    python scripts/backfill_fingerprint_blobs.py --dry-run
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import database
+from migrations import runner as migration_runner
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def backfill(conn: sqlite3.Connection, batch_size: int = DEFAULT_BATCH_SIZE,
+             dry_run: bool = False) -> Dict[str, Any]:
+    """Pack fingerprint_json into fingerprint_blob where the BLOB is missing."""
+    summary: Dict[str, Any] = {"updated": 0, "invalid": 0, "invalid_part_ids": []}
+    last_id = 0
+    while True:
+        rows = conn.execute("""
+            SELECT id, fingerprint_json FROM ops__parts
+            WHERE fingerprint_blob IS NULL AND id > ?
+            ORDER BY id LIMIT ?
+        """, (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        updates = []
+        for part_id, fingerprint_json in rows:
+            blob = database.pack_fingerprint(fingerprint_json) if fingerprint_json else None
+            if blob is None:
+                summary["invalid"] += 1
+                if len(summary["invalid_part_ids"]) < 20:
+                    summary["invalid_part_ids"].append(part_id)
+            else:
+                updates.append((blob, part_id))
+
+        if updates and not dry_run:
+            conn.executemany(
+                "UPDATE ops__parts SET fingerprint_blob = ? WHERE id = ? AND fingerprint_blob IS NULL",
+                updates
+            )
+            conn.commit()
+        summary["updated"] += len(updates)
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Backfill packed fingerprint BLOBs on ops__parts",
+        epilog="""
+Examples:
+  python scripts/backfill_fingerprint_blobs.py
+  python scripts/backfill_fingerprint_blobs.py --db-path ./data/test_scale.db --batch-size 5000
+  python scripts/backfill_fingerprint_blobs.py --dry-run
+        """
+    )
+    parser.add_argument('--db-path', type=str, help='Database path (default: active DB)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Rows per transaction (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--dry-run', action='store_true', help='Count rows without writing')
+    args = parser.parse_args()
+
+    db_path = Path(args.db_path) if args.db_path else database.resolve_db_path()
+    if not db_path.exists():
+        print(f"[ERROR] Database not found at {db_path}")
+        return 1
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.execute("PRAGMA journal_mode=WAL;")
+        if not args.dry_run:
+            migration_runner.ensure_schema(conn)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(ops__parts)").fetchall()}
+        if "fingerprint_blob" not in columns:
+            print(f"[ERROR] {db_path}: ops__parts.fingerprint_blob missing (run python -m migrations.runner)")
+            return 1
+        summary = backfill(conn, batch_size=max(1, args.batch_size), dry_run=args.dry_run)
+    finally:
+        conn.close()
+
+    prefix = "[BACKFILL] (dry run)" if args.dry_run else "[BACKFILL]"
+    print(f"{prefix} {db_path}: {summary['updated']} BLOB(s) packed, {summary['invalid']} invalid fingerprint(s)")
+    if summary["invalid_part_ids"]:
+        print(json.dumps({"invalid_part_ids": summary["invalid_part_ids"]}))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
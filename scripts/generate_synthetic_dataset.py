@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+Synthetic Dataset Generator - Scale Testing Only
+
+Populates an isolated TEST database with production-scale synthetic data so
+O(n) scans (get_events, view_state_time_in_state, get_all_customers, ...)
+surface in benchmarks and scale tests.
+
+Default target sizes:
+- 1,000,000 cutter__events
+- 100,000 state__declarations across 10,000 state__entities
+- 100,000 ops__quotes / ops__parts / ops__customers / ops__contacts
+
+Distributions (deterministic for a given --seed):
+- Heavy-tailed reuse: a few customers, parts and entities carry most activity
+- Timestamps span --days, ascending with id (append-only ledger order)
+- Stage events come in started/completed pairs with dwell around expectation;
+  some jobs never complete, some promises never see a handoff/response
+- ~5% of entities have no recognition owner (DS-2), cadences 1-30 days (DS-5)
+
+Constitutional compliance:
+- TEST databases only: refuses to run without a test TEST_DB_PATH
+- Bulk executemany inside ONE transaction per run (all-or-nothing)
+- Ledger rows are append-only INSERTs (no UPDATE/DELETE)
+- Bootstrap path: bypasses boundary validation for speed, never for prod
+
+Usage:
+    TEST_DB_PATH=./data/test_scale.db python scripts/generate_synthetic_dataset.py --fresh
+    python scripts/generate_synthetic_dataset.py --db-path ./data/test_scale.db --scale 0.1
+    python scripts/generate_synthetic_dataset.py --events 50000 --declarations 5000 --entities 500
+"""
+
+# CUTTER: LEDGER_SQL_ALLOWED (BOOTSTRAP)
+
+import argparse
+import heapq
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_SIZES = {
+    "events": 1_000_000,
+    "declarations": 100_000,
+    "entities": 10_000,
+    "quotes": 100_000,
+    "parts": 100_000,
+    "customers": 100_000,
+    "contacts": 100_000,
+}
+DEFAULT_DAYS = 365
+DEFAULT_SEED = 4242
+
+SERVICE_ID = "synthetic_generator"
+SERVICE_VERSION = "synthetic"
+ORG_REF = "org:synthetic"
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+MATERIALS = ["Aluminum 6061", "Aluminum 6061", "Aluminum 6061", "Steel 1018", "Stainless 304", "Customer Supplied"]
+STATUSES = ["Draft", "Sent", "Sent", "Sent", "Won", "Won", "Lost"]
+OUTCOMES = ["WON", "LOST", "LOST", "NO_RESPONSE"]
+TAG_NAMES = ["Rush Job", "Expedite", "Tight Tol", "Complex Fixture", "Heavy Deburr", "Proto", "Price Rounding"]
+ENTITY_KINDS = ["customer", "job", "job", "equipment", "project"]
+CADENCES = [1, 7, 7, 14, 30]
+STAGES = [("machining", 3600), ("inspection", 1800), ("packing", 900)]
+CARRIERS = ["UPS", "FedEx", "Freight", "Will Call"]
+STATE_TEXTS = [
+    "Running on second shift",
+    "Waiting on material cert",
+    "Fixture in rework",
+    "Scheduled for next week",
+    "Holding for customer drawing revision",
+    "Running as planned",
+]
+CLASSIFICATIONS = ["stable", "stable", "changing", None]
+
+
+def skewed_index(rng: random.Random, n: int, power: float = 3.0) -> int:
+    """0-based index biased toward low values (heavy-tailed reuse)."""
+    return min(n - 1, int(n * (rng.random() ** power)))
+
+
+class Clock:
+    """Monotonic synthetic timestamps spread evenly (with jitter) over a span."""
+
+    def __init__(self, start: datetime, span: timedelta, steps: int, rng: random.Random) -> None:
+        self.current = start
+        self.step_seconds = span.total_seconds() / max(1, steps)
+        self.rng = rng
+
+    def tick(self) -> datetime:
+        self.current += timedelta(seconds=self.step_seconds * self.rng.uniform(0.2, 1.8))
+        return self.current
+
+
+def fmt(ts: datetime) -> str:
+    return ts.strftime(TS_FORMAT)
+
+
+# ============================================================================
+# ROW GENERATORS (streamed into executemany; never materialized)
+# ============================================================================
+
+def iter_customers(rng: random.Random, n: int, offset: int, start: datetime, span: timedelta) -> Iterator[Tuple]:
+    clock = Clock(start, span, n, rng)
+    for i in range(offset + 1, offset + n + 1):
+        yield (f"Synthetic Customer {i}", f"synthetic-{i}.example.com", fmt(clock.tick()))
+
+
+def iter_contacts(rng: random.Random, n: int, offset: int, customer_ids: Tuple[int, int],
+                  start: datetime, span: timedelta) -> Iterator[Tuple]:
+    clock = Clock(start, span, n, rng)
+    first_id, count = customer_ids
+    for i in range(offset + 1, offset + n + 1):
+        customer_id = first_id + skewed_index(rng, count, power=1.5)
+        yield (
+            f"Synthetic Buyer {i}",
+            f"buyer{i}@synthetic-{customer_id}.example.com",
+            f"555-{i % 10000:04d}",
+            customer_id,
+            fmt(clock.tick())
+        )
+
+
+def iter_parts(rng: random.Random, n: int, offset: int, start: datetime, span: timedelta) -> Iterator[Tuple]:
+    import database
+
+    clock = Clock(start, span, n, rng)
+    for i in range(offset + 1, offset + n + 1):
+        dims = sorted(round(rng.lognormvariate(1.0, 0.7), 3) for _ in range(3))
+        volume = round(dims[0] * dims[1] * dims[2] * rng.uniform(0.25, 0.95), 4)
+        area = round(2 * (dims[0] * dims[1] + dims[1] * dims[2] + dims[0] * dims[2]), 4)
+        fingerprint = [volume / 10.0, dims[0], dims[1], dims[2], area / 50.0]
+        yield (
+            f"CUTTER-S{i:07X}",
+            f"synthetic_part_{i}.step",
+            json.dumps(fingerprint),
+            database.pack_fingerprint(fingerprint),
+            volume,
+            area,
+            json.dumps({"x": dims[0], "y": dims[1], "z": dims[2]}),
+            fmt(clock.tick())
+        )
+
+
+def iter_quotes(rng: random.Random, n: int, offset: int, part_ids: Tuple[int, int],
+                customer_ids: Tuple[int, int], contact_ids: Tuple[int, int],
+                start: datetime, span: timedelta) -> Iterator[Tuple]:
+    clock = Clock(start, span, n, rng)
+    for i in range(offset + 1, offset + n + 1):
+        created_at = fmt(clock.tick())
+        anchor = round(rng.lognormvariate(6.0, 1.0), 2)
+        overridden = rng.random() < 0.4
+        final = round(anchor * rng.uniform(0.85, 1.35), 2) if overridden else anchor
+        tags = {name: round(rng.uniform(0.05, 0.5), 2)
+                for name in rng.sample(TAG_NAMES, rng.choice([0, 0, 1, 1, 2, 3]))}
+        yield (
+            f"SYN-{i:08d}",
+            part_ids[0] + skewed_index(rng, part_ids[1], power=2.0),
+            customer_ids[0] + skewed_index(rng, customer_ids[1]),
+            contact_ids[0] + skewed_index(rng, contact_ids[1], power=1.5),
+            rng.choice(MATERIALS),
+            rng.choice([1, 1, 2, 5, 10, 25, 100, 250]),
+            anchor,
+            final,
+            json.dumps(tags),
+            rng.choice(STATUSES),
+            rng.choice([3, 5, 7, 10, 14, 21, 30, 45]),
+            rng.choice([0, 15, 30, 30, 45, 60]),
+            created_at,
+            created_at
+        )
+
+
+def iter_outcomes(rng: random.Random, quote_ids: Tuple[int, int]) -> Iterator[Tuple]:
+    """~55% of quotes get an outcome row (the rest stay on the unclosed worklist)."""
+    first_id, count = quote_ids
+    for quote_id in range(first_id, first_id + count):
+        if rng.random() < 0.55:
+            yield (quote_id, rng.choice(OUTCOMES), 1)
+
+
+def build_entities(rng: random.Random, n: int, offset: int) -> List[Dict[str, Any]]:
+    entities = []
+    n_actors = max(1, n // 50)
+    for i in range(offset + 1, offset + n + 1):
+        kind = rng.choice(ENTITY_KINDS)
+        owned = rng.random() >= 0.05
+        entities.append({
+            "entity_ref": f"{ORG_REF}/entity:{kind}:{i}",
+            "kind": kind,
+            "label": f"Synthetic {kind.title()} {i}",
+            "cadence_days": rng.choice(CADENCES),
+            "owner": f"{ORG_REF}/actor:estimator-{rng.randrange(n_actors)}" if owned else None,
+        })
+    return entities
+
+
+def iter_declarations(rng: random.Random, n: int, entities: List[Dict[str, Any]],
+                      start: datetime, span: timedelta) -> Iterator[Tuple]:
+    owned = [e for e in entities if e["owner"]]
+    if not owned:
+        return
+    seen_scopes = set()
+    clock = Clock(start, span, n, rng)
+    for _ in range(n):
+        entity = owned[skewed_index(rng, len(owned), power=2.0)]
+        roll = rng.random()
+        if entity["kind"] == "job" and roll < 0.15:
+            scope_ref = "promise:deadline"
+        elif entity["kind"] == "job" and roll < 0.25:
+            scope_ref = "promise:response_by"
+        else:
+            scope_ref = f"{ORG_REF}/scope:weekly"
+        declared_at = clock.tick()
+        if scope_ref.startswith("promise:"):
+            deadline = declared_at + timedelta(days=rng.randint(2, 30))
+            state_text = json.dumps({"deadline": deadline.strftime("%Y-%m-%dT%H:%M:%SZ")})
+        else:
+            state_text = rng.choice(STATE_TEXTS)
+        key = (entity["entity_ref"], scope_ref)
+        if key not in seen_scopes or rng.random() < 0.1:
+            kind = "RECLASSIFICATION"
+        else:
+            kind = "REAFFIRMATION"
+        seen_scopes.add(key)
+        yield (
+            entity["entity_ref"],
+            scope_ref,
+            state_text,
+            kind,
+            entity["owner"],
+            fmt(declared_at),
+            rng.choice(CLASSIFICATIONS)
+        )
+
+
+def iter_events(rng: random.Random, n: int, quote_ids: Tuple[int, int],
+                customer_ids: Tuple[int, int], contact_ids: Tuple[int, int],
+                job_entity_refs: List[str], start: datetime, span: timedelta) -> Iterator[Tuple]:
+    """
+    Ledger exhaust in append order. Follow-up events (stage completions) are
+    scheduled on a heap and released once the clock passes them, so created_at
+    stays ascending with id.
+    """
+    pending: List[Tuple[datetime, int, str, str, Dict[str, Any]]] = []
+    sequence = 0
+    emitted = 0
+    job_counter = 0
+    now = start
+    step_seconds = span.total_seconds() / max(1, n)
+
+    def row(ts: datetime, event_type: str, subject_ref: str, data: Dict[str, Any]) -> Tuple:
+        return (event_type, subject_ref, json.dumps(data), fmt(ts), SERVICE_ID, SERVICE_VERSION)
+
+    while emitted < n:
+        # Time follows emitted progress (bundles emit several rows per step)
+        progress = start + timedelta(seconds=step_seconds * (emitted + rng.uniform(0.2, 1.8)))
+        now = max(now + timedelta(seconds=1), progress)
+        while pending and pending[0][0] <= now and emitted < n:
+            due, _, event_type, subject_ref, data = heapq.heappop(pending)
+            yield row(due, event_type, subject_ref, data)
+            emitted += 1
+        if emitted >= n:
+            break
+
+        roll = rng.random()
+        if roll < 0.35:
+            quote_id = quote_ids[0] + rng.randrange(quote_ids[1])
+            yield row(now, "QUOTE_CREATED", f"quote:{quote_id}", {
+                "material": rng.choice(MATERIALS),
+                "quantity": rng.choice([1, 5, 25, 100]),
+                "status": "Draft"
+            })
+            emitted += 1
+            if rng.random() < 0.4:
+                sequence += 1
+                delta = round(rng.uniform(-200, 400), 2)
+                heapq.heappush(pending, (now + timedelta(seconds=1), sequence, "QUOTE_OVERRIDDEN",
+                                         f"quote:{quote_id}", {"override_delta": delta}))
+        elif roll < 0.50:
+            customer_id = customer_ids[0] + skewed_index(rng, customer_ids[1])
+            yield row(now, "CUSTOMER_RESOLVED", f"customer:{customer_id}",
+                      {"match_method": "domain", "input_domain_present": True})
+            emitted += 1
+        elif roll < 0.60:
+            contact_id = contact_ids[0] + skewed_index(rng, contact_ids[1], power=1.5)
+            yield row(now, "CONTACT_RESOLVED", f"contact:{contact_id}", {"match_method": "email"})
+            emitted += 1
+        elif roll < 0.70:
+            quote_id = quote_ids[0] + rng.randrange(quote_ids[1])
+            yield row(now, "QUOTE_STATUS_CHANGED", f"quote:{quote_id}",
+                      {"old_status": "Draft", "new_status": rng.choice(["Sent", "Won", "Lost"])})
+            emitted += 1
+        elif roll < 0.92:
+            # Job traverses stages; ~10% stall before completing the last stage
+            job_counter += 1
+            subject_ref = f"job:{job_counter}"
+            stage_start = now
+            for stage, expected in STAGES:
+                sequence += 1
+                heapq.heappush(pending, (stage_start, sequence, "stage_started", subject_ref, {"stage": stage}))
+                if rng.random() < 0.1:
+                    break
+                stage_end = stage_start + timedelta(seconds=int(expected * rng.uniform(0.5, 2.5)))
+                sequence += 1
+                heapq.heappush(pending, (stage_end, sequence, "stage_completed", subject_ref, {"stage": stage}))
+                stage_start = stage_end + timedelta(seconds=rng.randint(60, 7200))
+        elif job_entity_refs and roll < 0.97:
+            yield row(now, "carrier_handoff", rng.choice(job_entity_refs), {"carrier": rng.choice(CARRIERS)})
+            emitted += 1
+        elif job_entity_refs:
+            yield row(now, "response_received", rng.choice(job_entity_refs), {"channel": "email"})
+            emitted += 1
+
+
+# ============================================================================
+# GENERATION
+# ============================================================================
+
+def _max_id(cursor: sqlite3.Cursor, table: str, column: str = "id") -> int:
+    cursor.execute(f"SELECT COALESCE(MAX({column}), 0) FROM {table}")
+    return cursor.fetchone()[0]
+
+
+def _table_exists(cursor: sqlite3.Cursor, table: str) -> bool:
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,))
+    return cursor.fetchone() is not None
+
+
+def generate_dataset(sizes: Dict[str, int], seed: int = DEFAULT_SEED,
+                     days: int = DEFAULT_DAYS, now: Optional[datetime] = None,
+                     verbose: bool = True) -> Dict[str, Any]:
+    """
+    Append synthetic rows to the (initialized) TEST_DB_PATH database.
+
+    All inserts run in a single transaction; on any error nothing is written.
+    Returns per-table row counts and elapsed time.
+    """
+    import database
+    db_path = database.require_test_db("synthetic dataset generation")
+
+    rng = random.Random(seed)
+    end = (now or datetime.utcnow()).replace(microsecond=0)
+    span = timedelta(days=days)
+    start = end - span
+
+    def log(message: str) -> None:
+        if verbose:
+            print(message, file=sys.stderr)
+
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    cursor = conn.cursor()
+    counts: Dict[str, int] = {}
+    started = time.perf_counter()
+
+    try:
+        cursor.execute("BEGIN")
+
+        offsets = {
+            "customers": _max_id(cursor, "ops__customers"),
+            "contacts": _max_id(cursor, "ops__contacts"),
+            "parts": _max_id(cursor, "ops__parts"),
+            "quotes": _max_id(cursor, "ops__quotes"),
+        }
+        entity_offset = cursor.execute("SELECT COUNT(*) FROM state__entities").fetchone()[0]
+
+        def insert(table: str, sql: str, rows: Iterator[Tuple]) -> None:
+            t0 = time.perf_counter()
+            cursor.executemany(sql, rows)
+            # rowcount excludes trigger writes (e.g. ops__quote_tags)
+            counts[table] = counts.get(table, 0) + cursor.rowcount
+            log(f"[SYNTH] {table}: {counts[table]} rows ({time.perf_counter() - t0:.1f}s)")
+
+        insert("ops__customers", """
+            INSERT INTO ops__customers (name, domain, created_at) VALUES (?, ?, ?)
+        """, iter_customers(rng, sizes["customers"], offsets["customers"], start, span))
+        customer_ids = (offsets["customers"] + 1, max(1, sizes["customers"]))
+
+        insert("ops__contacts", """
+            INSERT INTO ops__contacts (name, email, phone, current_customer_id, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, iter_contacts(rng, sizes["contacts"], offsets["contacts"], customer_ids, start, span))
+        contact_ids = (offsets["contacts"] + 1, max(1, sizes["contacts"]))
+
+        insert("ops__parts", """
+            INSERT INTO ops__parts (
+                genesis_hash, filename, fingerprint_json, fingerprint_blob, volume, surface_area,
+                dimensions_json, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, iter_parts(rng, sizes["parts"], offsets["parts"], start, span))
+        part_ids = (offsets["parts"] + 1, max(1, sizes["parts"]))
+
+        insert("ops__quotes", """
+            INSERT INTO ops__quotes (
+                quote_id, part_id, customer_id, contact_id, material, quantity,
+                system_price_anchor, final_quoted_price, pricing_tags_json, status,
+                lead_time_days, payment_terms_days, created_at, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, iter_quotes(rng, sizes["quotes"], offsets["quotes"], part_ids, customer_ids,
+                         contact_ids, start, span))
+        quote_ids = (offsets["quotes"] + 1, max(1, sizes["quotes"]))
+
+        if sizes["quotes"]:
+            insert("ops__quote_outcome_events", """
+                INSERT INTO ops__quote_outcome_events (quote_id, outcome_type, wizard_completed)
+                VALUES (?, ?, ?)
+            """, iter_outcomes(rng, quote_ids))
+
+        # Junction tables exist only after migration 07; fill them when present
+        if _table_exists(cursor, "customer_parts") and sizes["quotes"]:
+            insert("customer_parts", """
+                INSERT OR IGNORE INTO customer_parts (customer_id, genesis_hash, first_quoted_at, total_quotes)
+                SELECT q.customer_id, p.genesis_hash, MIN(q.created_at), COUNT(*)
+                FROM ops__quotes q JOIN ops__parts p ON q.part_id = p.id
+                WHERE q.id >= ?
+                GROUP BY q.customer_id, p.genesis_hash
+            """, iter([(quote_ids[0],)]))
+        if _table_exists(cursor, "contact_companies") and sizes["contacts"]:
+            insert("contact_companies", """
+                INSERT OR IGNORE INTO contact_companies (contact_id, customer_id, is_primary)
+                SELECT id, current_customer_id, 1 FROM ops__contacts WHERE id >= ?
+            """, iter([(contact_ids[0],)]))
+
+        entities = build_entities(rng, sizes["entities"], entity_offset)
+        insert("state__entities", """
+            INSERT INTO state__entities (entity_ref, entity_label, cadence_days, created_at)
+            VALUES (?, ?, ?, ?)
+        """, ((e["entity_ref"], e["label"], e["cadence_days"], fmt(start)) for e in entities))
+
+        insert("state__recognition_owners", """
+            INSERT INTO state__recognition_owners (entity_ref, owner_actor_ref, assigned_at, assigned_by_actor_ref)
+            VALUES (?, ?, ?, ?)
+        """, ((e["entity_ref"], e["owner"], fmt(start), f"{ORG_REF}/actor:admin")
+              for e in entities if e["owner"]))
+
+        insert("state__declarations", """
+            INSERT INTO state__declarations (
+                entity_ref, scope_ref, state_text, declaration_kind,
+                declared_by_actor_ref, declared_at, classification
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, iter_declarations(rng, sizes["declarations"], entities, start, span))
+
+        job_entity_refs = [e["entity_ref"] for e in entities if e["kind"] == "job"]
+        insert("cutter__events", """
+            INSERT INTO cutter__events (
+                event_type, subject_ref, event_data, created_at,
+                ingested_by_service, ingested_by_version
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        """, iter_events(rng, sizes["events"], quote_ids, customer_ids, contact_ids,
+                         job_entity_refs, start, span))
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return {
+        "db_path": str(db_path),
+        "seed": seed,
+        "days": days,
+        "counts": counts,
+        "elapsed_s": round(time.perf_counter() - started, 2)
+    }
+
+
+def scaled_sizes(args: argparse.Namespace) -> Dict[str, int]:
+    sizes = {}
+    for key, default in DEFAULT_SIZES.items():
+        explicit = getattr(args, key)
+        sizes[key] = explicit if explicit is not None else int(default * args.scale)
+    return sizes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Populate a TEST database with production-scale synthetic data',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  TEST_DB_PATH=./data/test_scale.db python scripts/generate_synthetic_dataset.py --fresh
+  python scripts/generate_synthetic_dataset.py --db-path ./data/test_scale.db --scale 0.1
+  python scripts/generate_synthetic_dataset.py --events 50000 --declarations 5000 --entities 500
+
+Safety:
+  - Refuses to run unless TEST_DB_PATH (or --db-path) is a test database path
+  - Single transaction: a failed run writes nothing
+        """
+    )
+    parser.add_argument('--db-path', type=str, help='Test database path (sets TEST_DB_PATH)')
+    parser.add_argument('--fresh', action='store_true',
+                        help='Recreate the test database before generating')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiplier applied to all default sizes (default: 1.0)')
+    for key, default in DEFAULT_SIZES.items():
+        parser.add_argument(f'--{key}', type=int, default=None,
+                            help=f'Rows to generate (default: {default:,} x scale)')
+    parser.add_argument('--days', type=int, default=DEFAULT_DAYS,
+                        help='History span in days (default: 365)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='RNG seed')
+    args = parser.parse_args()
+
+    if args.db_path:
+        os.environ['TEST_DB_PATH'] = args.db_path
+
+    import database
+    try:
+        db_path = database.require_test_db("synthetic dataset generation")
+    except RuntimeError as e:
+        print(json.dumps({"error": str(e)}, indent=2))
+        return 1
+
+    if args.fresh or not db_path.exists():
+        from scripts import reset_db
+        reset_db.create_fresh_db(db_path)
+        database.initialize_database()
+
+    summary = generate_dataset(scaled_sizes(args), seed=args.seed, days=args.days)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Import-Time Budget Check
+
+Measures `import ops_layer.app` (or any module) in a fresh interpreter with
+`python -X importtime`, reports the slowest imports, and fails when:
+- cumulative import time exceeds the budget, or
+- a deferred heavy module (trimesh, reportlab, qrcode, psutil, scipy) was
+  imported eagerly.
+
+Each run uses a TEST database (a temp one is created if TEST_DB_PATH is unset),
+so the app's boot-time initialize_database()/preflight never touch production.
+
+Usage:
+    python scripts/import_time_budget.py
+    python scripts/import_time_budget.py --budget-ms 400 --runs 5
+    python scripts/import_time_budget.py --module cutter_ledger.queries --top 10 --output importtime.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_MODULE = "ops_layer.app"
+DEFAULT_BUDGET_MS = 500.0
+DEFAULT_RUNS = 3
+DEFAULT_TOP = 15
+
+# Must only be imported on first use (see ops_layer/warmup.py)
+DEFERRED_MODULES = ("trimesh", "reportlab", "qrcode", "psutil", "scipy", "ops_layer.pdf_generator")
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse `-X importtime` lines into {module, self_us, cumulative_us, depth}."""
+    rows: List[Dict[str, Any]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        try:
+            self_value = int(self_us.strip())
+            cumulative_value = int(cumulative_us.strip())
+        except ValueError:
+            # Header line: "self [us] | cumulative | imported package"
+            continue
+        stripped = name.lstrip(" ")
+        rows.append({
+            "module": stripped.strip(),
+            "self_us": self_value,
+            "cumulative_us": cumulative_value,
+            "depth": (len(name) - len(stripped)) // 2,
+        })
+    return rows
+
+
+def find_deferred_imports(rows: List[Dict[str, Any]],
+                          deferred: tuple = DEFERRED_MODULES) -> List[str]:
+    hits = set()
+    for row in rows:
+        module = row["module"]
+        for name in deferred:
+            if module == name or module.startswith(name + "."):
+                hits.add(name)
+    return sorted(hits)
+
+
+def measure_once(module: str, env: Dict[str, str]) -> List[Dict[str, Any]]:
+    repo_root = Path(__file__).parent.parent
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(repo_root),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        tail = "\n".join(result.stdout.splitlines()[-10:] + result.stderr.splitlines()[-5:])
+        raise RuntimeError(f"import {module} failed (exit {result.returncode}):\n{tail}")
+    return parse_importtime(result.stderr)
+
+
+def _prepare_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    if not env.get("TEST_DB_PATH"):
+        from scripts import reset_db
+        temp_dir = Path(tempfile.mkdtemp(prefix="cutter_importtime_"))
+        db_path = temp_dir / "test_importtime.db"
+        reset_db.create_fresh_db(db_path)
+        env["TEST_DB_PATH"] = str(db_path)
+    return env
+
+
+def run_budget(module: str = DEFAULT_MODULE, budget_ms: float = DEFAULT_BUDGET_MS,
+               runs: int = DEFAULT_RUNS, top: int = DEFAULT_TOP) -> Dict[str, Any]:
+    env = _prepare_env()
+    # Warm run: compiles .pyc files and fills the preflight lint cache
+    measure_once(module, env)
+
+    totals_ms: List[float] = []
+    last_rows: List[Dict[str, Any]] = []
+    deferred_hits: set = set()
+    for _ in range(max(1, runs)):
+        rows = measure_once(module, env)
+        target = [row for row in rows if row["module"] == module]
+        totals_ms.append(target[-1]["cumulative_us"] / 1000.0 if target else 0.0)
+        deferred_hits.update(find_deferred_imports(rows))
+        last_rows = rows
+
+    median_ms = statistics.median(totals_ms)
+    slowest = sorted(last_rows, key=lambda row: row["cumulative_us"], reverse=True)[:top]
+    heaviest_self = sorted(last_rows, key=lambda row: row["self_us"], reverse=True)[:top]
+    return {
+        "module": module,
+        "budget_ms": budget_ms,
+        "runs_ms": [round(value, 1) for value in totals_ms],
+        "median_ms": round(median_ms, 1),
+        "within_budget": median_ms <= budget_ms,
+        "deferred_imported": sorted(deferred_hits),
+        "slowest_cumulative": [
+            {"module": row["module"], "cumulative_ms": round(row["cumulative_us"] / 1000.0, 1)}
+            for row in slowest
+        ],
+        "slowest_self": [
+            {"module": row["module"], "self_ms": round(row["self_us"] / 1000.0, 1)}
+            for row in heaviest_self
+        ],
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    status = "OK" if report["within_budget"] and not report["deferred_imported"] else "OVER BUDGET"
+    print(f"\n[IMPORTTIME] {report['module']}: median {report['median_ms']}ms "
+          f"(budget {report['budget_ms']:.0f}ms, runs {report['runs_ms']}) -> {status}")
+    if report["deferred_imported"]:
+        print(f"[IMPORTTIME] Deferred modules imported eagerly: {', '.join(report['deferred_imported'])}")
+    print("\n  Slowest (cumulative ms):")
+    for row in report["slowest_cumulative"]:
+        print(f"    {row['cumulative_ms']:>8.1f}  {row['module']}")
+    print("\n  Slowest (self ms):")
+    for row in report["slowest_self"]:
+        print(f"    {row['self_ms']:>8.1f}  {row['module']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Measure module import time against a budget (python -X importtime)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/import_time_budget.py
+  python scripts/import_time_budget.py --budget-ms 400 --runs 5
+  python scripts/import_time_budget.py --module cutter_ledger.queries --output importtime.json
+
+Exit codes:
+  0 - within budget, no deferred module imported eagerly
+  1 - over budget or a deferred module was imported at startup
+        """
+    )
+    parser.add_argument('--module', default=DEFAULT_MODULE, help='Module to import (default: ops_layer.app)')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help='Median cumulative import budget in ms (default: 500)')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help='Measured runs (default: 3)')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help='Rows per slowest-list (default: 15)')
+    parser.add_argument('--output', type=str, help='Write JSON report to this path')
+    args = parser.parse_args()
+
+    try:
+        report = run_budget(args.module, args.budget_ms, args.runs, args.top)
+    except RuntimeError as e:
+        print(json.dumps({"error": str(e)}, indent=2))
+        return 1
+
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\n[IMPORTTIME] Report written to {args.output}")
+    return 0 if report["within_budget"] and not report["deferred_imported"] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -18,6 +18,8 @@ Usage:
     python scripts/ledger_query_cli.py state ds5
     python scripts/ledger_query_cli.py state time-in-state
     python scripts/ledger_query_cli.py cutter events --subject_ref quote:123
+    python scripts/ledger_query_cli.py cutter events --subject_kind quote --subject_id 123
+    python scripts/ledger_query_cli.py cutter events --after_id 500 --limit 100
     python scripts/ledger_query_cli.py cutter overrides
 
 Environment:
@@ -152,13 +154,13 @@ def cmd_cutter_events(args):
     """Query Cutter Ledger events."""
     events = get_events(
         subject_ref=args.subject_ref,
-        event_type=args.event_type
+        event_type=args.event_type,
+        subject_kind=args.subject_kind,
+        subject_id=args.subject_id,
+        after_id=args.after_id,
+        limit=args.limit if args.limit and args.limit > 0 else None
     )
     
-    # Apply limit client-side if specified
-    if args.limit and args.limit > 0:
-        events = events[:args.limit]
-    
     output_json(events, pretty=args.pretty)
     return 0
 
@@ -211,6 +213,7 @@ Examples:
   
   # Cutter Ledger
   %(prog)s cutter events --subject_ref quote:123
+  %(prog)s cutter events --subject_kind quote --subject_id 123
   %(prog)s cutter events --event_type quote_overridden --limit 10
   %(prog)s cutter overrides
   
@@ -313,7 +316,10 @@ Environment:
     )
     cutter_events.add_argument('--subject_ref', help='Filter by subject reference (e.g., quote:123)')
     cutter_events.add_argument('--event_type', help='Filter by event type')
+    cutter_events.add_argument('--subject_kind', help='Filter by parsed subject kind (e.g., quote, customer)')
+    cutter_events.add_argument('--subject_id', help='Filter by parsed subject id (e.g., 123)')
     cutter_events.add_argument('--limit', type=int, help='Max results')
+    cutter_events.add_argument('--after_id', type=int, help='Only events after this id (page by id with --limit)')
     cutter_events.set_defaults(func=cmd_cutter_events)
     
     # cutter overrides
@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+Load Test - Concurrent Estimator Simulation
+
+Replays a realistic mix of estimator traffic at configurable concurrency and
+reports per-endpoint throughput, p50/p99 latency and error rates (including
+SQLite "database is locked" errors).
+
+Traffic mix (default weights):
+- POST /quote                       (STL upload, geometry + vector search)
+- POST /recalculate                 (slider drags)
+- POST /save_quote                  (quote persistence + ledger events)
+- POST /api/pattern_suggestions     (local history scan)
+- GET  /api/quote/<id>/pdf          (ReportLab render)
+- GET  ledger queries               (cutter events, unclosed quotes, open deadlines)
+
+Targets:
+- In-process (default): Flask test client against an isolated test DB
+  (TEST_DB_PATH is required; a fresh temp test DB is created if unset)
+- --base-url http://localhost:5000: a running server (stdlib urllib only)
+
+Usage:
+    python scripts/load_test.py
+    python scripts/load_test.py --workers 6 --duration 30
+    python scripts/load_test.py --base-url http://localhost:5000 --workers 6 --requests 600
+    python scripts/load_test.py --output load_report.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+PLANNING_HEADERS = {"X-Ops-Mode": "planning"}
+LOCKED_MARKER = b"database is locked"
+
+DEFAULT_MIX = {
+    "quote": 15,
+    "recalculate": 30,
+    "save_quote": 15,
+    "pattern_suggestions": 15,
+    "pdf": 10,
+    "ledger_query": 15,
+}
+
+MATERIALS = ["Aluminum 6061", "Steel 1018", "Stainless 304"]
+CUSTOMERS = [
+    ("Acme Aerospace", "acme-aero.example.com"),
+    ("Birch Robotics", "birch-robotics.example.com"),
+    ("Cobalt Medical", "cobalt-med.example.com"),
+    ("Delta Fluidics", "delta-fluidics.example.com"),
+]
+
+
+# ============================================================================
+# TRANSPORTS
+# ============================================================================
+
+class InProcessTransport:
+    """Flask test client per worker thread (no network, same process)."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self._local = threading.local()
+
+    def _client(self) -> Any:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self.app.test_client()
+            self._local.client = client
+        return client
+
+    def request(self, method: str, path: str, json_body: Optional[Dict[str, Any]] = None,
+                form: Optional[Dict[str, str]] = None,
+                upload: Optional[Tuple[str, bytes]] = None) -> Tuple[int, bytes]:
+        kwargs: Dict[str, Any] = {"headers": PLANNING_HEADERS}
+        if json_body is not None:
+            kwargs["json"] = json_body
+        if upload is not None:
+            data: Dict[str, Any] = dict(form or {})
+            data["file"] = (io.BytesIO(upload[1]), upload[0])
+            kwargs["data"] = data
+            kwargs["content_type"] = "multipart/form-data"
+        response = self._client().open(path, method=method, **kwargs)
+        try:
+            return response.status_code, response.get_data()
+        finally:
+            response.close()
+
+
+class HttpTransport:
+    """Plain HTTP against a running server (stdlib only)."""
+
+    def __init__(self, base_url: str, timeout: float = 60.0) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method: str, path: str, json_body: Optional[Dict[str, Any]] = None,
+                form: Optional[Dict[str, str]] = None,
+                upload: Optional[Tuple[str, bytes]] = None) -> Tuple[int, bytes]:
+        headers = dict(PLANNING_HEADERS)
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        elif upload is not None:
+            body, content_type = encode_multipart(form or {}, upload)
+            headers["Content-Type"] = content_type
+        req = urllib.request.Request(self.base_url + path, data=body, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+def encode_multipart(form: Dict[str, str], upload: Tuple[str, bytes]) -> Tuple[bytes, str]:
+    boundary = f"----cutter-load-{uuid.uuid4().hex}"
+    parts = []
+    for key, value in form.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{key}"\r\n\r\n{value}\r\n'.encode("utf-8")
+        )
+    filename, payload = upload
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f'Content-Type: application/octet-stream\r\n\r\n'.encode("utf-8") + payload + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+# ============================================================================
+# WORKLOAD
+# ============================================================================
+
+def build_stl_payloads() -> List[bytes]:
+    """Deterministic binary STL uploads (mm-scale parts of increasing density)."""
+    import trimesh
+
+    meshes = [
+        trimesh.creation.box(extents=(60.0, 40.0, 25.0)),
+        trimesh.creation.cylinder(radius=15.0, height=50.0, sections=64),
+        trimesh.creation.icosphere(subdivisions=4, radius=30.0),
+    ]
+    return [mesh.export(file_type="stl") for mesh in meshes]
+
+
+class Workload:
+    """Shared state between workers: upload payloads and quote ids created so far."""
+
+    def __init__(self, stl_payloads: List[bytes]) -> None:
+        self.stl_payloads = stl_payloads
+        self.quote_ids: List[int] = []
+        self._lock = threading.Lock()
+
+    def add_quote_id(self, quote_id: int) -> None:
+        with self._lock:
+            self.quote_ids.append(quote_id)
+
+    def pick_quote_id(self, rng: random.Random) -> Optional[int]:
+        with self._lock:
+            return rng.choice(self.quote_ids) if self.quote_ids else None
+
+
+def op_quote(transport: Any, workload: Workload, rng: random.Random, worker_id: int) -> Tuple[str, int, bytes]:
+    payload = rng.choice(workload.stl_payloads)
+    status, body = transport.request(
+        "POST", "/quote",
+        form={"material_name": rng.choice(MATERIALS), "ops_mode": "planning"},
+        upload=(f"load_worker_{worker_id}.stl", payload)
+    )
+    return "POST /quote", status, body
+
+
+def op_recalculate(transport: Any, workload: Workload, rng: random.Random, worker_id: int) -> Tuple[str, int, bytes]:
+    status, body = transport.request("POST", "/recalculate", json_body={
+        "material_name": rng.choice(MATERIALS),
+        "stock_x": round(rng.uniform(1, 8), 2),
+        "stock_y": round(rng.uniform(1, 8), 2),
+        "stock_z": round(rng.uniform(0.5, 4), 2),
+        "part_volume": round(rng.uniform(0.5, 20), 2),
+        "quantity": rng.choice([1, 5, 25, 100]),
+        "ops_mode": "planning",
+    })
+    return "POST /recalculate", status, body
+
+
+def op_save_quote(transport: Any, workload: Workload, rng: random.Random, worker_id: int) -> Tuple[str, int, bytes]:
+    dims = sorted(round(rng.uniform(0.5, 10), 3) for _ in range(3))
+    volume = round(dims[0] * dims[1] * dims[2] * 0.6, 3)
+    anchor = round(rng.uniform(100, 3000), 2)
+    customer_name, domain = rng.choice(CUSTOMERS)
+    status, body = transport.request("POST", "/save_quote", json_body={
+        "fingerprint": [volume / 10.0, dims[0], dims[1], dims[2], rng.uniform(0.5, 5)],
+        "filename": f"load_part_{rng.randint(0, 199)}.stl",
+        "material": rng.choice(MATERIALS),
+        "quantity": rng.choice([1, 5, 25]),
+        "system_price_anchor": anchor,
+        "final_quoted_price": anchor if rng.random() < 0.6 else round(anchor * rng.uniform(0.9, 1.2), 2),
+        "customer_name": customer_name,
+        "contact_email": f"buyer{rng.randint(0, 9)}@{domain}",
+        "contact_name": "Load Buyer",
+        "lead_time_days": rng.randint(3, 30),
+        "tag_weights": {"Rush Job": 15} if rng.random() < 0.3 else {},
+        "ops_mode": "planning",
+    })
+    if status == 200:
+        try:
+            workload.add_quote_id(int(json.loads(body)["id"]))
+        except (ValueError, KeyError, TypeError):
+            pass
+    return "POST /save_quote", status, body
+
+
+def op_pattern_suggestions(transport: Any, workload: Workload, rng: random.Random, worker_id: int) -> Tuple[str, int, bytes]:
+    status, body = transport.request("POST", "/api/pattern_suggestions", json_body={
+        "material": rng.choice(MATERIALS),
+        "quantity": rng.choice([1, 2, 5, 50]),
+        "customer_id": rng.randint(1, len(CUSTOMERS)),
+        "lead_time_days": rng.randint(2, 30),
+        "ops_mode": "planning",
+    })
+    return "POST /api/pattern_suggestions", status, body
+
+
+def op_pdf(transport: Any, workload: Workload, rng: random.Random, worker_id: int) -> Tuple[str, int, bytes]:
+    quote_id = workload.pick_quote_id(rng)
+    if quote_id is None:
+        return op_save_quote(transport, workload, rng, worker_id)
+    status, body = transport.request("GET", f"/api/quote/{quote_id}/pdf")
+    return "GET /api/quote/<id>/pdf", status, body
+
+
+def op_ledger_query(transport: Any, workload: Workload, rng: random.Random, worker_id: int) -> Tuple[str, int, bytes]:
+    path = rng.choice([
+        "/api/cutter/events?limit=50",
+        "/api/unclosed_quotes",
+        "/api/state/open-deadlines",
+        "/api/state/open-response-deadlines",
+    ])
+    status, body = transport.request("GET", path)
+    return f"GET {path.split('?')[0]}", status, body
+
+
+OPERATIONS: Dict[str, Callable[..., Tuple[str, int, bytes]]] = {
+    "quote": op_quote,
+    "recalculate": op_recalculate,
+    "save_quote": op_save_quote,
+    "pattern_suggestions": op_pattern_suggestions,
+    "pdf": op_pdf,
+    "ledger_query": op_ledger_query,
+}
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+class Recorder:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[Tuple[float, int, bool]]] = {}
+
+    def record(self, endpoint: str, latency_ms: float, status: int, locked: bool) -> None:
+        with self._lock:
+            self.samples.setdefault(endpoint, []).append((latency_ms, status, locked))
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile over an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(recorder: Recorder, elapsed_s: float) -> Dict[str, Any]:
+    def summarize_samples(samples: List[Tuple[float, int, bool]]) -> Dict[str, Any]:
+        latencies = sorted(s[0] for s in samples)
+        errors = sum(1 for s in samples if s[1] >= 400)
+        locked = sum(1 for s in samples if s[2])
+        return {
+            "requests": len(samples),
+            "throughput_rps": round(len(samples) / elapsed_s, 2) if elapsed_s else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+            "errors": errors,
+            "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+            "database_locked": locked,
+            "status_counts": {
+                str(code): sum(1 for s in samples if s[1] == code)
+                for code in sorted({s[1] for s in samples})
+            }
+        }
+
+    all_samples = [s for samples in recorder.samples.values() for s in samples]
+    return {
+        "elapsed_s": round(elapsed_s, 3),
+        "overall": summarize_samples(all_samples),
+        "endpoints": {
+            endpoint: summarize_samples(samples)
+            for endpoint, samples in sorted(recorder.samples.items())
+        }
+    }
+
+
+def run_load(transport: Any, workers: int, duration_s: Optional[float],
+             total_requests: Optional[int], mix: Dict[str, int],
+             seed: int = 7) -> Dict[str, Any]:
+    """Run `workers` threads until duration_s elapses or total_requests are issued."""
+    workload = Workload(build_stl_payloads())
+    recorder = Recorder()
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+
+    # Warm-up: a few saved quotes so PDF downloads have targets from the start
+    warm_rng = random.Random(seed)
+    for _ in range(3):
+        op_save_quote(transport, workload, warm_rng, worker_id=0)
+
+    issued = [0]
+    issued_lock = threading.Lock()
+    deadline = time.perf_counter() + duration_s if duration_s else None
+
+    def claim_slot() -> bool:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        if total_requests is None:
+            return True
+        with issued_lock:
+            if issued[0] >= total_requests:
+                return False
+            issued[0] += 1
+            return True
+
+    def worker(worker_id: int) -> None:
+        rng = random.Random(seed * 1000 + worker_id)
+        while claim_slot():
+            op = OPERATIONS[rng.choices(names, weights=weights)[0]]
+            start = time.perf_counter()
+            try:
+                endpoint, status, body = op(transport, workload, rng, worker_id)
+                locked = LOCKED_MARKER in (body or b"")
+            except Exception as e:
+                endpoint, status = f"{op.__name__} (transport)", 599
+                locked = "database is locked" in str(e)
+            latency_ms = (time.perf_counter() - start) * 1000
+            recorder.record(endpoint, latency_ms, status, locked)
+
+    threads = [threading.Thread(target=worker, args=(i + 1,), daemon=True) for i in range(workers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed_s = time.perf_counter() - started
+
+    report = summarize(recorder, elapsed_s)
+    report["config"] = {
+        "workers": workers,
+        "duration_s": duration_s,
+        "requests": total_requests,
+        "mix": mix,
+        "seed": seed
+    }
+    return report
+
+
+def build_in_process_transport(output_dir: Optional[Path] = None) -> InProcessTransport:
+    """
+    Import the Flask app against an isolated test DB (TEST_DB_PATH; never cutter.db).
+
+    output_dir, when given, becomes the app's PDF_OUTPUT_DIR so the quote PDFs
+    it writes stay out of the caller's working directory.
+    """
+    import database
+    db_path = database.require_test_db("in-process load testing")
+    if not db_path.exists():
+        from scripts import reset_db
+        reset_db.create_fresh_db(db_path)
+    from ops_layer.app import app
+    if output_dir is not None:
+        app.config['PDF_OUTPUT_DIR'] = str(output_dir)
+    return InProcessTransport(app)
+
+
+def parse_mix(raw: Optional[str]) -> Dict[str, int]:
+    """Parse 'quote=10,recalculate=40' into a weight map (unlisted ops keep defaults)."""
+    mix = dict(DEFAULT_MIX)
+    if not raw:
+        return mix
+    for item in raw.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"unknown operation in --mix: {name}")
+        mix[name] = int(weight)
+    return mix
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    header = f"{'endpoint':<42} {'reqs':>6} {'rps':>8} {'p50 ms':>9} {'p99 ms':>9} {'err%':>7} {'locked':>7}"
+    print(header, file=sys.stderr)
+    print("-" * len(header), file=sys.stderr)
+    rows = list(report["endpoints"].items()) + [("OVERALL", report["overall"])]
+    for endpoint, stats in rows:
+        print(
+            f"{endpoint:<42} {stats['requests']:>6} {stats['throughput_rps']:>8.2f} "
+            f"{stats['p50_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+            f"{stats['error_rate'] * 100:>6.1f}% {stats['database_locked']:>7}",
+            file=sys.stderr
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Concurrent load test for the Ops Layer API',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/load_test.py --workers 6 --duration 30
+  python scripts/load_test.py --requests 500 --mix quote=5,recalculate=50
+  python scripts/load_test.py --base-url http://localhost:5000 --workers 6 --duration 60
+
+Safety:
+  - In-process mode runs only against TEST_DB_PATH (temp test DB if unset)
+  - --base-url mode writes quotes/events into whatever DB that server uses
+        """
+    )
+    parser.add_argument('--workers', type=int, default=6, help='Concurrent workers (default: 6)')
+    parser.add_argument('--duration', type=float, default=None,
+                        help='Run for N seconds (default: 20 unless --requests is set)')
+    parser.add_argument('--requests', type=int, default=None, help='Stop after N total requests')
+    parser.add_argument('--mix', type=str, help='Operation weights, e.g. quote=10,recalculate=40')
+    parser.add_argument('--seed', type=int, default=7, help='RNG seed for request mix')
+    parser.add_argument('--base-url', type=str, help='Target a running server instead of in-process')
+    parser.add_argument('--output', type=str, metavar='FILE', help='Write JSON report to file')
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}, indent=2))
+        return 1
+
+    duration = args.duration
+    if duration is None and args.requests is None:
+        duration = 20.0
+
+    scratch = None
+    if args.base_url:
+        transport: Any = HttpTransport(args.base_url)
+        target = args.base_url
+    else:
+        # The load DB (unless TEST_DB_PATH is set) and the app's output files go here
+        scratch = tempfile.TemporaryDirectory(prefix="cutter_load_test_")
+        os.environ.setdefault("TEST_DB_PATH", str(Path(scratch.name) / "test_load.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            transport = build_in_process_transport(output_dir=Path(scratch.name))
+        target = f"in-process ({os.environ['TEST_DB_PATH']})"
+
+    print(f"[LOAD] Target: {target}", file=sys.stderr)
+    print(f"[LOAD] Workers: {args.workers}  Duration: {duration}  Requests: {args.requests}", file=sys.stderr)
+
+    # App endpoints print debug output per request; keep the report readable
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        report = run_load(transport, args.workers, duration, args.requests, mix, seed=args.seed)
+    if scratch is not None:
+        scratch.cleanup()
+    report["target"] = target
+    report["timestamp"] = datetime.now().isoformat()
+
+    print_report(report)
+    output_json = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output_json, encoding="utf-8")
+        print(f"[LOAD] Report written to: {args.output}", file=sys.stderr)
+    else:
+        print(output_json)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -98,447 +98,21 @@ def create_fresh_db(db_path: Path):
         if shm_path.exists():
             shm_path.unlink()
     
-    # Create all tables directly - more reliable than module reloading
+    # Build from the consolidated schema snapshot (ops + ledgers), then any
+    # numbered migrations newer than it (migrations/runner.py)
     import sqlite3
+    from migrations import runner
     conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
     
     try:
         # Set WAL mode (constitutional requirement)
-        cursor.execute("PRAGMA journal_mode=WAL;")
-        
-        # Create Ops Layer tables directly
-        # (Simplified from database.initialize_database())
-        
-        # ops__materials
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ops__materials (
-                name TEXT PRIMARY KEY,
-                cost_per_cubic_inch REAL NOT NULL,
-                machinability_score REAL NOT NULL
-            )
-        """)
-        
-        # ops__shop_config
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ops__shop_config (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL,
-                description TEXT,
-                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # ops__quote_history (legacy)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ops__quote_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                filename TEXT,
-                fingerprint TEXT,
-                anchor_price REAL,
-                final_price REAL,
-                setup_time INTEGER,
-                user_feedback_tags TEXT,
-                tag_weights TEXT,
-                status TEXT DEFAULT 'Draft',
-                actual_runtime REAL,
-                is_guild_submission INTEGER DEFAULT 0,
-                submission_date TEXT,
-                exported_at TEXT,
-                is_compliant INTEGER DEFAULT 1,
-                is_deleted INTEGER DEFAULT 0,
-                timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-                loss_reason TEXT,
-                win_notes TEXT,
-                closed_at TEXT,
-                material TEXT,
-                genesis_hash TEXT,
-                process_routing TEXT,
-                source_type TEXT,
-                reference_image TEXT,
-                quote_id TEXT,
-                handling_time REAL
-            )
-        """)
-        
-        # ops__customers
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ops__customers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                domain TEXT NOT NULL,
-                corporate_tags_json TEXT DEFAULT '[]',
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # ops__contacts
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ops__contacts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                phone TEXT,
-                current_customer_id INTEGER,
-                behavior_tags_json TEXT DEFAULT '[]',
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(current_customer_id) REFERENCES ops__customers(id)
-            )
-        """)
-        
-        # ops__parts
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ops__parts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                genesis_hash TEXT UNIQUE NOT NULL,
-                filename TEXT,
-                fingerprint_json TEXT,
-                volume REAL,
-                surface_area REAL,
-                dimensions_json TEXT,
-                process_routing_json TEXT DEFAULT '[]',
-                features_json TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # ops__quotes
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ops__quotes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                quote_id TEXT UNIQUE NOT NULL,
-                part_id INTEGER NOT NULL,
-                customer_id INTEGER NOT NULL,
-                contact_id INTEGER,
-                user_id INTEGER,
-                material TEXT NOT NULL,
-                quantity INTEGER DEFAULT 1,
-                target_date TEXT,
-                payment_terms_days INTEGER DEFAULT 30,
-                system_price_anchor REAL NOT NULL,
-                final_quoted_price REAL NOT NULL,
-                variance_json TEXT,
-                pricing_tags_json TEXT,
-                physics_snapshot_json TEXT,
-                status TEXT DEFAULT 'Draft',
-                notes TEXT,
-                lead_time_date TEXT,
-                lead_time_days INTEGER,
-                target_price_per_unit REAL,
-                price_breaks_json TEXT,
-                outside_processing_json TEXT,
-                quality_requirements_json TEXT,
-                part_marking_json TEXT,
-                win_notes TEXT,
-                loss_reason TEXT,
-                closed_at TEXT,
-                win_attribution_json TEXT,
-                loss_attribution_json TEXT,
-                is_deleted INTEGER DEFAULT 0,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(part_id) REFERENCES ops__parts(id) ON DELETE CASCADE,
-                FOREIGN KEY(customer_id) REFERENCES ops__customers(id) ON DELETE RESTRICT,
-                FOREIGN KEY(contact_id) REFERENCES ops__contacts(id) ON DELETE SET NULL
-            )
-        """)
-        
-        print(f"[OK] Ops Layer tables created")
-        
-        # ops__quote_outcome_events
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ops__quote_outcome_events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                quote_id INTEGER NOT NULL,
-                outcome_type TEXT NOT NULL,
-                actor_user_id INTEGER,
-                saved_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                original_price REAL,
-                final_price REAL,
-                price_changed BOOLEAN DEFAULT FALSE,
-                original_leadtime_days INTEGER,
-                final_leadtime_days INTEGER,
-                leadtime_changed BOOLEAN DEFAULT FALSE,
-                original_terms_days INTEGER,
-                final_terms_days INTEGER,
-                terms_changed BOOLEAN DEFAULT FALSE,
-                other_notes TEXT,
-                wizard_completed BOOLEAN DEFAULT FALSE,
-                wizard_step_reached INTEGER DEFAULT 0,
-                FOREIGN KEY(quote_id) REFERENCES ops__quotes(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # ops__custom_tags
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ops__custom_tags (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE,
-                impact_type TEXT,
-                impact_value REAL,
-                persistence_type TEXT DEFAULT 'transient',
-                category TEXT DEFAULT 'General'
-            )
-        """)
-
-        # ops__reconciliations (MVP-12)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ops__reconciliations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                scope_ref TEXT NOT NULL,
-                scope_kind TEXT NOT NULL CHECK (scope_kind IN ('query', 'report')),
-                predicate_ref TEXT NOT NULL,
-                predicate_text TEXT,
-                actor_ref TEXT NOT NULL,
-                reconciled_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # ops__saved_reports (Post-MVP planning-only)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ops__saved_reports (
-                report_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                report_name TEXT NOT NULL UNIQUE,
-                query_type TEXT NOT NULL,
-                params_json TEXT NOT NULL,
-                created_by_actor_ref TEXT NOT NULL,
-                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                last_run_at TEXT
-            )
-        """)
-        
-        # Create Cutter Ledger tables (reuse connection)
-        if conn is None or not hasattr(conn, 'cursor'):
-            conn = sqlite3.connect(str(db_path))
-            cursor = conn.cursor()
-        
-        # Create cutter__events table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS cutter__events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                event_type TEXT NOT NULL,
-                subject_ref TEXT NOT NULL,
-                event_data TEXT,
-                created_at TEXT NOT NULL DEFAULT (datetime('now')),
-                ingested_by_service TEXT,
-                ingested_by_version TEXT
-            )
-        """)
-        
-        # Create append-only triggers for cutter__events
-        cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS block_cutter_events_update
-            BEFORE UPDATE ON cutter__events
-            BEGIN
-                SELECT RAISE(ABORT, 'Constitutional violation: cutter__events is append-only (no UPDATE)');
-            END
-        """)
-        
-        cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS block_cutter_events_delete
-            BEFORE DELETE ON cutter__events
-            BEGIN
-                SELECT RAISE(ABORT, 'Constitutional violation: cutter__events is append-only (no DELETE)');
-            END
-        """)
-        
-        print(f"[OK] Cutter Ledger tables created")
-        
-        # Create State Ledger tables
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS state__entities (
-                entity_ref TEXT PRIMARY KEY,
-                entity_label TEXT NOT NULL,
-                cadence_days INTEGER NOT NULL DEFAULT 7,
-                created_at TEXT NOT NULL DEFAULT (datetime('now'))
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS state__recognition_owners (
-                entity_ref TEXT NOT NULL,
-                owner_actor_ref TEXT NOT NULL,
-                assigned_at TEXT NOT NULL DEFAULT (datetime('now')),
-                unassigned_at TEXT,
-                assigned_by_actor_ref TEXT NOT NULL,
-                FOREIGN KEY (entity_ref) REFERENCES state__entities(entity_ref)
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE UNIQUE INDEX IF NOT EXISTS idx_one_current_owner
-            ON state__recognition_owners(entity_ref)
-            WHERE unassigned_at IS NULL
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS state__declarations (
-                declaration_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                entity_ref TEXT NOT NULL,
-                scope_ref TEXT NOT NULL,
-                state_text TEXT NOT NULL,
-                declaration_kind TEXT NOT NULL CHECK (declaration_kind IN ('REAFFIRMATION','RECLASSIFICATION')),
-                declared_by_actor_ref TEXT NOT NULL,
-                declared_at TEXT NOT NULL DEFAULT (datetime('now')),
-                supersedes_declaration_id INTEGER,
-                cutter_evidence_ref TEXT,
-                evidence_refs_json TEXT DEFAULT '[]',
-                classification TEXT,
-                FOREIGN KEY (entity_ref) REFERENCES state__entities(entity_ref)
-            )
-        """)
-        
-        # Create append-only triggers for state__declarations
-        cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS block_state_declarations_update
-            BEFORE UPDATE ON state__declarations
-            BEGIN
-                SELECT RAISE(ABORT, 'Constitutional violation: state__declarations is append-only (no UPDATE)');
-            END
-        """)
-        
-        cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS block_state_declarations_delete
-            BEFORE DELETE ON state__declarations
-            BEGIN
-                SELECT RAISE(ABORT, 'Constitutional violation: state__declarations is append-only (no DELETE)');
-            END
-        """)
-        
-        print(f"[OK] State Ledger tables created")
-        
-        # Create State Ledger derived-state views
-        # DS-2: Unowned Recognition
-        cursor.execute("""
-            CREATE VIEW IF NOT EXISTS view_ds2_unowned_recognition AS
-            SELECT 
-                e.entity_ref,
-                e.entity_label,
-                e.cadence_days,
-                e.created_at as entity_created_at
-            FROM state__entities e
-            WHERE NOT EXISTS (
-                SELECT 1 FROM state__recognition_owners o
-                WHERE o.entity_ref = e.entity_ref
-                AND o.unassigned_at IS NULL
-            )
-        """)
-        
-        # DS-5: Deferred Recognition
-        cursor.execute("""
-            CREATE VIEW IF NOT EXISTS view_ds5_deferred_recognition AS
-            SELECT 
-                e.entity_ref,
-                e.entity_label,
-                e.cadence_days,
-                MAX(d.declared_at) as last_declaration_at,
-                CAST((JULIANDAY('now') - JULIANDAY(MAX(d.declared_at))) AS INTEGER) as days_since_last_declaration
-            FROM state__entities e
-            LEFT JOIN state__declarations d ON e.entity_ref = d.entity_ref
-            GROUP BY e.entity_ref, e.entity_label, e.cadence_days
-            HAVING 
-                last_declaration_at IS NULL
-                OR CAST((JULIANDAY('now') - JULIANDAY(last_declaration_at)) AS INTEGER) > e.cadence_days
-        """)
-        
-        # DS-1: Persistent Continuity
-        cursor.execute("""
-            CREATE VIEW IF NOT EXISTS view_ds1_persistent_continuity AS
-            WITH last_reclassification AS (
-                SELECT 
-                    entity_ref,
-                    scope_ref,
-                    MAX(declaration_id) as last_recl_id
-                FROM state__declarations
-                WHERE declaration_kind = 'RECLASSIFICATION'
-                GROUP BY entity_ref, scope_ref
-            ),
-            current_reaffirmations AS (
-                SELECT 
-                    d.entity_ref,
-                    d.scope_ref,
-                    d.classification,
-                    d.declared_at,
-                    d.declaration_id,
-                    lr.last_recl_id
-                FROM state__declarations d
-                LEFT JOIN last_reclassification lr
-                    ON d.entity_ref = lr.entity_ref
-                    AND d.scope_ref = lr.scope_ref
-                WHERE d.declaration_kind = 'REAFFIRMATION'
-                    AND (lr.last_recl_id IS NULL OR d.declaration_id > lr.last_recl_id)
-            )
-            SELECT 
-                entity_ref,
-                scope_ref,
-                classification,
-                COUNT(*) as consecutive_reaffirmations,
-                MIN(declared_at) as first_reaffirmed_at,
-                MAX(declared_at) as last_reaffirmed_at
-            FROM current_reaffirmations
-            GROUP BY entity_ref, scope_ref, classification
-            HAVING COUNT(*) > 1
-            ORDER BY consecutive_reaffirmations DESC, entity_ref
-        """)
-
-        cursor.execute("""
-            CREATE VIEW IF NOT EXISTS view_ops_unclosed_quotes AS
-            SELECT 
-                q.id,
-                q.quote_id,
-                q.final_quoted_price,
-                q.lead_time_days,
-                q.payment_terms_days,
-                q.status,
-                q.created_at,
-                cu.name as customer_name,
-                CAST((JULIANDAY('now') - JULIANDAY(q.created_at)) AS INTEGER) AS age_days
-            FROM ops__quotes q
-            LEFT JOIN ops__customers cu ON q.customer_id = cu.id
-            LEFT JOIN ops__quote_outcome_events e ON q.id = e.quote_id AND e.outcome_type != 'NO_RESPONSE'
-            WHERE e.id IS NULL
-            ORDER BY q.created_at ASC
-        """)
-
-        cursor.execute("""
-            CREATE VIEW IF NOT EXISTS view_state_time_in_state AS
-            WITH latest AS (
-                SELECT
-                    entity_ref,
-                    scope_ref,
-                    MAX(declared_at) AS last_declared_at
-                FROM state__declarations
-                GROUP BY entity_ref, scope_ref
-            ),
-            latest_rows AS (
-                SELECT d.*
-                FROM state__declarations d
-                JOIN latest l
-                    ON d.entity_ref = l.entity_ref
-                    AND d.scope_ref = l.scope_ref
-                    AND d.declared_at = l.last_declared_at
-            )
-            SELECT
-                e.entity_ref,
-                e.entity_label,
-                e.cadence_days,
-                l.scope_ref,
-                l.state_text,
-                l.classification,
-                l.declaration_kind,
-                l.declared_by_actor_ref,
-                l.declared_at,
-                CAST((JULIANDAY('now') - JULIANDAY(l.declared_at)) AS INTEGER) AS days_since_declaration
-            FROM state__entities e
-            LEFT JOIN latest_rows l
-                ON e.entity_ref = l.entity_ref
-        """)
-        
-        print(f"[OK] State Ledger derived-state views created")
-        
-        conn.commit()
+        conn.execute("PRAGMA journal_mode=WAL;")
+        runner.build_fresh_schema(conn)
+        version = runner.get_schema_version(conn)
         conn.close()
         
+        print(f"[OK] Ops Layer, Cutter Ledger and State Ledger schema created")
+        print(f"[OK] schema_version: {version}")
         print(f"[SUCCESS] Database initialized")
     except Exception as e:
         print(f"[ERROR] Failed to initialize database: {e}")
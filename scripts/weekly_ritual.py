@@ -31,7 +31,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
     from state_ledger.boundary import query_unowned_entities, query_deferred_recognition
-    from cutter_ledger.boundary import get_events
+    from cutter_ledger.boundary import count_events, get_latest_events
     import database
 except ImportError as e:
     print(json.dumps({
@@ -44,7 +44,9 @@ except ImportError as e:
 def check_database_exists():
     """Check if database exists and is accessible."""
     try:
-        conn = database.get_connection()
+        # Read-only: never creates a missing database file
+        conn = database.get_read_connection()
+        conn.execute("SELECT 1 FROM sqlite_master LIMIT 1")
         conn.close()
         return True
     except Exception as e:
@@ -97,15 +99,14 @@ def get_ds5_deferred_recognition():
 def get_recent_cutter_events(limit=10):
     """Query recent Cutter Ledger events."""
     try:
-        # Get all events, then take last N
-        all_events = get_events()
-        recent_events = all_events[-limit:] if len(all_events) > limit else all_events
+        # Read only the last N (by id), not the whole ledger
+        recent_events = get_latest_events(limit)
         
         return {
             "recent_cutter_events": {
                 "description": f"Last {limit} operational events from Cutter Ledger",
                 "count": len(recent_events),
-                "total_events_in_ledger": len(all_events),
+                "total_events_in_ledger": count_events(),
                 "events": recent_events
             }
         }
@@ -117,6 +118,36 @@ def get_recent_cutter_events(limit=10):
         }
 
 
+def build_ritual_data(events=None):
+    """Collect the ritual bundle (also precomputed by ops_layer/report_scheduler.py)."""
+    # Get database path for diagnostics
+    test_db_path = os.environ.get('TEST_DB_PATH')
+    if test_db_path:
+        db_path_str = test_db_path
+    else:
+        db_path_str = str(database.DB_PATH)
+    
+    # Collect ritual data
+    ritual_data = {
+        "ritual": "weekly_structural_visibility",
+        "timestamp": datetime.now().isoformat(),
+        "db_path": db_path_str,
+        "constitutional_note": "Raw visibility only. No summaries, advice, or enforcement."
+    }
+    
+    # DS-2: Unowned Recognition
+    ritual_data.update(get_ds2_unowned_recognition())
+    
+    # DS-5: Deferred Recognition
+    ritual_data.update(get_ds5_deferred_recognition())
+    
+    # Optional: Recent Cutter Events
+    if events:
+        ritual_data.update(get_recent_cutter_events(limit=events))
+    
+    return ritual_data
+
+
 def main():
     """Run weekly ritual: print raw structural visibility."""
     parser = argparse.ArgumentParser(
@@ -154,34 +185,11 @@ Constitutional compliance:
     
     args = parser.parse_args()
     
-    # Get database path for diagnostics
-    test_db_path = os.environ.get('TEST_DB_PATH')
-    if test_db_path:
-        db_path_str = test_db_path
-    else:
-        db_path_str = str(database.DB_PATH)
-    
     # Check database accessibility
     if not check_database_exists():
         return 1
     
-    # Collect ritual data
-    ritual_data = {
-        "ritual": "weekly_structural_visibility",
-        "timestamp": datetime.now().isoformat(),
-        "db_path": db_path_str,
-        "constitutional_note": "Raw visibility only. No summaries, advice, or enforcement."
-    }
-    
-    # DS-2: Unowned Recognition
-    ritual_data.update(get_ds2_unowned_recognition())
-    
-    # DS-5: Deferred Recognition
-    ritual_data.update(get_ds5_deferred_recognition())
-    
-    # Optional: Recent Cutter Events
-    if args.events:
-        ritual_data.update(get_recent_cutter_events(limit=args.events))
+    ritual_data = build_ritual_data(events=args.events)
     
     # Output
     output_json = json.dumps(ritual_data, indent=2, default=str)
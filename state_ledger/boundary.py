@@ -27,6 +27,9 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+import read_connection
+import write_queue
+
 from . import validation
 
 
@@ -40,14 +43,11 @@ def _get_db_path() -> Path:
 
 def get_connection() -> sqlite3.Connection:
     """
-    Get database connection with foreign keys enabled.
+    Get a read-only database connection (read_connection.py).
+    Writes go through write_queue.run(), which opens its own connection.
     Respects TEST_DB_PATH environment variable for hermetic testing.
     """
-    db_path = _get_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    return read_connection.connect(_get_db_path())
 
 
 def register_entity(
@@ -77,20 +77,17 @@ def register_entity(
     if cadence_days < 1:
         raise ValueError(f"cadence_days must be >= 1, got: {cadence_days}")
     
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute("""
+    def _write(conn: sqlite3.Connection) -> None:
+        conn.execute("""
             INSERT INTO state__entities (entity_ref, entity_label, cadence_days)
             VALUES (?, ?, ?)
         """, (entity_ref, entity_label, cadence_days))
-        conn.commit()
-        conn.close()
+    
+    try:
+        write_queue.run(_write, db_path=_get_db_path(), foreign_keys=True)
         return True
     except sqlite3.IntegrityError:
         # Entity already exists
-        conn.close()
         return False
 
 
@@ -167,10 +164,9 @@ def ensure_entity_with_owner(
 
     label = entity_label or entity_ref
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        conn.execute("BEGIN")
+    # One write transaction (write_queue.run): no committed unowned entity
+    def _write(conn: sqlite3.Connection) -> Dict[str, Any]:
+        cursor = conn.cursor()
 
         cursor.execute("""
             SELECT entity_ref
@@ -200,18 +196,17 @@ def ensure_entity_with_owner(
                 VALUES (?, ?, ?)
             """, (entity_ref, owner_actor_ref, assigned_by_actor_ref))
 
-        conn.commit()
         return {
             "entity_ref": entity_ref,
             "owner_actor_ref": owner_actor_ref if owner_row is None else owner_row["owner_actor_ref"],
             "entity_created": entity_row is None,
             "owner_assigned": owner_row is None
         }
+
+    try:
+        return write_queue.run(_write, db_path=_get_db_path(), foreign_keys=True)
     except sqlite3.IntegrityError:
-        conn.rollback()
         raise ValueError("ensure_entity_with_owner failed")
-    finally:
-        conn.close()
 def assign_owner(
     entity_ref: str,
     owner_actor_ref: str,
@@ -250,10 +245,9 @@ def assign_owner(
     if not assigner_valid:
         raise ValueError(f"Invalid assigned_by_actor_ref: {assigner_error}")
     
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    try:
+    def _write(conn: sqlite3.Connection) -> int:
+        cursor = conn.cursor()
+        
         # Unassign current owner if exists
         cursor.execute("""
             UPDATE state__recognition_owners
@@ -269,14 +263,11 @@ def assign_owner(
             VALUES (?, ?, ?)
         """, (entity_ref, owner_actor_ref, assigned_by_actor_ref))
         
-        assignment_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return assignment_id
-        
+        return cursor.lastrowid
+    
+    try:
+        return write_queue.run(_write, db_path=_get_db_path(), foreign_keys=True)
     except sqlite3.IntegrityError as e:
-        conn.close()
         raise ValueError(f"Failed to assign owner: {e}")
 
 
@@ -387,26 +378,19 @@ def emit_state_declaration(
         )
     
     # All validations passed - write to State Ledger
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute("""
+    def _write(conn: sqlite3.Connection) -> int:
+        cursor = conn.execute("""
             INSERT INTO state__declarations
             (entity_ref, scope_ref, state_text,
              declared_by_actor_ref, declaration_kind, supersedes_declaration_id, cutter_evidence_ref, evidence_refs_json)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """, (entity_ref, scope_ref, state_text,
               actor_ref, declaration_kind, supersedes_declaration_id, cutter_evidence_ref, evidence_refs_json))
-        
-        declaration_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return declaration_id
-        
+        return cursor.lastrowid
+    
+    try:
+        return write_queue.run(_write, db_path=_get_db_path(), foreign_keys=True)
     except sqlite3.IntegrityError as e:
-        conn.close()
         raise ValueError(f"Failed to emit state declaration: {e}")
 
 
@@ -9,7 +9,10 @@ import sqlite3
 import os
 import json
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence, Tuple
+
+import read_connection
+from cutter_ledger import projections
 
 
 # Support TEST_DB_PATH for hermetic testing
@@ -18,11 +21,8 @@ def resolve_db_path() -> Path:
 
 
 def get_connection() -> sqlite3.Connection:
-    """Get database connection with row factory."""
-    conn = sqlite3.connect(resolve_db_path())
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    """Get a read-only database connection with row factory."""
+    return read_connection.connect(resolve_db_path())
 
 
 def list_entities() -> List[Dict[str, Any]]:
@@ -121,13 +121,17 @@ def query_time_in_state() -> List[Dict[str, Any]]:
     return rows
 
 
-def query_entities_time_in_state_over(threshold_days: int) -> List[Dict[str, Any]]:
+def query_entities_time_in_state_over(
+    threshold_days: int,
+    db_path: Optional[Path] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> List[Dict[str, Any]]:
     """
     Return entities where time-in-state exceeds threshold_days.
     """
     if threshold_days < 0:
         raise ValueError("threshold_days must be >= 0")
-    conn = get_connection()
+    conn, owns_conn = _open_connection(db_path, conn)
     cursor = conn.cursor()
     cursor.execute("""
         SELECT
@@ -158,22 +162,30 @@ def query_entities_time_in_state_over(threshold_days: int) -> List[Dict[str, Any
             'declared_at': row['declared_at'],
             'days_since_declaration': row['days_since_declaration']
         })
-    conn.close()
+    if owns_conn:
+        conn.close()
     return rows
 
 
-def query_entities_missing_reaffirmation_over(threshold_days: int) -> List[Dict[str, Any]]:
+def query_entities_missing_reaffirmation_over(
+    threshold_days: int,
+    db_path: Optional[Path] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> List[Dict[str, Any]]:
     """
     Return entities missing reaffirmation beyond threshold_days.
     """
-    return query_entities_time_in_state_over(threshold_days)
+    return query_entities_time_in_state_over(threshold_days, db_path=db_path, conn=conn)
 
 
-def query_latest_declaration_per_entity() -> List[Dict[str, Any]]:
+def query_latest_declaration_per_entity(
+    db_path: Optional[Path] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> List[Dict[str, Any]]:
     """
     Return latest declarations per entity (no aggregation or judgment).
     """
-    conn = get_connection()
+    conn, owns_conn = _open_connection(db_path, conn)
     cursor = conn.cursor()
     cursor.execute("""
         SELECT
@@ -203,7 +215,8 @@ def query_latest_declaration_per_entity() -> List[Dict[str, Any]]:
             'declared_at': row['declared_at'],
             'days_since_declaration': row['days_since_declaration']
         })
-    conn.close()
+    if owns_conn:
+        conn.close()
     return rows
 
 
@@ -235,6 +248,38 @@ def get_latest_declarations(
     )
 
 
+# Projection rows plus handoff events newer than its checkpoint (the only parameter)
+CARRIER_HANDOFF_EXISTS_PROJECTION_SQL = """
+    SELECT 1
+    FROM cutter__proj_carrier_handoffs h
+    WHERE h.subject_ref = d.entity_ref
+    UNION ALL
+    SELECT 1
+    FROM cutter__events e
+    WHERE e.subject_ref = d.entity_ref
+    AND e.event_type = 'carrier_handoff'
+    AND e.id > ?
+"""
+
+CARRIER_HANDOFF_EXISTS_SCAN_SQL = """
+    SELECT 1
+    FROM cutter__events e
+    WHERE e.event_type = 'carrier_handoff'
+    AND e.subject_ref = d.entity_ref
+"""
+
+
+def _open_connection(
+    db_path: Optional[Path],
+    conn: Optional[sqlite3.Connection]
+) -> Tuple[sqlite3.Connection, bool]:
+    if conn is not None:
+        return conn, False
+    if db_path is not None:
+        return read_connection.connect(db_path), True
+    return get_connection(), True
+
+
 def query_open_deadlines(
     db_path: Optional[Path] = None,
     conn: Optional[sqlite3.Connection] = None
@@ -243,44 +288,56 @@ def query_open_deadlines(
     Query open promise:deadline declarations with no carrier_handoff event.
 
     Returns raw declaration data only (no inference, no scoring, no prioritization).
+    Anti-joins on the carrier_handoffs projection plus handoffs newer than its
+    checkpoint (see cutter_ledger/projections.py).
     """
-    owns_conn = False
-    if conn is None:
-        if db_path is not None:
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA foreign_keys = ON;")
-            owns_conn = True
-        else:
-            conn = get_connection()
-            owns_conn = True
+    conn, owns_conn = _open_connection(db_path, conn)
+    try:
+        if not projections.is_available(conn):
+            return _select_open_deadlines(conn, CARRIER_HANDOFF_EXISTS_SCAN_SQL)
+        checkpoint = projections.get_checkpoint(conn, "carrier_handoffs")
+        return _select_open_deadlines(conn, CARRIER_HANDOFF_EXISTS_PROJECTION_SQL, [checkpoint])
+    finally:
+        if owns_conn:
+            conn.close()
+
+
+def _query_open_deadlines_scan(
+    db_path: Optional[Path] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> List[Dict[str, Any]]:
+    """Full-scan reference implementation (projection verify)."""
+    conn, owns_conn = _open_connection(db_path, conn)
+    try:
+        return _select_open_deadlines(conn, CARRIER_HANDOFF_EXISTS_SCAN_SQL)
+    finally:
+        if owns_conn:
+            conn.close()
+
+
+def _select_open_deadlines(
+    conn: sqlite3.Connection,
+    handoff_exists_sql: str,
+    handoff_exists_params: Sequence[Any] = ()
+) -> List[Dict[str, Any]]:
     cursor = conn.cursor()
 
-    cursor.execute("""
+    cursor.execute(f"""
         SELECT d.entity_ref, d.state_text, d.declared_at, d.declared_by_actor_ref
         FROM state__declarations d
         WHERE d.scope_ref = 'promise:deadline'
-        AND NOT EXISTS (
-            SELECT 1
-            FROM cutter__events e
-            WHERE e.event_type = 'carrier_handoff'
-            AND e.subject_ref = d.entity_ref
-        )
+        AND NOT EXISTS ({handoff_exists_sql})
         ORDER BY d.declared_at ASC
-    """)
+    """, list(handoff_exists_params))
 
     results = []
     for row in cursor.fetchall():
         try:
             payload = json.loads(row['state_text'])
         except json.JSONDecodeError as exc:
-            if owns_conn:
-                conn.close()
             raise ValueError(f"Malformed state_text JSON for {row['entity_ref']}: {exc}") from exc
 
         if not isinstance(payload, dict) or 'deadline' not in payload:
-            if owns_conn:
-                conn.close()
             raise ValueError(f"Missing deadline in state_text for {row['entity_ref']}")
 
         results.append({
@@ -290,6 +347,4 @@ def query_open_deadlines(
             'declared_by_actor_ref': row['declared_by_actor_ref'],
         })
 
-    if owns_conn:
-        conn.close()
     return results
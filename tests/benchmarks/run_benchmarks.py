@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Micro-Benchmark Suite - Hot Path Performance Baseline
+
+Times the hot paths of the quoting loop against deterministic inputs:
+- Geometry: calculate_geometry, generate_from_trimesh
+  (trimesh.creation meshes at several triangle counts)
+- History: find_similar_parts, detect_patterns
+  (isolated test DBs seeded at 1k / 10k / 100k quotes)
+- Pricing: PriceCalculator.calculate_price_breaks
+- Ledgers: emit_cutter_event, emit_state_declaration
+
+Results are written as JSON (with machine info) into --results-dir. When a
+previous result exists there, per-benchmark deltas against it are printed.
+
+Runs only against isolated test databases (never touches cutter.db).
+Not part of unittest discovery; run explicitly.
+
+Usage:
+    python tests/benchmarks/run_benchmarks.py
+    python tests/benchmarks/run_benchmarks.py --scales 1000 10000 --repeats 3
+    python tests/benchmarks/run_benchmarks.py --compare data/benchmarks/bench_20260101_120000.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+DEFAULT_SCALES = [1000, 10000, 100000]
+DEFAULT_REPEATS = 5
+DEFAULT_RESULTS_DIR = REPO_ROOT / "data" / "benchmarks"
+DEFAULT_SEED = 1337
+
+MATERIALS = ["Aluminum 6061", "Steel 1018", "Stainless 304", "Customer Supplied"]
+STATUSES = ["Draft", "Sent", "Sent", "Won", "Won", "Lost"]
+TAG_NAMES = ["Rush Job", "Expedite", "Tight Tol", "Complex Fixture", "Heavy Deburr", "Proto"]
+
+ENTITY_REF = "org:bench/entity:project:alpha"
+OWNER_REF = "org:bench/actor:owner"
+ADMIN_REF = "org:bench/actor:admin"
+SCOPE_REF = "org:bench/scope:weekly"
+
+
+# ============================================================================
+# DETERMINISTIC INPUTS
+# ============================================================================
+
+def build_meshes() -> Dict[str, Any]:
+    """Deterministic meshes keyed by name (triangle count in the name)."""
+    import trimesh
+
+    meshes = {
+        "box": trimesh.creation.box(extents=(50.0, 30.0, 20.0)),
+        "cylinder": trimesh.creation.cylinder(radius=12.0, height=40.0, sections=64),
+    }
+    for subdivisions in (2, 4, 6):
+        meshes[f"icosphere_s{subdivisions}"] = trimesh.creation.icosphere(
+            subdivisions=subdivisions, radius=25.0
+        )
+    return {f"{name}[{len(mesh.faces)}f]": mesh for name, mesh in meshes.items()}
+
+
+def seed_quote_history(db_path: Path, n_quotes: int, seed: int = DEFAULT_SEED) -> Dict[str, int]:
+    """
+    Bulk-seed ops__parts / ops__customers / ops__quotes in one transaction.
+
+    Roughly four quotes per part (repeat geometry) and 200 customers, so the
+    genesis-hash and customer pattern paths both have history to scan.
+    """
+    rng = random.Random(seed)
+    n_parts = max(1, n_quotes // 4)
+    n_customers = min(200, max(1, n_quotes // 5))
+
+    customers = [(f"Bench Customer {i}", f"customer{i}.example.com") for i in range(n_customers)]
+
+    parts = []
+    for i in range(n_parts):
+        dims = sorted(round(rng.uniform(0.25, 12.0), 3) for _ in range(3))
+        volume = round(dims[0] * dims[1] * dims[2] * rng.uniform(0.3, 0.95), 4)
+        area = round(2 * (dims[0] * dims[1] + dims[1] * dims[2] + dims[0] * dims[2]), 4)
+        fingerprint = [volume / 10.0, dims[0], dims[1], dims[2], area / 50.0]
+        parts.append((
+            f"CUTTER-B{i:07X}",
+            f"bench_part_{i}.stl",
+            json.dumps(fingerprint),
+            volume,
+            area,
+            json.dumps({"x": dims[0], "y": dims[1], "z": dims[2]})
+        ))
+
+    quotes = []
+    for i in range(n_quotes):
+        tags = {name: round(rng.uniform(5, 25), 2) for name in rng.sample(TAG_NAMES, rng.randint(0, 3))}
+        anchor = round(rng.uniform(50, 5000), 2)
+        quotes.append((
+            f"BENCH-{i:07d}",
+            rng.randint(1, n_parts),
+            rng.randint(1, n_customers),
+            rng.choice(MATERIALS),
+            rng.choice([1, 2, 5, 10, 25, 100, 250]),
+            anchor,
+            round(anchor * rng.uniform(0.85, 1.3), 2),
+            json.dumps(tags),
+            rng.choice(STATUSES),
+            rng.randint(2, 45)
+        ))
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO ops__customers (name, domain) VALUES (?, ?)", customers
+            )
+            conn.executemany("""
+                INSERT INTO ops__parts (
+                    genesis_hash, filename, fingerprint_json, volume, surface_area, dimensions_json
+                ) VALUES (?, ?, ?, ?, ?, ?)
+            """, parts)
+            conn.executemany("""
+                INSERT INTO ops__quotes (
+                    quote_id, part_id, customer_id, material, quantity,
+                    system_price_anchor, final_quoted_price, pricing_tags_json,
+                    status, lead_time_days
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, quotes)
+    finally:
+        conn.close()
+    return {"quotes": n_quotes, "parts": n_parts, "customers": n_customers}
+
+
+def prepare_scale_db(work_dir: Path, n_quotes: int, seed: int) -> Path:
+    """Create a fresh isolated test DB for one scale and point TEST_DB_PATH at it."""
+    db_path = work_dir / f"test_bench_{n_quotes}.db"
+    os.environ["TEST_DB_PATH"] = str(db_path)
+    from scripts import reset_db
+    import database
+
+    database.require_test_db("benchmark seeding")
+    with contextlib.redirect_stdout(io.StringIO()):
+        reset_db.create_fresh_db(db_path)
+        database.initialize_database()
+    seed_quote_history(db_path, n_quotes, seed=seed)
+    return db_path
+
+
+# ============================================================================
+# TIMING
+# ============================================================================
+
+def time_call(fn: Callable[..., Any], repeats: int,
+              setup: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+    """
+    Time fn over `repeats` runs (after one untimed warm-up).
+
+    setup() runs untimed before each call and its return value is passed to fn,
+    so per-call state (e.g. a cache-free mesh copy) does not skew the timing.
+    """
+    def invoke() -> float:
+        arg = setup() if setup else None
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn(arg) if setup else fn()
+            return (time.perf_counter() - start) * 1000
+
+    invoke()
+    samples = [invoke() for _ in range(max(1, repeats))]
+    ordered = sorted(samples)
+    return {
+        "repeats": len(samples),
+        "min_ms": round(ordered[0], 4),
+        "median_ms": round(statistics.median(ordered), 4),
+        "mean_ms": round(statistics.fmean(ordered), 4),
+        "max_ms": round(ordered[-1], 4),
+    }
+
+
+def collect_machine_info() -> Dict[str, Any]:
+    import numpy
+    import trimesh
+    from cutter_ledger.boundary import get_version
+
+    info = {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "sqlite": sqlite3.sqlite_version,
+        "numpy": numpy.__version__,
+        "trimesh": trimesh.__version__,
+        "git_version": get_version(),
+    }
+    try:
+        import psutil
+        info["memory_total_mb"] = round(psutil.virtual_memory().total / (1024 * 1024), 1)
+    except ImportError:
+        info["memory_total_mb"] = None
+    return info
+
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def run_geometry_benchmarks(repeats: int) -> Dict[str, Any]:
+    from ops_layer.estimator import calculate_geometry
+    from ops_layer.genesis_hash import generate_from_trimesh
+
+    results = {}
+    for name, mesh in build_meshes().items():
+        fresh_copy = mesh.copy
+        results[f"calculate_geometry/{name}"] = time_call(calculate_geometry, repeats, setup=fresh_copy)
+        results[f"generate_from_trimesh/{name}"] = time_call(generate_from_trimesh, repeats, setup=fresh_copy)
+    return results
+
+
+def run_scale_benchmarks(n_quotes: int, repeats: int) -> Dict[str, Any]:
+    """Benchmarks that read or write the (already seeded) TEST_DB_PATH database."""
+    import vector_engine
+    from ops_layer import pattern_matcher
+    from ops_layer.pricing_engine import PriceCalculator
+    from cutter_ledger.boundary import emit_cutter_event
+    from state_ledger import boundary as state_boundary
+
+    probe_fingerprint = [1.2, 1.0, 2.5, 4.0, 0.9]
+    results = {
+        "find_similar_parts": time_call(
+            lambda: vector_engine.find_similar_parts(probe_fingerprint, current_vol=12.0),
+            repeats
+        ),
+        "detect_patterns": time_call(
+            lambda: pattern_matcher.detect_patterns(
+                genesis_hash="CUTTER-B0000001",
+                customer_id=1,
+                material="Aluminum 6061",
+                quantity=2,
+                lead_time_days=3
+            ),
+            repeats
+        ),
+    }
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        calculator = PriceCalculator()
+    results["calculate_price_breaks"] = time_call(
+        lambda: calculator.calculate_price_breaks(
+            stock_volume_in3=24.0,
+            material_name="Aluminum 6061",
+            per_part_time_mins=18.0,
+            setup_time_mins=60.0,
+            shop_rate_hour=75.0
+        ),
+        repeats
+    )
+
+    counter = iter(range(10**9))
+    results["emit_cutter_event"] = time_call(
+        lambda: emit_cutter_event(
+            event_type="BENCHMARK_SAMPLE_RECORDED",
+            subject_ref=f"bench:{next(counter)}",
+            event_data={"n_quotes": n_quotes}
+        ),
+        repeats
+    )
+
+    state_boundary.register_entity(ENTITY_REF, "Benchmark Project", cadence_days=7)
+    state_boundary.assign_owner(ENTITY_REF, OWNER_REF, ADMIN_REF)
+    results["emit_state_declaration"] = time_call(
+        lambda: state_boundary.emit_state_declaration(
+            entity_ref=ENTITY_REF,
+            scope_ref=SCOPE_REF,
+            state_text="Benchmark declaration",
+            actor_ref=OWNER_REF,
+            declaration_kind="REAFFIRMATION"
+        ),
+        repeats
+    )
+    return results
+
+
+def run_suite(scales: List[int], repeats: int, work_dir: Path,
+              seed: int = DEFAULT_SEED) -> Dict[str, Any]:
+    previous_test_db = os.environ.get("TEST_DB_PATH")
+    report: Dict[str, Any] = {
+        "suite": "cutter_hot_paths",
+        "timestamp": datetime.now().isoformat(),
+        "machine": collect_machine_info(),
+        "config": {"scales": scales, "repeats": repeats, "seed": seed},
+        "geometry": run_geometry_benchmarks(repeats),
+        "scales": {}
+    }
+    try:
+        for n_quotes in scales:
+            print(f"[BENCH] Seeding {n_quotes} quotes...", file=sys.stderr)
+            seed_start = time.perf_counter()
+            prepare_scale_db(work_dir, n_quotes, seed)
+            seed_ms = (time.perf_counter() - seed_start) * 1000
+            print(f"[BENCH] Timing at {n_quotes} quotes...", file=sys.stderr)
+            report["scales"][str(n_quotes)] = {
+                "seed_ms": round(seed_ms, 1),
+                "benchmarks": run_scale_benchmarks(n_quotes, repeats)
+            }
+    finally:
+        if previous_test_db is None:
+            os.environ.pop("TEST_DB_PATH", None)
+        else:
+            os.environ["TEST_DB_PATH"] = previous_test_db
+    return report
+
+
+# ============================================================================
+# RESULTS
+# ============================================================================
+
+def flatten_medians(report: Dict[str, Any]) -> Dict[str, float]:
+    medians = {name: r["median_ms"] for name, r in report.get("geometry", {}).items()}
+    for scale, scale_report in report.get("scales", {}).items():
+        for name, r in scale_report.get("benchmarks", {}).items():
+            medians[f"{name}@{scale}"] = r["median_ms"]
+    return medians
+
+
+def compare_reports(current: Dict[str, Any], previous: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-benchmark median deltas for benchmarks present in both reports."""
+    current_medians = flatten_medians(current)
+    previous_medians = flatten_medians(previous)
+    rows = []
+    for name in sorted(current_medians):
+        if name not in previous_medians:
+            continue
+        before = previous_medians[name]
+        after = current_medians[name]
+        delta_pct = ((after - before) / before * 100) if before else None
+        rows.append({
+            "benchmark": name,
+            "previous_median_ms": before,
+            "current_median_ms": after,
+            "delta_pct": round(delta_pct, 1) if delta_pct is not None else None
+        })
+    return rows
+
+
+def find_latest_result(results_dir: Path) -> Optional[Path]:
+    candidates = sorted(results_dir.glob("bench_*.json"))
+    return candidates[-1] if candidates else None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Micro-benchmark suite for Cutter hot paths',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python tests/benchmarks/run_benchmarks.py
+  python tests/benchmarks/run_benchmarks.py --scales 1000 --repeats 3
+  python tests/benchmarks/run_benchmarks.py --compare data/benchmarks/bench_20260101_120000.json
+
+Output:
+  JSON report in --results-dir (default: data/benchmarks/)
+  Deltas vs. --compare (or the newest previous report) on stderr
+        """
+    )
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help='Quote-history sizes to seed (default: 1000 10000 100000)')
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                        help='Timed runs per benchmark (default: 5)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help='RNG seed for synthetic history')
+    parser.add_argument('--results-dir', type=str, default=str(DEFAULT_RESULTS_DIR),
+                        help='Directory for JSON reports')
+    parser.add_argument('--compare', type=str, metavar='FILE',
+                        help='Previous report to diff against (default: newest in results dir)')
+    parser.add_argument('--work-dir', type=str,
+                        help='Directory for seeded test DBs (default: temp dir)')
+    args = parser.parse_args()
+
+    results_dir = Path(args.results_dir)
+    previous_path = Path(args.compare) if args.compare else find_latest_result(results_dir)
+
+    with tempfile.TemporaryDirectory(prefix="cutter_bench_test_") as tmp_dir:
+        work_dir = Path(args.work_dir) if args.work_dir else Path(tmp_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        report = run_suite(args.scales, args.repeats, work_dir, seed=args.seed)
+
+    if previous_path and previous_path.exists():
+        previous = json.loads(previous_path.read_text(encoding="utf-8"))
+        report["compared_to"] = str(previous_path)
+        report["comparison"] = compare_reports(report, previous)
+
+    results_dir.mkdir(parents=True, exist_ok=True)
+    output_path = results_dir / f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    for name, median in flatten_medians(report).items():
+        print(f"  {name:<60} {median:>12.3f} ms", file=sys.stderr)
+    for row in report.get("comparison", []):
+        if row["delta_pct"] is not None:
+            print(f"  [DELTA] {row['benchmark']:<52} {row['delta_pct']:>+8.1f}%", file=sys.stderr)
+    print(f"[BENCH] Report written to: {output_path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+Shared fixture for tests that run against their own fresh database.
+"""
+
+import inspect
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import database
+from scripts import reset_db
+
+
+def _restore_env(previous: Dict[str, Optional[str]]) -> None:
+    for name, value in previous.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+
+
+class FreshDbTestCase(unittest.TestCase):
+    """
+    Points TEST_DB_PATH at a new database in a per-test temp directory.
+
+    setUp() sets self.temp_dir and self.test_db and builds the database with
+    reset_db.create_fresh_db(). Cleanups (run after the subclass's tearDown)
+    remove the directory and restore TEST_DB_PATH and every variable named in
+    restore_env.
+    """
+
+    create_db: bool = True  # False: the test builds (or migrates) the database itself
+    seed_defaults: bool = False  # database.seed_default_data() after creating
+    restore_env: Tuple[str, ...] = ()
+
+    def setUp(self) -> None:
+        module = Path(inspect.getfile(type(self))).stem
+        self.addCleanup(_restore_env, {name: os.environ.get(name) for name in ("TEST_DB_PATH", *self.restore_env)})
+        self.temp_dir = tempfile.TemporaryDirectory(prefix=f"{module}_")
+        self.addCleanup(self.temp_dir.cleanup)
+        self.test_db = Path(self.temp_dir.name) / f"{module}.db"
+        os.environ["TEST_DB_PATH"] = str(self.test_db)
+        database.require_test_db(module.replace("_", " "))
+        if self.create_db:
+            reset_db.create_fresh_db(self.test_db)
+            if self.seed_defaults:
+                database.seed_default_data()
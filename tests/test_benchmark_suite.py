@@ -0,0 +1,60 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from tests.benchmarks import run_benchmarks
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def setUp(self) -> None:
+        self.previous_test_db = os.environ.get("TEST_DB_PATH")
+        self.work_dir = tempfile.TemporaryDirectory(prefix="test_bench_suite_")
+
+    def tearDown(self) -> None:
+        if self.previous_test_db is None:
+            os.environ.pop("TEST_DB_PATH", None)
+        else:
+            os.environ["TEST_DB_PATH"] = self.previous_test_db
+        self.work_dir.cleanup()
+
+    def test_meshes_are_deterministic(self) -> None:
+        first = run_benchmarks.build_meshes()
+        second = run_benchmarks.build_meshes()
+        self.assertEqual(list(first), list(second))
+        for name in first:
+            self.assertEqual(len(first[name].faces), len(second[name].faces))
+            self.assertAlmostEqual(first[name].volume, second[name].volume)
+
+    def test_seed_quote_history_counts(self) -> None:
+        db_path = run_benchmarks.prepare_scale_db(Path(self.work_dir.name), 40, seed=7)
+        conn = sqlite3.connect(str(db_path))
+        quotes = conn.execute("SELECT COUNT(*) FROM ops__quotes").fetchone()[0]
+        parts = conn.execute("SELECT COUNT(*) FROM ops__parts").fetchone()[0]
+        conn.close()
+        self.assertEqual(quotes, 40)
+        self.assertEqual(parts, 10)
+
+    def test_run_suite_smoke(self) -> None:
+        report = run_benchmarks.run_suite([20], repeats=1, work_dir=Path(self.work_dir.name))
+        self.assertIn("machine", report)
+        self.assertIn("python", report["machine"])
+        benchmarks = report["scales"]["20"]["benchmarks"]
+        for name in (
+            "find_similar_parts",
+            "detect_patterns",
+            "calculate_price_breaks",
+            "emit_cutter_event",
+            "emit_state_declaration",
+        ):
+            self.assertIn(name, benchmarks)
+            self.assertGreaterEqual(benchmarks[name]["median_ms"], 0.0)
+
+        comparison = run_benchmarks.compare_reports(report, report)
+        self.assertTrue(comparison)
+        self.assertTrue(all(row["delta_pct"] == 0.0 for row in comparison))
+
+
+if __name__ == "__main__":
+    unittest.main()
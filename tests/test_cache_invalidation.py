@@ -0,0 +1,94 @@
+"""
+Test cross-process cache invalidation (cache_invalidation.py, migrations 22-23).
+"""
+
+import sqlite3
+import subprocess
+import sys
+import unittest
+
+import cache_invalidation
+import database
+from scripts import reset_db
+from tests.db_test_case import FreshDbTestCase
+
+
+class TestCacheInvalidation(FreshDbTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache_invalidation.check()
+        self.notifications = []
+
+    def tearDown(self) -> None:
+        cache_invalidation.unregister("test_listener")
+        cache_invalidation.reset()
+
+    def _write(self, sql: str, params=()) -> None:
+        conn = sqlite3.connect(self.test_db)
+        conn.execute(sql, params)
+        conn.commit()
+        conn.close()
+
+    def test_listener_told_exactly_which_tables_changed(self) -> None:
+        cache_invalidation.register(
+            "test_listener", ["ops__materials", "ops__shop_config"], self.notifications.append
+        )
+        self.assertEqual(cache_invalidation.check(), set())
+
+        self._write("INSERT INTO ops__custom_tags (name, impact_type, impact_value) VALUES ('Rush', 'x', 1)")
+        self.assertEqual(cache_invalidation.check(), {"ops__custom_tags"})
+        self.assertEqual(self.notifications, [])
+
+        self._write("UPDATE ops__materials SET cost_per_cubic_inch = 9.5 WHERE name = 'Aluminum 6061'")
+        self.assertEqual(cache_invalidation.check(), {"ops__materials"})
+        self.assertEqual(self.notifications, [{"ops__materials"}])
+
+        # Writes to untracked tables move data_version but invalidate nothing
+        self._write("INSERT INTO ops__customers (name, domain) VALUES ('Acme', 'acme.com')")
+        self.assertEqual(cache_invalidation.check(), set())
+
+    def test_config_cache_sees_other_process_writes(self) -> None:
+        loads = []
+        cache = database._shop_config_cache
+        original_loader = cache._loader
+        cache._loader = lambda: loads.append(1) or original_loader()
+        try:
+            cache.invalidate()
+            self.assertEqual(database.get_config("shop_rate_standard", 0.0), 75.0)
+            self.assertEqual(database.get_config("shop_name", "", str), database.get_config("shop_name", "", str))
+            self.assertEqual(len(loads), 1)
+
+            script = (
+                "import sqlite3, sys; conn = sqlite3.connect(sys.argv[1]); "
+                "conn.execute(\"UPDATE ops__shop_config SET value = '95' WHERE key = 'shop_rate_standard'\"); "
+                "conn.commit()"
+            )
+            subprocess.run([sys.executable, "-c", script, str(self.test_db)], check=True)
+
+            self.assertEqual(database.get_config("shop_rate_standard", 0.0), 95.0)
+            self.assertEqual(len(loads), 2)
+        finally:
+            cache._loader = original_loader
+
+    def test_set_config_and_tag_edits_visible_immediately(self) -> None:
+        database.get_all_tags()
+        database.set_config("shop_name", "Cutter Works")
+        self._write("INSERT INTO ops__custom_tags (name, impact_type, impact_value) VALUES ('Deburr Plus', 'x', 2)")
+
+        self.assertEqual(database.get_config("shop_name", "", str), "Cutter Works")
+        self.assertIn("Deburr Plus", [tag["name"] for tag in database.get_all_tags()])
+
+    def test_replaced_database_invalidates_everything(self) -> None:
+        cache_invalidation.register("test_listener", ["ops__materials"], self.notifications.append)
+        self.assertIn("Aluminum 6061", database.get_all_materials())
+
+        self.test_db.unlink()
+        reset_db.create_fresh_db(self.test_db)
+        self._write("DELETE FROM ops__materials WHERE name = 'Aluminum 6061'")
+
+        self.assertNotIn("Aluminum 6061", database.get_all_materials())
+        self.assertEqual(self.notifications, [{cache_invalidation.ALL_TABLES}])
+
+
+if __name__ == "__main__":
+    unittest.main()
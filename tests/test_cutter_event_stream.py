@@ -0,0 +1,98 @@
+"""
+Test keyset reads of the Cutter Ledger and the server-sent event stream.
+"""
+
+import json
+import os
+import threading
+import time
+import unittest
+
+from cutter_ledger import boundary as cutter_boundary
+from ops_layer import event_stream
+from tests.db_test_case import FreshDbTestCase
+
+
+def _messages(chunks):
+    """(event name, id, data) for each data message in SSE chunks."""
+    parsed = []
+    for chunk in chunks:
+        fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines() if not line.startswith(":"))
+        if "data" in fields:
+            parsed.append((fields.get("event"), fields.get("id"), json.loads(fields["data"])))
+    return parsed
+
+
+class TestCutterEventStream(FreshDbTestCase):
+    restore_env = (event_stream.MAX_SECONDS_ENV,)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.ids = [
+            cutter_boundary.emit_cutter_event(
+                "QUOTE_CREATED" if n % 2 == 0 else "QUOTE_VIEWED", f"quote:{n}", {"n": n}
+            )
+            for n in range(6)
+        ]
+
+    def test_keyset_pages_and_latest(self) -> None:
+        first = cutter_boundary.get_events(after_id=0, limit=4)
+        self.assertEqual([event["id"] for event in first], self.ids[:4])
+        rest = cutter_boundary.get_events(after_id=first[-1]["id"], limit=4)
+        self.assertEqual([event["id"] for event in rest], self.ids[4:])
+        self.assertEqual(cutter_boundary.get_events(after_id=self.ids[-1], limit=4), [])
+
+        created = cutter_boundary.get_events(event_type="QUOTE_CREATED", after_id=self.ids[0])
+        self.assertEqual([event["event_data"]["n"] for event in created], [2, 4])
+
+        latest = cutter_boundary.get_latest_events(3)
+        self.assertEqual([event["id"] for event in latest], self.ids[-3:])
+        self.assertEqual(cutter_boundary.count_events(), 6)
+
+    def test_stream_replays_then_pushes_appends(self) -> None:
+        stream = event_stream.stream_cutter_events(
+            after_id=self.ids[3], filters={"event_type": "QUOTE_CREATED"},
+            max_seconds=5, poll_interval=0.05
+        )
+        self.assertTrue(next(stream).startswith("retry:"))
+        event, event_id, data = _messages([next(stream)])[0]
+        self.assertEqual((event, event_id, data["subject_ref"]), ("cutter_event", str(self.ids[4]), "quote:4"))
+
+        def append() -> None:
+            time.sleep(0.2)
+            cutter_boundary.emit_cutter_event("QUOTE_VIEWED", "quote:6", {"n": 6})
+            cutter_boundary.emit_cutter_event("QUOTE_CREATED", "quote:7", {"n": 7})
+
+        writer = threading.Thread(target=append)
+        writer.start()
+        started = time.monotonic()
+        pushed = _messages([next(stream)])
+        writer.join()
+        stream.close()
+        # Only the matching append, delivered without waiting out the stream
+        self.assertEqual([data["subject_ref"] for _, _, data in pushed], ["quote:7"])
+        self.assertLess(time.monotonic() - started, 4)
+
+    def test_stream_endpoint(self) -> None:
+        from ops_layer import app as app_module
+        client = app_module.app.test_client()
+        os.environ[event_stream.MAX_SECONDS_ENV] = "0"
+
+        response = client.get("/api/cutter/events/stream?after_id=0")
+        self.assertEqual(response.status_code, 400)  # ops_mode required
+
+        response = client.get("/api/cutter/events/stream?ops_mode=planning",
+                              headers={"Last-Event-ID": str(self.ids[2])})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "text/event-stream")
+        body = response.get_data(as_text=True)
+        self.assertEqual([int(event_id) for _, event_id, _ in _messages(body.split("\n\n"))], self.ids[3:])
+
+        response = client.get("/api/cutter/events?ops_mode=planning&after_id=%d&limit=2" % self.ids[0])
+        payload = response.get_json()
+        self.assertEqual([event["id"] for event in payload["events"]], self.ids[1:3])
+        self.assertEqual(payload["next_after_id"], self.ids[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Test online snapshots, incremental ledger exports, retention and scheduling.
+"""
+
+import json
+import os
+import sqlite3
+import unittest
+from pathlib import Path
+
+import write_queue
+from ops_layer import db_backup, metrics
+from tests.db_test_case import FreshDbTestCase
+
+
+class TestDbBackup(FreshDbTestCase):
+    restore_env = (db_backup.BACKUP_DIR_ENV, db_backup.BACKUP_KEEP_ENV)
+
+    def setUp(self) -> None:
+        super().setUp()
+        os.environ.pop(db_backup.BACKUP_DIR_ENV, None)
+        os.environ.pop(db_backup.BACKUP_KEEP_ENV, None)
+        self.backup_dir = db_backup.get_backup_dir(self.test_db)
+        metrics.clear()
+        # Writes stay in the WAL while this connection is open
+        self.writer = write_queue.connect(self.test_db)
+        self.writer.execute("INSERT INTO state__entities (entity_ref, entity_label) VALUES ('E-1', 'Entity')")
+
+    def tearDown(self) -> None:
+        self.writer.close()
+        metrics.clear()
+
+    def _append(self, events: int, declarations: int = 0) -> None:
+        self.writer.executemany(
+            "INSERT INTO cutter__events (event_type, subject_ref) VALUES ('PROBE', ?)",
+            [(f"probe:{n}",) for n in range(events)]
+        )
+        self.writer.executemany("""
+            INSERT INTO state__declarations
+            (entity_ref, scope_ref, state_text, declaration_kind, declared_by_actor_ref)
+            VALUES ('E-1', 'scope', ?, 'REAFFIRMATION', 'actor')
+        """, [(f"state {n}",) for n in range(declarations)])
+
+    def _ledger_ids(self, db_path: Path) -> tuple:
+        conn = sqlite3.connect(db_path)
+        events = [row[0] for row in conn.execute("SELECT id FROM cutter__events ORDER BY id")]
+        declarations = [row[0] for row in conn.execute(
+            "SELECT declaration_id FROM state__declarations ORDER BY declaration_id")]
+        conn.close()
+        return events, declarations
+
+    def test_snapshot_copies_committed_wal_pages_in_steps(self) -> None:
+        self._append(50, declarations=2)
+        summary = db_backup.backup_snapshot(step_pages=2, step_sleep=0)
+
+        snapshot = Path(summary["path"])
+        self.assertEqual(snapshot.parent, self.backup_dir)
+        self.assertGreater(summary["steps"], 1)
+        self.assertEqual(self._ledger_ids(snapshot), self._ledger_ids(self.test_db))
+        self.assertEqual(summary["high_water"], {"cutter__events": 50, "state__declarations": 2})
+        conn = sqlite3.connect(snapshot)
+        self.assertEqual(conn.execute("PRAGMA integrity_check").fetchone()[0], "ok")
+        conn.close()
+        self.assertEqual(metrics.events()[db_backup.SNAPSHOT_EVENT]["file"], snapshot.name)
+        self.assertEqual(list(self.backup_dir.glob(".*.tmp")), [])
+
+    def test_ledger_exports_only_rows_past_the_high_water_mark(self) -> None:
+        self._append(5, declarations=1)
+        snapshot = Path(db_backup.backup_snapshot(step_sleep=0)["path"])
+
+        self._append(3, declarations=2)
+        first = db_backup.export_ledgers(step_sleep=0)
+        self.assertEqual(first["rows"], {"cutter__events": 3, "state__declarations": 2})
+        self.assertEqual(first["from_ids"], {"cutter__events": 5, "state__declarations": 1})
+        self.assertEqual(self._ledger_ids(Path(first["path"])), ([6, 7, 8], [2, 3]))
+
+        self.assertIsNone(db_backup.export_ledgers(step_sleep=0)["file"])
+        self._append(1)
+        second = db_backup.export_ledgers(step_sleep=0)
+        self.assertEqual(second["rows"], {"cutter__events": 1})
+        manifest = db_backup.load_manifest(self.backup_dir)
+        self.assertEqual([entry["file"] for entry in manifest["exports"]],
+                         [Path(first["path"]).name, Path(second["path"]).name])
+
+        # Snapshot + exports in order restores both ledgers
+        restored = Path(self.temp_dir.name) / "test_restored.db"
+        restored.write_bytes(snapshot.read_bytes())
+        conn = sqlite3.connect(restored)
+        applied = [db_backup.apply_ledger_export(conn, self.backup_dir / entry["file"])
+                   for entry in manifest["exports"]]
+        conn.close()
+        self.assertEqual(applied, [first["rows"], second["rows"]])
+        self.assertEqual(self._ledger_ids(restored), self._ledger_ids(self.test_db))
+
+    def test_restore_applies_only_exports_after_the_snapshot(self) -> None:
+        self._append(2)
+        db_backup.backup_snapshot(step_sleep=0)
+        self._append(2, declarations=1)
+        before = db_backup.export_ledgers(step_sleep=0)
+        snapshot = db_backup.backup_snapshot(step_sleep=0)
+        self._append(3, declarations=1)
+        after = db_backup.export_ledgers(step_sleep=0)
+
+        # The first snapshot keeps `before` in the manifest; the newest one already holds its rows
+        manifest = db_backup.load_manifest(self.backup_dir)
+        self.assertEqual([entry["file"] for entry in manifest["exports"]], [before["file"], after["file"]])
+        entry = manifest["snapshots"][-1]
+        self.assertEqual([export["file"] for export in db_backup.exports_after(manifest, entry)], [after["file"]])
+
+        restored = Path(self.temp_dir.name) / "test_restored.db"
+        restored.write_bytes(Path(snapshot["path"]).read_bytes())
+        conn = sqlite3.connect(restored)
+        # Every export, twice: rows the snapshot already has are skipped
+        applied = [db_backup.apply_ledger_export(conn, self.backup_dir / export["file"])
+                   for export in manifest["exports"] * 2]
+        conn.close()
+        nothing = {"cutter__events": 0, "state__declarations": 0}
+        self.assertEqual(applied, [nothing, after["rows"], nothing, nothing])
+        self.assertEqual(self._ledger_ids(restored), self._ledger_ids(self.test_db))
+
+    def test_retention_prunes_snapshots_and_the_exports_they_cover(self) -> None:
+        os.environ[db_backup.BACKUP_KEEP_ENV] = "2"
+        files = []
+        for _ in range(3):
+            self._append(2)
+            files.append(db_backup.export_ledgers(step_sleep=0)["file"])
+            files.append(Path(db_backup.backup_snapshot(step_sleep=0)["path"]).name)
+        self._append(1)
+        last_export = db_backup.export_ledgers(step_sleep=0)["file"]
+
+        manifest = db_backup.load_manifest(self.backup_dir)
+        self.assertEqual([entry["file"] for entry in manifest["snapshots"]], [files[3], files[5]])
+        # files[4] is still needed to roll the oldest kept snapshot forward
+        self.assertEqual([entry["file"] for entry in manifest["exports"]], [files[4], last_export])
+        on_disk = sorted(path.name for path in self.backup_dir.glob("*.db"))
+        self.assertEqual(on_disk, sorted([files[3], files[4], files[5], last_export]))
+
+    def test_scheduled_runs_take_what_is_due(self) -> None:
+        self._append(1)
+        first = db_backup.run_scheduled(backup_interval=3600, export_interval=3600)
+        self.assertIn("taken_at", first)
+        # The snapshot also counts as the latest backup for exports
+        self.assertIsNone(db_backup.run_scheduled(backup_interval=3600, export_interval=3600))
+        manifest = json.loads((self.backup_dir / db_backup.MANIFEST_NAME).read_text())
+        self.assertEqual(len(manifest["snapshots"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
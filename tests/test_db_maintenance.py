@@ -0,0 +1,90 @@
+"""
+Test SQLite maintenance: statistics, WAL truncation, incremental vacuum, scheduling.
+"""
+
+import io
+import os
+import sqlite3
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import write_queue
+from ops_layer import db_maintenance, metrics
+from tests.db_test_case import FreshDbTestCase
+
+
+class TestDbMaintenance(FreshDbTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        metrics.clear()
+
+    def tearDown(self) -> None:
+        metrics.clear()
+
+    def _fill_wal(self) -> sqlite3.Connection:
+        """Commit into the WAL and keep the connection open (closing would checkpoint)."""
+        conn = write_queue.connect(self.test_db)
+        conn.execute("CREATE TABLE IF NOT EXISTS maintenance_probe (payload TEXT)")
+        conn.executemany("INSERT INTO maintenance_probe VALUES (?)", [("x" * 2048,)] * 200)
+        return conn
+
+    def test_run_updates_statistics_and_truncates_the_wal(self) -> None:
+        conn = self._fill_wal()
+        try:
+            first = db_maintenance.run_maintenance()
+            second = db_maintenance.run_maintenance()
+        finally:
+            conn.close()
+
+        self.assertEqual(first["statistics"]["mode"], "ANALYZE")
+        self.assertEqual(second["statistics"]["mode"], "optimize")
+        self.assertGreater(first["wal_size_before_mb"], 0)
+        self.assertFalse(first["checkpoint"]["busy"])
+        self.assertEqual(first["wal_size_after_mb"], 0)
+        self.assertLess(first["wal_size_delta_mb"], 0)
+        self.assertEqual(first["settings"]["journal_size_limit"], write_queue.JOURNAL_SIZE_LIMIT)
+        self.assertEqual(first["incremental_vacuum"]["auto_vacuum"], "NONE")
+        self.assertEqual(metrics.events()[db_maintenance.METRICS_EVENT]["duration_ms"], second["duration_ms"])
+
+    def test_incremental_vacuum_where_enabled(self) -> None:
+        vacuum_db = Path(self.temp_dir.name) / "test_incremental.db"
+        conn = sqlite3.connect(vacuum_db)
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("CREATE TABLE filler (payload TEXT)")
+        conn.executemany("INSERT INTO filler VALUES (?)", [("y" * 4096,)] * 100)
+        conn.commit()
+        conn.execute("DELETE FROM filler")
+        conn.commit()
+        conn.close()
+
+        summary = db_maintenance.run_maintenance(vacuum_db)["incremental_vacuum"]
+        self.assertTrue(summary["ran"])
+        self.assertGreater(summary["freelist_pages_before"], 0)
+        self.assertEqual(summary["freelist_pages_after"], 0)
+
+    def test_scheduled_runs_wait_for_idle_and_interval(self) -> None:
+        conn = self._fill_wal()
+        try:
+            self.assertFalse(db_maintenance.is_idle(idle_seconds=3600))
+            self.assertTrue(db_maintenance.is_idle(idle_seconds=0))
+            os.environ[db_maintenance.IDLE_ENV] = "3600"
+            try:
+                summary = db_maintenance.run_scheduled(interval=3600)
+            finally:
+                os.environ.pop(db_maintenance.IDLE_ENV, None)
+        finally:
+            conn.close()
+        self.assertEqual(summary["checkpoint"]["mode"], "skipped (not idle)")
+        # Ran less than an interval ago
+        self.assertIsNone(db_maintenance.run_scheduled(interval=3600))
+
+    def test_cli_runs_once(self) -> None:
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(db_maintenance.main(["--no-checkpoint"]), 0)
+        self.assertIn('"statistics"', output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
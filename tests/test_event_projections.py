@@ -0,0 +1,168 @@
+"""
+Test Cutter Ledger projections: checkpointed catch-up, rebuild, verify.
+"""
+
+import sqlite3
+import unittest
+
+from cutter_ledger import boundary as cutter_boundary
+from cutter_ledger import projections
+from cutter_ledger import queries as cutter_queries
+from state_ledger import queries as state_queries
+from tests.db_test_case import FreshDbTestCase
+
+NOW = "2026-01-02T00:00:00Z"
+
+
+class TestEventProjections(FreshDbTestCase):
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.test_db)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _insert_events(self, rows) -> None:
+        conn = sqlite3.connect(self.test_db)
+        conn.executemany("""
+            INSERT INTO cutter__events (event_type, subject_ref, event_data, created_at)
+            VALUES (?, ?, ?, ?)
+        """, rows)
+        conn.commit()
+        conn.close()
+
+    def _insert_deadlines(self, rows) -> None:
+        conn = sqlite3.connect(self.test_db)
+        conn.executemany("""
+            INSERT INTO state__declarations
+            (entity_ref, scope_ref, state_text, declaration_kind, declared_by_actor_ref, declared_at)
+            VALUES (?, ?, ?, 'RECLASSIFICATION', 'org:test/actor:a', ?)
+        """, rows)
+        conn.commit()
+        conn.close()
+
+    def test_catch_up_applies_only_new_events(self) -> None:
+        self._insert_events([
+            ("stage_started", "entity:a", '{"stage":"machining"}', "2026-01-01T00:00:00Z"),
+            ("quote_created", "entity:a", "{}", "2026-01-01T00:00:01Z"),
+        ])
+        conn = self._connect()
+        self.assertEqual(projections.catch_up(conn), 1)
+        self.assertEqual(projections.catch_up(conn), 0)
+        self.assertEqual(set(projections.get_checkpoints(conn).values()), {2})
+
+        self._insert_events([
+            ("stage_completed", "entity:a", '{"stage":"machining"}', "2026-01-01T00:30:00Z"),
+        ])
+        results = cutter_queries.query_dwell_vs_expectation(conn=conn, now=NOW)
+        conn.close()
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["completed_at"], "2026-01-01T00:30:00Z")
+        self.assertEqual(results[0]["elapsed_seconds"], 1800)
+
+    def test_first_by_created_at_regardless_of_insert_order(self) -> None:
+        self._insert_events([
+            ("stage_started", "entity:b", '{"stage":"packing"}', "2026-01-01T02:00:00Z"),
+            ("stage_started", "entity:b", '{"stage":"packing"}', "2026-01-01T01:00:00Z"),
+            ("stage_started", "entity:a", '{"stage":"machining"}', "2026-01-01T00:00:00Z"),
+        ])
+        projected = cutter_queries.query_dwell_vs_expectation(db_path=self.test_db, now=NOW)
+        scanned = cutter_queries._query_dwell_vs_expectation_scan(db_path=self.test_db, now=NOW)
+
+        self.assertEqual(projected, scanned)
+        self.assertEqual([row["subject_ref"] for row in projected], ["entity:a", "entity:b"])
+        self.assertEqual(projected[1]["started_at"], "2026-01-01T01:00:00Z")
+
+    def test_deadline_anti_joins_use_projections(self) -> None:
+        self._insert_deadlines([
+            ("entity:a", "promise:deadline", '{"deadline":"2026-02-01T00:00:00Z"}', "2026-01-01T00:00:00Z"),
+            ("entity:b", "promise:deadline", '{"deadline":"2026-02-02T00:00:00Z"}', "2026-01-01T00:00:01Z"),
+            ("entity:a", "promise:response_by", '{"deadline":"2026-01-05T00:00:00Z"}', "2026-01-01T00:00:02Z"),
+        ])
+        self.assertEqual(len(state_queries.query_open_deadlines(db_path=self.test_db)), 2)
+
+        self._insert_events([
+            ("carrier_handoff", "entity:a", "{}", "2026-01-01T03:00:00Z"),
+            ("response_received", "entity:a", "{}", "2026-01-01T04:00:00Z"),
+        ])
+        open_deadlines = state_queries.query_open_deadlines(db_path=self.test_db)
+        open_responses = cutter_queries.query_open_response_deadlines(db_path=self.test_db)
+
+        self.assertEqual([row["entity_ref"] for row in open_deadlines], ["entity:b"])
+        self.assertEqual(open_responses, [])
+
+    def test_reads_answer_from_checkpoint_plus_tail_without_writing(self) -> None:
+        self._insert_deadlines([
+            ("entity:a", "promise:deadline", '{"deadline":"2026-02-01T00:00:00Z"}', "2026-01-01T00:00:00Z"),
+            ("entity:b", "promise:deadline", '{"deadline":"2026-02-02T00:00:00Z"}', "2026-01-01T00:00:01Z"),
+        ])
+        self._insert_events([
+            ("carrier_handoff", "entity:a", "{}", "2026-01-01T03:00:00Z"),
+            ("stage_started", "entity:a", '{"stage":"machining"}', "2026-01-01T00:00:00Z"),
+        ])
+        writer = sqlite3.connect(self.test_db, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            open_deadlines = state_queries.query_open_deadlines(db_path=self.test_db)
+            dwell = cutter_queries.query_dwell_vs_expectation(db_path=self.test_db, now=NOW)
+        finally:
+            writer.execute("ROLLBACK")
+            writer.close()
+
+        self.assertEqual([row["entity_ref"] for row in open_deadlines], ["entity:b"])
+        self.assertEqual([row["stage"] for row in dwell], ["machining"])
+        conn = self._connect()
+        self.assertEqual(projections.get_checkpoints(conn), {})
+
+        # The writer applies projections with each append
+        event_id = cutter_boundary.emit_cutter_event("carrier_handoff", "entity:b")
+        self.assertTrue(projections.is_current(conn))
+        self.assertEqual(projections.get_checkpoint(conn, "carrier_handoffs"), event_id)
+        self.assertEqual(projections.tail_events(conn, "carrier_handoffs", 0),
+                         projections.tail_events(conn, "carrier_handoffs", 0, "entity:a")
+                         + projections.tail_events(conn, "carrier_handoffs", 0, "entity:b"))
+        conn.close()
+        self.assertEqual(state_queries.query_open_deadlines(db_path=self.test_db), [])
+
+    def test_malformed_event_scoped_to_its_subject(self) -> None:
+        self._insert_events([
+            ("stage_started", "entity:bad", "{bad json}", "2026-01-01T00:00:00Z"),
+            ("stage_started", "entity:ok", '{"stage":"inspection"}', "2026-01-01T00:00:00Z"),
+        ])
+        with self.assertRaises(ValueError):
+            cutter_queries.query_dwell_vs_expectation(db_path=self.test_db, now=NOW)
+        with self.assertRaises(ValueError):
+            cutter_queries.query_dwell_vs_expectation(db_path=self.test_db, subject_ref="entity:bad", now=NOW)
+
+        ok_rows = cutter_queries.query_dwell_vs_expectation(
+            db_path=self.test_db, subject_ref="entity:ok", now=NOW
+        )
+        self.assertEqual([row["stage"] for row in ok_rows], ["inspection"])
+
+    def test_rebuild_from_zero_matches_scan(self) -> None:
+        self._insert_deadlines([
+            ("entity:a", "promise:deadline", '{"deadline":"2026-02-01T00:00:00Z"}', "2026-01-01T00:00:00Z"),
+            ("entity:c", "promise:response_by", '{"deadline":"2026-01-05T00:00:00Z"}', "2026-01-01T00:00:02Z"),
+        ])
+        self._insert_events([
+            ("stage_started", "entity:a", '{"stage":"machining"}', "2026-01-01T00:00:00Z"),
+            ("stage_completed", "entity:a", '{"stage":"machining"}', "2026-01-01T00:45:00Z"),
+            ("stage_completed", "entity:c", '{"stage":"packing"}', "2026-01-01T00:10:00Z"),
+            ("carrier_handoff", "entity:a", "{}", "2026-01-01T01:00:00Z"),
+        ])
+        conn = self._connect()
+        projections.catch_up(conn)
+        before = conn.execute("SELECT * FROM cutter__proj_stage_intervals ORDER BY subject_ref, stage").fetchall()
+        applied = projections.rebuild(conn)
+        after = conn.execute("SELECT * FROM cutter__proj_stage_intervals ORDER BY subject_ref, stage").fetchall()
+        conn.close()
+
+        self.assertEqual(applied, 4)
+        self.assertEqual([tuple(row) for row in before], [tuple(row) for row in after])
+        report = projections.verify(self.test_db, now=NOW)
+        self.assertEqual(set(report), {"dwell_vs_expectation", "open_response_deadlines", "open_deadlines"})
+        for name, check in report.items():
+            self.assertTrue(check["equal"], f"{name}: {check}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Test parsed subject columns on cutter__events (migration 19).
+"""
+
+import json
+import sqlite3
+import unittest
+
+import query_override_events
+from cutter_ledger import boundary
+from tests.db_test_case import FreshDbTestCase
+
+
+class TestEventSubjectColumns(FreshDbTestCase):
+    def _insert_events(self, rows) -> None:
+        conn = sqlite3.connect(self.test_db)
+        conn.executemany("""
+            INSERT INTO cutter__events (event_type, subject_ref, event_data)
+            VALUES (?, ?, ?)
+        """, rows)
+        conn.commit()
+        conn.close()
+
+    def test_subject_ref_parsing(self) -> None:
+        cases = [
+            ("QUOTE_OVERRIDDEN", "quote:45", ("quote", "45")),
+            ("QUOTE_CREATED", "123", ("quote", "123")),
+            ("stage_started", "org:acme.com/entity:customer:42", ("customer", "42")),
+            ("stage_started", "entity:job-7", ("entity", "job-7")),
+            ("CUSTOMER_CREATED", "customer:9", ("customer", "9")),
+            ("QUOTE_CREATED", "12a", (None, None)),
+            ("unknown_subject", "unknown", (None, None)),
+        ]
+        self._insert_events([(event_type, ref, None) for event_type, ref, _ in cases])
+
+        conn = sqlite3.connect(self.test_db)
+        rows = conn.execute(
+            "SELECT subject_kind, subject_id FROM cutter__events ORDER BY id"
+        ).fetchall()
+        conn.close()
+        self.assertEqual(rows, [expected for _, _, expected in cases])
+
+    def test_get_events_matches_prefixed_and_bare_quote_refs(self) -> None:
+        self._insert_events([
+            ("QUOTE_CREATED", "7", None),
+            ("QUOTE_OVERRIDDEN", "quote:7", '{"override_delta": 5}'),
+            ("QUOTE_OVERRIDDEN", "quote:70", '{"override_delta": 1}'),
+        ])
+        events = boundary.get_events(subject_kind="quote", subject_id=7)
+        self.assertEqual([event["event_type"] for event in events], ["QUOTE_CREATED", "QUOTE_OVERRIDDEN"])
+
+    def test_override_joins_use_subject_index(self) -> None:
+        conn = sqlite3.connect(self.test_db)
+        conn.executemany("""
+            INSERT INTO ops__quotes (id, quote_id, part_id, customer_id, material,
+                                     system_price_anchor, final_quoted_price)
+            VALUES (?, ?, 1, ?, '6061', 100.0, 110.0)
+        """, [(1, "Q-1", 10), (2, "Q-2", 20)])
+        conn.commit()
+        plan = " ".join(row[3] for row in conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT oe.id FROM ops__quotes q
+            JOIN cutter__events oe ON oe.subject_kind = 'quote' AND oe.subject_id = CAST(q.id AS TEXT)
+            WHERE q.customer_id = ? AND oe.event_type = 'QUOTE_OVERRIDDEN'
+        """, (10,)).fetchall())
+        conn.close()
+        self.assertNotIn("SCAN", plan)
+
+        payload = json.dumps({"override_delta": 10.0, "override_percent": 10.0})
+        self._insert_events([
+            ("QUOTE_OVERRIDDEN", "quote:1", payload),
+            ("QUOTE_OVERRIDDEN", "quote:2", payload),
+            ("QUOTE_OVERRIDDEN", "unknown", payload),
+        ])
+
+        all_events = query_override_events.query_all_override_events()
+        by_subject = {row["subject_ref"]: row["quote_id_human"] for row in all_events}
+        self.assertEqual(by_subject, {"quote:1": "Q-1", "quote:2": "Q-2", "unknown": None})
+
+        customer_events = query_override_events.query_override_events_for_customer(10)
+        self.assertEqual([row["quote_id_human"] for row in customer_events], ["Q-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
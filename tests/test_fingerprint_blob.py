@@ -0,0 +1,91 @@
+"""
+Test packed fingerprint BLOBs (migration 21) and vectorized similarity search.
+"""
+
+import json
+import sqlite3
+import unittest
+
+import numpy as np
+
+import database
+import vector_engine
+from scripts import backfill_fingerprint_blobs
+from tests.db_test_case import FreshDbTestCase
+
+
+class TestFingerprintBlob(FreshDbTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        conn = sqlite3.connect(self.test_db)
+        conn.execute("INSERT INTO ops__customers (id, name, domain) VALUES (1, 'Acme', 'acme.com')")
+        conn.commit()
+        conn.close()
+
+    def _add_quote(self, name: str, fingerprint, is_deleted: int = 0) -> int:
+        part_id = database.upsert_part(
+            genesis_hash=f"hash-{name}", filename=f"{name}.stl",
+            fingerprint_json=json.dumps(fingerprint), volume=fingerprint[0] * 10.0,
+            surface_area=fingerprint[4] * 50.0, dimensions_json="{}", process_routing_json="[]"
+        )
+        conn = sqlite3.connect(self.test_db)
+        cursor = conn.execute("""
+            INSERT INTO ops__quotes (quote_id, part_id, customer_id, material, system_price_anchor,
+                                     final_quoted_price, status, is_deleted)
+            VALUES (?, ?, 1, '6061', 100.0, 110.0, 'Sent', ?)
+        """, (f"Q-{name}", part_id, is_deleted))
+        conn.commit()
+        conn.close()
+        return cursor.lastrowid
+
+    def test_pack_round_trips_exact_values(self) -> None:
+        fingerprint = [0.1, 1.0 / 3.0, 2.5, 1e-9, 123456.789]
+        blob = database.pack_fingerprint(json.dumps(fingerprint))
+
+        self.assertEqual(len(blob), database.FINGERPRINT_BLOB_SIZE)
+        self.assertEqual(np.frombuffer(blob, dtype="<f8").tolist(), fingerprint)
+        self.assertIsNone(database.pack_fingerprint([1.0, 2.0]))
+        self.assertIsNone(database.pack_fingerprint("{not json"))
+        self.assertIsNone(database.pack_fingerprint(["a", 1, 2, 3, 4]))
+
+    def test_find_similar_parts_ranks_active_quotes(self) -> None:
+        twin = self._add_quote("twin", [1.0, 1.0, 2.0, 3.0, 0.5])
+        cousin = self._add_quote("cousin", [1.2, 1.5, 2.5, 3.5, 0.6])
+        self._add_quote("trashed", [1.0, 1.0, 2.0, 3.0, 0.5], is_deleted=1)
+        far = self._add_quote("far", [50.0, 9.0, 9.0, 9.0, 20.0])
+
+        matches = vector_engine.find_similar_parts([1.0, 1.0, 2.0, 3.0, 0.5], current_vol=10.0)
+
+        self.assertEqual([m["id"] for m in matches], [twin, cousin, far])
+        self.assertEqual(matches[0]["match_type"], "twin")
+        self.assertEqual(matches[0]["distance"], 0.0)
+        self.assertEqual(matches[0]["filename"], "twin.stl")
+        self.assertGreater(matches[2]["distance"], 10.0)  # volume liar penalty
+
+    def test_backfill_fills_legacy_rows_and_loader_falls_back(self) -> None:
+        self._add_quote("new", [1.0, 1.0, 2.0, 3.0, 0.5])
+        legacy = self._add_quote("legacy", [2.0, 1.0, 2.0, 3.0, 0.5])
+        conn = sqlite3.connect(self.test_db)
+        conn.execute("UPDATE ops__parts SET fingerprint_blob = NULL WHERE filename = 'legacy.stl'")
+        conn.execute("""
+            INSERT INTO ops__parts (genesis_hash, filename, fingerprint_json)
+            VALUES ('hash-bad', 'bad.stl', '[1, 2]')
+        """)
+        conn.commit()
+
+        # NULL BLOB -> packed from JSON at load time; invalid vectors dropped
+        ids, vectors = vector_engine.load_fingerprint_matrix()
+        self.assertEqual(vectors.shape, (2, 5))
+        self.assertEqual(vectors[1].tolist(), [2.0, 1.0, 2.0, 3.0, 0.5])
+        self.assertEqual(vector_engine.find_similar_parts([2.0, 1.0, 2.0, 3.0, 0.5])[0]["id"], legacy)
+
+        summary = backfill_fingerprint_blobs.backfill(conn, batch_size=1)
+        self.assertEqual((summary["updated"], summary["invalid"]), (1, 1))
+        self.assertEqual(backfill_fingerprint_blobs.backfill(conn)["updated"], 0)
+        missing = conn.execute("SELECT filename FROM ops__parts WHERE fingerprint_blob IS NULL").fetchall()
+        conn.close()
+        self.assertEqual(missing, [("bad.stl",)])
+
+
+if __name__ == "__main__":
+    unittest.main()
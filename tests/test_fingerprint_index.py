@@ -0,0 +1,119 @@
+"""
+Test the shared fingerprint matrix (fingerprint_index.py, migration 22).
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+import database
+import fingerprint_index
+import vector_engine
+from scripts import reset_db
+from tests.db_test_case import FreshDbTestCase
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+class TestFingerprintIndex(FreshDbTestCase):
+    restore_env = (fingerprint_index.INDEX_ENV,)
+
+    def setUp(self) -> None:
+        super().setUp()
+        os.environ.pop(fingerprint_index.INDEX_ENV, None)
+        conn = sqlite3.connect(self.test_db)
+        conn.execute("INSERT INTO ops__customers (id, name, domain) VALUES (1, 'Acme', 'acme.com')")
+        conn.commit()
+        conn.close()
+        fingerprint_index.reset()
+
+    def tearDown(self) -> None:
+        fingerprint_index.reset()
+
+    def _add_quote(self, name: str, fingerprint) -> int:
+        part_id = database.upsert_part(
+            genesis_hash=f"hash-{name}", filename=f"{name}.stl",
+            fingerprint_json=json.dumps(fingerprint), volume=fingerprint[0] * 10.0,
+            surface_area=fingerprint[4] * 50.0, dimensions_json="{}", process_routing_json="[]"
+        )
+        conn = sqlite3.connect(self.test_db)
+        cursor = conn.execute("""
+            INSERT INTO ops__quotes (quote_id, part_id, customer_id, material,
+                                     system_price_anchor, final_quoted_price, status)
+            VALUES (?, ?, 1, '6061', 100.0, 110.0, 'Sent')
+        """, (f"Q-{name}", part_id))
+        conn.commit()
+        conn.close()
+        return cursor.lastrowid
+
+    def test_publishes_once_and_remaps_after_writes(self) -> None:
+        first = self._add_quote("first", [1.0, 1.0, 2.0, 3.0, 0.5])
+        snapshot = fingerprint_index.get_snapshot()
+        index_path = fingerprint_index.get_index_path()
+
+        self.assertEqual(index_path, Path(str(self.test_db) + "-fingerprints"))
+        self.assertEqual(snapshot.source, "mmap")
+        self.assertEqual(snapshot.quote_ids.tolist(), [first])
+        self.assertEqual(snapshot.volumes.tolist(), [10.0])
+        self.assertFalse(snapshot.vectors.flags.writeable)
+        self.assertIs(fingerprint_index.get_snapshot(), snapshot)
+
+        second = self._add_quote("second", [2.0, 1.0, 2.0, 3.0, 0.5])
+        remapped = fingerprint_index.get_snapshot()
+        self.assertGreater(remapped.generation, snapshot.generation)
+        self.assertEqual(sorted(remapped.quote_ids.tolist()), [first, second])
+        self.assertEqual(snapshot.quote_ids.tolist(), [first])  # old map still readable
+
+        conn = sqlite3.connect(self.test_db)
+        conn.execute("UPDATE ops__quotes SET is_deleted = 1 WHERE id = ?", (second,))
+        conn.commit()
+        conn.close()
+        self.assertEqual(fingerprint_index.get_snapshot().quote_ids.tolist(), [first])
+        self.assertEqual([m["id"] for m in vector_engine.find_similar_parts([2.0, 1.0, 2.0, 3.0, 0.5])], [first])
+
+    def test_second_process_attaches_without_republishing(self) -> None:
+        quote_id = self._add_quote("shared", [1.0, 1.0, 2.0, 3.0, 0.5])
+        fingerprint_index.get_snapshot()
+        index_path = fingerprint_index.get_index_path()
+        published = index_path.stat()
+
+        script = (
+            "import fingerprint_index; s = fingerprint_index.get_snapshot(); "
+            "print(s.source, s.quote_ids.tolist())"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=str(REPO_ROOT), env=dict(os.environ),
+            capture_output=True, text=True, check=True
+        )
+
+        self.assertEqual(result.stdout.strip().splitlines()[-1], f"mmap [{quote_id}]")
+        self.assertEqual(index_path.stat().st_ino, published.st_ino)
+        self.assertEqual(index_path.stat().st_mtime_ns, published.st_mtime_ns)
+
+    def test_rebuilt_database_does_not_reuse_stale_file(self) -> None:
+        self._add_quote("old", [1.0, 1.0, 2.0, 3.0, 0.5])
+        stale = fingerprint_index.get_snapshot()
+
+        # Same path, new epoch: counters restart but the old file must not match
+        self.test_db.unlink()
+        reset_db.create_fresh_db(self.test_db)
+        self.assertEqual(fingerprint_index.get_snapshot().quote_ids.tolist(), [])
+        self.assertNotEqual(fingerprint_index.get_snapshot().epoch, stale.epoch)
+
+    def test_disabled_index_keeps_matrix_in_memory(self) -> None:
+        os.environ[fingerprint_index.INDEX_ENV] = "off"
+        quote_id = self._add_quote("local", [1.0, 1.0, 2.0, 3.0, 0.5])
+
+        snapshot = fingerprint_index.get_snapshot()
+        self.assertEqual(snapshot.source, "memory")
+        self.assertEqual(snapshot.quote_ids.tolist(), [quote_id])
+        self.assertIs(fingerprint_index.get_snapshot(), snapshot)
+        self.assertFalse(Path(str(self.test_db) + "-fingerprints").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
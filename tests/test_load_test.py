@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts import reset_db
+
+
+class TestLoadTestScript(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.previous_test_db = os.environ.get("TEST_DB_PATH")
+        cls.temp_dir = tempfile.TemporaryDirectory(prefix="test_load_script_")
+        cls.test_db_path = Path(cls.temp_dir.name) / "test_load_script.db"
+        os.environ["TEST_DB_PATH"] = str(cls.test_db_path)
+        reset_db.create_fresh_db(cls.test_db_path)
+        from scripts import load_test
+        cls.load_test = load_test
+        cls.transport = load_test.build_in_process_transport(output_dir=Path(cls.temp_dir.name))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.transport.app.config['PDF_OUTPUT_DIR'] = ''
+        if cls.previous_test_db is None:
+            os.environ.pop("TEST_DB_PATH", None)
+        else:
+            os.environ["TEST_DB_PATH"] = cls.previous_test_db
+        cls.temp_dir.cleanup()
+
+    def setUp(self) -> None:
+        os.environ["TEST_DB_PATH"] = str(self.test_db_path)
+
+    def test_percentile_nearest_rank(self) -> None:
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(self.load_test.percentile(values, 50), 50.0)
+        self.assertEqual(self.load_test.percentile(values, 99), 99.0)
+        self.assertEqual(self.load_test.percentile([], 99), 0.0)
+
+    def test_parse_mix_rejects_unknown_operation(self) -> None:
+        mix = self.load_test.parse_mix("quote=0,recalculate=5")
+        self.assertEqual(mix["quote"], 0)
+        self.assertEqual(mix["recalculate"], 5)
+        with self.assertRaises(ValueError):
+            self.load_test.parse_mix("teleport=1")
+
+    def test_single_worker_mix_reports_per_endpoint(self) -> None:
+        mix = {"quote": 1, "recalculate": 1, "save_quote": 1,
+               "pattern_suggestions": 1, "pdf": 1, "ledger_query": 1}
+        cwd = os.getcwd()
+        report = self.load_test.run_load(
+            self.transport, workers=1, duration_s=None, total_requests=24, mix=mix
+        )
+        self.assertEqual(os.getcwd(), cwd)
+        self.assertTrue(any(Path(self.temp_dir.name, "quotes_pdf").glob("*.pdf")))
+        self.assertEqual(report["overall"]["requests"], 24)
+        self.assertEqual(report["overall"]["database_locked"], 0)
+        for endpoint, stats in report["endpoints"].items():
+            self.assertIn("p50_ms", stats)
+            self.assertIn("p99_ms", stats)
+            self.assertEqual(stats["errors"], 0, f"{endpoint}: {stats['status_counts']}")
+
+
+if __name__ == "__main__":
+    unittest.main()
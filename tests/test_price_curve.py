@@ -0,0 +1,122 @@
+"""
+Test the vectorized price curve against the per-quantity anchor formula.
+"""
+
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import database
+from ops_layer import pricing_engine
+from ops_layer.pricing_engine import PriceCalculator, price_curve
+from tests.db_test_case import FreshDbTestCase
+
+INPUTS = dict(
+    stock_volume_in3=8.0,
+    material_name='Aluminum 6061',
+    per_part_time_mins=4.0,
+    setup_time_mins=60.0,
+    shop_rate_hour=75.0
+)
+
+
+class TestPriceCurve(FreshDbTestCase):
+    seed_defaults = True
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.calculator = PriceCalculator()
+
+    def test_curve_matches_the_anchor_formula_across_the_scrap_rule(self) -> None:
+        quantities = [1, 2, 9, 10, 11, 99, 250, 10000]
+        curve = self.calculator.calculate_price_curve(quantities=quantities, handling_time_mins=0.75, **INPUTS)
+        material_per_unit = 8.0 * 0.30 * pricing_engine.MATERIAL_MARKUP()
+
+        for i, qty in enumerate(quantities):
+            anchor = self.calculator.calculate_anchor(quantity=qty, handling_time_mins=0.75, **INPUTS)
+            self.assertAlmostEqual(curve['material_cost'][i], anchor['material_cost'], places=9)
+            self.assertAlmostEqual(curve['labor_cost'][i], anchor['labor_cost'], places=9)
+            self.assertAlmostEqual(curve['unit_price'][i], anchor['total_price'] / qty, places=9)
+        # One setup scrap block below 10 pieces, 2% from 10 on
+        self.assertAlmostEqual(curve['material_cost'][2], material_per_unit * 10)
+        self.assertAlmostEqual(curve['material_cost'][3], material_per_unit * 10 * 1.02)
+
+        default_curve = self.calculator.calculate_price_curve(**INPUTS)
+        self.assertEqual(default_curve['quantity'].tolist(), list(range(1, pricing_engine.CURVE_MAX_QUANTITY + 1)))
+        with self.assertRaises(ValueError):
+            price_curve([0, 5], 1.0, 1.0, 1.0, 1.0)
+
+    def test_price_breaks_read_material_cost_once(self) -> None:
+        with mock.patch.object(database, "get_material_cost", wraps=database.get_material_cost) as lookup:
+            breaks = self.calculator.calculate_price_breaks(**INPUTS)
+            tiers = self.calculator.calculate_price_breaks(quantities=[3, 30, 300], **INPUTS)
+        self.assertEqual(lookup.call_count, 2)
+        self.assertEqual(list(breaks), pricing_engine.QUANTITY_BREAKS)
+        self.assertEqual(list(tiers), [3, 30, 300])
+        anchor = self.calculator.calculate_anchor(quantity=30, **INPUTS)
+        self.assertEqual(tiers[30]['total_price'], round(anchor['total_price'], 2))
+        self.assertEqual(tiers[30]['price_per_unit'], round(anchor['total_price'] / 30, 2))
+
+    def test_curve_endpoint_and_pdf_rows_use_saved_inputs(self) -> None:
+        from ops_layer import app as app_module
+        from ops_layer.pdf_generator import QuotePDFGenerator
+        client = app_module.app.test_client()
+
+        response = client.post("/api/pricing/curve", json=dict(INPUTS, max_quantity=500))
+        payload = response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(payload['count'], 500)
+        self.assertEqual(len(payload['curve']['unit_price']), 500)
+
+        saved_inputs = payload['pricing_inputs']
+        response = client.post("/api/pricing/curve", json={'pricing_inputs': saved_inputs, 'quantities': [1, 25]})
+        curve = response.get_json()['curve']
+        self.assertEqual(curve['quantity'], [1, 25])
+        self.assertEqual(curve['total_price'][1],
+                         round(self.calculator.calculate_anchor(quantity=25, **INPUTS)['total_price'], 2))
+
+        for body in ({'quantities': [1]}, dict(INPUTS, max_quantity=10 ** 6), dict(INPUTS, quantities=[0]),
+                     dict(INPUTS, quantities=[1e30]), dict(INPUTS, quantities=[float('inf')]),
+                     dict(INPUTS, quantities=[pricing_engine.CURVE_QUANTITY_LIMIT + 1]),
+                     dict(INPUTS, shop_rate_hour=float('nan')), dict(INPUTS, setup_time_mins=float('inf')),
+                     dict(INPUTS, shop_rate_hour=1e308, quantities=[1000])):
+            response = client.post("/api/pricing/curve", json=body)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.get_json()['code'], 'INVALID_PRICING_INPUT')
+
+        generator = QuotePDFGenerator(output_dir=str(Path(self.temp_dir.name) / "pdf"))
+        rows = generator._price_break_rows_from_curve([1, 25], saved_inputs)
+        self.assertEqual([row[0] for row in rows], ['1', '25'])
+        self.assertEqual(rows[1][2], f"${curve['total_price'][1]:,.2f}")
+        self.assertIsNone(generator._price_break_rows_from_curve([1, 25], None))
+
+    def test_save_quote_keeps_only_inputs_that_reproduce_the_anchor(self) -> None:
+        import json
+        import sqlite3
+        from ops_layer import app as app_module
+        client = app_module.app.test_client()
+        saved_inputs = client.post("/api/pricing/curve", json=dict(INPUTS, max_quantity=1)).get_json()['pricing_inputs']
+        total_at_5 = self.calculator.calculate_anchor(quantity=5, **INPUTS)['total_price']
+
+        def save(quote_id: str, anchor: float, inputs: dict) -> dict:
+            response = client.post("/save_quote", json={
+                "shape_config": {"type": "block", "dimensions": {"x": 2.0, "y": 2.0, "z": 2.0}, "volume": 6.0},
+                "quote_id": quote_id, "material": "Aluminum 6061", "quantity": 5,
+                "system_price_anchor": anchor, "final_quoted_price": anchor,
+                "customer_name": "Test Customer", "pricing_inputs": inputs
+            })
+            self.assertEqual(response.status_code, 200)
+            conn = sqlite3.connect(self.test_db)
+            row = conn.execute("SELECT physics_snapshot_json FROM ops__quotes WHERE quote_id = ?", (quote_id,)).fetchone()
+            conn.close()
+            return json.loads(row[0])
+
+        # Glass-box anchors are per unit; anchor_price is the total
+        self.assertEqual(save("Q-PER-UNIT", total_at_5 / 5, saved_inputs)['pricing_inputs'], saved_inputs)
+        self.assertIn('pricing_inputs', save("Q-TOTAL", round(total_at_5, 2), saved_inputs))
+        tampered = dict(saved_inputs, shop_rate_hour=saved_inputs['shop_rate_hour'] * 2)
+        self.assertNotIn('pricing_inputs', save("Q-TAMPERED", total_at_5 / 5, tampered))
+
+
+if __name__ == "__main__":
+    unittest.main()
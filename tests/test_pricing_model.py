@@ -0,0 +1,169 @@
+"""
+Test the pricing model document, its browser evaluation and /save_quote anchor checks.
+"""
+
+import json
+import shutil
+import sqlite3
+import subprocess
+import unittest
+from pathlib import Path
+
+import database
+from tests.db_test_case import FreshDbTestCase
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+PRICING_MODEL_JS = PROJECT_ROOT / "ops_layer" / "static" / "js" / "modules" / "pricing_model.js"
+
+# /recalculate bodies as api.recalculateQuote() sends them (DOM values are strings)
+RECALC_CASES = [
+    {"material_name": "Aluminum 6061", "stock_x": 2.125, "stock_y": 1.125, "stock_z": 4.25,
+     "part_volume": 6.5, "setup_time": "60", "shop_rate": "75", "quantity": 1, "handling_time": 0.5},
+    {"material_name": "Stainless 304", "stock_x": 3.5, "stock_y": 3.5, "stock_z": 1.0,
+     "part_volume": 4.0, "setup_time": "90", "shop_rate": "110", "quantity": 25, "handling_time": 1.25},
+    {"material_name": "Unobtainium", "stock_x": 1.0, "stock_y": 1.0, "stock_z": 1.0,
+     "part_volume": 0.9, "quantity": 9},
+]
+
+
+class TestPricingModel(FreshDbTestCase):
+    seed_defaults = True
+
+    def setUp(self) -> None:
+        super().setUp()
+        from ops_layer import app as app_module
+        self.client = app_module.app.test_client()
+
+    def _quote_count(self) -> int:
+        conn = sqlite3.connect(self.test_db)
+        count = conn.execute("SELECT COUNT(*) FROM ops__quotes").fetchone()[0]
+        conn.close()
+        return count
+
+    def _snapshot(self, quote_id: str) -> dict:
+        conn = sqlite3.connect(self.test_db)
+        row = conn.execute("SELECT physics_snapshot_json FROM ops__quotes WHERE quote_id = ?", (quote_id,)).fetchone()
+        conn.close()
+        return json.loads(row[0])
+
+    def test_model_is_versioned_and_served_conditionally(self) -> None:
+        response = self.client.get("/api/pricing/model")
+        model = response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["ETag"], f'"{model["version"]}"')
+        self.assertEqual(response.headers["Cache-Control"], "no-cache")
+        self.assertEqual(model["materials"]["Aluminum 6061"]["cost_per_cubic_inch"],
+                         database.get_material_cost("Aluminum 6061"))
+        self.assertEqual(model["config"]["material_markup"], database.get_config("material_markup"))
+
+        response = self.client.get("/api/pricing/model", headers={"If-None-Match": f'"{model["version"]}"'})
+        self.assertEqual(response.status_code, 304)
+
+        conn = sqlite3.connect(self.test_db)
+        conn.execute("UPDATE ops__materials SET cost_per_cubic_inch = 0.45 WHERE name = 'Aluminum 6061'")
+        conn.commit()
+        conn.close()
+        response = self.client.get("/api/pricing/model", headers={"If-None-Match": f'"{model["version"]}"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.get_json()["version"], model["version"])
+
+    @unittest.skipUnless(shutil.which("node"), "node is required to evaluate the browser module")
+    def test_browser_evaluation_matches_recalculate(self) -> None:
+        model = self.client.get("/api/pricing/model").get_json()
+        script = (
+            f"const m = await import({json.dumps(PRICING_MODEL_JS.as_uri())});"
+            f"const model = {json.dumps(model)};"
+            f"console.log(JSON.stringify({json.dumps(RECALC_CASES)}.map((c) => m.evaluate(model, c))));"
+        )
+        result = subprocess.run(
+            [shutil.which("node"), "--input-type=module", "-e", script],
+            capture_output=True, text=True, timeout=30
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        browser = json.loads(result.stdout)
+
+        for case, local in zip(RECALC_CASES, browser):
+            server = self.client.post("/recalculate", json=dict(case, ops_mode="planning")).get_json()
+            for key in ("total_price", "material_cost", "labor_cost", "total_runtime_mins",
+                        "per_part_time_mins", "machine_time_mins", "hand_time_mins", "quantity"):
+                self.assertAlmostEqual(local[key], server[key], delta=0.011, msg=f"{case['material_name']}: {key}")
+            for key, value in server["pricing_inputs"].items():
+                self.assertAlmostEqual(local["pricing_inputs"][key], value, places=9)
+
+    @unittest.skipUnless(shutil.which("node"), "node is required to evaluate the browser module")
+    def test_browser_evaluation_rejects_what_recalculate_rejects(self) -> None:
+        model = self.client.get("/api/pricing/model").get_json()
+        malformed = [dict(RECALC_CASES[0], stock_x="12abc"), dict(RECALC_CASES[0], shop_rate=""),
+                     dict(RECALC_CASES[0], quantity="2.5")]
+        script = (
+            f"const m = await import({json.dumps(PRICING_MODEL_JS.as_uri())});"
+            f"const model = {json.dumps(model)};"
+            f"console.log(JSON.stringify({json.dumps(malformed)}.map((c) => {{"
+            f"try {{ m.evaluate(model, c); return null; }} catch (e) {{ return e.message; }} }})));"
+        )
+        result = subprocess.run(
+            [shutil.which("node"), "--input-type=module", "-e", script],
+            capture_output=True, text=True, timeout=30
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        errors = json.loads(result.stdout)
+
+        for case, error in zip(malformed, errors):
+            self.assertIsNotNone(error, case)
+            response = self.client.post("/recalculate", json=dict(case, ops_mode="planning"))
+            self.assertIn("error", response.get_json())
+
+    def test_save_quote_checks_a_locally_computed_anchor(self) -> None:
+        recalc_inputs = RECALC_CASES[1]
+        expected = self.client.post("/recalculate", json=recalc_inputs).get_json()
+        version = self.client.get("/api/pricing/model").get_json()["version"]
+        payload = {
+            "shape_config": {"type": "block", "dimensions": {"x": 3.0, "y": 3.0, "z": 0.5}, "volume": 4.0},
+            "material": recalc_inputs["material_name"],
+            "quantity": recalc_inputs["quantity"],
+            "final_price": 2000.0,
+            "customer_name": "Test Customer",
+            "recalc_inputs": recalc_inputs,
+            "pricing_model_version": version,
+            # Whatever the client claims, the snapshot keeps the server's inputs
+            "pricing_inputs": {"material_cost_per_unit": 0.01},
+        }
+
+        response = self.client.post("/save_quote", json=dict(payload, anchor_price=expected["total_price"] - 5))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.get_json()["code"], "ANCHOR_MISMATCH")
+        self.assertEqual(response.get_json()["expected_anchor_price"], expected["total_price"])
+        response = self.client.post("/save_quote", json=dict(
+            payload, anchor_price=expected["total_price"] - 5, pricing_model_version="0" * 16))
+        self.assertEqual(response.get_json()["code"], "PRICING_MODEL_STALE")
+        response = self.client.post("/save_quote", json=dict(payload, recalc_inputs={"shop_rate": "abc"}))
+        self.assertEqual(response.status_code, 400)
+        # The stored anchor is the glass box's per-unit system_price_anchor when present
+        response = self.client.post("/save_quote", json=dict(
+            payload, anchor_price=expected["total_price"], system_price_anchor=1.0))
+        self.assertEqual(response.get_json()["code"], "ANCHOR_MISMATCH")
+        self.assertEqual(self._quote_count(), 0)
+
+        response = self.client.post("/save_quote", json=dict(
+            payload, quote_id="Q-CHECKED", system_price_anchor=expected["total_price"] / 25))
+        self.assertEqual(response.status_code, 200)
+        snapshot = self._snapshot("Q-CHECKED")
+        self.assertEqual(snapshot["pricing_inputs"], expected["pricing_inputs"])
+        self.assertAlmostEqual(snapshot["stock_volume_in3"], 3.5 * 3.5 * 1.0)
+
+        # Without recalc_inputs, client inputs are kept only if they reproduce the stored anchor
+        unchecked = dict(payload, recalc_inputs=None, anchor_price=expected["total_price"],
+                         pricing_inputs=expected["pricing_inputs"])
+        self.client.post("/save_quote", json=dict(unchecked, quote_id="Q-KEPT", stock_volume_in3=3.5 * 3.5))
+        self.client.post("/save_quote", json=dict(unchecked, quote_id="Q-BAD-STOCK", stock_volume_in3=99.0))
+        self.client.post("/save_quote", json=dict(unchecked, quote_id="Q-BAD-ANCHOR", anchor_price=1.0,
+                                                  stock_volume_in3=3.5 * 3.5))
+        self.assertEqual(self._snapshot("Q-KEPT")["pricing_inputs"], expected["pricing_inputs"])
+        self.assertAlmostEqual(self._snapshot("Q-KEPT")["stock_volume_in3"], 3.5 * 3.5)
+        self.assertNotIn("stock_volume_in3", self._snapshot("Q-BAD-STOCK"))
+        self.assertNotIn("pricing_inputs", self._snapshot("Q-BAD-ANCHOR"))
+        self.assertNotIn("stock_volume_in3", self._snapshot("Q-BAD-ANCHOR"))
+
+
+if __name__ == "__main__":
+    unittest.main()
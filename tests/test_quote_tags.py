@@ -0,0 +1,124 @@
+"""
+Test ops__quote_tags side table (migration 20).
+"""
+
+import json
+import sqlite3
+import unittest
+
+import database
+from migrations import runner
+from ops_layer import pattern_matcher
+from scripts import reset_db
+from tests.db_test_case import FreshDbTestCase
+
+
+class TestQuoteTags(FreshDbTestCase):
+    create_db = False
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.previous_cache = runner._migrations_cache
+
+    def tearDown(self) -> None:
+        runner._migrations_cache = self.previous_cache
+
+    def _seed_part_and_customer(self, conn: sqlite3.Connection) -> None:
+        conn.execute("INSERT INTO ops__parts (id, genesis_hash) VALUES (1, 'hash-1')")
+        conn.execute("INSERT INTO ops__customers (id, name, domain) VALUES (1, 'Acme', 'acme.com')")
+
+    def _insert_quote(self, conn: sqlite3.Connection, quote_id: str, tags, status: str = 'Sent') -> int:
+        tags_json = tags if isinstance(tags, str) or tags is None else json.dumps(tags)
+        cursor = conn.execute("""
+            INSERT INTO ops__quotes (quote_id, part_id, customer_id, material,
+                                     system_price_anchor, final_quoted_price, pricing_tags_json, status)
+            VALUES (?, 1, 1, '6061', 100.0, 120.0, ?, ?)
+        """, (quote_id, tags_json, status))
+        return cursor.lastrowid
+
+    def _tags(self) -> list:
+        conn = sqlite3.connect(self.test_db)
+        rows = conn.execute(
+            "SELECT quote_id, tag_name, value FROM ops__quote_tags ORDER BY quote_id, tag_name"
+        ).fetchall()
+        conn.close()
+        return rows
+
+    def test_backfill_from_existing_json(self) -> None:
+        runner._migrations_cache = []  # baseline only: no side table yet
+        reset_db.create_fresh_db(self.test_db)
+        conn = sqlite3.connect(self.test_db)
+        self._seed_part_and_customer(conn)
+        first = self._insert_quote(conn, "Q-1", {"Rush Job": 0.5, "Proto": 0.0})
+        self._insert_quote(conn, "Q-2", "{not json")
+        self._insert_quote(conn, "Q-3", None)
+        conn.commit()
+        conn.close()
+
+        runner._migrations_cache = None
+        database.initialize_database()
+
+        self.assertEqual(self._tags(), [(first, "Proto", 0.0), (first, "Rush Job", 0.5)])
+
+    def test_create_quote_writes_tags_with_the_quote(self) -> None:
+        reset_db.create_fresh_db(self.test_db)
+        conn = sqlite3.connect(self.test_db)
+        self._seed_part_and_customer(conn)
+        conn.commit()
+        conn.close()
+
+        rush = database.create_quote(
+            part_id=1, customer_id=1, contact_id=None, quote_id="Q-RUSH", user_id=None,
+            material="6061", system_price_anchor=100.0, final_quoted_price=130.0,
+            pricing_tags_json=json.dumps({"Rush Job": 0.75, "Rush": 0.25})
+        )
+        database.create_quote(
+            part_id=1, customer_id=1, contact_id=None, quote_id="Q-RUSHISH", user_id=None,
+            material="6061", system_price_anchor=100.0, final_quoted_price=110.0,
+            pricing_tags_json=json.dumps({"Rush": 1.0, "Rush Job": 0.0})
+        )
+
+        # Exact names: "Rush" no longer counts as "Rush Job" (old LIKE search did)
+        self.assertEqual(database.count_quotes_using_tag_name("Rush Job"), 2)
+        self.assertEqual(database.get_quote_ids_with_tag("Rush Job"), [rush])
+        self.assertEqual(database.count_quotes_using_tag_name("Rush Job Extra"), 0)
+
+        conn = sqlite3.connect(self.test_db)
+        conn.execute("UPDATE ops__quotes SET pricing_tags_json = '{\"Proto\": 1}' WHERE id = ?", (rush,))
+        conn.commit()
+        conn.close()
+        self.assertEqual(database.get_quote_ids_with_tag("Rush Job"), [])
+        self.assertEqual(database.get_quote_ids_with_tag("Proto"), [rush])
+
+    def test_pattern_matcher_counts_from_side_table(self) -> None:
+        reset_db.create_fresh_db(self.test_db)
+        conn = sqlite3.connect(self.test_db)
+        self._seed_part_and_customer(conn)
+        self._insert_quote(conn, "Q-1", {"Rush Job": 0.5, "Tight Tol": 0.2})
+        self._insert_quote(conn, "Q-2", {"Rush Job": 0.4})
+        self._insert_quote(conn, "Q-3", {"Rush Job": 0.0, "Tight Tol": 0.1})
+        self._insert_quote(conn, "Q-4", {"Rush Job": 1.0}, status='Draft')
+        conn.commit()
+        conn.close()
+
+        conn = database.get_connection()
+        suggestions = pattern_matcher._detect_customer_patterns(conn.cursor(), 1)
+        conn.close()
+        by_tag = {s['tag']: (s['historical_count'], round(s['confidence'], 3)) for s in suggestions}
+        self.assertEqual(by_tag, {"Rush Job": (2, 0.667), "Tight Tol": (2, 0.667)})
+
+        # SQLite sorts TEXT above every number; a TEXT value is not an active tag
+        conn = database.get_connection()
+        text_quote = self._insert_quote(conn, "Q-5", {"Tight Tol": "high", "Rush Job": "yes"})
+        conn.commit()
+        self.assertEqual(conn.execute(
+            "SELECT COUNT(*) FROM ops__quote_tags WHERE quote_id = ? AND typeof(value) = 'text'", (text_quote,)
+        ).fetchone()[0], 2)
+        counts = pattern_matcher._count_active_tags(conn.cursor(), "q.customer_id = ?", (1,))
+        conn.close()
+        self.assertEqual(counts, (4, [("Rush Job", 2), ("Tight Tol", 2)]))
+        self.assertNotIn(text_quote, database.get_quote_ids_with_tag("Rush Job"))
+
+
+if __name__ == "__main__":
+    unittest.main()
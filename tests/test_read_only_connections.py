@@ -0,0 +1,73 @@
+"""
+Test read-only connections: no writes, no file creation, no write lock.
+"""
+
+import sqlite3
+import unittest
+from pathlib import Path
+
+import database
+from cutter_ledger import projections
+from state_ledger import boundary as state_boundary
+from state_ledger import queries as state_queries
+from tests.db_test_case import FreshDbTestCase
+
+
+class TestReadOnlyConnections(FreshDbTestCase):
+    def _insert(self, sql: str, rows) -> None:
+        conn = sqlite3.connect(self.test_db)
+        conn.executemany(sql, rows)
+        conn.commit()
+        conn.close()
+
+    def test_writes_are_refused(self) -> None:
+        conn = database.get_read_connection()
+        with self.assertRaises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO ops__custom_tags (name, impact_type, impact_value, category) "
+                         "VALUES ('Nope', 'multiplier', 1.0, 'Test')")
+        conn.close()
+
+    def test_missing_database_is_not_created(self) -> None:
+        missing = Path(self.temp_dir.name) / "test_missing.db"
+        with self.assertRaises(sqlite3.OperationalError):
+            database.get_read_connection(missing)
+        self.assertFalse(missing.exists())
+
+    def test_reads_run_while_write_lock_is_held(self) -> None:
+        state_boundary.register_entity("org:test/entity:part:1", "Part 1")
+        writer = sqlite3.connect(self.test_db, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            writer.execute("INSERT INTO state__entities (entity_ref, entity_label) "
+                           "VALUES ('org:test/entity:part:2', 'Part 2')")
+            entities = [row["entity_ref"] for row in state_queries.list_entities()]
+            self.assertTrue(state_boundary.entity_exists("org:test/entity:part:1"))
+        finally:
+            writer.execute("ROLLBACK")
+            writer.close()
+
+        self.assertEqual(entities, ["org:test/entity:part:1"])
+
+    def test_projection_reads_through_read_connection(self) -> None:
+        self._insert("""
+            INSERT INTO state__declarations
+            (entity_ref, scope_ref, state_text, declaration_kind, declared_by_actor_ref, declared_at)
+            VALUES (?, 'promise:deadline', '{"deadline":"2026-02-01T00:00:00Z"}', 'RECLASSIFICATION',
+                    'org:test/actor:a', ?)
+        """, [("entity:a", "2026-01-01T00:00:00Z"), ("entity:b", "2026-01-01T00:00:01Z")])
+        self._insert("""
+            INSERT INTO cutter__events (event_type, subject_ref, event_data, created_at)
+            VALUES ('carrier_handoff', ?, '{}', ?)
+        """, [("entity:a", "2026-01-01T03:00:00Z")])
+
+        conn = database.get_read_connection()
+        open_deadlines = state_queries.query_open_deadlines(conn=conn)
+        # The handoff came from the tail; the read applied nothing
+        self.assertFalse(projections.is_current(conn, ["carrier_handoffs"]))
+        conn.close()
+
+        self.assertEqual([row["entity_ref"] for row in open_deadlines], ["entity:b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Test the saved-report result cache: hits, exact invalidation, provenance.
+"""
+
+import sqlite3
+import unittest
+
+from ops_layer import report_cache
+from tests.db_test_case import FreshDbTestCase
+
+ENTITY_A = "org:test/entity:part:a"
+ENTITY_B = "org:test/entity:part:b"
+
+
+class TestReportCache(FreshDbTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        report_cache.clear()
+        conn = sqlite3.connect(self.test_db)
+        conn.executemany("INSERT INTO state__entities (entity_ref, entity_label) VALUES (?, ?)",
+                         [(ENTITY_A, "Part A"), (ENTITY_B, "Part B")])
+        conn.commit()
+        conn.close()
+
+    def tearDown(self) -> None:
+        report_cache.clear()
+
+    def _declare(self, entity_ref: str, scope_ref: str, days_ago: float) -> None:
+        conn = sqlite3.connect(self.test_db)
+        conn.execute("""
+            INSERT INTO state__declarations
+            (entity_ref, scope_ref, state_text, declaration_kind, declared_by_actor_ref, declared_at)
+            VALUES (?, ?, 'Running', 'REAFFIRMATION', 'org:test/actor:a',
+                    strftime('%Y-%m-%dT%H:%M:%SZ', 'now', ?))
+        """, (entity_ref, scope_ref, f"-{days_ago * 86400:.0f} seconds"))
+        conn.commit()
+        conn.close()
+
+    def _run(self, query_type: str = "entities_time_in_state_over", threshold_days: int = 5):
+        params = {} if query_type == "latest_declaration_per_entity" else {"threshold_days": threshold_days}
+        return report_cache.run_report(1, query_type, params)
+
+    def test_rerun_without_new_declarations_is_a_hit(self) -> None:
+        self._declare(ENTITY_A, "scope:weekly", 10.5)
+        rows, cache = self._run()
+        self.assertFalse(cache["hit"])
+        self.assertEqual(cache["declaration_high_water"], 1)
+        # Next change: day 11 of the only row
+        self.assertIsNotNone(cache["valid_until"])
+
+        cached_rows, cache = self._run()
+        self.assertTrue(cache["hit"])
+        self.assertEqual(cached_rows, rows)
+        self.assertEqual([row["entity_ref"] for row in rows], [ENTITY_A])
+
+        _, other = self._run(threshold_days=3)
+        self.assertFalse(other["hit"])  # different params, different entry
+
+    def test_append_that_cannot_change_the_answer_keeps_the_entry(self) -> None:
+        self._declare(ENTITY_A, "scope:weekly", 10.5)
+        self._run()
+        self._declare(ENTITY_B, "scope:weekly", 1.5)  # below threshold, new pair
+        rows, cache = self._run()
+
+        self.assertTrue(cache["hit"])
+        self.assertEqual(cache["declaration_high_water"], 2)
+        self.assertEqual([row["entity_ref"] for row in rows], [ENTITY_A])
+
+    def test_append_that_changes_the_answer_invalidates(self) -> None:
+        self._declare(ENTITY_A, "scope:weekly", 10.5)
+        self._run()
+        self._declare(ENTITY_A, "scope:weekly", 0.5)  # reaffirms the reported pair
+        rows, cache = self._run()
+        self.assertFalse(cache["hit"])
+        self.assertEqual(rows, [])
+
+        self._declare(ENTITY_B, "scope:monthly", 20.5)  # backdated: qualifies itself
+        rows, cache = self._run()
+        self.assertFalse(cache["hit"])
+        self.assertEqual([row["entity_ref"] for row in rows], [ENTITY_B])
+
+        latest_rows, cache = self._run("latest_declaration_per_entity")
+        self.assertFalse(cache["hit"])
+        self._declare(ENTITY_B, "scope:other", 0.5)
+        rows, cache = self._run("latest_declaration_per_entity")
+        self.assertFalse(cache["hit"])
+        self.assertEqual(len(rows), len(latest_rows) + 1)
+
+    def test_day_boundary_expires_the_entry(self) -> None:
+        self._declare(ENTITY_A, "scope:weekly", 3.5)
+        self._run()
+        key = next(iter(report_cache._entries))
+        entry = report_cache._entries[key]
+        # Day 6 of the row is its first day over the threshold of 5
+        declared_jd = entry.valid_until - 6
+        conn = sqlite3.connect(self.test_db)
+        expected_jd = conn.execute(
+            "SELECT JULIANDAY(declared_at) FROM state__declarations"
+        ).fetchone()[0]
+        conn.close()
+        self.assertAlmostEqual(declared_jd, expected_jd, places=6)
+
+        report_cache._entries[key] = entry._replace(valid_until=entry.computed_at)
+        _, cache = self._run()
+        self.assertFalse(cache["hit"])
+
+
+if __name__ == "__main__":
+    unittest.main()
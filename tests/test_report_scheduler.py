@@ -0,0 +1,81 @@
+"""
+Test background report snapshots: cycle, latest snapshot, pruning, locking.
+"""
+
+import os
+import unittest
+
+import database
+from ops_layer import report_cache, report_scheduler
+from state_ledger import boundary as state_boundary
+from tests.db_test_case import FreshDbTestCase
+
+
+class TestReportScheduler(FreshDbTestCase):
+    restore_env = (report_scheduler.SNAPSHOT_KEEP_ENV,)
+
+    def setUp(self) -> None:
+        super().setUp()
+        report_cache.clear()
+
+        entity_ref = "org:test/entity:project:alpha"
+        state_boundary.register_entity(entity_ref, "Alpha", cadence_days=7)
+        state_boundary.assign_owner(entity_ref, "org:test/actor:owner", "org:test/actor:admin")
+        state_boundary.emit_state_declaration(
+            entity_ref=entity_ref,
+            scope_ref="org:test/scope:weekly",
+            state_text="Running",
+            actor_ref="org:test/actor:owner",
+            declaration_kind="REAFFIRMATION"
+        )
+        self.report_id = database.create_saved_report(
+            "weekly-latest", "latest_declaration_per_entity", "{}", "org:test/actor:owner"
+        )["report_id"]
+        self.directory = report_scheduler.get_snapshot_dir()
+
+    def tearDown(self) -> None:
+        report_cache.clear()
+
+    def test_cycle_writes_latest_snapshots_once_per_interval(self) -> None:
+        summary = report_scheduler.run_cycle(force=True)
+        self.assertFalse(summary["skipped"])
+        self.assertEqual(summary["reports"], 1)
+        self.assertTrue(summary["ritual"])
+        self.assertEqual(self.directory, self.test_db.with_name(f"{self.test_db.name}-snapshots"))
+
+        snapshot = report_scheduler.latest_snapshot(report_scheduler.report_kind(self.report_id))
+        self.assertEqual(snapshot["report_id"], self.report_id)
+        self.assertEqual([row["entity_ref"] for row in snapshot["rows"]], ["org:test/entity:project:alpha"])
+        self.assertIn("hit", snapshot["cache"])
+        ritual = report_scheduler.latest_snapshot(report_scheduler.RITUAL_KIND)
+        self.assertEqual(ritual["ritual"]["ritual"], "weekly_structural_visibility")
+        self.assertIn("ds2_unowned_recognition", ritual["ritual"])
+
+        # Another process (or thread) finished a cycle less than an interval ago
+        self.assertTrue(report_scheduler.run_cycle(interval=3600)["skipped"])
+        # Scheduled runs are not interactive runs
+        self.assertIsNone(database.get_saved_report(self.report_id)["last_run_at"])
+
+    def test_old_snapshots_are_pruned(self) -> None:
+        os.environ[report_scheduler.SNAPSHOT_KEEP_ENV] = "2"
+        kind = report_scheduler.report_kind(self.report_id)
+        paths = [report_scheduler.write_snapshot(kind, {"n": n}) for n in range(4)]
+
+        remaining = sorted(path.name for path in self.directory.glob(f"{kind}-*.json"))
+        self.assertEqual(remaining, sorted(path.name for path in paths[2:]))
+        self.assertEqual(report_scheduler.latest_snapshot(kind)["n"], 3)
+        self.assertIsNone(report_scheduler.latest_snapshot(report_scheduler.report_kind(self.report_id + 10)))
+
+    @unittest.skipIf(report_scheduler.fcntl is None, "flock unavailable")
+    def test_cycle_skipped_while_another_process_holds_the_lock(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / report_scheduler.LOCK_NAME, "a") as handle:
+            report_scheduler.fcntl.flock(handle.fileno(), report_scheduler.fcntl.LOCK_EX)
+            self.assertTrue(report_scheduler.run_cycle(force=True)["skipped"])
+            self.assertIsNone(report_scheduler.latest_snapshot(report_scheduler.RITUAL_KIND))
+        self.assertFalse(report_scheduler.run_cycle(force=True)["skipped"])
+        self.assertIsNotNone(report_scheduler.latest_snapshot(report_scheduler.RITUAL_KIND))
+
+
+if __name__ == "__main__":
+    unittest.main()
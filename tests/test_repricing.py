@@ -0,0 +1,181 @@
+"""
+Test what-if repricing of open quotes against the per-quote anchor formula.
+"""
+
+import json
+import sqlite3
+import unittest
+
+import database
+from ops_layer import estimator, repricing
+from tests.db_test_case import FreshDbTestCase
+
+
+class TestRepricing(FreshDbTestCase):
+    seed_defaults = True
+
+    def setUp(self) -> None:
+        super().setUp()
+        self._execute("INSERT INTO ops__customers (id, name, domain) VALUES (1, 'Acme', 'acme.test')")
+        self._execute("""
+            INSERT INTO ops__parts (id, genesis_hash, volume, dimensions_json)
+            VALUES (1, 'hash-1', 2.0, '{"x": 1.5, "y": 2.25, "z": 4.0}')
+        """)
+        self.inputs = {
+            'material_cost_per_unit': 3.0, 'per_part_time_mins': 6.0,
+            'setup_time_mins': 45.0, 'shop_rate_hour': 75.0, 'handling_time_mins': 0.75
+        }
+        snapshot = json.dumps({'stock_volume_in3': 12.0, 'pricing_inputs': self.inputs})
+        self.saved = self._quote("Q-SAVED", 'Draft', 25, snapshot)
+        self.legacy = self._quote("Q-LEGACY", 'Sent', 3, json.dumps({'material_cost': 5.0}))
+        self._quote("Q-WON", 'Won', 1, snapshot)
+        deleted = self._quote("Q-DELETED", 'Draft', 1, snapshot)
+        self._execute("UPDATE ops__quotes SET is_deleted = 1 WHERE id = ?", (deleted,))
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        conn = sqlite3.connect(self.test_db)
+        cursor = conn.execute(sql, params)
+        conn.commit()
+        conn.close()
+        return cursor.lastrowid
+
+    def _quote(self, quote_id: str, status: str, quantity: int, snapshot: str) -> int:
+        return self._execute("""
+            INSERT INTO ops__quotes
+            (quote_id, part_id, customer_id, material, quantity, system_price_anchor,
+             final_quoted_price, physics_snapshot_json, status)
+            VALUES (?, 1, 1, 'Aluminum 6061', ?, 500.0, 600.0, ?, ?)
+        """, (quote_id, quantity, snapshot, status))
+
+    def _quote_rows(self) -> list:
+        conn = sqlite3.connect(self.test_db)
+        rows = conn.execute("SELECT * FROM ops__quotes ORDER BY id").fetchall()
+        conn.close()
+        return rows
+
+    def test_open_quotes_reprice_like_the_anchor_formula(self) -> None:
+        before = self._quote_rows()
+        summary = repricing.run_reprice({
+            'shop_rate_hour': 90.0,
+            'material_costs': {'Aluminum 6061': 0.40},
+        })
+        self.assertEqual(self._quote_rows(), before)
+        self.assertEqual((summary['quote_count'], summary['repriced_count']), (2, 2))
+
+        results = {row['quote_id']: row for row in repricing.get_run(summary['run_id'])['results']}
+        self.assertEqual(sorted(results), ["Q-LEGACY", "Q-SAVED"])
+        markup = summary['scenario']['material_markup']
+
+        # Saved snapshot: stock volume and runtime inputs as quoted, new rate and cost
+        saved = results["Q-SAVED"]
+        self.assertEqual(saved['stock_source'], repricing.STOCK_SNAPSHOT)
+        material = 12.0 * 0.40 * markup * 25 * 1.02
+        labor = (45.0 + 6.75 * 25) / 60.0 * 90.0
+        self.assertAlmostEqual(saved['anchor_after'], round(material + labor, 2))
+        self.assertAlmostEqual(saved['delta'], round(material + labor - 500.0, 2))
+
+        # No snapshot inputs: stock from the part dimensions, runtime estimated
+        legacy = results["Q-LEGACY"]
+        stock_volume = estimator.suggest_stock(1.5, 2.25, 4.0)[3]
+        self.assertEqual(legacy['stock_source'], repricing.STOCK_ESTIMATED)
+        self.assertAlmostEqual(legacy['stock_volume_in3'], round(stock_volume, 6))
+        per_part = estimator.estimate_runtime(2.0, stock_volume, 'Aluminum 6061')['per_part_time_mins']
+        material = stock_volume * 0.40 * markup * 4
+        labor = (estimator.SETUP_TIME() + (per_part + 0.5) * 3) / 60.0 * 90.0
+        self.assertAlmostEqual(legacy['anchor_after'], round(material + labor, 2))
+
+    def test_quotes_without_stock_are_counted_but_not_repriced(self) -> None:
+        self._execute("UPDATE ops__parts SET dimensions_json = NULL")
+        summary = repricing.run_reprice()
+        run = repricing.get_run(summary['run_id'])
+        self.assertEqual((run['quote_count'], run['repriced_count']), (2, 1))
+        self.assertEqual(summary['skipped_count'], 1)
+        self.assertEqual([row['quote_id'] for row in run['results']], ["Q-SAVED", "Q-LEGACY"])
+        self.assertIsNone(run['results'][1]['anchor_after'])
+        self.assertIsNone(run['scenario']['shop_rate_hour'])
+        with self.assertRaises(ValueError):
+            repricing.resolve_scenario({'shop_rate': 90})
+        with self.assertRaises(ValueError):
+            repricing.resolve_scenario({'material_costs': {'Aluminum 6061': -1}})
+
+    def test_unchanged_config_keeps_each_quotes_own_rate(self) -> None:
+        # Q-SAVED was quoted at 110/h, not the 75/h shop standard
+        self._execute("UPDATE ops__quotes SET physics_snapshot_json = ? WHERE quote_id = 'Q-SAVED'", (json.dumps({
+            'stock_volume_in3': 12.0, 'pricing_inputs': dict(self.inputs, shop_rate_hour=110.0)
+        }),))
+        markup = database.get_config('material_markup')
+        material = 12.0 * 0.30 * markup * 25 * 1.02
+        labor = (45.0 + 6.75 * 25) / 60.0 * 110.0
+        self._execute("UPDATE ops__quotes SET system_price_anchor = ? WHERE quote_id = 'Q-SAVED'",
+                      (material + labor,))
+
+        results = {row['quote_id']: row for row in repricing.get_run(repricing.run_reprice()['run_id'])['results']}
+        self.assertAlmostEqual(results["Q-SAVED"]['delta'], 0.0)
+        overridden = repricing.run_reprice({'shop_rate_hour': 75.0})
+        results = {row['quote_id']: row for row in repricing.get_run(overridden['run_id'])['results']}
+        self.assertAlmostEqual(results["Q-SAVED"]['delta'], round((45.0 + 6.75 * 25) / 60.0 * -35.0, 2))
+
+    def test_per_unit_anchor_is_compared_per_unit(self) -> None:
+        # The glass box saves system_price_anchor per unit (total / quantity)
+        material = 12.0 * 0.30 * database.get_config('material_markup') * 25 * 1.02
+        labor = (45.0 + 6.75 * 25) / 60.0 * 75.0
+        self._execute("UPDATE ops__quotes SET system_price_anchor = ? WHERE quote_id = 'Q-SAVED'",
+                      ((material + labor) / 25,))
+
+        summary = repricing.run_reprice()
+        results = {row['quote_id']: row for row in repricing.get_run(summary['run_id'])['results']}
+        saved = results["Q-SAVED"]
+        self.assertAlmostEqual(saved['anchor_before'], (material + labor) / 25)
+        self.assertAlmostEqual(saved['anchor_after'], round((material + labor) / 25, 2))
+        self.assertAlmostEqual(saved['delta'], 0.0, places=2)
+        self.assertAlmostEqual(saved['delta_pct'], 0.0, places=1)
+        # Run totals count the quote's total, not its unit price
+        legacy = results["Q-LEGACY"]
+        self.assertAlmostEqual(summary['anchor_before_total'], round(material + labor + legacy['anchor_before'], 2))
+
+        overridden = repricing.run_reprice({'shop_rate_hour': 90.0})
+        results = {row['quote_id']: row for row in repricing.get_run(overridden['run_id'])['results']}
+        self.assertAlmostEqual(results["Q-SAVED"]['anchor_after'],
+                               round((material + (45.0 + 6.75 * 25) / 60.0 * 90.0) / 25, 2))
+
+    def test_identity_scenario_keeps_saved_material_cost_without_stock_volume(self) -> None:
+        # pricing_inputs saved without stock_volume_in3: material_cost_per_unit is the quote's own
+        self._execute("UPDATE ops__quotes SET physics_snapshot_json = ?, system_price_anchor = ? "
+                      "WHERE quote_id = 'Q-SAVED'", (json.dumps({'pricing_inputs': self.inputs}),
+                                                     3.0 * 25 * 1.02 + (45.0 + 6.75 * 25) / 60.0 * 75.0))
+
+        results = {row['quote_id']: row for row in repricing.get_run(repricing.run_reprice()['run_id'])['results']}
+        self.assertEqual(results["Q-SAVED"]['stock_source'], repricing.STOCK_ESTIMATED)
+        self.assertEqual(results["Q-SAVED"]['delta'], 0.0)
+        self.assertEqual(results["Q-SAVED"]['delta_pct'], 0.0)
+
+        # Scenario cost and markup scale the saved material cost
+        markup = database.get_config('material_markup')
+        overridden = repricing.run_reprice({'material_costs': {'Aluminum 6061': 0.45}, 'material_markup': markup * 2})
+        results = {row['quote_id']: row for row in repricing.get_run(overridden['run_id'])['results']}
+        self.assertAlmostEqual(results["Q-SAVED"]['delta'], round(3.0 * 1.5 * 2 * 25 * 1.02 - 3.0 * 25 * 1.02, 2))
+
+    def test_endpoints_require_planning_mode(self) -> None:
+        from ops_layer import app as app_module
+        client = app_module.app.test_client()
+
+        response = client.post("/api/quotes/reprice", json={'ops_mode': 'execution'})
+        self.assertEqual(response.status_code, 400)
+        response = client.post("/api/quotes/reprice", json={'ops_mode': 'planning', 'material_markup': 'x'})
+        self.assertEqual(response.get_json()['code'], 'INVALID_REPRICE_SCENARIO')
+
+        response = client.post("/api/quotes/reprice", json={'ops_mode': 'planning', 'material_markup': 1.5})
+        run = response.get_json()['run']
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(run['scenario']['material_markup'], 1.5)
+
+        response = client.get(f"/api/quotes/reprice/{run['run_id']}?ops_mode=planning&limit=1")
+        stored = response.get_json()['run']
+        self.assertEqual(stored['anchor_after_total'], run['anchor_after_total'])
+        self.assertEqual(len(stored['results']), 1)
+        response = client.get("/api/quotes/reprice/999?ops_mode=planning")
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
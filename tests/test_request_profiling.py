@@ -0,0 +1,101 @@
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts import reset_db
+
+
+class TestRequestProfiling(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.test_db_path = Path(tempfile.gettempdir()) / "test_request_profiling.db"
+        os.environ["TEST_DB_PATH"] = str(cls.test_db_path)
+        reset_db.create_fresh_db(cls.test_db_path)
+        from ops_layer import app as app_module
+        cls.client = app_module.app.test_client()
+
+    def setUp(self) -> None:
+        os.environ["TEST_DB_PATH"] = str(self.test_db_path)
+        self.profile_dir = Path(tempfile.mkdtemp(prefix="test_profiles_"))
+        os.environ["CUTTER_PROFILE_DIR"] = str(self.profile_dir)
+        os.environ["CUTTER_PROFILE_MAX_FILES"] = "3"
+
+    def tearDown(self) -> None:
+        os.environ.pop("CUTTER_PROFILE_DIR", None)
+        os.environ.pop("CUTTER_PROFILE_MAX_FILES", None)
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def _stored_profiles(self) -> list:
+        return sorted(self.profile_dir.glob("*.pstats"))
+
+    def test_unflagged_request_is_not_profiled(self) -> None:
+        response = self.client.get("/api/cutter/events", headers={"X-Ops-Mode": "planning"})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Cutter-Profile-Id", response.headers)
+        self.assertEqual(self._stored_profiles(), [])
+
+    def test_execution_mode_is_not_profiled(self) -> None:
+        response = self.client.get(
+            "/api/cutter/events?profile=1",
+            headers={"X-Ops-Mode": "execution"}
+        )
+        self.assertNotIn("X-Cutter-Profile-Id", response.headers)
+        self.assertEqual(self._stored_profiles(), [])
+
+    def test_flagged_planning_request_writes_pstats(self) -> None:
+        response = self.client.get(
+            "/api/cutter/events",
+            headers={"X-Ops-Mode": "planning", "X-Cutter-Profile": "1"}
+        )
+        self.assertEqual(response.status_code, 200)
+        profile_id = response.headers.get("X-Cutter-Profile-Id")
+        self.assertTrue(profile_id)
+        profile_path = self.profile_dir / profile_id
+        self.assertTrue(profile_path.exists())
+        stats = pstats.Stats(str(profile_path))
+        self.assertGreater(stats.total_calls, 0)
+
+    def test_profile_dir_is_bounded(self) -> None:
+        for _ in range(5):
+            self.client.get(
+                "/api/cutter/events?profile=1",
+                headers={"X-Ops-Mode": "planning"}
+            )
+        self.assertEqual(len(self._stored_profiles()), 3)
+
+    def test_list_and_download_profiles(self) -> None:
+        response = self.client.get(
+            "/api/cutter/events?profile=1",
+            headers={"X-Ops-Mode": "planning"}
+        )
+        profile_id = response.headers.get("X-Cutter-Profile-Id")
+
+        list_response = self.client.get("/api/profiles", headers={"X-Ops-Mode": "planning"})
+        self.assertEqual(list_response.status_code, 200)
+        payload = list_response.get_json()
+        self.assertEqual([p["profile_id"] for p in payload["profiles"]], [profile_id])
+
+        download = self.client.get(
+            f"/api/profiles/{profile_id}",
+            headers={"X-Ops-Mode": "planning"}
+        )
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(download.data, (self.profile_dir / profile_id).read_bytes())
+        download.close()
+
+        missing = self.client.get(
+            "/api/profiles/..%2Fcutter.db",
+            headers={"X-Ops-Mode": "planning"}
+        )
+        self.assertEqual(missing.status_code, 404)
+
+    def test_profiles_refuse_execution_mode(self) -> None:
+        response = self.client.get("/api/profiles", headers={"X-Ops-Mode": "execution"})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -130,6 +130,17 @@ class TestSavedReportsPlanningOnly(unittest.TestCase):
         self.assertIsInstance(rows, list)
         self.assertGreater(len(rows), 0)
 
+        self.assertFalse(body.get("cache", {}).get("hit"))
+
+        rerun_response = self.client.post(
+            "/api/reports/run",
+            headers={"X-Ops-Mode": "planning"},
+            json={"report_id": report_id}
+        )
+        rerun_body = rerun_response.get_json() or {}
+        self.assertTrue(rerun_body.get("cache", {}).get("hit"))
+        self.assertEqual(rerun_body.get("rows"), rows)
+
         after_state = self._count_table("state__declarations")
         after_events = self._count_table("cutter__events")
         self.assertEqual(before_state, after_state)
@@ -151,6 +162,44 @@ class TestSavedReportsPlanningOnly(unittest.TestCase):
             self.assertTrue(set(row.keys()).issubset(expected_keys))
             self.assertTrue(forbidden_keys.isdisjoint(set(row.keys())))
 
+    def test_snapshot_served_after_scheduler_cycle(self) -> None:
+        from ops_layer import report_scheduler
+        self._seed_state_declaration()
+        save_response = self.client.post(
+            "/api/reports/save",
+            headers={"X-Ops-Mode": "planning"},
+            json={
+                "report_name": "weekly-latest",
+                "query_type": "latest_declaration_per_entity",
+                "params": {},
+                "created_by_actor_ref": "org:demo/actor:owner"
+            }
+        )
+        report_id = ((save_response.get_json() or {}).get("report") or {}).get("report_id")
+
+        missing = self.client.post(
+            "/api/reports/snapshot",
+            headers={"X-Ops-Mode": "planning"},
+            json={"report_id": report_id}
+        )
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual((missing.get_json() or {}).get("code"), "REPORT_SNAPSHOT_NOT_FOUND")
+
+        report_scheduler.run_cycle(force=True)
+        response = self.client.post(
+            "/api/reports/snapshot",
+            headers={"X-Ops-Mode": "planning"},
+            json={"report_id": report_id}
+        )
+        self.assertEqual(response.status_code, 200)
+        snapshot = (response.get_json() or {}).get("snapshot", {})
+        self.assertEqual(snapshot.get("report_id"), report_id)
+        self.assertGreater(len(snapshot.get("rows", [])), 0)
+
+        ritual = self.client.get("/api/reports/ritual_snapshot", headers={"X-Ops-Mode": "planning"})
+        self.assertEqual(ritual.status_code, 200)
+        self.assertIn("ds5_deferred_recognition", (ritual.get_json() or {}).get("snapshot", {}).get("ritual", {}))
+
 
 if __name__ == "__main__":
     unittest.main()
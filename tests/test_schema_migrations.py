@@ -0,0 +1,200 @@
+import sqlite3
+import threading
+import unittest
+from pathlib import Path
+
+import database
+from migrations import runner
+from migrations import schema_snapshot
+from ops_layer import preflight
+from scripts import reset_db
+from tests.db_test_case import FreshDbTestCase
+
+
+def _write_migration(directory: Path, filename: str, body: str) -> None:
+    (directory / filename).write_text(body, encoding="utf-8")
+
+
+class TestSchemaMigrations(FreshDbTestCase):
+    create_db = False
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.previous_cache = runner._migrations_cache
+
+    def tearDown(self) -> None:
+        runner._migrations_cache = self.previous_cache
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.test_db))
+
+    def _use_migrations_dir(self) -> Path:
+        migrations_dir = Path(self.temp_dir.name) / "migrations"
+        migrations_dir.mkdir(exist_ok=True)
+        runner._migrations_cache = []  # fresh DB stops at the baseline
+        return migrations_dir
+
+    def _activate(self, migrations_dir: Path) -> None:
+        runner._migrations_cache = runner.discover_migrations(migrations_dir)
+
+    def test_fresh_db_builds_from_snapshot(self) -> None:
+        reset_db.create_fresh_db(self.test_db)
+        conn = self._connect()
+        self.assertEqual(runner.get_schema_version(conn), runner.latest_version())
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        materials = conn.execute("SELECT COUNT(*) FROM ops__materials").fetchone()[0]
+        conn.close()
+        for table in ("customer_parts", "contact_companies", "cutter__events", "state__declarations"):
+            self.assertIn(table, tables)
+        self.assertEqual(materials, len(schema_snapshot.DEFAULT_MATERIALS))
+        self.assertEqual(preflight.check_preflight(self.test_db), [])
+
+    def test_current_db_startup_is_one_select(self) -> None:
+        reset_db.create_fresh_db(self.test_db)
+        conn = self._connect()
+        statements = []
+        conn.set_trace_callback(statements.append)
+        self.assertEqual(runner.ensure_schema(conn), [])
+        conn.close()
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith("SELECT MAX(version) FROM schema_version"))
+
+    def test_initialize_database_does_not_create_ledgers(self) -> None:
+        database.initialize_database()
+        conn = self._connect()
+        self.assertEqual(runner.get_schema_version(conn), runner.latest_version())
+        has_events = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='cutter__events'"
+        ).fetchone()
+        conn.close()
+        self.assertIsNone(has_events)
+        self.assertIn("table:cutter__events", preflight.check_preflight(self.test_db))
+
+    def test_unversioned_legacy_db_is_stamped_once(self) -> None:
+        conn = self._connect()
+        conn.execute("CREATE TABLE ops__quote_history (id INTEGER PRIMARY KEY AUTOINCREMENT, filename TEXT)")
+        conn.execute("""
+            CREATE TABLE ops__reconciliations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scope_ref TEXT NOT NULL,
+                scope_kind TEXT NOT NULL,
+                predicate_text TEXT NOT NULL,
+                actor_ref TEXT NOT NULL,
+                reconciled_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            INSERT INTO ops__reconciliations (scope_ref, scope_kind, predicate_text, actor_ref)
+            VALUES ('query:a', 'query', 'pred-1', 'org:x/actor:a')
+        """)
+        conn.commit()
+        conn.close()
+
+        database.initialize_database()
+        database.initialize_database()
+
+        conn = self._connect()
+        applied = runner.list_applied(conn)
+        history_columns = runner._column_names(conn, "ops__quote_history")
+        reconciliation = conn.execute(
+            "SELECT predicate_ref, predicate_text FROM ops__reconciliations"
+        ).fetchone()
+        conn.close()
+        self.assertEqual(
+            [row["version"] for row in applied],
+            [schema_snapshot.BASELINE_VERSION] + [m.version for m in runner.get_migrations()],
+        )
+        self.assertIn("is_deleted", history_columns)
+        self.assertIn("handling_time", history_columns)
+        self.assertEqual(reconciliation, ("pred-1", "pred-1"))
+
+    def test_numbered_migrations_apply_in_order_once(self) -> None:
+        migrations_dir = self._use_migrations_dir()
+        _write_migration(migrations_dir, "19_second.py", (
+            "def upgrade(conn):\n"
+            "    conn.execute(\"INSERT INTO ops__shop_config (key, value) VALUES ('order', 'second')\")\n"
+        ))
+        _write_migration(migrations_dir, "18_first.py", (
+            "def upgrade(conn):\n"
+            "    conn.execute(\"INSERT INTO ops__shop_config (key, value) VALUES ('first', '1')\")\n"
+        ))
+        _write_migration(migrations_dir, "05_legacy.py", "raise SystemExit('legacy scripts never run')\n")
+        reset_db.create_fresh_db(self.test_db)
+        self._activate(migrations_dir)
+
+        database.initialize_database()
+        database.initialize_database()
+
+        conn = self._connect()
+        versions = [row["version"] for row in runner.list_applied(conn)]
+        rows = conn.execute(
+            "SELECT key FROM ops__shop_config WHERE key IN ('first', 'order') ORDER BY rowid"
+        ).fetchall()
+        conn.close()
+        self.assertEqual(versions, [schema_snapshot.BASELINE_VERSION, 18, 19])
+        self.assertEqual([row[0] for row in rows], ["first", "order"])
+
+    def test_failed_migration_rolls_back_and_is_not_recorded(self) -> None:
+        migrations_dir = self._use_migrations_dir()
+        _write_migration(migrations_dir, "18_broken.py", (
+            "def upgrade(conn):\n"
+            "    conn.execute('CREATE TABLE ops__half_done (id INTEGER)')\n"
+            "    raise RuntimeError('boom')\n"
+        ))
+        reset_db.create_fresh_db(self.test_db)
+        self._activate(migrations_dir)
+
+        with self.assertRaises(RuntimeError):
+            database.initialize_database()
+
+        conn = self._connect()
+        version = runner.get_schema_version(conn)
+        half_done = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name='ops__half_done'"
+        ).fetchone()
+        conn.close()
+        self.assertEqual(version, schema_snapshot.BASELINE_VERSION)
+        self.assertIsNone(half_done)
+
+    def test_concurrent_boots_apply_each_step_once(self) -> None:
+        migrations_dir = self._use_migrations_dir()
+        _write_migration(migrations_dir, "18_counted.py", (
+            "def upgrade(conn):\n"
+            "    conn.execute(\"INSERT INTO ops__shop_config (key, value) VALUES ('counted', '1')\")\n"
+        ))
+        reset_db.create_fresh_db(self.test_db)
+        self._activate(migrations_dir)
+
+        errors = []
+
+        def boot() -> None:
+            conn = sqlite3.connect(str(self.test_db), timeout=10)
+            try:
+                runner.ensure_schema(conn)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                conn.close()
+
+        threads = [threading.Thread(target=boot) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        conn = self._connect()
+        versions = [row["version"] for row in runner.list_applied(conn)]
+        conn.close()
+        self.assertEqual(errors, [])
+        self.assertEqual(versions, [schema_snapshot.BASELINE_VERSION, 18])
+
+    def test_duplicate_versions_rejected(self) -> None:
+        migrations_dir = self._use_migrations_dir()
+        _write_migration(migrations_dir, "18_a.py", "def upgrade(conn):\n    pass\n")
+        _write_migration(migrations_dir, "18_b.py", "def upgrade(conn):\n    pass\n")
+        with self.assertRaises(RuntimeError):
+            runner.discover_migrations(migrations_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Test the production server entry point (ops_layer/server.py).
+"""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import urllib.request
+from pathlib import Path
+
+from ops_layer import server
+from scripts import reset_db
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestServerEntryPoint(unittest.TestCase):
+    def test_backend_and_worker_defaults(self) -> None:
+        self.assertEqual(server.resolve_backend("builtin", 4), "builtin")
+        self.assertIn(server.resolve_backend("auto", 4), ("gunicorn", "waitress", "builtin"))
+        self.assertGreaterEqual(server.default_workers(), 1)
+        self.assertLessEqual(server.default_workers(), server.MAX_DEFAULT_WORKERS)
+
+    def test_pooled_server_leaves_connections_in_backlog_when_threads_are_busy(self) -> None:
+        release = threading.Event()
+        entered = []
+
+        def app(environ, start_response):
+            entered.append(environ["PATH_INFO"])
+            release.wait(10)
+            start_response("200 OK", [("Content-Type", "text/plain")])
+            return [b"ok"]
+
+        pooled = server._make_pooled_server("127.0.0.1", 0, app, threads=1)
+        accepted = []
+        get_request = pooled.get_request
+
+        def _counting_get_request():
+            request = get_request()
+            accepted.append(request)
+            return request
+
+        pooled.get_request = _counting_get_request
+        serving = threading.Thread(target=pooled.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        serving.start()
+        clients = []
+        try:
+            for i in range(3):
+                client = socket.create_connection(("127.0.0.1", pooled.port), timeout=10)
+                client.sendall(f"GET /{i} HTTP/1.0\r\nHost: localhost\r\n\r\n".encode())
+                clients.append(client)
+            deadline = time.monotonic() + 10
+            while not entered and time.monotonic() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.3)
+            # The one thread is busy: the other two connections are not accepted yet
+            self.assertEqual(len(accepted), 1)
+
+            release.set()
+            for client in clients:
+                self.assertIn(b"200 OK", client.makefile("rb").read())
+            self.assertEqual(len(accepted), 3)
+        finally:
+            release.set()
+            for client in clients:
+                client.close()
+            pooled.shutdown()
+            pooled.server_close()
+            serving.join(10)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "pre-fork workers need os.fork")
+    def test_builtin_prefork_serves_and_stops_gracefully(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="test_server_") as temp_dir:
+            test_db = Path(temp_dir) / "test_server.db"
+            reset_db.create_fresh_db(test_db)
+            env = dict(os.environ, TEST_DB_PATH=str(test_db), PYTHONUNBUFFERED="1")
+            port = _free_port()
+            process = subprocess.Popen(
+                [sys.executable, "-m", "ops_layer.server", "--backend", "builtin", "--host", "127.0.0.1",
+                 "--port", str(port), "--workers", "2", "--threads", "2", "--no-warm"],
+                cwd=str(REPO_ROOT), env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+            )
+            try:
+                bodies = []
+                deadline = time.monotonic() + 30
+                while len(bodies) < 4 and time.monotonic() < deadline:
+                    try:
+                        with urllib.request.urlopen(f"http://127.0.0.1:{port}/materials", timeout=5) as response:
+                            bodies.append(response.status)
+                    except OSError:
+                        time.sleep(0.2)
+                self.assertEqual(bodies, [200, 200, 200, 200])
+            finally:
+                process.send_signal(signal.SIGTERM)
+                output, _ = process.communicate(timeout=30)
+
+            self.assertEqual(process.returncode, 0, output)
+            self.assertIn("2 processes x 2 threads", output)
+            self.assertIn("[SERVER] Stopped", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
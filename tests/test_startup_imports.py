@@ -0,0 +1,142 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from ops_layer import preflight
+from ops_layer import warmup
+from scripts import reset_db
+from scripts import import_time_budget
+
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+class TestLazyHeavyImports(unittest.TestCase):
+    def test_app_import_defers_heavy_modules(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="test_startup_") as temp_dir:
+            db_path = Path(temp_dir) / "test_startup.db"
+            reset_db.create_fresh_db(db_path)
+            env = dict(os.environ, TEST_DB_PATH=str(db_path))
+            env.pop(warmup.WARMUP_ENV, None)
+            code = (
+                "import json, sys; import ops_layer.app; "
+                "print(json.dumps(sorted(m for m in sys.modules "
+                "if m.split('.')[0] in ('trimesh', 'reportlab', 'qrcode', 'psutil', 'scipy') "
+                "or m == 'ops_layer.pdf_generator')))"
+            )
+            result = subprocess.run(
+                [sys.executable, "-c", code], cwd=str(REPO_ROOT), env=env,
+                capture_output=True, text=True
+            )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertEqual(loaded, [])
+
+    def test_warmup_thread_is_opt_in(self) -> None:
+        previous = os.environ.pop(warmup.WARMUP_ENV, None)
+        try:
+            self.assertFalse(warmup.is_warmup_enabled())
+            self.assertIsNone(warmup.start_warmup_thread())
+            os.environ[warmup.WARMUP_ENV] = "1"
+            self.assertTrue(warmup.is_warmup_enabled())
+        finally:
+            if previous is None:
+                os.environ.pop(warmup.WARMUP_ENV, None)
+            else:
+                os.environ[warmup.WARMUP_ENV] = previous
+
+    def test_warm_imports_reports_timings(self) -> None:
+        timings = warmup.warm_imports(("json", "definitely_not_a_module_xyz"))
+        self.assertIn("json", timings)
+        self.assertNotIn("definitely_not_a_module_xyz", timings)
+
+    def test_parse_importtime(self) -> None:
+        sample = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   reportlab.lib",
+            "import time:       500 |        900 | ops_layer.app",
+        ])
+        rows = import_time_budget.parse_importtime(sample)
+        self.assertEqual([row["module"] for row in rows], ["reportlab.lib", "ops_layer.app"])
+        self.assertEqual(rows[0]["depth"], 1)
+        self.assertEqual(rows[1]["cumulative_us"], 900)
+        self.assertEqual(import_time_budget.find_deferred_imports(rows), ["reportlab"])
+
+
+class TestPreflightLintCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.previous_cache = os.environ.get(preflight.LINT_CACHE_ENV)
+        self.temp_dir = tempfile.TemporaryDirectory(prefix="test_preflight_cache_")
+        self.cache_path = Path(self.temp_dir.name) / "lint_cache.json"
+        os.environ[preflight.LINT_CACHE_ENV] = str(self.cache_path)
+
+    def tearDown(self) -> None:
+        if self.previous_cache is None:
+            os.environ.pop(preflight.LINT_CACHE_ENV, None)
+        else:
+            os.environ[preflight.LINT_CACHE_ENV] = self.previous_cache
+        self.temp_dir.cleanup()
+
+    def _read_cache(self) -> dict:
+        return json.loads(self.cache_path.read_text(encoding="utf-8"))
+
+    def test_lint_rules(self) -> None:
+        self.assertTrue(preflight._lint_file_content('sql = "INSERT INTO cutter__events VALUES (1)"'))
+        self.assertFalse(preflight._lint_file_content(
+            'database.require_test_db("x")\nsql = "DELETE FROM state__declarations"'
+        ))
+        self.assertFalse(preflight._lint_file_content(
+            'class TestX(FreshDbTestCase):\n    sql = "INSERT INTO cutter__events VALUES (1)"\n'
+        ))
+        self.assertTrue(preflight._lint_file_content(
+            'class TestX(FreshDbTestCase):\n    pass\n\nsql = "INSERT INTO cutter__events VALUES (1)"\n'
+        ))
+        self.assertTrue(preflight._lint_file_content(
+            'from tests.db_test_case import FreshDbTestCase\nsql = "INSERT INTO cutter__events VALUES (1)"'
+        ))
+        self.assertFalse(preflight._lint_file_content(
+            preflight.LINT_ALLOW_MARKER + '\nsql = "UPDATE cutter__events SET x=1"'
+        ))
+        self.assertFalse(preflight._lint_file_content('sql = "SELECT * FROM cutter__events"'))
+
+    def test_cache_is_written_and_trusted_until_file_changes(self) -> None:
+        self.assertEqual(preflight._lint_direct_sql_bypass(), [])
+        payload = self._read_cache()
+        self.assertEqual(payload["rules_version"], preflight._lint_rules_version())
+        rel_path = str(Path("tests") / "test_startup_imports.py")
+        self.assertIn(rel_path, payload["files"])
+
+        # Matching (mtime, size) -> cached verdict is used without re-reading
+        payload["files"][rel_path]["flagged"] = True
+        self.cache_path.write_text(json.dumps(payload), encoding="utf-8")
+        self.assertEqual(preflight._lint_direct_sql_bypass(), [rel_path])
+        self.assertEqual(preflight._lint_direct_sql_bypass(use_cache=False), [])
+
+        # Size mismatch -> file is re-linted and the cache corrected
+        payload["files"][rel_path]["size"] += 1
+        self.cache_path.write_text(json.dumps(payload), encoding="utf-8")
+        self.assertEqual(preflight._lint_direct_sql_bypass(), [])
+        self.assertFalse(self._read_cache()["files"][rel_path]["flagged"])
+
+    def test_rules_change_invalidates_cache(self) -> None:
+        preflight._lint_direct_sql_bypass()
+        payload = self._read_cache()
+        for entry in payload["files"].values():
+            entry["flagged"] = True
+        payload["rules_version"] = "stale"
+        self.cache_path.write_text(json.dumps(payload), encoding="utf-8")
+        self.assertEqual(preflight._lint_direct_sql_bypass(), [])
+
+    def test_cache_can_be_disabled(self) -> None:
+        os.environ[preflight.LINT_CACHE_ENV] = "off"
+        self.assertIsNone(preflight.get_lint_cache_path())
+        self.assertEqual(preflight._lint_direct_sql_bypass(), [])
+        self.assertFalse(self.cache_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
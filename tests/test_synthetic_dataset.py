@@ -0,0 +1,76 @@
+import os
+import sqlite3
+import unittest
+from datetime import datetime
+
+import database
+from scripts import generate_synthetic_dataset as synth
+from tests.db_test_case import FreshDbTestCase
+
+
+SIZES = {
+    "events": 3000,
+    "declarations": 400,
+    "entities": 60,
+    "quotes": 200,
+    "parts": 150,
+    "customers": 80,
+    "contacts": 90,
+}
+
+
+class TestSyntheticDataset(FreshDbTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        database.initialize_database()
+
+    def _generate(self, seed: int = 11) -> dict:
+        return synth.generate_dataset(
+            SIZES, seed=seed, days=30,
+            now=datetime(2026, 1, 1), verbose=False
+        )
+
+    def test_counts_and_ledger_order(self) -> None:
+        summary = self._generate()
+        counts = summary["counts"]
+        for table, key in (("cutter__events", "events"), ("state__declarations", "declarations"),
+                           ("state__entities", "entities"), ("ops__quotes", "quotes")):
+            self.assertEqual(counts[table], SIZES[key])
+
+        conn = sqlite3.connect(str(self.test_db))
+        inversions = conn.execute("""
+            SELECT COUNT(*) FROM cutter__events a
+            JOIN cutter__events b ON b.id = a.id + 1
+            WHERE b.created_at < a.created_at
+        """).fetchone()[0]
+        unowned_declarations = conn.execute("""
+            SELECT COUNT(*) FROM state__declarations d
+            WHERE NOT EXISTS (
+                SELECT 1 FROM state__recognition_owners o
+                WHERE o.entity_ref = d.entity_ref AND o.unassigned_at IS NULL
+            )
+        """).fetchone()[0]
+        conn.close()
+        self.assertEqual(inversions, 0)
+        self.assertEqual(unowned_declarations, 0)
+
+    def test_appends_to_existing_rows(self) -> None:
+        self._generate(seed=1)
+        second = self._generate(seed=2)
+        self.assertEqual(second["counts"]["ops__customers"], SIZES["customers"])
+
+        conn = sqlite3.connect(str(self.test_db))
+        quotes = conn.execute("SELECT COUNT(*) FROM ops__quotes").fetchone()[0]
+        entities = conn.execute("SELECT COUNT(*) FROM state__entities").fetchone()[0]
+        conn.close()
+        self.assertEqual(quotes, SIZES["quotes"] * 2)
+        self.assertEqual(entities, SIZES["entities"] * 2)
+
+    def test_refuses_production_db(self) -> None:
+        os.environ.pop("TEST_DB_PATH", None)
+        with self.assertRaises(RuntimeError):
+            self._generate()
+
+
+if __name__ == "__main__":
+    unittest.main()
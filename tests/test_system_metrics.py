@@ -0,0 +1,77 @@
+"""
+Test the background metrics ring buffer behind /api/system/health.
+"""
+
+import os
+import sqlite3
+import unittest
+from unittest import mock
+
+from ops_layer import metrics
+from tests.db_test_case import FreshDbTestCase
+
+
+class TestSystemMetrics(FreshDbTestCase):
+    restore_env = (metrics.SAMPLES_ENV, metrics.INTERVAL_ENV)
+
+    def setUp(self) -> None:
+        super().setUp()
+        metrics.clear()
+
+    def tearDown(self) -> None:
+        metrics.clear()
+
+    def test_sample_reads_the_configured_database(self) -> None:
+        conn = sqlite3.connect(self.test_db)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE metrics_probe (payload TEXT)")
+        conn.executemany("INSERT INTO metrics_probe VALUES (?)", [("x" * 4096,)] * 300)
+        conn.commit()
+
+        point = metrics.sample()
+        db_size_mb = round(self.test_db.stat().st_size / (1024 * 1024), 2)
+        conn.close()
+        self.assertEqual(point["db_size_mb"], db_size_mb)
+        self.assertGreater(point["wal_size_mb"], 0)
+        self.assertEqual(point["write_queue_depth"], 0)
+        if point["db_connections"] is not None:
+            self.assertGreaterEqual(point["db_connections"], 1)
+
+    def test_latest_without_sampler_skips_open_file_scan(self) -> None:
+        with mock.patch.object(metrics, "_thread", None), \
+                mock.patch.object(metrics, "_db_connections", side_effect=AssertionError("open_files() scan")):
+            point = metrics.latest()
+        self.assertIsNone(point["db_connections"])
+        self.assertIn("wal_size_mb", point)
+
+    def test_ring_buffer_keeps_the_newest_samples(self) -> None:
+        os.environ[metrics.SAMPLES_ENV] = "3"
+        points = [metrics.sample() for _ in range(5)]
+
+        series = metrics.series()
+        self.assertEqual([point["timestamp"] for point in series], [point["timestamp"] for point in points[2:]])
+        self.assertEqual(len(metrics.series(limit=2)), 2)
+        self.assertEqual(metrics.series(since=points[-1]["timestamp"]), [])
+
+    def test_health_and_series_endpoints_answer_from_memory(self) -> None:
+        from ops_layer import app as app_module
+        client = app_module.app.test_client()
+        metrics.record_event("db_maintenance", {"duration_ms": 12.5})
+
+        response = client.get("/api/system/health", headers={"X-Ops-Mode": "planning"})
+        payload = response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("wal_size_mb", payload["metrics"])
+        self.assertGreaterEqual(payload["metrics"]["requests_in_flight"], 1)
+        self.assertEqual(payload["background_jobs"]["db_maintenance"]["duration_ms"], 12.5)
+
+        response = client.get("/api/system/metrics?limit=1")
+        payload = response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(payload["count"], 1)
+        self.assertIn("cpu_percent", payload["samples"][0])
+        self.assertEqual(client.get("/api/system/metrics?since=soon").status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Test the incrementally maintained unclosed-quotes worklist and its deltas.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import database
+from ops_layer import unclosed_worklist
+from tests.db_test_case import FreshDbTestCase
+
+
+def _view(test_db: Path) -> list:
+    conn = sqlite3.connect(test_db)
+    rows = conn.execute("SELECT id, age_days FROM view_ops_unclosed_quotes ORDER BY id").fetchall()
+    conn.close()
+    return [tuple(row) for row in rows]
+
+
+class TestUnclosedWorklist(FreshDbTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        unclosed_worklist.clear()
+        conn = sqlite3.connect(self.test_db)
+        conn.execute("INSERT INTO ops__customers (id, name, domain) VALUES (1, 'Acme', 'acme.test')")
+        conn.execute("INSERT INTO ops__parts (id, genesis_hash) VALUES (1, 'hash-1')")
+        conn.commit()
+        conn.close()
+        self.quote_ids = [self._quote(f"Q-{n}", days_ago=n + 0.5) for n in range(3)]
+
+    def tearDown(self) -> None:
+        unclosed_worklist.clear()
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        conn = sqlite3.connect(self.test_db)
+        cursor = conn.execute(sql, params)
+        conn.commit()
+        conn.close()
+        return cursor.lastrowid
+
+    def _quote(self, quote_id: str, days_ago: float) -> int:
+        return self._execute("""
+            INSERT INTO ops__quotes
+            (quote_id, part_id, customer_id, material, system_price_anchor, final_quoted_price, created_at)
+            VALUES (?, 1, 1, 'Aluminum 6061', 100.0, 120.0, strftime('%Y-%m-%d %H:%M:%S', 'now', ?))
+        """, (quote_id, f"-{days_ago * 86400:.0f} seconds"))
+
+    def _save_outcome(self, quote_row_id: int, outcome_type: str) -> None:
+        self._execute(
+            "INSERT INTO ops__quote_outcome_events (quote_id, outcome_type) VALUES (?, ?)",
+            (quote_row_id, outcome_type)
+        )
+
+    def _listed(self) -> list:
+        _, quotes = unclosed_worklist.snapshot()
+        return [(quote["id"], quote["age_days"]) for quote in quotes]
+
+    def test_appends_apply_incrementally_and_match_the_view(self) -> None:
+        version, quotes = unclosed_worklist.snapshot()
+        self.assertEqual([quote["quote_id"] for quote in quotes], ["Q-2", "Q-1", "Q-0"])
+        self.assertEqual(sorted(self._listed()), _view(self.test_db))
+        self.assertEqual(unclosed_worklist.sync(), version)  # nothing changed
+
+        self._save_outcome(self.quote_ids[1], "WON")
+        self._save_outcome(self.quote_ids[0], "NO_RESPONSE")  # stays on the list
+        new_id = self._quote("Q-new", days_ago=0.1)
+        self.assertEqual(unclosed_worklist.sync(), version + 1)
+
+        delta, = unclosed_worklist.changes_since(version)
+        self.assertEqual(delta["removed"], [self.quote_ids[1]])
+        self.assertEqual([row["id"] for row in delta["added"]], [new_id])
+        self.assertEqual(delta["aged"], [])
+        self.assertEqual(sorted(self._listed()), _view(self.test_db))
+
+    def test_saved_outcome_is_a_delta_without_reload(self) -> None:
+        version, _ = unclosed_worklist.snapshot()
+        database.save_quote_outcome_wizard(self.quote_ids[1], "WON")
+        database.save_quote_outcome_wizard(self.quote_ids[2], "LOST")
+        reloads = []
+        real_reload = unclosed_worklist._reload
+        unclosed_worklist._reload = lambda *args: reloads.append(args) or real_reload(*args)
+        try:
+            self.assertEqual(unclosed_worklist.sync(), version + 1)
+        finally:
+            unclosed_worklist._reload = real_reload
+        self.assertEqual(reloads, [])
+        delta, = unclosed_worklist.changes_since(version)
+        self.assertEqual(sorted(delta["removed"]), sorted(self.quote_ids[1:]))
+        self.assertEqual(sorted(self._listed()), _view(self.test_db))
+
+        # Status changes of a quote still on the list do reload it
+        self._execute("UPDATE ops__quotes SET status = 'Sent' WHERE id = ?", (self.quote_ids[0],))
+        unclosed_worklist.sync()
+        delta, = unclosed_worklist.changes_since(version + 1)
+        self.assertEqual([row["status"] for row in delta["added"]], ["Sent"])
+
+    def test_edits_and_deletes_reload_via_generation(self) -> None:
+        version, _ = unclosed_worklist.snapshot()
+        self._execute("UPDATE ops__quotes SET final_quoted_price = 99.0 WHERE id = ?", (self.quote_ids[2],))
+        self._execute("UPDATE ops__customers SET name = 'Acme Corp' WHERE id = 1")
+        unclosed_worklist.sync()
+
+        deltas = unclosed_worklist.changes_since(version)
+        added = {row["id"]: row for delta in deltas for row in delta["added"]}
+        self.assertEqual(set(added), set(self.quote_ids))
+        self.assertEqual(added[self.quote_ids[2]]["final_quoted_price"], 99.0)
+        self.assertEqual(added[self.quote_ids[0]]["customer_name"], "Acme Corp")
+
+        self._save_outcome(self.quote_ids[0], "LOST")
+        self._execute("DELETE FROM ops__quote_outcome_events")
+        version = unclosed_worklist.sync()
+        self.assertEqual(sorted(self._listed()), _view(self.test_db))
+        self.assertEqual(len(self._listed()), 3)
+        self.assertEqual(unclosed_worklist.changes_since(version - 10 ** 6), None)
+
+    def test_age_ticks_are_deltas(self) -> None:
+        version, _ = unclosed_worklist.snapshot()
+        self.assertIsNotNone(unclosed_worklist.seconds_until_tick())
+        # Pretend a day passed: every row's age_days ticks over
+        real_now = unclosed_worklist._now_julian
+        unclosed_worklist._now_julian = lambda: real_now() + 1
+        try:
+            unclosed_worklist.sync()
+        finally:
+            unclosed_worklist._now_julian = real_now
+        delta, = unclosed_worklist.changes_since(version)
+        self.assertEqual(sorted((row["id"], row["age_days"]) for row in delta["aged"]),
+                         [(quote_id, n + 1) for n, quote_id in enumerate(self.quote_ids)])
+
+    def test_stream_sends_snapshot_then_deltas(self) -> None:
+        stream = unclosed_worklist.stream(max_seconds=5, poll_interval=0.05)
+        self.assertTrue(next(stream).startswith("retry:"))
+        snapshot = next(stream)
+        self.assertIn("event: snapshot", snapshot)
+        self.assertEqual(json.loads(snapshot.split("data: ", 1)[1])["count"], 3)
+
+        writer = threading.Timer(0.2, self._save_outcome, (self.quote_ids[2], "WON"))
+        writer.start()
+        started = time.monotonic()
+        message = next(stream)
+        writer.join()
+        stream.close()
+        self.assertIn("event: delta", message)
+        self.assertEqual(json.loads(message.split("data: ", 1)[1])["removed"], [self.quote_ids[2]])
+        self.assertLess(time.monotonic() - started, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+Test the single-writer queue: group commit, per-job rollback, lock release.
+"""
+
+import sqlite3
+import threading
+import time
+import unittest
+from unittest import mock
+
+import database
+import write_queue
+from cutter_ledger.boundary import emit_cutter_event
+from tests.db_test_case import FreshDbTestCase
+
+
+class TestWriteQueue(FreshDbTestCase):
+    def tearDown(self) -> None:
+        write_queue.stop()
+        write_queue._enabled = None
+
+    def _tag_names(self) -> set:
+        conn = sqlite3.connect(self.test_db)
+        names = {row[0] for row in conn.execute("SELECT name FROM ops__custom_tags WHERE category = 'Queue'")}
+        conn.close()
+        return names
+
+    def test_inline_failure_rolls_back_and_releases_lock(self) -> None:
+        write_queue.enable(False)
+
+        def _fail(conn: sqlite3.Connection) -> None:
+            conn.execute("INSERT INTO ops__custom_tags (name, impact_type, impact_value, category) "
+                         "VALUES ('Half Written', 'multiplier', 1.0, 'Queue')")
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            write_queue.run(_fail)
+
+        other = sqlite3.connect(self.test_db, timeout=0.1, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")  # would raise "database is locked" on a leaked transaction
+        other.execute("ROLLBACK")
+        other.close()
+        self.assertEqual(self._tag_names(), set())
+
+    def test_queued_jobs_group_commit_and_fail_alone(self) -> None:
+        write_queue.enable(True)
+        blocker_started = threading.Event()
+        release = threading.Event()
+        seen_uncommitted = []
+
+        def _block(conn: sqlite3.Connection) -> None:
+            blocker_started.set()
+            release.wait(5)
+
+        def _insert(name: str):
+            def _write(conn: sqlite3.Connection) -> int:
+                if name == "Tag 3":
+                    raise ValueError("rejected")
+                cursor = conn.execute(
+                    "INSERT INTO ops__custom_tags (name, impact_type, impact_value, category) "
+                    "VALUES (?, 'multiplier', 1.0, 'Queue')", (name,))
+                if name == "Tag 5":
+                    # Earlier jobs in the batch are visible here but not yet committed
+                    outside = sqlite3.connect(self.test_db)
+                    seen_uncommitted.append((
+                        conn.execute("SELECT COUNT(*) FROM ops__custom_tags WHERE category = 'Queue'").fetchone()[0],
+                        outside.execute("SELECT COUNT(*) FROM ops__custom_tags WHERE category = 'Queue'").fetchone()[0],
+                    ))
+                    outside.close()
+                return cursor.lastrowid
+            return _write
+
+        results = {}
+
+        def _submit(name: str) -> None:
+            try:
+                results[name] = write_queue.run(_insert(name))
+            except ValueError as e:
+                results[name] = e
+
+        blocker = threading.Thread(target=write_queue.run, args=(_block,))
+        blocker.start()
+        self.assertTrue(blocker_started.wait(5))
+        threads = []
+        for index in range(1, 6):
+            thread = threading.Thread(target=_submit, args=(f"Tag {index}",))
+            thread.start()
+            threads.append(thread)
+            # Queue in order so the batch is deterministic
+            deadline = time.monotonic() + 5
+            while write_queue._writer.jobs.qsize() < index and time.monotonic() < deadline:
+                time.sleep(0.001)
+        release.set()
+        blocker.join(5)
+        for thread in threads:
+            thread.join(5)
+
+        self.assertIsInstance(results["Tag 3"], ValueError)
+        self.assertEqual(self._tag_names(), {"Tag 1", "Tag 2", "Tag 4", "Tag 5"})
+        self.assertEqual(seen_uncommitted, [(4, 0)])
+
+    def test_concurrent_saves_get_unique_generated_quote_ids(self) -> None:
+        write_queue.enable(False)
+        part_id = database.upsert_part("hash-queue", "queue.stl", "[1, 1, 1, 1, 1]", 10.0, 50.0, "{}", "[]")
+        customer_id, _ = database.resolve_customer("Queue Co", "queue.example.com")
+        errors = []
+
+        def _save() -> None:
+            try:
+                for _ in range(5):
+                    database.create_quote(part_id, customer_id, None, None, None,
+                                          "Aluminum 6061", 100.0, 100.0)
+                    emit_cutter_event("QUOTE_CREATED", subject_ref="quote:queue")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=_save) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+
+        conn = sqlite3.connect(self.test_db)
+        quote_ids = [row[0] for row in conn.execute("SELECT quote_id FROM ops__quotes")]
+        conn.close()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(quote_ids), 30)
+        self.assertEqual(len(set(quote_ids)), 30)
+
+    def test_concurrent_customer_and_contact_writes_go_through_the_queue(self) -> None:
+        write_queue.enable(True)
+        errors = []
+
+        def _manage(worker: int) -> None:
+            try:
+                for i in range(5):
+                    customer_id = database.create_customer(f"Queue Customer {worker}-{i}", f"q{worker}-{i}.example.com")
+                    database.update_customer(customer_id, domain=f"w{worker}-{i}.example.com")
+                    contact_id = database.create_contact_for_customer(
+                        customer_id, f"Buyer {worker}-{i}", email=f"buyer{worker}-{i}@example.com", is_primary=True)
+                    database.update_contact(contact_id, phone="555-0100")
+                    if i % 2:
+                        database.delete_contact(contact_id)
+                        database.delete_customer(customer_id)
+            except Exception as e:
+                errors.append(e)
+
+        # A write that opened its own connection instead of using the queue's fails here
+        with mock.patch.object(database, "get_connection", side_effect=AssertionError("own write connection")):
+            threads = [threading.Thread(target=_manage, args=(worker,)) for worker in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(30)
+
+        conn = sqlite3.connect(self.test_db)
+        customers = conn.execute("SELECT COUNT(*) FROM ops__customers WHERE domain LIKE 'w%.example.com'").fetchone()[0]
+        links = conn.execute("SELECT COUNT(*) FROM contact_companies WHERE is_primary = 1").fetchone()[0]
+        phones = conn.execute("SELECT COUNT(*) FROM ops__contacts WHERE phone = '555-0100'").fetchone()[0]
+        conn.close()
+        self.assertEqual(errors, [])
+        self.assertEqual((customers, links, phones), (18, 18, 18))
+
+    def test_final_quoted_price_returns_the_price_it_replaced(self) -> None:
+        write_queue.enable(True)
+        part_id = database.upsert_part("hash-final", "final.stl", "[1, 1, 1, 1, 1]", 10.0, 50.0, "{}", "[]")
+        customer_id, _ = database.resolve_customer("Final Co", "final.example.com")
+        quote_id = database.create_quote(part_id, customer_id, None, None, None, "Aluminum 6061", 100.0, 120.0)
+
+        self.assertEqual(database.set_final_quoted_price(quote_id, 110.0), 120.0)
+        self.assertEqual(database.set_final_quoted_price(quote_id, 105.0), 110.0)
+        self.assertIsNone(database.set_final_quoted_price(quote_id + 1000, 1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
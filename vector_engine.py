@@ -4,7 +4,7 @@ The Brain - 5D Vector Search & Fingerprinting
 """
 import numpy as np
 import database
-import json
+import fingerprint_index
 import hashlib
 
 # ============================================================================
@@ -197,6 +197,28 @@ def generate_genesis_hash(volume, bbox_dims):
     # Step 4: Return formatted hash (first 8 chars, uppercase)
     return f"CUTTER-{hash_obj.hexdigest()[:8].upper()}"
 
+def fingerprint_matrix_from_rows(rows):
+    """
+    Build (ids, vectors) from (id, fingerprint_blob, fingerprint_json) rows.
+    
+    Fast path: all rows carry the fixed-width BLOB -> one bytes join and
+    np.frombuffer into a contiguous (N, 5) float64 array (no per-row parsing).
+    Rows without a BLOB (not yet backfilled) are packed from JSON; rows with
+    no valid 5D vector are dropped, as the old per-record loop skipped them.
+    
+    Returns:
+        (ids int64 array (N,), vectors float64 array (N, 5))
+    """
+    rows = fingerprint_index.valid_fingerprint_rows(rows)
+    ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    return ids, fingerprint_index.vectors_from_rows(rows)
+
+
+def load_fingerprint_matrix():
+    """All part fingerprints with one query: (part ids (N,), vectors (N, 5))."""
+    return fingerprint_matrix_from_rows(database.get_part_fingerprint_rows())
+
+
 def find_similar_parts(current_fingerprint, history=None, current_vol=None):
     """
     Finds matches in history using Euclidean distance.
@@ -204,59 +226,68 @@ def find_similar_parts(current_fingerprint, history=None, current_vol=None):
     
     CRITICAL: Only searches ACTIVE quotes (is_deleted = 0).
     The AI must not learn from trash (data integrity).
+    
+    Distances are computed for all candidates at once on the shared
+    fingerprint matrix (fingerprint_index.py); full history records are
+    loaded for the top 5 only.
     """
+    curr_vec = np.asarray(current_fingerprint, dtype=np.float64)
+    if curr_vec.shape != (database.FINGERPRINT_DIMS,):
+        return []
+    
     if history is None:
-        # get_all_history() already filters is_deleted = 0
-        history = database.get_all_history()
-        
+        snapshot = fingerprint_index.get_snapshot()
+        ids, vectors, hist_vols = snapshot.quote_ids, snapshot.vectors, snapshot.volumes
+        records = None
+    else:
+        # Explicit records (fingerprint as list or JSON text); ids index into history
+        rows = [(i, database.pack_fingerprint(record.get('fingerprint')) if record.get('fingerprint') else None, None)
+                for i, record in enumerate(history)]
+        ids, vectors = fingerprint_matrix_from_rows(rows)
+        hist_vols = vectors[:, 0] * 10.0  # Decode volume from vector
+        records = history
+    
+    if len(ids) == 0:
+        return []
+    
+    # 1. Euclidean Distance (The Similarity Score)
+    distances = np.linalg.norm(vectors - curr_vec, axis=1)
+    
+    # 2. The Vise Check (Volume Ratio)
+    # Prevents "Geometric Liars" (tiny parts matching huge parts by vector accident)
+    if current_vol:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = current_vol / hist_vols
+        # If volume varies by > 50%, it's definitely not the same part logic
+        is_liar = (hist_vols > 0) & ((ratio > 1.5) | (ratio < 0.66))
+        distances = distances + np.where(is_liar, 10.0, 0.0)  # Hard penalty sends it to the bottom
+    
+    # Sort by distance (closest first); stable keeps history order on ties
+    top = np.argsort(distances, kind='stable')[:5]
+    if records is None:
+        top_records = database.get_history_records([int(ids[i]) for i in top])
+        by_id = {record['id']: record for record in top_records}
+        selected = [(by_id.get(int(ids[i])), float(distances[i])) for i in top]
+    else:
+        selected = [(records[int(ids[i])], float(distances[i])) for i in top]
+    
     matches = []
-    curr_vec = np.array(current_fingerprint)
-    
-    for record in history:
-        try:
-            if not record['fingerprint']: continue
-            
-            hist_vec = np.array(json.loads(record['fingerprint']))
-            
-            # Crash Protection: Skip legacy vectors if size mismatch
-            if len(hist_vec) != 5: continue
-
-            # 1. Euclidean Distance (The Similarity Score)
-            dist = np.linalg.norm(curr_vec - hist_vec)
-            
-            # 2. The Vise Check (Volume Ratio)
-            # Prevents "Geometric Liars" (tiny parts matching huge parts by vector accident)
-            is_liar = False
-            if current_vol:
-                hist_vol = hist_vec[0] * 10.0 # Decode volume from vector
-                if hist_vol > 0:
-                    ratio = current_vol / hist_vol
-                    # If volume varies by > 50%, it's definitely not the same part logic
-                    if ratio > 1.5 or ratio < 0.66: 
-                        is_liar = True
-            
-            if is_liar: 
-                dist += 10.0 # Hard penalty sends it to the bottom of the list
-
-            matches.append({
-                'distance': float(dist),
-                'match_type': 'twin' if dist < 2.5 else 'cousin', # WIDENED THRESHOLD FOR SIMULATION
-                'id': record['id'],
-                'filename': record['filename'],
-                'final_price': record['final_price'],
-                'setup_time': record.get('setup_time'),
-                'tag_weights': record.get('tag_weights'),
-                'user_feedback_tags': record.get('user_feedback_tags'),
-                'timestamp': record.get('timestamp'),
-                'process_routing': record.get('process_routing', [])  # Traveler Tags
-            })
-        except Exception as e:
-            # print(f"Vector Error on ID {record.get('id')}: {e}")
-            continue
-        
-    # Sort by distance (closest first)
-    matches.sort(key=lambda x: x['distance'])
-    return matches[:5]
+    for record, dist in selected:
+        if record is None:
+            continue  # deleted between the two reads
+        matches.append({
+            'distance': dist,
+            'match_type': 'twin' if dist < 2.5 else 'cousin', # WIDENED THRESHOLD FOR SIMULATION
+            'id': record['id'],
+            'filename': record['filename'],
+            'final_price': record['final_price'],
+            'setup_time': record.get('setup_time'),
+            'tag_weights': record.get('tag_weights'),
+            'user_feedback_tags': record.get('user_feedback_tags'),
+            'timestamp': record.get('timestamp'),
+            'process_routing': record.get('process_routing', [])  # Traveler Tags
+        })
+    return matches
 
 def analyze_cluster(matches):
     """
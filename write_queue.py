@@ -0,0 +1,258 @@
+"""
+write_queue.py
+Single-Writer Queue - one connection writes for the whole process
+
+SQLite WAL runs readers in parallel, but only one connection can write at a
+time. When every save_quote, wizard auto-save, ledger emit and tag edit
+opens its own write connection, concurrent requests queue on the file lock
+and fail with "database is locked" once the busy timeout runs out.
+
+Write paths (database.py, the cutter and state ledger boundaries) hand
+their work to run() as a closure over a connection:
+
+    def _write(conn):
+        cursor = conn.execute("INSERT ...")
+        return cursor.lastrowid
+    return write_queue.run(_write)
+
+Disabled (default): run() opens a connection, runs the closure inside
+BEGIN IMMEDIATE ... COMMIT, rolls back if it raises and always closes the
+connection.
+
+Enabled (CUTTER_WRITE_QUEUE=1; python -m ops_layer.server turns it on):
+one writer thread owns the process's write connection. It takes
+closures from a queue and group-commits whatever is waiting (up to
+MAX_BATCH jobs) in one transaction, each job in its own SAVEPOINT so a
+failing job rolls back alone. Results and exceptions come back through
+futures once the COMMIT has succeeded.
+
+Closures must only use the connection they are given and must not
+commit. A run() nested inside a closure joins the enclosing transaction.
+"""
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, TypeVar, Union
+
+ENV_VAR = "CUTTER_WRITE_QUEUE"
+BUSY_TIMEOUT_SECONDS = 15.0
+# Connection tuning (ops_layer/db_maintenance.py reports the effective values):
+# sorts and temp indexes in memory, a 16 MiB page cache for the writer, and
+# a WAL truncated back to 64 MiB after each checkpoint instead of keeping
+# its high-water size
+TEMP_STORE = "MEMORY"
+WRITE_CACHE_SIZE_KIB = 16384
+JOURNAL_SIZE_LIMIT = 64 * 1024 * 1024
+MAX_BATCH = 64
+
+T = TypeVar("T")
+# (database path, foreign_keys): jobs are only grouped with the same key
+_Key = Tuple[str, bool]
+
+
+class _Job(NamedTuple):
+    key: _Key
+    fn: Callable[[sqlite3.Connection], Any]
+    future: Future
+
+
+_STOP = object()
+_local = threading.local()
+_lock = threading.Lock()
+_writer: Optional["_Writer"] = None
+_enabled: Optional[bool] = None
+# Connections inherited across fork(): never closed by the child
+_inherited: List[sqlite3.Connection] = []
+
+
+def is_enabled() -> bool:
+    if _enabled is not None:
+        return _enabled
+    return os.environ.get(ENV_VAR, "").strip().lower() in {"1", "on", "true", "yes"}
+
+
+def enable(flag: bool = True) -> None:
+    """Override CUTTER_WRITE_QUEUE for this process."""
+    global _enabled
+    _enabled = flag
+    if not flag:
+        stop()
+
+
+def connect(db_path: Union[str, Path], foreign_keys: bool = False) -> sqlite3.Connection:
+    """A write connection: WAL, busy timeout, explicit transactions only."""
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None,
+                           check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL;")  # CRITICAL: Constitution Rule #2
+    conn.execute(f"PRAGMA temp_store = {TEMP_STORE};")
+    conn.execute(f"PRAGMA cache_size = -{WRITE_CACHE_SIZE_KIB};")
+    conn.execute(f"PRAGMA journal_size_limit = {JOURNAL_SIZE_LIMIT};")
+    if foreign_keys:
+        conn.execute("PRAGMA foreign_keys = ON;")
+    return conn
+
+
+def _run_job(conn: sqlite3.Connection, fn: Callable[[sqlite3.Connection], T]) -> T:
+    conn.execute("SAVEPOINT write_queue_job")
+    try:
+        result = fn(conn)
+    except BaseException:
+        conn.execute("ROLLBACK TO SAVEPOINT write_queue_job")
+        conn.execute("RELEASE SAVEPOINT write_queue_job")
+        raise
+    conn.execute("RELEASE SAVEPOINT write_queue_job")
+    return result
+
+
+def _run_inline(key: _Key, fn: Callable[[sqlite3.Connection], T]) -> T:
+    conn = connect(*key)
+    _local.conn = conn
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+    finally:
+        _local.conn = None
+        conn.close()
+
+
+class _Writer:
+    """The writer thread and its connections (one writer per process)."""
+
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+        self.jobs: "queue.Queue[Any]" = queue.Queue()
+        self.conns: Dict[_Key, sqlite3.Connection] = {}
+        self.thread = threading.Thread(target=self._loop, name="cutter-writer", daemon=True)
+        self.thread.start()
+
+    def _connection(self, key: _Key) -> sqlite3.Connection:
+        conn = self.conns.get(key)
+        if conn is None:
+            if any(path != key[0] for path, _ in self.conns):
+                self._close()  # TEST_DB_PATH switched: drop the old database's connections
+            conn = self.conns[key] = connect(*key)
+        return conn
+
+    def _close(self, key: Optional[_Key] = None) -> None:
+        for conn_key in [key] if key is not None else list(self.conns):
+            conn = self.conns.pop(conn_key, None)
+            if conn is not None:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+
+    def _loop(self) -> None:
+        carry: Any = None
+        while True:
+            job = carry if carry is not None else self.jobs.get()
+            carry = None
+            if job is _STOP:
+                break
+            batch = [job]
+            while len(batch) < MAX_BATCH:
+                try:
+                    queued = self.jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if queued is _STOP or queued.key != job.key:
+                    carry = queued
+                    break
+                batch.append(queued)
+            self._commit(batch)
+        self._close()
+
+    def _commit(self, batch: List[_Job]) -> None:
+        outcomes: List[Tuple[bool, Any]] = []
+        try:
+            conn = self._connection(batch[0].key)
+            _local.conn = conn
+            conn.execute("BEGIN IMMEDIATE")
+            for job in batch:
+                try:
+                    outcomes.append((True, _run_job(conn, job.fn)))
+                except BaseException as e:
+                    outcomes.append((False, e))
+                if not conn.in_transaction:
+                    raise sqlite3.OperationalError("write transaction was rolled back by SQLite")
+            conn.execute("COMMIT")
+        except Exception as e:
+            # Nothing in this batch was written: fail every job and reconnect
+            print(f"[WRITER] Group commit of {len(batch)} job(s) failed: {e}")
+            self._close(batch[0].key)
+            for job in batch:
+                job.future.set_exception(e)
+            return
+        finally:
+            _local.conn = None
+        for job, (ok, value) in zip(batch, outcomes):
+            if ok:
+                job.future.set_result(value)
+            else:
+                job.future.set_exception(value)
+
+
+def _get_writer() -> _Writer:
+    global _writer
+    with _lock:
+        if _writer is not None and _writer.pid != os.getpid():
+            # Forked child: the parent's thread does not exist here
+            _inherited.extend(_writer.conns.values())
+            _writer = None
+        if _writer is None:
+            _writer = _Writer()
+        return _writer
+
+
+def run(fn: Callable[[sqlite3.Connection], T], db_path: Optional[Union[str, Path]] = None,
+        foreign_keys: bool = False) -> T:
+    """
+    Run fn(conn) in a write transaction and return its result.
+
+    db_path defaults to database.resolve_db_path() (TEST_DB_PATH aware).
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return _run_job(conn, fn)
+    if db_path is None:
+        import database  # lazy: database.py builds its write paths on this module
+        db_path = database.resolve_db_path()
+    key = (str(db_path), foreign_keys)
+    if not is_enabled():
+        return _run_inline(key, fn)
+    future: Future = Future()
+    _get_writer().jobs.put(_Job(key, fn, future))
+    return future.result()
+
+
+def depth() -> int:
+    """Writes waiting for the writer thread (0 when the queue is off or idle)."""
+    writer = _writer
+    if writer is None or writer.pid != os.getpid():
+        return 0
+    return writer.jobs.qsize()
+
+
+def stop(timeout: float = 10.0) -> None:
+    """Finish queued writes and stop the writer thread (if running)."""
+    global _writer
+    with _lock:
+        writer, _writer = _writer, None
+    if writer is None or writer.pid != os.getpid():
+        return
+    writer.jobs.put(_STOP)
+    writer.thread.join(timeout)
+
+
+atexit.register(stop)